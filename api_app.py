@@ -0,0 +1,320 @@
+import os
+import sys
+import sqlite3
+import argparse
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import scores_utils
+import ratings_utils
+import tournament_service as service
+from tournaments_utils import use_current_tournament, use_database
+
+# Bearer token required on write requests when set (reads stay open for scoreboards and kiosks)
+API_TOKEN = os.environ.get("TOURNAMENT_API_TOKEN", "")
+
+
+class APIError(Exception):
+    """Raised by handlers to return a JSON error with the given HTTP status"""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+def _int_param(request, name, default=None):
+    value = request.query_params.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise APIError(400, f"{name} must be an integer")
+
+
+def _bool_param(request, name):
+    value = request.query_params.get(name)
+    if value is None or value == "":
+        return None
+    return value.lower() in ("1", "true", "yes")
+
+
+def _bool_field(body, name, default):
+    # JSON flags must be real booleans: bool("false") would be True
+    value = body.get(name, default)
+    if not isinstance(value, bool):
+        raise APIError(400, f"{name} must be true or false")
+    return value
+
+
+def _path_id(request, name):
+    try:
+        return int(request.path_params[name])
+    except ValueError:
+        raise APIError(404, "Not found")
+
+
+async def _json_body(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise APIError(400, "Request body must be JSON")
+    if not isinstance(body, dict):
+        raise APIError(400, "Request body must be a JSON object")
+    return body
+
+
+def _require_token(request):
+    if API_TOKEN and request.headers.get("authorization") != f"Bearer {API_TOKEN}":
+        raise APIError(401, "Missing or invalid API token")
+
+
+async def _run(function, *args, **kwargs):
+    # Service functions use blocking sqlite3 calls; keep them off the event loop
+    return await run_in_threadpool(function, *args, **kwargs)
+
+
+def cached(handler):
+    """
+    Serve GET handlers with a weak ETag derived from the change feed's latest seq.
+
+    The seq moves on every participant, match and fixture change, so a matching
+    If-None-Match is answered with 304 before the handler runs any query.
+    """
+    async def wrapper(request):
+        etag = f'W/"{await _run(service.get_data_version)}"'
+        if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=304, headers={"ETag": etag})
+        response = await handler(request)
+        if response.status_code == 200:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+    return wrapper
+
+
+def write(handler):
+    """Wrap POST/DELETE handlers with the API token check"""
+    async def wrapper(request):
+        _require_token(request)
+        return await handler(request)
+    return wrapper
+
+
+@cached
+async def list_participants(request):
+    return JSONResponse(await _run(
+        service.list_participants,
+        offset=_int_param(request, "offset", 0),
+        limit=_int_param(request, "limit", service.DEFAULT_PAGE_SIZE),
+        category=request.query_params.get("category"),
+        game=request.query_params.get("game"),
+        registered=_bool_param(request, "registered"),
+        search=request.query_params.get("search"),
+    ))
+
+
+@write
+async def create_participant(request):
+    body = await _json_body(request)
+    fields = ("emp_id", "name", "email", "category", "location", "sub_location", "game", "slot",
+              "partner_emp_id", "gender", "partner_gender")
+    try:
+        participant = await _run(service.create_participant, **{key: body[key] for key in fields if key in body})
+    except sqlite3.IntegrityError:
+        raise APIError(409, f"Participant {body.get('emp_id')} already exists")
+    return JSONResponse(participant, status_code=201)
+
+
+@cached
+async def get_participant(request):
+    participant = await _run(service.get_participant, _path_id(request, "participant_id"))
+    if participant is None:
+        raise APIError(404, "Participant not found")
+    return JSONResponse(participant)
+
+
+@write
+async def check_in(request):
+    body = await _json_body(request) if await request.body() else {}
+    participant = await _run(service.check_in_participant, _path_id(request, "participant_id"),
+                             registered=_bool_field(body, "registered", True))
+    if participant is None:
+        raise APIError(404, "Participant not found")
+    return JSONResponse(participant)
+
+
+@cached
+async def list_matches(request):
+    status = request.query_params.get("status")
+    if status and status not in service.MATCH_STATUSES:
+        raise APIError(400, f"status must be one of {', '.join(service.MATCH_STATUSES)}")
+    return JSONResponse(await _run(
+        service.list_matches,
+        offset=_int_param(request, "offset", 0),
+        limit=_int_param(request, "limit", service.DEFAULT_PAGE_SIZE),
+        category=request.query_params.get("category"),
+        status=status,
+        round_number=_int_param(request, "round"),
+        game=request.query_params.get("game"),
+    ))
+
+
+@write
+async def create_match(request):
+    body = await _json_body(request)
+    if not body.get("category") or body.get("round_number") is None:
+        raise APIError(400, "category and round_number are required")
+    fields = ("category", "round_number", "player1_id", "player2_id", "team1_player1_id", "team1_player2_id",
+              "team2_player1_id", "team2_player2_id", "game")
+    match = await _run(service.schedule_match, **{key: body[key] for key in fields if key in body})
+    return JSONResponse(match, status_code=201)
+
+
+@cached
+async def get_match(request):
+    match = await _run(service.get_match, _path_id(request, "match_id"))
+    if match is None:
+        raise APIError(404, "Match not found")
+    return JSONResponse(match)
+
+
+@write
+async def record_result(request):
+    body = await _json_body(request)
+    match = await _run(service.record_result, _path_id(request, "match_id"),
+                       winner_id=body.get("winner_id"), winner_team=body.get("winner_team"),
+                       advancement_type=body.get("advancement_type", "normal"), score=body.get("score"),
+                       advance=_bool_field(body, "advance", False))
+    if match is None:
+        raise APIError(404, "Match not found")
+    return JSONResponse(match)
+
+
+@write
+async def record_results(request):
+    body = await _json_body(request)
+    results = body.get("results")
+    if not isinstance(results, list) or not all(isinstance(result, dict) and "match_id" in result for result in results):
+        raise APIError(400, "results must be a list of objects with match_id")
+    return JSONResponse(await _run(service.record_results, results, advance=_bool_field(body, "advance", True)))
+
+
+@cached
+async def list_fixtures(request):
+    return JSONResponse(await _run(
+        service.list_fixtures,
+        offset=_int_param(request, "offset", 0),
+        limit=_int_param(request, "limit", service.DEFAULT_PAGE_SIZE),
+        category=request.query_params.get("category"),
+        location=request.query_params.get("location"),
+        game=request.query_params.get("game"),
+    ))
+
+
+@cached
+async def get_fixture(request):
+    fixture = await _run(service.get_fixture, _path_id(request, "fixture_id"))
+    if fixture is None:
+        raise APIError(404, "Fixture not found")
+    return JSONResponse(fixture)
+
+
+@write
+async def generate_fixtures(request):
+    body = await _json_body(request)
+    missing = [key for key in ("category", "location", "start_time", "end_time") if not body.get(key)]
+    if missing:
+        raise APIError(400, f"Missing fields: {', '.join(missing)}")
+    created = await _run(service.generate_fixtures, body["category"], body["location"], body["start_time"],
+                         body["end_time"], body.get("interval_minutes", 30), body.get("matches_per_slot", 1),
+                         body.get("game"), _bool_field(body, "seeded", False))
+    return JSONResponse({'created': created}, status_code=201)
+
+
+@write
+async def delete_fixture(request):
+    if not await _run(service.remove_fixture, _path_id(request, "fixture_id")):
+        raise APIError(404, "Fixture not found")
+    return Response(status_code=204)
+
+
+@cached
+async def get_bracket(request):
+    return JSONResponse(await _run(service.get_bracket, request.path_params["category"],
+                                   request.query_params.get("game")))
+
+
+@cached
+async def get_leaderboard(request):
+    leaderboard = await _run(scores_utils.get_leaderboard, request.query_params.get("game"),
+                             request.query_params.get("category"),
+                             min(_int_param(request, "limit", 20), service.MAX_PAGE_SIZE))
+    return JSONResponse({'items': leaderboard.to_dict(orient="records")})
+
+
+# Not @cached: ratings span every tournament, so this tournament's change feed does not track them
+async def get_ratings(request):
+    ratings = await _run(ratings_utils.get_top_ratings, request.query_params.get("game"),
+                         min(_int_param(request, "limit", 20), service.MAX_PAGE_SIZE))
+    return JSONResponse({'items': ratings.to_dict(orient="records")})
+
+
+@cached
+async def get_summary(request):
+    return JSONResponse(await _run(service.get_summary, request.query_params.get("game")))
+
+
+async def api_error(request, exc):
+    return JSONResponse({'error': exc.message}, status_code=exc.status_code)
+
+
+async def value_error(request, exc):
+    return JSONResponse({'error': str(exc)}, status_code=400)
+
+
+app = Starlette(routes=[
+    Route("/api/participants", list_participants, methods=["GET"]),
+    Route("/api/participants", create_participant, methods=["POST"]),
+    Route("/api/participants/{participant_id}", get_participant, methods=["GET"]),
+    Route("/api/participants/{participant_id}/check-in", check_in, methods=["POST"]),
+    Route("/api/matches", list_matches, methods=["GET"]),
+    Route("/api/matches", create_match, methods=["POST"]),
+    Route("/api/matches/results", record_results, methods=["POST"]),
+    Route("/api/matches/{match_id}", get_match, methods=["GET"]),
+    Route("/api/matches/{match_id}/result", record_result, methods=["POST"]),
+    Route("/api/fixtures", list_fixtures, methods=["GET"]),
+    Route("/api/fixtures/generate", generate_fixtures, methods=["POST"]),
+    Route("/api/fixtures/{fixture_id}", get_fixture, methods=["GET"]),
+    Route("/api/fixtures/{fixture_id}", delete_fixture, methods=["DELETE"]),
+    Route("/api/brackets/{category}", get_bracket, methods=["GET"]),
+    Route("/api/leaderboard", get_leaderboard, methods=["GET"]),
+    Route("/api/ratings", get_ratings, methods=["GET"]),
+    Route("/api/summary", get_summary, methods=["GET"]),
+], exception_handlers={APIError: api_error, ValueError: value_error})
+
+
+def main(argv=None):
+    """Command line entry point: serve the API with uvicorn"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the tournament JSON API")
+    parser.add_argument("--db", help="Tournament database path (default: the current tournament)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    args = parser.parse_args(argv)
+    if args.db:
+        use_database(args.db)
+    else:
+        use_current_tournament()
+
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
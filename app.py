@@ -1,25 +1,49 @@
 import streamlit as st
 import pandas as pd
-import json
 import os
 from datetime import datetime
 import sqlite3
 from io import BytesIO
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import time
+import zipfile
+from contextlib import contextmanager
 
-# Windows-specific imports (for Outlook integration)
-# These will only work on Windows systems
-try:
-    import win32com.client
-    import pythoncom
-    OUTLOOK_AVAILABLE = True
-except ImportError:
-    OUTLOOK_AVAILABLE = False
-from fixtures_utils import (get_all_fixtures, get_fixtures_by_category, parse_time_slot, 
-                           generate_time_slots, assign_participants_to_slots, save_fixtures, 
-                           delete_fixture, get_fixture_emails, mark_emails_sent)
+from import_utils import lazy_import
+from db_utils import connect, get_database
+from sample_data import generate_participants
+from perf_utils import PERF_PROFILING, SLOW_QUERY_MS, begin_rerun, finish_rerun, read_log
+from email_utils import get_transport_name, get_transport, email_session, send_email
+from export_utils import EXPORT_QUERIES, build_export_file
+from tournament_service import (init_database, get_participants, get_matches, add_participant_extended, ensure_partner_exists,
+                                update_registration_status, create_match, update_match_result, record_results,
+                                search_participants, get_registration_desk_view, import_participants, get_memory_report)
+from events_utils import record_event, get_changes_since, get_latest_seq
+from teams_utils import get_pairing_report, get_teams
+from tournaments_utils import (list_tournaments, get_tournament, get_current_tournament, use_database,
+                               create_tournament, set_current_tournament, archive_tournament, restore_tournament)
+from summary_utils import get_summary_metrics, get_category_summary, get_round_progress
+from scores_utils import get_leaderboard
+from ratings_utils import get_ratings, recompute_ratings, seed_by_rating
+from archive_utils import archive_rows, get_archive_status, start_compaction, enable_incremental_vacuum
+from snapshot_utils import PYARROW_AVAILABLE, create_snapshot, list_snapshots, restore_snapshot, zip_snapshot, unzip_snapshot
+from email_jobs import (EMAIL_RATE_PER_MINUTE, EMAIL_RATE_BURST, split_into_batches, create_send_job,
+                        run_send_job, get_send_jobs, cancel_send_job)
+from fixtures_utils import get_all_fixtures, delete_fixture, mark_emails_sent
+from email_templates import (EmailTemplate, FIXTURE_DETAILS, WINNER_DETAILS, DIGEST_DETAILS, FIXTURE_SLOT_SUBJECT, FIXTURE_SLOT_BODY,
+                             get_notification_frame, get_fixture_notification_frame, render_notifications, render_digests)
+
+# plotly is only needed for the category report chart; import it on first use
+go = lazy_import("plotly.graph_objects")
+
+# Fixture slot notification sent from the Fixtures tab, compiled once at startup
+FIXTURE_SLOT_TEMPLATE = EmailTemplate(FIXTURE_SLOT_SUBJECT, FIXTURE_SLOT_BODY)
+
+def find_participant(participants_df, participant_id):
+    """A participant's row, or None when the ID is missing (pd.NA) or not in the frame"""
+    if pd.isna(participant_id):
+        return None
+    rows = participants_df[participants_df['id'] == participant_id]
+    return rows.iloc[0] if not rows.empty else None
 
 # Function to generate sample participants for testing
 def generate_sample_participants(game, category, count=30, slot_type="Morning"):
@@ -36,88 +60,11 @@ def generate_sample_participants(game, category, count=30, slot_type="Morning"):
         int: Number of participants generated
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Generate unique IDs starting from a high number to avoid conflicts
-        cursor.execute("SELECT MAX(id) FROM participants")
-        max_id = cursor.fetchone()[0] or 0
-        start_id = max_id + 1
-        
-        # Generate unique employee IDs
-        cursor.execute("SELECT MAX(CAST(emp_id AS INTEGER)) FROM participants WHERE emp_id GLOB '[0-9]*'")
-        result = cursor.fetchone()[0]
-        max_emp_id = int(result) if result else 10000
-        start_emp_id = max_emp_id + 1
-        
-        participants_added = 0
-        
-        # For doubles categories, we need to create pairs
-        if 'Doubles' in category:
-            # Generate pairs (need even number of participants)
-            pairs_count = count // 2
-            for i in range(pairs_count):
-                # Create first player of the pair
-                player1_id = start_id + (i * 2)
-                player1_emp_id = str(start_emp_id + (i * 2))
-                player1_name = f"Player {player1_emp_id}"
-                
-                # Create second player of the pair
-                player2_id = start_id + (i * 2) + 1
-                player2_emp_id = str(start_emp_id + (i * 2) + 1)
-                player2_name = f"Player {player2_emp_id}"
-                
-                # Insert first player with reference to second player
-                # Current timestamp for registration and creation time
-                current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                cursor.execute("""
-                    INSERT INTO participants 
-                    (id, emp_id, name, email, category, game, partner_emp_id, registered_at_desk, slot, registered_timestamp, created_at) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player1_id, player1_emp_id, player1_name, 
-                    f"player{player1_emp_id}@example.com", 
-                    category, game, player2_emp_id, 0, slot_type, current_time, current_time
-                ))
-                
-                # Insert second player with reference to first player
-                cursor.execute("""
-                    INSERT INTO participants 
-                    (id, emp_id, name, email, category, game, partner_emp_id, registered_at_desk, slot, registered_timestamp, created_at) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player2_id, player2_emp_id, player2_name, 
-                    f"player{player2_emp_id}@example.com", 
-                    category, game, player1_emp_id, 0, slot_type, current_time, current_time
-                ))
-                
-                participants_added += 2
-        else:
-            # For singles, just create individual participants
-            for i in range(count):
-                player_id = start_id + i
-                player_emp_id = str(start_emp_id + i)
-                player_name = f"Player {player_emp_id}"
-                
-                # Current timestamp for registration and creation time
-                current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                cursor.execute("""
-                    INSERT INTO participants 
-                    (id, emp_id, name, email, category, game, registered_at_desk, slot, registered_timestamp, created_at) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player_id, player_emp_id, player_name, 
-                    f"player{player_emp_id}@example.com", 
-                    category, game, 0, slot_type, current_time, current_time
-                ))
-                
-                participants_added += 1
-        
+        conn = connect(get_database())
+        entries = generate_participants(conn, count, games=[game], categories=[category], slots=[slot_type])
         conn.commit()
         conn.close()
-        return participants_added
+        return sum(len(entry) for bucket in entries.values() for entry in bucket)
     
     except Exception as e:
         st.error(f"Error generating sample participants: {str(e)}")
@@ -131,6 +78,10 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Per-rerun query profiling (perf_utils): on for every session with PERF_PROFILING=1,
+# or for this session while the sidebar performance panel is switched on
+perf_profile = begin_rerun(st.session_state, PERF_PROFILING or st.session_state.get("perf_panel", False))
+
 # Enhanced colorful CSS styling
 st.markdown("""
 <style>
@@ -311,597 +262,13 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Database path
-DB_PATH = 'tournament.db'
-
-def init_database():
-    """Initialize the SQLite database"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Check if participants table exists and get its structure
-    cursor.execute("PRAGMA table_info(participants)")
-    columns = [column[1] for column in cursor.fetchall()]
-    
-    # Migrate old database if needed
-    if columns and 'emp_id' not in columns:
-        print("Migrating database to new schema...")
-        
-        # Create new table with correct schema
-        cursor.execute('''
-            CREATE TABLE participants_new (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                emp_id TEXT NOT NULL UNIQUE,
-                name TEXT NOT NULL,  
-                email TEXT,
-                location TEXT,
-                sub_location TEXT,
-                game TEXT,
-                category TEXT NOT NULL,
-                slot TEXT,
-                partner_emp_id TEXT,
-                gender TEXT,
-                partner_gender TEXT,
-                registered_at_desk INTEGER DEFAULT 0,
-                registered_timestamp TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Migrate existing data if any
-        cursor.execute("SELECT COUNT(*) FROM participants")
-        if cursor.fetchone()[0] > 0:
-            # Generate unique emp_ids for existing participants
-            if 'team_partner' in columns:
-                cursor.execute('''
-                    INSERT INTO participants_new (emp_id, name, email, category, partner_emp_id, registered_at_desk, created_at)
-                    SELECT 
-                        'EMP' || SUBSTR('0000' || id, -4) AS emp_id,
-                        name,
-                        email,
-                        category,
-                        CASE WHEN team_partner IS NOT NULL AND team_partner != '' THEN team_partner ELSE NULL END,
-                        COALESCE(registered_at_desk, 0),
-                        COALESCE(created_at, CURRENT_TIMESTAMP)
-                    FROM participants
-                ''')
-            else:
-                cursor.execute('''
-                    INSERT INTO participants_new (emp_id, name, email, category, registered_at_desk, created_at)
-                    SELECT 
-                        'EMP' || SUBSTR('0000' || id, -4) AS emp_id,
-                        name,
-                        email,
-                        category,
-                        COALESCE(registered_at_desk, 0),
-                        COALESCE(created_at, CURRENT_TIMESTAMP)
-                    FROM participants
-                ''')
-        
-        # Replace old table
-        cursor.execute("DROP TABLE participants")
-        cursor.execute("ALTER TABLE participants_new RENAME TO participants")
-        print("Database migration completed.")
-    
-    # Check if registered_timestamp column exists, if not add it
-    elif columns and 'registered_timestamp' not in columns:
-        print("Adding registered_timestamp column...")
-        cursor.execute("ALTER TABLE participants ADD COLUMN registered_timestamp TIMESTAMP")
-    
-    # Check if created_at column exists, if not add it
-    if columns and 'created_at' not in columns:
-        print("Adding created_at column to participants table...")
-        cursor.execute("ALTER TABLE participants ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-        print("created_at column added to participants table.")
-    
-    # Check and add missing columns to matches table
-    cursor.execute("PRAGMA table_info(matches)")
-    matches_columns = [column[1] for column in cursor.fetchall()]
-    
-    if matches_columns and 'winner_team' not in matches_columns:
-        print("Adding winner_team column to matches table...")
-        try:
-            cursor.execute("ALTER TABLE matches ADD COLUMN winner_team INTEGER")
-            print("winner_team column added to matches table.")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-    
-    if matches_columns and 'completed_at' not in matches_columns:
-        print("Adding completed_at column to matches table...")
-        try:
-            cursor.execute("ALTER TABLE matches ADD COLUMN completed_at TIMESTAMP")
-            print("completed_at column added to matches table.")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-    
-    if matches_columns and 'updated_at' not in matches_columns:
-        print("Adding updated_at column to matches table...")
-        try:
-            cursor.execute("ALTER TABLE matches ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-            print("updated_at column added to matches table.")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-    
-    if matches_columns and 'created_at' not in matches_columns:
-        print("Adding created_at column to matches table...")
-        try:
-            cursor.execute("ALTER TABLE matches ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-            print("created_at column added to matches table.")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-    
-    # Create participants table if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS participants (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            emp_id TEXT UNIQUE,
-            name TEXT,
-            email TEXT,
-            category TEXT,
-            partner_emp_id TEXT,
-            registered_at_desk INTEGER DEFAULT 0,
-            registered_timestamp TIMESTAMP,
-            location TEXT,
-            sub_location TEXT,
-            game TEXT,
-            slot TEXT,
-            gender TEXT,
-            partner_gender TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Create matches table if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS matches (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            match_number INTEGER,
-            round_number INTEGER,
-            category TEXT,
-            player1_id INTEGER,
-            player2_id INTEGER,
-            team1_player1_id INTEGER,
-            team1_player2_id INTEGER,
-            team2_player1_id INTEGER,
-            team2_player2_id INTEGER,
-            winner_id INTEGER,
-            winner_team_id INTEGER,
-            winner_team INTEGER,
-            match_status TEXT DEFAULT 'pending',
-            match_date TIMESTAMP,
-            score TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_at TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (player1_id) REFERENCES participants (id),
-            FOREIGN KEY (player2_id) REFERENCES participants (id),
-            FOREIGN KEY (team1_player1_id) REFERENCES participants (id),
-            FOREIGN KEY (team1_player2_id) REFERENCES participants (id),
-            FOREIGN KEY (team2_player1_id) REFERENCES participants (id),
-            FOREIGN KEY (team2_player2_id) REFERENCES participants (id)
-        )
-    ''')
-    
-    # Create fixtures table if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS fixtures (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category TEXT,
-            time_slot TEXT,
-            start_time TIMESTAMP,
-            end_time TIMESTAMP,
-            location TEXT,
-            court_number INTEGER,
-            player1_id INTEGER,
-            player2_id INTEGER,
-            team1_player1_id INTEGER,
-            team1_player2_id INTEGER,
-            team2_player1_id INTEGER,
-            team2_player2_id INTEGER,
-            fixture_status TEXT DEFAULT 'scheduled',
-            emails_sent INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (player1_id) REFERENCES participants (id),
-            FOREIGN KEY (player2_id) REFERENCES participants (id),
-            FOREIGN KEY (team1_player1_id) REFERENCES participants (id),
-            FOREIGN KEY (team1_player2_id) REFERENCES participants (id),
-            FOREIGN KEY (team2_player1_id) REFERENCES participants (id),
-            FOREIGN KEY (team2_player2_id) REFERENCES participants (id)
-        )
-    ''')
-    
-    # Check if match_code column exists in matches table, if not add it
-    cursor.execute("PRAGMA table_info(matches)")
-    match_columns = [column[1] for column in cursor.fetchall()]
-    
-    if 'match_code' not in match_columns:
-        print("Adding match_code column to matches table...")
-        cursor.execute("ALTER TABLE matches ADD COLUMN match_code TEXT")
-        print("match_code column added.")
-    
-    if 'advancement_type' not in match_columns:
-        print("Adding advancement_type column to matches table...")
-        cursor.execute("ALTER TABLE matches ADD COLUMN advancement_type TEXT DEFAULT 'normal'")
-        print("advancement_type column added.")
-    
-    # Check if slot and round_number columns exist in fixtures table, if not add them
-    cursor.execute("PRAGMA table_info(fixtures)")
-    fixtures_columns = [column[1] for column in cursor.fetchall()]
-    
-    if 'slot' not in fixtures_columns:
-        print("Adding slot column to fixtures table...")
-        cursor.execute("ALTER TABLE fixtures ADD COLUMN slot TEXT")
-        print("slot column added to fixtures table.")
-    
-    if 'round_number' not in fixtures_columns:
-        print("Adding round_number column to fixtures table...")
-        cursor.execute("ALTER TABLE fixtures ADD COLUMN round_number INTEGER")
-        print("round_number column added to fixtures table.")
-    
-    if 'game' not in fixtures_columns:
-        print("Adding game column to fixtures table...")
-        cursor.execute("ALTER TABLE fixtures ADD COLUMN game TEXT")
-        print("game column added to fixtures table.")
-    
-    conn.commit()
-    conn.close()
-
-def get_participants():
-    """Get all participants from database, excluding auto-generated placeholder partners"""
-    conn = sqlite3.connect(DB_PATH)
-    # Filter out placeholder partners (those with names starting with "Player-")
-    df = pd.read_sql_query('''
-        SELECT * FROM participants 
-        WHERE name NOT LIKE 'Player-%' 
-        ORDER BY created_at DESC
-    ''', conn)
-    conn.close()
-    return df
-
-def get_matches():
-    """Get all matches from database"""
-    conn = sqlite3.connect(DB_PATH)
-    
-    # Check if created_at column exists in matches table
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(matches)")
-    columns = [column[1] for column in cursor.fetchall()]
-    
-    # Use appropriate ordering based on available columns
-    if 'created_at' in columns:
-        order_by = 'ORDER BY m.created_at DESC'
-    elif 'updated_at' in columns:
-        order_by = 'ORDER BY m.updated_at DESC'
-    else:
-        order_by = 'ORDER BY m.id DESC'
-    
-    df = pd.read_sql_query(f'''
-        SELECT m.*, 
-               p1.name as player1_name, p2.name as player2_name,
-               t1p1.name as team1_player1_name, t1p2.name as team1_player2_name,
-               t2p1.name as team2_player1_name, t2p2.name as team2_player2_name,
-               w.name as winner_name
-        FROM matches m
-        LEFT JOIN participants p1 ON m.player1_id = p1.id
-        LEFT JOIN participants p2 ON m.player2_id = p2.id
-        LEFT JOIN participants t1p1 ON m.team1_player1_id = t1p1.id
-        LEFT JOIN participants t1p2 ON m.team1_player2_id = t1p2.id
-        LEFT JOIN participants t2p1 ON m.team2_player1_id = t2p1.id
-        LEFT JOIN participants t2p2 ON m.team2_player2_id = t2p2.id
-        LEFT JOIN participants w ON m.winner_id = w.id
-        {order_by}
-    ''', conn)
-    conn.close()
-    return df
-
-def add_participant(emp_id, name, email, category, partner_emp_id=None):
-    """Add a new participant to the database (legacy function)"""
-    return add_participant_extended(emp_id, name, email, None, None, "Carrom", category, None, partner_emp_id, None, None)
-
-def add_participant_extended(emp_id, name, email, location=None, sub_location=None, game="Carrom", 
-                           category=None, slot=None, partner_emp_id=None, gender=None, partner_gender=None):
-    """Add a new participant to the database with extended fields"""
-    try:
-        # Print debug info
-        print(f"Adding participant: {emp_id}, {name}, {email}, {location}, {sub_location}, {game}, {category}, {slot}, {partner_emp_id}, {gender}, {partner_gender}")
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Get current timestamp for created_at
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Check if the participant already exists
-        cursor.execute('SELECT COUNT(*) FROM participants WHERE emp_id = ?', (emp_id,))
-        if cursor.fetchone()[0] > 0:
-            print(f"Participant with emp_id {emp_id} already exists!")
-            conn.close()
-            raise sqlite3.IntegrityError(f"UNIQUE constraint failed: participants.emp_id ({emp_id})")
-        
-        # Insert the new participant with all fields
-        cursor.execute('''
-            INSERT INTO participants (emp_id, name, email, location, sub_location, game, category, slot, 
-                                    partner_emp_id, gender, partner_gender, registered_at_desk, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (emp_id, name, email, location, sub_location, game, category, slot, 
-              partner_emp_id, gender, partner_gender, 0, current_time))
-        
-        # Verify the insert worked
-        cursor.execute('SELECT * FROM participants WHERE emp_id = ?', (emp_id,))
-        result = cursor.fetchone()
-        print(f"Insert result: {result}")
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Error in add_participant_extended: {str(e)}")
-        # Re-raise the exception to be caught by the caller
-        raise e
-
-def ensure_partner_exists(partner_emp_id, category, game="Carrom", slot=None, gender=None):
-    """Ensure that a partner exists in the database, create a placeholder if not"""
-    if not partner_emp_id:
-        return False
-        
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Check if partner exists
-    cursor.execute('SELECT COUNT(*) FROM participants WHERE emp_id = ?', (partner_emp_id,))
-    exists = cursor.fetchone()[0] > 0
-    
-    if not exists:
-        # Create a placeholder partner entry
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        partner_name = f"Player-{partner_emp_id}"
-        partner_email = f"player{partner_emp_id}@example.com"
-        
-        # Insert with all the new fields
-        cursor.execute('''
-            INSERT INTO participants (emp_id, name, email, game, category, slot, gender, registered_at_desk, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (partner_emp_id, partner_name, partner_email, game, category, slot, gender, 0, current_time))
-        
-        conn.commit()
-        print(f"Created placeholder partner with ID {partner_emp_id}")
-        result = True
-    else:
-        print(f"Partner with ID {partner_emp_id} already exists")
-        result = False
-        
-    conn.close()
-    return result
-
-def update_registration_status(participant_id, status):
-    """Update participant registration status with timestamp"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    if status == 1:
-        # Mark as reported with current timestamp
-        cursor.execute('''
-            UPDATE participants 
-            SET registered_at_desk = ?, registered_timestamp = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (status, participant_id))
-    else:
-        # Unmark - clear both status and timestamp
-        cursor.execute('''
-            UPDATE participants 
-            SET registered_at_desk = ?, registered_timestamp = NULL
-            WHERE id = ?
-        ''', (status, participant_id))
-    
-    conn.commit()
-    conn.close()
-
-def generate_match_id(match_id, category, round_number):
-    """Generate a readable match ID"""
-    category_code = ''.join([word[0].upper() for word in category.split()])
-    return f"{category_code}-R{round_number}-{match_id:03d}"
-
-def create_match(category, round_number, player1_id=None, player2_id=None, 
-                team1_player1_id=None, team1_player2_id=None,
-                team2_player1_id=None, team2_player2_id=None):
-    """Create a new match"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Check if created_at column exists
-    cursor.execute("PRAGMA table_info(matches)")
-    columns = [column[1] for column in cursor.fetchall()]
-    
-    if 'created_at' in columns:
-        cursor.execute(''' 
-            INSERT INTO matches (category, round_number, player1_id, player2_id, 
-                                team1_player1_id, team1_player2_id, 
-                                team2_player1_id, team2_player2_id, 
-                                match_status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (category, round_number, player1_id, player2_id, 
-              team1_player1_id, team1_player2_id, 
-              team2_player1_id, team2_player2_id, 
-              'scheduled', current_time))
-    else:
-        cursor.execute(''' 
-            INSERT INTO matches (category, round_number, player1_id, player2_id, 
-                                team1_player1_id, team1_player2_id, 
-                                team2_player1_id, team2_player2_id, 
-                                match_status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (category, round_number, player1_id, player2_id, 
-              team1_player1_id, team1_player2_id, 
-              team2_player1_id, team2_player2_id, 
-              'scheduled'))
-    
-    match_id = cursor.lastrowid
-    
-    # Generate a readable match ID
-    readable_id = generate_match_id(match_id, category, round_number)
-    
-    # Update the match with the readable ID
-    cursor.execute(''' 
-        UPDATE matches SET match_code = ? WHERE id = ?
-    ''', (readable_id, match_id))
-    
-    conn.commit()
-    conn.close()
-    return match_id
-
-def update_match_result(match_id, winner_id=None, winner_team=None, advancement_type='normal'):
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Update match status and winner
-        if winner_id is not None:  # Singles match
-            cursor.execute('''
-                UPDATE matches 
-                SET match_status = 'completed', winner_id = ?, completed_at = ?, advancement_type = ? 
-                WHERE id = ?
-            ''', (winner_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), advancement_type, match_id))
-        elif winner_team is not None:  # Doubles match
-            cursor.execute('''
-                UPDATE matches 
-                SET match_status = 'completed', winner_team = ?, completed_at = ?, advancement_type = ? 
-                WHERE id = ?
-            ''', (winner_team, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), advancement_type, match_id))
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Error updating match result: {str(e)}")
-        return False
-
-def update_match_tracker_details(match_id, round_number=None, match_status=None, winner_id=None, advancement_type=None):
-    """Update match details including round, status, winner and advancement type"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Build the update query dynamically based on provided parameters
-        update_parts = []
-        params = []
-        
-        if round_number is not None:
-            update_parts.append("round_number = ?")
-            params.append(round_number)
-        
-        if match_status is not None:
-            update_parts.append("match_status = ?")
-            params.append(match_status)
-            
-            # If status is completed, add timestamp
-            if match_status == 'completed':
-                update_parts.append("completed_at = ?")
-                params.append(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-            elif match_status == 'scheduled':
-                # Reset completed_at if match is rescheduled
-                update_parts.append("completed_at = NULL")
-        
-        if winner_id is not None:
-            update_parts.append("winner_id = ?")
-            params.append(winner_id)
-        
-        if advancement_type is not None:
-            update_parts.append("advancement_type = ?")
-            params.append(advancement_type)
-        
-        # Only proceed if we have something to update
-        if update_parts:
-            query = f"UPDATE matches SET {', '.join(update_parts)} WHERE id = ?"
-            params.append(match_id)
-            
-            cursor.execute(query, params)
-            conn.commit()
-            
-            print(f"Updated match {match_id} with {', '.join(update_parts)}")
-            result = True
-        else:
-            print(f"No updates provided for match {match_id}")
-            result = False
-            
-        conn.close()
-        return result
-    except Exception as e:
-        print(f"Error updating match details: {str(e)}")
-        return False
-
-def update_match_details(match_id, player1_id=None, player2_id=None, team1_player1_id=None, team1_player2_id=None, team2_player1_id=None, team2_player2_id=None, match_status=None, round_number=None):
-    """Update match details"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Build the update query dynamically
-    update_parts = []
-    params = []
-    
-    if player1_id is not None:
-        update_parts.append("player1_id = ?")
-        params.append(player1_id)
-    
-    if player2_id is not None:
-        update_parts.append("player2_id = ?")
-        params.append(player2_id)
-    
-    if team1_player1_id is not None:
-        update_parts.append("team1_player1_id = ?")
-        params.append(team1_player1_id)
-    
-    if team1_player2_id is not None:
-        update_parts.append("team1_player2_id = ?")
-        params.append(team1_player2_id)
-    
-    if team2_player1_id is not None:
-        update_parts.append("team2_player1_id = ?")
-        params.append(team2_player1_id)
-    
-    if team2_player2_id is not None:
-        update_parts.append("team2_player2_id = ?")
-        params.append(team2_player2_id)
-    
-    if match_status is not None:
-        update_parts.append("match_status = ?")
-        params.append(match_status)
-    
-    if round_number is not None:
-        update_parts.append("round_number = ?")
-        params.append(round_number)
-    
-    # Only proceed if we have something to update
-    if update_parts:
-        query = f"UPDATE matches SET {', '.join(update_parts)} WHERE id = ?"
-        params.append(match_id)
-        
-        cursor.execute(query, params)
-        conn.commit()
-        conn.close()
-        return True
-    else:
-        conn.close()
-        return False
-
-def search_participants(search_term, participants_df):
-    # Search participants by emp_id, name, email, or category
-    if participants_df.empty:
-        return pd.DataFrame()
-        
-    search_term = str(search_term).lower()
-    
-    # Search in multiple columns
-    mask = (
-        participants_df['emp_id'].astype(str).str.lower().str.contains(search_term) |
-        participants_df['name'].astype(str).str.lower().str.contains(search_term) |
-        participants_df['email'].astype(str).str.lower().str.contains(search_term) |
-        participants_df['category'].astype(str).str.lower().str.contains(search_term)
-    )
-    
-    return participants_df[mask]
-
+# This session's tournament: new sessions start on the current one and keep their own choice,
+# so switching never redirects another organiser mid-task. Set for this rerun's thread only.
+session_tournament = get_tournament(st.session_state.get('tournament_slug') or '')
+if session_tournament is None or session_tournament['status'] != 'active':
+    session_tournament = get_current_tournament()
+    st.session_state.tournament_slug = session_tournament['slug']
+use_database(session_tournament['db_path'], thread_only=True)
 
 def get_match_details(match_id):
     """
@@ -914,7 +281,7 @@ def get_match_details(match_id):
         dict: Dictionary containing match details with participant information
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = connect(get_database())
         cursor = conn.cursor()
         
         # Get basic match information
@@ -1011,12 +378,12 @@ def get_upcoming_matches(limit=50):
         DataFrame: DataFrame containing upcoming match information
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = connect(get_database())
         
         # Get matches that are scheduled (not completed)
         matches_df = pd.read_sql_query("""
             SELECT * FROM matches 
-            WHERE match_status = 'scheduled' 
+            WHERE archived = 0 AND match_status = 'scheduled' 
             ORDER BY round_number ASC, id ASC
             LIMIT ?
         """, conn, params=(limit,))
@@ -1076,12 +443,12 @@ def get_recent_winners(limit=20):
         DataFrame: DataFrame containing completed matches with winner information
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = connect(get_database())
         
         # Get completed matches with winners
         matches_df = pd.read_sql_query("""
             SELECT * FROM matches 
-            WHERE match_status = 'completed' 
+            WHERE archived = 0 AND match_status = 'completed' 
             ORDER BY completed_at DESC
             LIMIT ?
         """, conn, params=(limit,))
@@ -1135,87 +502,58 @@ def get_recent_winners(limit=20):
 
 def send_outlook_email(recipients, subject, body, html_body=None, save_copy=True, draft_only=False, open_outlook=False):
     """
-    Send an email using the Outlook desktop application.
+    Send an email through the configured email transport (Outlook, SMTP or a local Maildir).
+    
+    Inside an email_session() block all calls reuse the session's open connection.
     
     Args:
         recipients (str or list): Email recipient(s)
         subject (str): Email subject
         body (str): Email body text
         html_body (str, optional): HTML formatted email body
-        save_copy (bool): Whether to save a copy in the Sent Items folder
+        save_copy (bool): Whether to save a copy in the Sent Items folder (Outlook only)
         draft_only (bool): If True, save as draft instead of sending
         open_outlook (bool): If True, attempt to open Outlook after creating drafts
     
     Returns:
         bool: True if email was sent successfully, False otherwise
     """
-    if not OUTLOOK_AVAILABLE:
-        st.warning("⚠️ Email functionality is not available on this platform. This feature requires Microsoft Outlook on Windows.")
+    if get_transport_name() is None:
+        st.warning("⚠️ Email functionality is not available on this platform. Configure an SMTP server (SMTP_HOST) or use Microsoft Outlook on Windows.")
         return False
         
     try:
-        # Initialize COM for this thread (required for multithreaded applications)
-        pythoncom.CoInitialize()
-        outlook = win32com.client.Dispatch("Outlook.Application")
-        namespace = outlook.GetNamespace("MAPI")
-        mail = outlook.CreateItem(0)  # olMailItem
-        
-        # Set recipients
-        if isinstance(recipients, list):
-            mail.To = "; ".join(recipients)
-        else:
-            mail.To = recipients
-            
-        # Set subject and body
-        mail.Subject = subject
-        if html_body:
-            mail.HTMLBody = html_body
-        else:
-            mail.Body = body
-        
-        # Try to save to sent items folder for both old and new Outlook
-        if save_copy:
-            try:
-                # Method for older Outlook versions
-                mail.SaveSentMessageFolder = namespace.GetDefaultFolder(5)  # 5 = olFolderSentMail
-            except Exception as save_error:
-                # For newer Outlook versions, this property might be handled differently
-                # The default behavior should save to sent items anyway
-                pass
-        
-        # If draft_only is True, save as draft instead of sending
-        if draft_only:
-            mail.Save()  # Save as draft
-            
-            # Try to open Outlook if requested
-            if open_outlook:
-                try:
-                    # Try to make Outlook visible
-                    outlook_app = outlook.Application
-                    outlook_app.ActiveExplorer().Activate()
-                except:
-                    # If that fails, try to launch Outlook via shell
-                    try:
-                        import os
-                        os.system('start outlook.exe')
-                    except:
-                        pass
-            
-            pythoncom.CoUninitialize()
-            return True
-        else:
-            # Send the email
-            mail.Send()
-            pythoncom.CoUninitialize()
-            return True
+        sent = send_email(recipients, subject, body, html_body=html_body, save_copy=save_copy,
+                          draft_only=draft_only, open_outlook=open_outlook)
     except Exception as e:
         st.error(f"Failed to send email: {str(e)}")
-        try:
-            pythoncom.CoUninitialize()
-        except:
-            pass
         return False
+    
+    if sent:
+        try:
+            record_event('email_sent', 'email', payload={
+                'recipients': len(recipients) if isinstance(recipients, list) else 1,
+                'subject': subject,
+                'draft_only': draft_only,
+            })
+        except sqlite3.Error:
+            pass  # The email went out; a busy database must not report it as failed
+    return sent
 
+@contextmanager
+def app_email_session():
+    """
+    email_session() for the send buttons: an unusable transport setting is shown with
+    st.error instead of raising out of the button handler.
+    """
+    try:
+        transport = get_transport()
+    except (ValueError, RuntimeError) as e:
+        st.error(f"❌ Email is not configured correctly: {str(e)}")
+        yield None
+        return
+    with email_session(transport=transport) as session:
+        yield session
 
 def get_match_details(match_id):
     """
@@ -1227,7 +565,7 @@ def get_match_details(match_id):
     Returns:
         dict: Dictionary containing match details
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     
     try:
         # Get match information
@@ -1301,23 +639,26 @@ def get_match_details(match_id):
         return None
 
 
-def get_upcoming_matches():
+def get_upcoming_matches(game=None):
     """
     Get all upcoming matches (scheduled but not completed)
     
+    Args:
+        game (str, optional): Only this game's matches
+        
     Returns:
         DataFrame: DataFrame containing upcoming match details
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     
     try:
-        query = """
+        query = f"""
         SELECT * FROM matches 
-        WHERE match_status = 'scheduled' 
+        WHERE archived = 0 AND match_status = 'scheduled' {"AND game = ?" if game else ""}
         ORDER BY round_number, category
         """
         
-        matches_df = pd.read_sql_query(query, conn)
+        matches_df = pd.read_sql_query(query, conn, params=[game] if game else None)
         conn.close()
         
         # Enhance with participant names
@@ -1329,7 +670,7 @@ def get_upcoming_matches():
             matches_df['team2_names'] = ''
             
             # Get all participants
-            participants_df = get_participants()
+            participants_df = get_participants(game)
             
             # Map IDs to names
             for idx, match in matches_df.iterrows():
@@ -1379,31 +720,32 @@ def get_upcoming_matches():
         return pd.DataFrame()
 
 
-def get_recent_winners(limit=10):
+def get_recent_winners(limit=10, game=None):
     """
     Get recent match winners
     
     Args:
         limit (int): Maximum number of recent winners to retrieve
+        game (str, optional): Only this game's matches
         
     Returns:
         DataFrame: DataFrame containing recent winners
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     
     try:
-        query = """
+        query = f"""
         SELECT * FROM matches 
-        WHERE match_status = 'completed' 
+        WHERE archived = 0 AND match_status = 'completed' {"AND game = ?" if game else ""}
         ORDER BY updated_at DESC
         LIMIT ?
         """
         
-        matches_df = pd.read_sql_query(query, conn, params=(limit,))
+        matches_df = pd.read_sql_query(query, conn, params=(game, limit) if game else (limit,))
         conn.close()
         
         # Get all participants
-        participants_df = get_participants()
+        participants_df = get_participants(game)
         
         # Add winner information
         if not matches_df.empty:
@@ -1457,6 +799,115 @@ def get_recent_winners(limit=10):
         conn.close()
         return pd.DataFrame()
 
+
+def tally_result_entry(results, seconds):
+    """Count results saved this session, the reruns they took (one per save) and the time spent saving"""
+    stats = st.session_state.setdefault('result_entry_stats', {'results': 0, 'reruns': 0, 'seconds': 0.0})
+    stats['results'] += results
+    stats['reruns'] += 1
+    stats['seconds'] += seconds
+
+
+def save_single_result(match_id, **result):
+    """
+    Save one result from a match card's winner button.
+
+    Returns:
+        bool: Whether it was saved; only saved results count in the session's entry stats
+    """
+    start = time.perf_counter()
+    if not update_match_result(match_id, **result):
+        st.error(f"❌ Could not save the result of match #{match_id}")
+        return False
+    tally_result_entry(1, time.perf_counter() - start)
+    return True
+
+
+def show_result_grid(scheduled_matches):
+    """
+    Keyboard-driven result entry for scheduled matches.
+
+    The grid sits in a form, so typing 1 or 2 in the Winner column (and a score) only
+    changes it in the browser; "Save results" writes every entered result, and any
+    next-round matches, in one transaction and one rerun. A score is checked against
+    the game's rules and is enough on its own to pick the winner.
+    """
+    if scheduled_matches.empty:
+        st.info("No scheduled matches waiting for a result.")
+        return
+    scheduled_matches = scheduled_matches.set_index('id')
+    doubles = scheduled_matches['team1_player1_id'].notna() | scheduled_matches['team2_player1_id'].notna()
+
+    def side_names(team):
+        singles_name = scheduled_matches[f'player{team}_name'].astype(object).fillna('TBD')
+        team_name = (scheduled_matches[f'team{team}_player1_name'].astype(object).fillna('TBD') + " & "
+                     + scheduled_matches[f'team{team}_player2_name'].astype(object).fillna('TBD'))
+        return team_name.where(doubles, singles_name)
+
+    grid = pd.DataFrame({
+        'Match': scheduled_matches['match_code'].astype(object).fillna(scheduled_matches.index.to_series().astype(str)),
+        'Category': scheduled_matches['category'].astype(object),
+        'Round': scheduled_matches['round_number'],
+        'Side 1': side_names(1),
+        'Side 2': side_names(2),
+        'Winner': pd.Series(pd.NA, index=scheduled_matches.index, dtype='Int64'),
+        'Score': "",
+    }).sort_values(['Category', 'Round', 'Match'])
+
+    with st.form("result_grid_form"):
+        st.caption("Arrow keys move between cells; type 1 or 2 under Winner and Enter. Nothing is saved until you press Save.")
+        edited = st.data_editor(
+            grid,
+            key=f"result_grid_{st.session_state.get('result_grid_version', 0)}",
+            hide_index=True,
+            use_container_width=True,
+            disabled=['Match', 'Category', 'Round', 'Side 1', 'Side 2'],
+            column_config={
+                'Winner': st.column_config.NumberColumn("Winner (1/2)", min_value=1, max_value=2, step=1),
+                'Score': st.column_config.TextColumn(
+                    "Score", help="Optional, e.g. 21-15 18-21 21-19; Carrom boards 12-0 0-5 ...; Chess 1-0 1/2-1/2"),
+            },
+        )
+        advance = st.checkbox("Create the next round when a round is complete", value=True)
+        submitted = st.form_submit_button("💾 Save results", type="primary")
+
+    if not submitted:
+        return
+    results = []
+    scores = edited['Score'].fillna("").astype(str).str.strip()
+    for match_id, row in edited[edited['Winner'].notna() | (scores != "")].iterrows():
+        result = {'match_id': int(match_id), 'score': scores[match_id] or None}
+        if pd.isna(row['Winner']):
+            results.append(result)
+            continue
+        side = int(row['Winner'])
+        if doubles[match_id]:
+            result['winner_team'] = side
+        elif pd.isna(scheduled_matches.at[match_id, f'player{side}_id']):
+            st.error(f"❌ {row['Match']} has no player {side}; nothing was saved.")
+            return
+        else:
+            result['winner_id'] = int(scheduled_matches.at[match_id, f'player{side}_id'])
+        results.append(result)
+    if not results:
+        st.warning("Type 1 or 2 in the Winner column, or a score, for at least one match.")
+        return
+
+    start = time.perf_counter()
+    try:
+        saved = record_results(results, advance=advance)
+    except ValueError as e:
+        st.error(f"❌ Nothing was saved: {str(e)}")
+        return
+    elapsed = time.perf_counter() - start
+    tally_result_entry(saved['completed'], elapsed)
+    message = f"✅ Saved {saved['completed']} results in {elapsed * 1000:.0f} ms"
+    if saved['created']:
+        message += f" and created {len(saved['created'])} next-round matches"
+    st.session_state.result_grid_message = message
+    st.session_state.result_grid_version = st.session_state.get('result_grid_version', 0) + 1
+    st.rerun()
+
 # Initialize database
 init_database()
 
@@ -1464,6 +915,57 @@ init_database()
 st.title("🏆 Tournament Manager")
 st.markdown("<div style='background: linear-gradient(90deg, #5bc0be 0%, #3a506b 100%); padding: 10px; border-radius: 10px; margin-bottom: 20px;'><h3 style='color: white; margin:0; text-align:center; text-shadow: 2px 2px 4px rgba(0,0,0,0.2);'>Welcome to the Tournament Management System</h3></div>", unsafe_allow_html=True)
 
+# Tournament selection: each tournament has its own database file
+st.sidebar.markdown("### 🏆 Tournament")
+st.sidebar.markdown(f"**Current Tournament:** {session_tournament['name']}")
+with st.sidebar.expander("Manage tournaments"):
+    st.caption("Switching changes the tournament for this session only.")
+    tournaments = list_tournaments()
+    active_tournaments = [t for t in tournaments if t['status'] == 'active']
+    archived_tournaments = [t for t in tournaments if t['status'] == 'archived']
+    tournament_names = {t['slug']: t['name'] for t in tournaments}
+
+    switch_slug = st.selectbox("Switch to", [t['slug'] for t in active_tournaments],
+                               index=[t['slug'] for t in active_tournaments].index(session_tournament['slug']),
+                               format_func=tournament_names.get, key="switch_tournament")
+    make_default = st.checkbox("Also use it for new sessions, the API and scripts", key="make_default_tournament")
+    if switch_slug != session_tournament['slug'] and st.button("Switch", key="switch_tournament_button"):
+        if make_default:
+            set_current_tournament(switch_slug)
+        st.session_state.tournament_slug = switch_slug
+        st.rerun()
+
+    new_tournament_name = st.text_input("New tournament", placeholder="e.g. Carrom 2025", key="new_tournament_name")
+    if st.button("Create", key="create_tournament_button", disabled=not new_tournament_name.strip()):
+        try:
+            st.session_state.tournament_slug = create_tournament(new_tournament_name, make_current=make_default)['slug']
+            st.rerun()
+        except ValueError as e:
+            st.error(str(e))
+
+    archivable = [t['slug'] for t in active_tournaments
+                  if not t['is_current'] and t['slug'] != session_tournament['slug']]
+    if archivable:
+        archive_slug = st.selectbox("Archive", archivable, format_func=tournament_names.get, key="archive_tournament")
+        if st.button("Archive", key="archive_tournament_button", help="Moves its database file to the archive folder"):
+            archive_tournament(archive_slug)
+            st.rerun()
+    if archived_tournaments:
+        restore_slug = st.selectbox("Restore", [t['slug'] for t in archived_tournaments],
+                                    format_func=tournament_names.get, key="restore_tournament")
+        if st.button("Restore", key="restore_tournament_button"):
+            try:
+                restore_tournament(restore_slug)
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
+    if st.button("Recompute ratings", key="recompute_ratings_button",
+                 help="Replays every tournament's results, e.g. after generating sample data or restoring a snapshot"):
+        counts = recompute_ratings()
+        st.success(f"Rated {counts['results']} results for {counts['players']} players "
+                   f"across {counts['tournaments']} tournaments")
+st.sidebar.divider()
+
 # Global Game Selection
 st.sidebar.markdown("### 🎮 Game Selection")
 selected_game = st.sidebar.selectbox(
@@ -1481,53 +983,71 @@ if 'selected_game' not in st.session_state:
 else:
     st.session_state.selected_game = selected_game
 
-# Create tabs
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
-    "📊 Dashboard", 
-    "📥 Import Participants", 
-    "📝 Registration Desk", 
-    "📅 Fixtures", 
-    "🏟️ Matches", 
-    "🏆 Tournament Bracket", 
-    "👑 Winners", 
-    "📊 Reports & Export",
-    "📋 Tournament Tracker",
-    "📧 Email Notifications"
-])
+# Section navigation: only the selected section's code (and its queries) runs on each rerun,
+# unlike st.tabs which executes every tab body every time
+SECTIONS = {
+    "dashboard": "📊 Dashboard",
+    "import": "📥 Import Participants",
+    "registration": "📝 Registration Desk",
+    "fixtures": "📅 Fixtures",
+    "matches": "🏟️ Matches",
+    "bracket": "🏆 Tournament Bracket",
+    "winners": "👑 Winners",
+    "reports": "📊 Reports & Export",
+    "tracker": "📋 Tournament Tracker",
+    "email": "📧 Email Notifications",
+}
+active_section = st.radio(
+    "Section",
+    list(SECTIONS),
+    format_func=SECTIONS.get,
+    horizontal=True,
+    key="active_section",
+    label_visibility="collapsed"
+)
+st.divider()
+if perf_profile is not None:
+    perf_profile.section = active_section
+    perf_profile.mark(active_section)
 
-with tab1:
+if active_section == "dashboard":
     # Dashboard content
     st.subheader("📊 Tournament Overview")
     
-    # Get current statistics
-    participants_df = get_participants()
-    matches_df = get_matches()
+    # Get current statistics from the trigger-maintained summary tables
+    summary = get_summary_metrics(st.session_state.selected_game)
     
     # Simple statistics section
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Participants", len(participants_df))
+        st.metric("Total Participants", summary['total_participants'])
     
     with col2:
-        reported_count = len(participants_df[participants_df['registered_at_desk'] == 1]) if not participants_df.empty else 0
-        st.metric("Reported at Desk", reported_count)
+        st.metric("Reported at Desk", summary['reported_participants'])
     
     with col3:
-        st.metric("Total Matches", len(matches_df))
+        st.metric("Total Matches", summary['total_matches'])
     
     with col4:
-        completed_count = len(matches_df[matches_df['match_status'] == 'completed']) if not matches_df.empty else 0
-        st.metric("Completed Matches", completed_count)
+        st.metric("Completed Matches", summary['completed_matches'])
     
     # Recent activity
-    if not matches_df.empty:
+    recent_matches = get_matches(limit=5, game=st.session_state.selected_game)
+    if not recent_matches.empty:
         st.subheader("📋 Recent Activity")
-        recent_matches = matches_df.head(5)
         st.dataframe(recent_matches[['category', 'player1_name', 'player2_name', 'match_status']], use_container_width=True)
     else:
         st.info("No matches found. Create some matches to see recent activity.")
     
+    # Latest entries from the change feed
+    latest_seq = get_latest_seq()
+    if latest_seq:
+        with st.expander("🕒 Latest Changes"):
+            changes = pd.DataFrame(get_changes_since(max(latest_seq - 20, 0)))
+            changes['details'] = changes['payload'].map(lambda payload: ", ".join(f"{key}: {value}" for key, value in payload.items() if value is not None))
+            st.dataframe(changes.iloc[::-1][['seq', 'created_at', 'event_type', 'entity_id', 'details']], use_container_width=True, hide_index=True)
+    
     # Help section
     st.subheader("💡 Getting Started")
     st.info("""
@@ -1539,7 +1059,7 @@ with tab1:
     6. **Generate Reports**: Export data and create summaries
     """)
 
-with tab2:
+if active_section == "import":
     # Import Participants
     st.subheader("📥 Import Participants")
     
@@ -1828,54 +1348,13 @@ with tab2:
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
+                    def show_progress(position, total_rows, row):
+                        progress_bar.progress((position + 1) / total_rows)
+                        status_text.text(f"Processing participant {position + 1} of {total_rows}: {row['name']}")
+                    
                     try:
-                        conn = sqlite3.connect(DB_PATH)
-                        cursor = conn.cursor()
-                        
-                        imported_count = 0
-                        skipped_count = 0
-                        errors = []
-                        total_rows = len(df_clean)
-                        
                         status_text.text("Starting import...")
-                        
-                        for idx, row in df_clean.iterrows():
-                            # Update progress
-                            progress = (idx + 1) / total_rows
-                            progress_bar.progress(progress)
-                            status_text.text(f"Processing participant {idx + 1} of {total_rows}: {row['name']}")
-                            
-                            try:
-                                cursor.execute('''
-                                    INSERT INTO participants (emp_id, name, email, location, sub_location, game, category, slot, 
-                                                          partner_emp_id, gender, partner_gender, registered_at_desk)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                ''', (
-                                    row['emp_id'], 
-                                    row['name'], 
-                                    row['email'],
-                                    row['location'] if 'location' in row and row['location'] else None,
-                                    row['sub_location'] if 'sub_location' in row and row['sub_location'] else None,
-                                    row['game'] if 'game' in row and row['game'] else 'Carrom',
-                                    row['category'], 
-                                    row['slot'] if 'slot' in row and row['slot'] else None,
-                                    row['partner_emp_id'] if 'partner_emp_id' in row and row['partner_emp_id'] else None,
-                                    row['gender'] if 'gender' in row and row['gender'] else None,
-                                    row['partner_gender'] if 'partner_gender' in row and row['partner_gender'] else None,
-                                    row['registered_at_desk']
-                                ))
-                                imported_count += 1
-                            except sqlite3.IntegrityError as ie:
-                                if "UNIQUE constraint failed" in str(ie):
-                                    skipped_count += 1
-                                    errors.append(f"Skipped {row['emp_id']} - {row['name']} (Employee ID already exists)")
-                                else:
-                                    errors.append(f"Error with {row['emp_id']} - {row['name']}: {str(ie)}")
-                            except Exception as e:
-                                errors.append(f"Unexpected error with {row['emp_id']} - {row['name']}: {str(e)}")
-                        
-                        conn.commit()
-                        conn.close()
+                        imported_count, skipped_count, errors = import_participants(df_clean, progress=show_progress)
                         
                         # Clear progress indicators
                         progress_bar.empty()
@@ -2061,21 +1540,21 @@ with tab2:
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
-with tab3:
+if active_section == "registration":
     # Registration Desk
     st.subheader("📝 Registration Desk")
     
     # Add reset option 
     with st.expander("⚙️ Admin Options"):
-        st.warning("⚠️ Danger Zone - These actions cannot be undone!")
+        st.warning("⚠️ Danger Zone - Reset data leaves the app straight away and is moved to the archive database in the background!")
         
         # Side by side layout for admin options
         col1, col2 = st.columns(2, gap="large")
         
         with col1:
             st.markdown("### 👥 Reset Participants Only")
-            st.write("Delete all participant data but keep match history.")
-            st.markdown("**What gets deleted:**")
+            st.write("Archive all participant data but keep match history.")
+            st.markdown("**What gets archived:**")
             st.markdown("- All participant records")
             st.markdown("- Registration status")
             st.markdown("**What stays:**")
@@ -2090,31 +1569,25 @@ with tab3:
             # Check for confirmation state
             if st.session_state.get("confirm_reset_participants", False):
                 st.error("⚠️ **CONFIRM DELETION**")
-                st.warning("This will permanently delete ALL participant data!")
+                st.warning("This will remove ALL participants from the tournament!")
                 col_yes, col_no = st.columns(2)
                 with col_yes:
                     if st.button("�️ Yes, Delete All Participants", key="confirm_reset_participants_yes", type="primary"):
                         with st.spinner("�🔄 Resetting participants data..."):
                             try:
-                                conn = sqlite3.connect(DB_PATH)
-                                cursor = conn.cursor()
-                                # Get count before deletion
-                                cursor.execute("SELECT COUNT(*) FROM participants")
-                                participant_count = cursor.fetchone()[0]
+                                # One UPDATE flags the rows; compaction moves them out afterwards
+                                participant_count = archive_rows(["participants"], reason="participants_reset")['participants']
                                 
                                 if participant_count > 0:
-                                    cursor.execute("DELETE FROM participants")
-                                    conn.commit()
-                                    conn.close()
+                                    start_compaction()
                                     
                                     # Show success animation
-                                    st.success(f"✅ Successfully deleted {participant_count} participants from the database!")
+                                    st.success(f"✅ Successfully archived {participant_count} participants!")
                                     st.balloons()  # Success animation
                                     st.info("🔄 Page will refresh to show updated data...")
                                     del st.session_state.confirm_reset_participants
                                     st.rerun()
                                 else:
-                                    conn.close()
                                     st.info("ℹ️ No participants found to delete.")
                                     del st.session_state.confirm_reset_participants
                             except Exception as e:
@@ -2127,12 +1600,13 @@ with tab3:
         
         with col2:
             st.markdown("### 🗂️ Reset All Tournament Data")
-            st.write("Delete ALL data including participants and matches.")
-            st.markdown("**What gets deleted:**")
+            st.write(f"Archive ALL data of {session_tournament['name']} including participants, matches and fixtures. "
+                     "To start a new season, create a new tournament in the sidebar instead; this one is kept.")
+            st.markdown("**What gets archived:**")
             st.markdown("- All participant records")
             st.markdown("- All match records and results")
-            st.markdown("- Complete tournament history")
-            st.markdown("**⚠️ This action is irreversible!**")
+            st.markdown("- All fixtures")
+            st.markdown("**⚠️ Archived data cannot be brought back from the app!**")
             
             if st.button("🗑️ Reset All Data", type="secondary", use_container_width=True):
                 # Show confirmation dialog
@@ -2143,37 +1617,29 @@ with tab3:
             # Check for confirmation state
             if st.session_state.get("confirm_reset_all_data", False):
                 st.error("⚠️ **CONFIRM COMPLETE RESET**")
-                st.warning("This will permanently delete ALL tournament data including participants and matches!")
+                st.warning("This will remove ALL tournament data including participants, matches and fixtures!")
                 st.markdown("**⚠️ THIS ACTION CANNOT BE UNDONE!**")
                 col_yes, col_no = st.columns(2)
                 with col_yes:
                     if st.button("🗑️ Yes, Delete Everything", key="confirm_reset_all_data_yes", type="primary"):
                         with st.spinner("🔄 Resetting all tournament data..."):
                             try:
-                                conn = sqlite3.connect(DB_PATH)
-                                cursor = conn.cursor()
+                                archived = archive_rows(["participants", "matches", "fixtures"], reason="tournament_reset")
+                                participant_count = archived['participants']
+                                match_count = archived['matches']
                                 
-                                # Get counts before deletion
-                                cursor.execute("SELECT COUNT(*) FROM participants")
-                                participant_count = cursor.fetchone()[0]
-                                cursor.execute("SELECT COUNT(*) FROM matches")
-                                match_count = cursor.fetchone()[0]
-                                
-                                if participant_count > 0 or match_count > 0:
-                                    cursor.execute("DELETE FROM participants")
-                                    cursor.execute("DELETE FROM matches") 
-                                    conn.commit()
-                                    conn.close()
+                                if any(archived.values()):
+                                    start_compaction()
                                     
                                     # Show success animation
                                     st.success(f"✅ Successfully reset all tournament data!")
-                                    st.info(f"📊 Deleted: {participant_count} participants and {match_count} matches")
+                                    st.info(f"📊 Archived: {participant_count} participants, {match_count} matches "
+                                            f"and {archived['fixtures']} fixtures")
                                     st.snow()  # Different animation for complete reset
                                     st.info("🔄 Page will refresh to show clean slate...")
                                     del st.session_state.confirm_reset_all_data
                                     st.rerun()
                                 else:
-                                    conn.close()
                                     st.info("ℹ️ No data found to delete.")
                                     del st.session_state.confirm_reset_all_data
                             except Exception as e:
@@ -2183,8 +1649,33 @@ with tab3:
                     if st.button("❌ Cancel", key="confirm_reset_all_data_no", type="secondary"):
                         del st.session_state.confirm_reset_all_data
                         st.rerun()
-    
-    participants_df = get_participants()
+
+        # Archived rows waiting to be moved into the archive database
+        archive_status = get_archive_status()
+        waiting = sum(archive_status['archived'].values())
+        if archive_status['running']:
+            st.caption(f"🗄️ Moving {waiting} archived rows to {archive_status['archive_path']}...")
+        elif waiting:
+            col_status, col_compact = st.columns([3, 1])
+            with col_status:
+                st.caption(f"🗄️ {waiting} archived rows still in the tournament file "
+                           "(participants named in active matches stay until those are reset)")
+            with col_compact:
+                if st.button("Compact now", key="compact_archive"):
+                    start_compaction()
+                    st.rerun()
+        if not archive_status['incremental_vacuum'] and not archive_status['running']:
+            col_status, col_vacuum = st.columns([3, 1])
+            with col_status:
+                st.caption("🗄️ This tournament file predates incremental vacuum, so compaction cannot shrink it. "
+                           "Enabling it rewrites the file once; do it while nobody is entering results.")
+            with col_vacuum:
+                if st.button("Enable", key="enable_incremental_vacuum"):
+                    with st.spinner("Rewriting the tournament file..."):
+                        enable_incremental_vacuum()
+                    st.rerun()
+
+    participants_df = get_participants(st.session_state.selected_game)
     
     if participants_df.empty:
         st.info("No participants found. Please import participants first.")
@@ -2220,60 +1711,9 @@ with tab3:
             st.write(f"**Game:** {st.session_state.selected_game}")
             game_filter = st.session_state.selected_game
         
-        # Get participants who have completed matches
-        conn = sqlite3.connect(DB_PATH)
-        
-        # For singles matches
-        completed_singles_query = '''
-        SELECT player1_id, player2_id FROM matches 
-        WHERE match_status = 'completed' AND (player1_id IS NOT NULL OR player2_id IS NOT NULL)
-        '''
-        completed_singles = pd.read_sql_query(completed_singles_query, conn)
-        
-        # For doubles matches
-        completed_doubles_query = '''
-        SELECT team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id 
-        FROM matches 
-        WHERE match_status = 'completed' AND 
-        (team1_player1_id IS NOT NULL OR team1_player2_id IS NOT NULL OR 
-         team2_player1_id IS NOT NULL OR team2_player2_id IS NOT NULL)
-        '''
-        completed_doubles = pd.read_sql_query(completed_doubles_query, conn)
-        conn.close()
-        
-        # Create a set of all participant IDs who have completed matches
-        completed_participant_ids = set()
-        
-        # Add singles participants
-        if not completed_singles.empty:
-            completed_participant_ids.update(completed_singles['player1_id'].dropna().astype(int).tolist())
-            completed_participant_ids.update(completed_singles['player2_id'].dropna().astype(int).tolist())
-        
-        # Add doubles participants
-        if not completed_doubles.empty:
-            completed_participant_ids.update(completed_doubles['team1_player1_id'].dropna().astype(int).tolist())
-            completed_participant_ids.update(completed_doubles['team1_player2_id'].dropna().astype(int).tolist())
-            completed_participant_ids.update(completed_doubles['team2_player1_id'].dropna().astype(int).tolist())
-            completed_participant_ids.update(completed_doubles['team2_player2_id'].dropna().astype(int).tolist())
-        
-        # Apply search
-        filtered_df = search_participants(search_term, participants_df)
-        
-        # Apply game filter (always filter by selected game)
-        filtered_df = filtered_df[filtered_df['game'] == game_filter]
-        
-        # Remove participants who have completed matches
-        filtered_df = filtered_df[~filtered_df['id'].isin(completed_participant_ids)]
-        
-        # Apply status filter
-        if status_filter == "Reported":
-            filtered_df = filtered_df[filtered_df['registered_at_desk'] == 1]
-        elif status_filter == "Not Reported":
-            filtered_df = filtered_df[filtered_df['registered_at_desk'] == 0]
-        
-        # Apply category filter
-        if category_filter != "All":
-            filtered_df = filtered_df[filtered_df['category'] == category_filter]
+        # Filtered participants with partner names and next scheduled match (participants
+        # who already played a completed match are left out)
+        filtered_df = get_registration_desk_view(participants_df, game_filter, search_term, status_filter, category_filter)
         
         if len(filtered_df) == 0 and (search_term or status_filter != "All" or category_filter != "All"):
             st.warning("No participants found matching your criteria.")
@@ -2305,63 +1745,14 @@ with tab3:
             # Create interactive table with status toggle
             if not filtered_df.empty:
                 for idx, participant in filtered_df.iterrows():
-                    # Get partner name if exists
-                    partner_info = "None"
-                    if participant['partner_emp_id']:
-                        conn = sqlite3.connect(DB_PATH)
-                        cursor = conn.cursor()
-                        cursor.execute('SELECT name FROM participants WHERE emp_id = ?', (participant['partner_emp_id'],))
-                        partner_result = cursor.fetchone()
-                        conn.close()
-                        if partner_result:
-                            partner_info = f"{partner_result[0]} ({participant['partner_emp_id']})"
-                        else:
-                            partner_info = participant['partner_emp_id']
-                    
-                    # Get match information for this participant
-                    conn = sqlite3.connect(DB_PATH)
-                    cursor = conn.cursor()
-                    
-                    # Check for singles matches
-                    cursor.execute('''
-                        SELECT round_number, match_date, match_number 
-                        FROM matches 
-                        WHERE (player1_id = ? OR player2_id = ?) AND match_status = 'scheduled'
-                        ORDER BY round_number ASC
-                        LIMIT 1
-                    ''', (participant['id'], participant['id']))
-                    singles_match = cursor.fetchone()
-                    
-                    # Check for doubles matches
-                    cursor.execute('''
-                        SELECT round_number, match_date, match_number 
-                        FROM matches 
-                        WHERE (team1_player1_id = ? OR team1_player2_id = ? OR 
-                               team2_player1_id = ? OR team2_player2_id = ?) AND match_status = 'scheduled'
-                        ORDER BY round_number ASC
-                        LIMIT 1
-                    ''', (participant['id'], participant['id'], participant['id'], participant['id']))
-                    doubles_match = cursor.fetchone()
-                    
-                    conn.close()
-                    
-                    # Determine slot and round info
-                    slot_info = participant.get('slot', 'Not Assigned')
-                    round_info = "Not Assigned"
-                    
-                    # Use singles or doubles match info
-                    current_match = singles_match or doubles_match
-                    if current_match:
-                        round_info = f"Round {current_match[0]}"
-                        if current_match[1]:  # match_date contains time slot
-                            slot_info = current_match[1]
+                    partner_info = participant['partner_info']
+                    slot_info = participant['slot_info']
+                    current_round = participant['current_round']
+                    round_info = "Not Assigned" if pd.isna(current_round) else f"Round {current_round}"
                     
                     # Apply round filter
                     if round_filter != "All":
-                        expected_round = int(round_filter.split()[1])
-                        if current_match and current_match[0] != expected_round:
-                            continue
-                        elif not current_match and round_filter != "All":
+                        if pd.isna(current_round) or current_round != int(round_filter.split()[1]):
                             continue
                     
                     # Display row
@@ -2441,7 +1832,7 @@ with tab3:
                         with col_yes:
                             if st.button("Yes, Mark All", key="confirm_mark_all_yes", type="primary"):
                                 try:
-                                    conn = sqlite3.connect(DB_PATH)
+                                    conn = connect(get_database())
                                     cursor = conn.cursor()
                                     participant_ids = filtered_df['id'].tolist()
                                     cursor.executemany("UPDATE participants SET registered_at_desk = 1, registered_timestamp = CURRENT_TIMESTAMP WHERE id = ?", [(pid,) for pid in participant_ids])
@@ -2471,7 +1862,7 @@ with tab3:
                         with col_yes:
                             if st.button("Yes, Unmark All", key="confirm_unmark_all_yes", type="primary"):
                                 try:
-                                    conn = sqlite3.connect(DB_PATH)
+                                    conn = connect(get_database())
                                     cursor = conn.cursor()
                                     participant_ids = filtered_df['id'].tolist()
                                     cursor.executemany("UPDATE participants SET registered_at_desk = 0, registered_timestamp = NULL WHERE id = ?", [(pid,) for pid in participant_ids])
@@ -2490,9 +1881,9 @@ with tab3:
                         with col2:
                             # Delete fixture
                             st.subheader("🗑️ Delete Fixture")
-                            delete_fixture_id = st.number_input(f"Fixture ID to Delete for {category}", min_value=1, key=f"delete_fixture_id_{category}")
+                            delete_fixture_id = st.number_input(f"Fixture ID to Delete for {category_filter}", min_value=1, key=f"delete_fixture_id_{category_filter}")
                             
-                            if st.button("Delete Fixture", key=f"delete_fixture_{category}"):
+                            if st.button("Delete Fixture", key=f"delete_fixture_{category_filter}"):
                                 # Confirm deletion
                                 if "confirm_delete_fixture" not in st.session_state:
                                     st.session_state.confirm_delete_fixture = True
@@ -2504,7 +1895,7 @@ with tab3:
                             if st.session_state.get("confirm_delete_fixture", False):
                                 col_yes, col_no = st.columns(2)
                                 with col_yes:
-                                    if st.button("Yes, Delete", key=f"confirm_delete_yes_{category}"):
+                                    if st.button("Yes, Delete", key=f"confirm_delete_yes_{category_filter}"):
                                         success = delete_fixture(st.session_state.fixture_to_delete)
                                         if success:
                                             st.success(f"✅ Fixture #{st.session_state.fixture_to_delete} deleted successfully.")
@@ -2514,16 +1905,16 @@ with tab3:
                                         else:
                                             st.error("❌ Failed to delete fixture.")
                                 with col_no:
-                                    if st.button("Cancel", key=f"confirm_delete_no_{category}"):
+                                    if st.button("Cancel", key=f"confirm_delete_no_{category_filter}"):
                                         del st.session_state.confirm_delete_fixture
                                         del st.session_state.fixture_to_delete
                                         st.rerun()
 
-with tab4:
+if active_section == "fixtures":
     # Fixtures tab
     st.subheader("📅 Fixtures Management")
     
-    participants_df = get_participants()
+    participants_df = get_participants(st.session_state.selected_game)
     
     if participants_df.empty:
         st.info("No participants found. Please import participants first.")
@@ -2536,13 +1927,13 @@ with tab4:
             
             # Sample data generator section
             with st.expander("🧪 Generate Sample Data for Testing", expanded=False):
-                st.write("Generate 30 sample participants for testing purposes.")
+                st.write("Generate sample participants for testing purposes.")
                 
                 sample_game = st.session_state.selected_game
                 sample_categories = ["Men's Singles", "Women's Singles", "Men's Doubles", "Women's Doubles", "Mixed Doubles"]
                 sample_slot_types = ["Morning", "Afternoon", "Evening"]
                 
-                col1, col2 = st.columns(2)
+                col1, col2, col3 = st.columns(3)
                 
                 with col1:
                     sample_category = st.selectbox(
@@ -2558,9 +1949,16 @@ with tab4:
                         key="sample_slot_type_selector"
                     )
                 
-                if st.button("Generate 30 Sample Participants", key="generate_sample_data"):
-                    with st.spinner(f"Generating 30 sample participants for {sample_game} - {sample_category} ({sample_slot_type} slot)..."):
-                        count = generate_sample_participants(sample_game, sample_category, 30, sample_slot_type)
+                with col3:
+                    sample_count = st.number_input("Participants", min_value=2, max_value=10000, value=30, step=10,
+                                                   key="sample_count")
+                
+                st.caption("For full tournaments (all games, brackets, results and fixtures) use: "
+                           "python sample_data.py --participants 100000")
+                
+                if st.button(f"Generate {sample_count} Sample Participants", key="generate_sample_data"):
+                    with st.spinner(f"Generating {sample_count} sample participants for {sample_game} - {sample_category} ({sample_slot_type} slot)..."):
+                        count = generate_sample_participants(sample_game, sample_category, sample_count, sample_slot_type)
                         st.success(f"✅ Generated {count} sample participants for {sample_game} - {sample_category} ({sample_slot_type} slot)")
                         # Set flag to rerun the app to refresh data
                         st.session_state.rerun_app = True
@@ -2619,33 +2017,38 @@ with tab4:
                         # Display participants in a table with slot and round info
                         with st.expander(f"👥 View All {max_participants} Participants", expanded=True):
                             if 'Doubles' in selected_category:
-                                # For doubles, show teams with partners
-                                teams_data = []
-                                processed_ids = set()
-                                team_count = 0
-                                
-                                for _, participant in category_participants.iterrows():
-                                    if participant['id'] not in processed_ids and participant['partner_emp_id']:
-                                        partner = category_participants[category_participants['emp_id'] == participant['partner_emp_id']]
-                                        if not partner.empty:
-                                            team_count += 1
-                                            teams_data.append({
-                                                'Team #': team_count,
-                                                'Player 1': f"{participant['name']} ({participant['emp_id']})",
-                                                'Player 2': f"{partner.iloc[0]['name']} ({partner.iloc[0]['emp_id']})",
-                                                'Slot': participant.get('slot', 'Not Assigned'),
-                                                'Round': participant.get('round', 'Not Assigned')
-                                            })
-                                            processed_ids.add(participant['id'])
-                                            processed_ids.add(partner.iloc[0]['id'])
+                                # For doubles, show the category's teams with both partners
+                                category_teams = get_teams(selected_category, st.session_state.selected_game)
+                                team_count = len(category_teams)
                                 
-                                if teams_data:
-                                    st.dataframe(pd.DataFrame(teams_data), use_container_width=True)
+                                if team_count:
+                                    teams_data = pd.DataFrame({
+                                        'Team #': range(1, team_count + 1),
+                                        'Player 1': category_teams['player1_name'] + " (" + category_teams['player1_emp_id'].astype(str) + ")",
+                                        'Player 2': category_teams['player2_name'] + " (" + category_teams['player2_emp_id'].astype(str) + ")",
+                                        'Slot': category_teams['player1_id'].map(category_participants.set_index('id')['slot'].astype(object)),
+                                        'Round': 'Not Assigned'
+                                    })
+                                    st.dataframe(teams_data, use_container_width=True)
                                     st.info(f"👥 **Teams Available:** {team_count} complete teams")
                                     max_matches = team_count // 2  # Each match needs 2 teams
                                 else:
                                     st.warning("No complete teams found. Please ensure participants have valid partners.")
                                     max_matches = 0
+
+                                pairing = get_pairing_report(selected_category, st.session_state.selected_game)
+                                if pairing['asymmetric'] or pairing['conflicts'] or pairing['orphans']:
+                                    with st.expander(f"⚠️ Partner issues: {len(pairing['asymmetric'])} one-sided, "
+                                                     f"{len(pairing['conflicts'])} conflicting, {len(pairing['orphans'])} without a partner"):
+                                        if pairing['asymmetric']:
+                                            st.caption("Paired, but only one player named the other")
+                                            st.dataframe(pd.DataFrame(pairing['asymmetric']), use_container_width=True)
+                                        if pairing['conflicts']:
+                                            st.caption("Named a partner who is paired with someone else")
+                                            st.dataframe(pd.DataFrame(pairing['conflicts']), use_container_width=True)
+                                        if pairing['orphans']:
+                                            st.caption("No partner: Partner Employee ID is empty or names nobody in this category")
+                                            st.dataframe(pd.DataFrame(pairing['orphans']), use_container_width=True)
                             else:
                                 # For singles, show individual participants
                                 singles_data = []
@@ -2683,6 +2086,9 @@ with tab4:
                            f"Example: 20 participants, 4 matches per slot = 5 time slots needed.")
                 
                 location = st.text_input("Location", "Main Sports Hall")
+                seeded = st.checkbox("🏅 Seed by rating", value=False,
+                                     help="Pair the highest rated against the lowest rated, with top seeds in "
+                                          "opposite halves of the draw (ratings carry across tournaments)")
                 
                 # Submit button
                 submitted = st.form_submit_button("🎯 Generate Fixtures and Matches")
@@ -2724,44 +2130,21 @@ with tab4:
                                 st.info(f"📊 Found {len(filtered_participants)} participants to schedule for {slot_option} slot")
                                 
                                 # Apply slot filtering based on selected slot option
-                                # Update participants with slot information
-                                for index, participant in filtered_participants.iterrows():
-                                    # Update the slot in the database
-                                    conn = sqlite3.connect(DB_PATH)
-                                    cursor = conn.cursor()
-                                    cursor.execute(
-                                        "UPDATE participants SET slot = ? WHERE id = ?",
-                                        (slot_option, participant['id'])
-                                    )
-                                    conn.commit()
-                                    conn.close()
-                                    
-                                    # Also update in the dataframe
-                                    filtered_participants.at[index, 'slot'] = slot_option
+                                # Update participants with slot information, in the database and the dataframe
+                                conn = connect(get_database())
+                                conn.executemany("UPDATE participants SET slot = ? WHERE id = ?",
+                                                 [(slot_option, participant_id) for participant_id in filtered_participants['id'].tolist()])
+                                conn.commit()
+                                conn.close()
+                                filtered_participants = filtered_participants.assign(slot=slot_option)
                                 
-                                # For doubles, group into teams first
+                                # For doubles, schedule the category's teams
                                 if 'Doubles' in selected_category:
-                                    teams = []
-                                    processed_ids = set()
-                                    
-                                    for _, player in filtered_participants.iterrows():
-                                        if player['id'] in processed_ids:
-                                            continue
-                                            
-                                        partner_emp_id = player['partner_emp_id']
-                                        if not partner_emp_id or pd.isna(partner_emp_id):
-                                            continue
-                                            
-                                        # Find the partner
-                                        partner = filtered_participants[filtered_participants['emp_id'] == partner_emp_id]
-                                        if not partner.empty:
-                                            teams.append({
-                                                'team_id': len(teams) + 1,
-                                                'player1': player,
-                                                'player2': partner.iloc[0]
-                                            })
-                                            processed_ids.add(player['id'])
-                                            processed_ids.add(partner.iloc[0]['id'])
+                                    teams = [{
+                                        'team_id': team['id'],
+                                        'player1': {'id': team['player1_id'], 'name': team['player1_name'], 'emp_id': team['player1_emp_id']},
+                                        'player2': {'id': team['player2_id'], 'name': team['player2_name'], 'emp_id': team['player2_emp_id']}
+                                    } for team in get_teams(selected_category, st.session_state.selected_game).to_dict('records')]
                                     
                                     total_entities = teams
                                     entity_type = "teams"
@@ -2770,6 +2153,12 @@ with tab4:
                                     total_entities = filtered_participants.to_dict('records')
                                     entity_type = "players"
                                 
+                                if seeded:
+                                    total_entities = seed_by_rating(total_entities, lambda entity: (
+                                        st.session_state.selected_game,
+                                        [entity['player1']['emp_id'], entity['player2']['emp_id']] if 'player1' in entity
+                                        else [entity['emp_id']]))
+                                
                                 # Calculate time slots needed for individual entity scheduling
                                 total_entities_count = len(total_entities)
                                 
@@ -2954,7 +2343,7 @@ with tab4:
                                         for i, slot_info in enumerate(time_slots):
                                             try:
                                                 # Use a separate connection for each operation to avoid locking
-                                                conn = sqlite3.connect(DB_PATH, timeout=10.0)
+                                                conn = connect(get_database(), timeout=10.0)
                                                 cursor = conn.cursor()
                                                 
                                                 # Create fixture entry for individual entity
@@ -2964,12 +2353,12 @@ with tab4:
                                                     
                                                     cursor.execute('''
                                                         INSERT INTO fixtures (category, time_slot, location, court_number, 
-                                                                            team1_player1_id, team1_player2_id, 
+                                                                            team1_player1_id, team1_player2_id, team1_id,
                                                                             fixture_status, created_at, slot, round_number, game)
-                                                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                                                     ''', (selected_category, slot_info['time_slot'], location, 
                                                           slot_info['court_number'], 
-                                                          team_ids[0], team_ids[1],
+                                                          team_ids[0], team_ids[1], slot_info['entity']['team_id'],
                                                           'scheduled', datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                                                           slot_option, round_number, st.session_state.selected_game))
                                                     
@@ -2980,7 +2369,8 @@ with tab4:
                                                         team1_player1_id=team_ids[0],
                                                         team1_player2_id=team_ids[1],
                                                         team2_player1_id=None,  # To be assigned later
-                                                        team2_player2_id=None   # To be assigned later
+                                                        team2_player2_id=None,  # To be assigned later
+                                                        game=st.session_state.selected_game
                                                     )
                                                 else:
                                                     # Singles fixture for individual player
@@ -3000,7 +2390,8 @@ with tab4:
                                                         category=selected_category,
                                                         round_number=round_number,
                                                         player1_id=player_id,
-                                                        player2_id=None  # To be assigned later
+                                                        player2_id=None,  # To be assigned later
+                                                        game=st.session_state.selected_game
                                                     )
                                                 
                                                 fixture_id = cursor.lastrowid
@@ -3053,7 +2444,7 @@ with tab4:
             st.subheader("📋 View and Manage Fixtures")
             
             # Get all fixtures
-            fixtures_df = get_all_fixtures()
+            fixtures_df = get_all_fixtures(st.session_state.selected_game)
             
             if fixtures_df.empty:
                 st.info("No fixtures found. Please create fixtures first.")
@@ -3185,42 +2576,30 @@ with tab4:
                             fixture_id = st.number_input(f"Fixture ID", min_value=1, key=f"email_fixture_id_{category}")
                             
                             if st.button("Send Email", key=f"send_individual_email_{category}"):
-                                # Get fixture data for emails
-                                email_data = get_fixture_emails(fixture_id)
+                                # Render the notification for all players of this fixture
+                                fixture_frame = get_fixture_notification_frame([fixture_id])
                                 
-                                if email_data:
-                                    # Create email content
-                                    subject = f"Tournament: Your {email_data['category']} Match Details"
+                                if not fixture_frame.empty:
+                                    rendered, _ = render_notifications(fixture_frame, FIXTURE_SLOT_TEMPLATE)
                                     
-                                    # Simple email body
-                                    body = f"""Dear Participant,
-
-Your {email_data['category']} match has been scheduled.
-
-Match Details:
-- Time Slot: {email_data['time_slot']}
-- Location: {email_data['location']}  
-- Court Number: {email_data['court_number']}
-
-Please arrive 10 minutes before your scheduled time.
-
-Good luck!
-Tournament Committee"""
-                                    
-                                    # Send email
-                                    success = send_outlook_email(
-                                        recipients=email_data['emails'],
-                                        subject=subject,
-                                        body=body,
-                                        draft_only=True,
-                                        open_outlook=True
-                                    )
-                                    
-                                    if success:
-                                        mark_emails_sent(fixture_id)
-                                        st.success("✅ Email draft created in Outlook")
+                                    if not rendered.empty:
+                                        email = rendered.iloc[0]
+                                        # Send email
+                                        success = send_outlook_email(
+                                            recipients=email['recipients'],
+                                            subject=email['subject'],
+                                            body=email['body'],
+                                            draft_only=True,
+                                            open_outlook=True
+                                        )
+                                        
+                                        if success:
+                                            mark_emails_sent(fixture_id)
+                                            st.success("✅ Email draft created in Outlook")
+                                        else:
+                                            st.error("❌ Failed to create email")
                                     else:
-                                        st.error("❌ Failed to create email")
+                                        st.error(f"❌ No participant emails found for fixture #{fixture_id}")
                                 else:
                                     st.error(f"❌ Fixture #{fixture_id} not found")
                         
@@ -3262,48 +2641,39 @@ Tournament Committee"""
                                         success_count = 0
                                         error_count = 0
                                         
-                                        for fixture_id in selected_fixtures:
+                                        with app_email_session():
                                             try:
-                                                email_data = get_fixture_emails(fixture_id)
-                                                if email_data and email_data['emails']:
-                                                    subject = f"Tournament: Your {email_data['category']} Match Details"
-                                                    
-                                                    # Personalized email body for each participant
-                                                    for i, email in enumerate(email_data['emails']):
-                                                        participant_name = email_data['names'][i] if i < len(email_data['names']) else "Participant"
-                                                        
-                                                        body = f"""Dear {participant_name},
-
-Your {email_data['category']} match has been scheduled.
-
-Match Details:
-- Time Slot: {email_data['time_slot']}
-- Venue: {email_data['location']}
-- Court Number: {email_data['court_number']}
-
-Please arrive 10 minutes before your scheduled time.
-
-Good luck!
-Tournament Committee"""
-                                                        
-                                                        # Send individual email
-                                                        success = send_outlook_email(
-                                                            recipients=[email],
-                                                            subject=subject,
-                                                            body=body,
-                                                            draft_only=True
-                                                        )
-                                                        
-                                                        if success:
-                                                            success_count += 1
-                                                        else:
-                                                            error_count += 1
-                                                    
-                                                    # Mark emails as sent
-                                                    mark_emails_sent(fixture_id)
+                                                # Render one personalised email per participant for all selected fixtures at once
+                                                fixture_frame = get_fixture_notification_frame(selected_fixtures)
+                                                rendered, render_seconds = render_notifications(fixture_frame, FIXTURE_SLOT_TEMPLATE, per_recipient=True)
+                                                st.caption(f"⏱️ Rendered {len(rendered)} emails in {render_seconds * 1000:.1f} ms")
                                             except Exception as e:
+                                                rendered = None
                                                 error_count += 1
-                                                st.error(f"Error with fixture {fixture_id}: {str(e)}")
+                                                st.error(f"Error preparing emails: {str(e)}")
+                                            
+                                            if rendered is not None:
+                                                for fixture_id, fixture_emails in rendered.groupby('id', sort=False):
+                                                    try:
+                                                        for _, email in fixture_emails.iterrows():
+                                                            # Send individual email
+                                                            success = send_outlook_email(
+                                                                recipients=email['recipients'],
+                                                                subject=email['subject'],
+                                                                body=email['body'],
+                                                                draft_only=True
+                                                            )
+                                                        
+                                                            if success:
+                                                                success_count += 1
+                                                            else:
+                                                                error_count += 1
+                                                    
+                                                        # Mark emails as sent
+                                                        mark_emails_sent(int(fixture_id))
+                                                    except Exception as e:
+                                                        error_count += 1
+                                                        st.error(f"Error with fixture {fixture_id}: {str(e)}")
                                         
                                         if success_count > 0:
                                             st.success(f"✅ Created {success_count} email drafts in Outlook")
@@ -3319,48 +2689,39 @@ Tournament Committee"""
                                 success_count = 0
                                 error_count = 0
                                 
-                                for _, fixture in category_fixtures.iterrows():
+                                with app_email_session():
                                     try:
-                                        email_data = get_fixture_emails(fixture['id'])
-                                        if email_data and email_data['emails']:
-                                            subject = f"Tournament: Your {email_data['category']} Match Details"
-                                            
-                                            # Personalized email body for each participant
-                                            for i, email in enumerate(email_data['emails']):
-                                                participant_name = email_data['names'][i] if i < len(email_data['names']) else "Participant"
-                                                
-                                                body = f"""Dear {participant_name},
-
-Your {email_data['category']} match has been scheduled.
-
-Match Details:
-- Time Slot: {email_data['time_slot']}
-- Venue: {email_data['location']}
-- Court Number: {email_data['court_number']}
-
-Please arrive 10 minutes before your scheduled time.
-
-Good luck!
-Tournament Committee"""
-                                                
-                                                # Send individual email
-                                                success = send_outlook_email(
-                                                    recipients=[email],
-                                                    subject=subject,
-                                                    body=body,
-                                                    draft_only=True
-                                                )
-                                                
-                                                if success:
-                                                    success_count += 1
-                                                else:
-                                                    error_count += 1
-                                            
-                                            # Mark emails as sent
-                                            mark_emails_sent(fixture['id'])
+                                        # Render one personalised email per participant for every fixture in the category at once
+                                        fixture_frame = get_fixture_notification_frame(category_fixtures['id'].tolist())
+                                        rendered, render_seconds = render_notifications(fixture_frame, FIXTURE_SLOT_TEMPLATE, per_recipient=True)
+                                        st.caption(f"⏱️ Rendered {len(rendered)} emails in {render_seconds * 1000:.1f} ms")
                                     except Exception as e:
+                                        rendered = None
                                         error_count += 1
-                                        st.error(f"Error with fixture {fixture['id']}: {str(e)}")
+                                        st.error(f"Error preparing emails: {str(e)}")
+                                    
+                                    if rendered is not None:
+                                        for fixture_id, fixture_emails in rendered.groupby('id', sort=False):
+                                            try:
+                                                for _, email in fixture_emails.iterrows():
+                                                    # Send individual email
+                                                    success = send_outlook_email(
+                                                        recipients=email['recipients'],
+                                                        subject=email['subject'],
+                                                        body=email['body'],
+                                                        draft_only=True
+                                                    )
+                                                
+                                                    if success:
+                                                        success_count += 1
+                                                    else:
+                                                        error_count += 1
+                                            
+                                                # Mark emails as sent
+                                                mark_emails_sent(int(fixture_id))
+                                            except Exception as e:
+                                                error_count += 1
+                                                st.error(f"Error with fixture {fixture_id}: {str(e)}")
                                 
                                 if success_count > 0:
                                     st.success(f"✅ Created {success_count} email drafts in Outlook")
@@ -3380,13 +2741,13 @@ Tournament Committee"""
                         
                         st.divider()
 
-with tab5:
+if active_section == "matches":
     # Match Management
     st.subheader("⚔️ Match Management")
     
-    participants_df = get_participants()
+    participants_df = get_participants(st.session_state.selected_game)
     reported_participants = participants_df[participants_df['registered_at_desk'] == 1]
-    matches_df = get_matches()
+    matches_df = get_matches(game=st.session_state.selected_game)
     
     if reported_participants.empty:
         st.info("No reported participants found. Please mark participants as reported first.")
@@ -3395,14 +2756,10 @@ with tab5:
         # Get participants who are already in matches
         participants_in_matches = set()
         if not matches_df.empty:
-            # Add singles participants
-            participants_in_matches.update(matches_df['player1_id'].dropna().astype(int).tolist())
-            participants_in_matches.update(matches_df['player2_id'].dropna().astype(int).tolist())
-            # Add doubles participants
-            participants_in_matches.update(matches_df['team1_player1_id'].dropna().astype(int).tolist())
-            participants_in_matches.update(matches_df['team1_player2_id'].dropna().astype(int).tolist())
-            participants_in_matches.update(matches_df['team2_player1_id'].dropna().astype(int).tolist())
-            participants_in_matches.update(matches_df['team2_player2_id'].dropna().astype(int).tolist())
+            # Singles and doubles participants (the ID columns are Int64, so no cast is needed)
+            for column in ['player1_id', 'player2_id', 'team1_player1_id', 'team1_player2_id',
+                           'team2_player1_id', 'team2_player2_id']:
+                participants_in_matches.update(matches_df[column].dropna().tolist())
         
         # Filter out participants who are already in matches
         available_participants = reported_participants[~reported_participants['id'].isin(participants_in_matches)]
@@ -3458,7 +2815,7 @@ with tab5:
                     )
                     
                     if st.button("Create Match", key="create_singles_match"):
-                        create_match(selected_category, round_number, player1, player2)
+                        create_match(selected_category, round_number, player1, player2, game=st.session_state.selected_game)
                         st.success("Match created successfully!")
                         st.rerun()
                 else:
@@ -3485,7 +2842,7 @@ with tab5:
                     
                     if st.button("Create Match", key="create_doubles_match"):
                         # For doubles, we still use player1_id and player2_id (same as singles)
-                        create_match(selected_category, round_number, player1, player2)
+                        create_match(selected_category, round_number, player1, player2, game=st.session_state.selected_game)
                         st.success("Match created successfully!")
                         st.rerun()
                 else:
@@ -3493,14 +2850,24 @@ with tab5:
 
     # Show existing matches with enhanced UI
     st.subheader("📋 Existing Matches")
-    matches_df = get_matches()
+    matches_df = get_matches(game=st.session_state.selected_game)
     
     if not matches_df.empty:
         # Filter matches by status
         col1, col2 = st.columns([3, 1])
+        with col1:
+            batch_mode = st.toggle("⌨️ Batch result entry", key="batch_result_entry",
+                                   help="Enter many results in a grid and save them together")
         with col2:
             match_filter = st.selectbox("Filter by Status:", ["All Matches", "Scheduled", "Completed"])
         
+        if "result_grid_message" in st.session_state:
+            st.success(st.session_state.pop("result_grid_message"))
+        result_stats = st.session_state.get('result_entry_stats')
+        if result_stats:
+            st.caption(f"This session: {result_stats['results']} results saved in {result_stats['reruns']} reruns, "
+                       f"{result_stats['seconds'] * 1000:.0f} ms writing to the database")
+        
         # Apply filter
         if match_filter == "Scheduled":
             display_matches = matches_df[matches_df['match_status'] == 'scheduled']
@@ -3509,7 +2876,9 @@ with tab5:
         else:
             display_matches = matches_df
         
-        if display_matches.empty:
+        if batch_mode:
+            show_result_grid(matches_df[matches_df['match_status'] == 'scheduled'])
+        elif display_matches.empty:
             st.info(f"No {match_filter.lower()} found.")
         else:
             # Group matches by category
@@ -3555,14 +2924,14 @@ with tab5:
                                     col1, col2 = st.columns(2)
                                     with col1:
                                         if st.button(f"🏆 {match['player1_name']}", key=f"win1_{match['id']}", use_container_width=True):
-                                            update_match_result(match['id'], winner_id=match['player1_id'])
-                                            st.success(f"{match['player1_name']} wins!")
-                                            st.rerun()
+                                            if save_single_result(match['id'], winner_id=match['player1_id']):
+                                                st.success(f"{match['player1_name']} wins!")
+                                                st.rerun()
                                     with col2:
                                         if st.button(f"🏆 {match['player2_name']}", key=f"win2_{match['id']}", use_container_width=True):
-                                            update_match_result(match['id'], winner_id=match['player2_id'])
-                                            st.success(f"{match['player2_name']} wins!")
-                                            st.rerun()
+                                            if save_single_result(match['id'], winner_id=match['player2_id']):
+                                                st.success(f"{match['player2_name']} wins!")
+                                                st.rerun()
                             
                             else:
                                 # Doubles match display
@@ -3592,160 +2961,32 @@ with tab5:
                                     with col1:
                                         team1 = f"{match['team1_player1_name']} & {match['team1_player2_name']}"
                                         if st.button(f"🏆 Team 1", key=f"team1_win_{match['id']}", use_container_width=True):
-                                            update_match_result(match['id'], winner_team=1)
-                                            st.success(f"Team 1 wins!")
-                                            st.rerun()
+                                            if save_single_result(match['id'], winner_team=1):
+                                                st.success(f"Team 1 wins!")
+                                                st.rerun()
                                     with col2:
                                         team2 = f"{match['team2_player1_name']} & {match['team2_player2_name']}"
                                         if st.button(f"🏆 Team 2", key=f"team2_win_{match['id']}", use_container_width=True):
-                                            update_match_result(match['id'], winner_team=2)
-                                            st.success(f"Team 2 wins!")
-                                            st.rerun()
+                                            if save_single_result(match['id'], winner_team=2):
+                                                st.success(f"Team 2 wins!")
+                                                st.rerun()
                             
                             st.divider()
     else:
         st.info("No matches found. Create some matches to see them here.")
 
-with tab5:
-    # Tournament Bracket
-    st.subheader("🏆 Tournament Bracket")
-    st.info("Tournament bracket view coming soon!")
-    # Winners Tab
-    st.subheader("👑 Tournament Winners")
-    
-    matches_df = get_matches()
-    completed_matches = matches_df[matches_df['match_status'] == 'completed']
-    
-    if completed_matches.empty:
-        st.info("No completed matches found. Complete some matches to see winners here.")
-    else:
-        # Get participants data for additional details
-        participants_df = get_participants()
-        
-        # Winners summary
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Completed Matches", len(completed_matches))
-        with col2:
-            categories_with_winners = completed_matches['category'].nunique()
-            st.metric("Categories with Winners", categories_with_winners)
-        with col3:
-            if not completed_matches.empty:
-                latest_match = completed_matches.iloc[0]
-                latest_date = pd.to_datetime(latest_match['completed_at']).strftime('%m/%d %H:%M')
-                st.metric("Latest Match", latest_date)
-        
-        st.divider()
-        
-        # Group winners by category
-        categories = completed_matches['category'].unique()
-        
-        for category in sorted(categories):
-            with st.expander(f"🏆 {category} Winners", expanded=True):
-                category_matches = completed_matches[completed_matches['category'] == category].sort_values('completed_at', ascending=False)
-                
-                for _, match in category_matches.iterrows():
-                    # Create winner card
-                    winner_container = st.container()
-                    with winner_container:
-                        # Winner header
-                        col1, col2, col3 = st.columns([2, 2, 1])
-                        with col1:
-                            st.markdown(f"**🆔 Match #{match['id']} - Round {match['round_number']}**")
-                        with col2:
-                            completed_date = pd.to_datetime(match['completed_at']).strftime('%B %d, %Y at %I:%M %p')
-                            st.caption(f"🕒 Completed: {completed_date}")
-                        
-                        if category in ['Mens Singles', 'Womens Singles']:
-                            # Singles winner display
-                            winner_id = match['winner_id']
-                            winner_name = match['winner_name']
-                            
-                            # Get winner details
-                            winner_details = participants_df[participants_df['id'] == winner_id].iloc[0] if not participants_df[participants_df['id'] == winner_id].empty else None
-                            
-                            col1, col2 = st.columns([1, 2])
-                            with col1:
-                                st.success(f"🏆 **Winner:** {winner_name}")
-                            with col2:
-                                if winner_details is not None:
-                                    st.info(f"**Details:**\n- Employee ID: {winner_details['emp_id']}\n- Email: {winner_details['email']}")
-                            
-                            # Opponent details
-                            opponent_name = match['player2_name'] if match['player1_name'] == winner_name else match['player1_name']
-                            opponent_id = match['player2_id'] if match['player1_id'] == winner_id else match['player1_id']
-                            opponent_details = participants_df[participants_df['id'] == opponent_id].iloc[0] if not participants_df[participants_df['id'] == opponent_id].empty else None
-                            
-                            st.markdown(f"**🥈 Defeated:** {opponent_name}")
-                            if opponent_details is not None:
-                                st.caption(f"Employee ID: {opponent_details['emp_id']} | Email: {opponent_details['email']}")
-                        
-                        else:
-                            # Doubles winner display
-                            winner_team = match['winner_team']
-                            
-                            if winner_team == 1:
-                                winner_player1_name = match['team1_player1_name']
-                                winner_player2_name = match['team1_player2_name']
-                                winner_player1_id = match['team1_player1_id']
-                                winner_player2_id = match['team1_player2_id']
-                                loser_player1_name = match['team2_player1_name']
-                                loser_player2_name = match['team2_player2_name']
-                                loser_player1_id = match['team2_player1_id']
-                                loser_player2_id = match['team2_player2_id']
-                            else:
-                                winner_player1_name = match['team2_player1_name']
-                                winner_player2_name = match['team2_player2_name']
-                                winner_player1_id = match['team2_player1_id']
-                                winner_player2_id = match['team2_player2_id']
-                                loser_player1_name = match['team1_player1_name']
-                                loser_player2_name = match['team1_player2_name']
-                                loser_player1_id = match['team1_player1_id']
-                                loser_player2_id = match['team1_player2_id']
-                            
-                            col1, col2 = st.columns([1, 2])
-                            with col1:
-                                st.success(f"🏆 **Winning Team:**\n• {winner_player1_name}\n• {winner_player2_name}")
-                            with col2:
-                                # Get winner details
-                                winner1_details = participants_df[participants_df['id'] == winner_player1_id].iloc[0] if not participants_df[participants_df['id'] == winner_player1_id].empty else None
-                                winner2_details = participants_df[participants_df['id'] == winner_player2_id].iloc[0] if not participants_df[participants_df['id'] == winner_player2_id].empty else None
-                                
-                                details_text = "**Winners Details:**\n"
-                                if winner1_details is not None:
-                                    details_text += f"• {winner1_details['emp_id']} - {winner1_details['email']}\n"
-                                if winner2_details is not None:
-                                    details_text += f"• {winner2_details['emp_id']} - {winner2_details['email']}"
-                                st.info(details_text)
-                            
-                            # Opponent team details
-                            st.markdown(f"**🥈 Defeated Team:**\n• {loser_player1_name}\n• {loser_player2_name}")
-                            
-                            # Get loser details
-                            loser1_details = participants_df[participants_df['id'] == loser_player1_id].iloc[0] if not participants_df[participants_df['id'] == loser_player1_id].empty else None
-                            loser2_details = participants_df[participants_df['id'] == loser_player2_id].iloc[0] if not participants_df[participants_df['id'] == loser_player2_id].empty else None
-                            
-                            loser_details_text = ""
-                            if loser1_details is not None:
-                                loser_details_text += f"• {loser1_details['emp_id']} - {loser1_details['email']}\n"
-                            if loser2_details is not None:
-                                loser_details_text += f"• {loser2_details['emp_id']} - {loser2_details['email']}"
-                            st.caption(loser_details_text)
-                        
-                        st.divider()
-
-with tab7:
+if active_section == "winners":
     # Winners tab content - simplified to only show recent winners
     st.subheader("👑 Recent Winners")
     
-    matches_df = get_matches()
+    matches_df = get_matches(game=st.session_state.selected_game)
     completed_matches = matches_df[matches_df['match_status'] == 'completed']
     
     if completed_matches.empty:
         st.info("No completed matches found. Complete some matches to see winners here.")
     else:
         # Get participants data for additional details
-        participants_df = get_participants()
+        participants_df = get_participants(st.session_state.selected_game)
         
         # Winners summary
         col1, col2, col3 = st.columns(3)
@@ -3787,7 +3028,7 @@ with tab7:
                             winner_name = match['winner_name']
                             
                             # Get winner details
-                            winner_details = participants_df[participants_df['id'] == winner_id].iloc[0] if not participants_df[participants_df['id'] == winner_id].empty else None
+                            winner_details = find_participant(participants_df, winner_id)
                             
                             col1, col2 = st.columns([1, 2])
                             with col1:
@@ -3798,8 +3039,8 @@ with tab7:
                             
                             # Opponent details
                             opponent_name = match['player2_name'] if match['player1_name'] == winner_name else match['player1_name']
-                            opponent_id = match['player2_id'] if match['player1_id'] == winner_id else match['player1_id']
-                            opponent_details = participants_df[participants_df['id'] == opponent_id].iloc[0] if not participants_df[participants_df['id'] == opponent_id].empty else None
+                            opponent_id = match['player2_id'] if match['player1_name'] == winner_name else match['player1_id']
+                            opponent_details = find_participant(participants_df, opponent_id)
                             
                             st.markdown(f"**🥈 Defeated:** {opponent_name}")
                             if opponent_details is not None:
@@ -3833,8 +3074,8 @@ with tab7:
                                 st.success(f"🏆 **Winning Team:**\n• {winner_player1_name}\n• {winner_player2_name}")
                             with col2:
                                 # Get winner details
-                                winner1_details = participants_df[participants_df['id'] == winner_player1_id].iloc[0] if not participants_df[participants_df['id'] == winner_player1_id].empty else None
-                                winner2_details = participants_df[participants_df['id'] == winner_player2_id].iloc[0] if not participants_df[participants_df['id'] == winner_player2_id].empty else None
+                                winner1_details = find_participant(participants_df, winner_player1_id)
+                                winner2_details = find_participant(participants_df, winner_player2_id)
                                 
                                 details_text = "**Winners Details:**\n"
                                 if winner1_details is not None:
@@ -3847,8 +3088,8 @@ with tab7:
                             st.markdown(f"**🥈 Defeated Team:**\n• {loser_player1_name}\n• {loser_player2_name}")
                             
                             # Get loser details
-                            loser1_details = participants_df[participants_df['id'] == loser_player1_id].iloc[0] if not participants_df[participants_df['id'] == loser_player1_id].empty else None
-                            loser2_details = participants_df[participants_df['id'] == loser_player2_id].iloc[0] if not participants_df[participants_df['id'] == loser_player2_id].empty else None
+                            loser1_details = find_participant(participants_df, loser_player1_id)
+                            loser2_details = find_participant(participants_df, loser_player2_id)
                             
                             loser_details_text = ""
                             if loser1_details is not None:
@@ -3859,53 +3100,17 @@ with tab7:
                         
                         st.divider()
 
-with tab5:
+if active_section == "bracket":
     # Tournament Bracket
     st.subheader("🏆 Tournament Bracket")
     
-    matches_df = get_matches()
+    matches_df = get_matches(game=st.session_state.selected_game)
     
     if matches_df.empty:
         st.info("No matches found. Create some matches to view the tournament bracket.")
     else:
         # Category selection for bracket view
-        categories = matches_df['category'].unique()
-        selected_category = st.selectbox("Select category to view bracket:", categories, key="bracket_view_category_tab1")
-        
-        category_matches = matches_df[matches_df['category'] == selected_category]
-        
-        if not category_matches.empty:
-            # Group by rounds
-            rounds = sorted(category_matches['round_number'].unique())
-            
-            for round_num in rounds:
-                st.subheader(f"Round {round_num}")
-                round_matches = category_matches[category_matches['round_number'] == round_num]
-                
-                for _, match in round_matches.iterrows():
-                    if match['category'] in ['Mens Singles', 'Womens Singles']:
-                        match_display = f"{match['player1_name']} vs {match['player2_name']}"
-                    else:
-                        team1 = f"{match['team1_player1_name']} & {match['team1_player2_name']}"
-                        team2 = f"{match['team2_player1_name']} & {match['team2_player2_name']}"
-                        match_display = f"{team1} vs {team2}"
-                    
-                    status_emoji = "✅" if match['match_status'] == 'completed' else "⏳"
-                    winner_info = f" - Winner: {match['winner_name']}" if match['match_status'] == 'completed' and match['winner_name'] else ""
-                    
-                    st.write(f"{status_emoji} {match_display}{winner_info}")
-
-with tab6:
-    # Tournament Bracket
-    st.subheader("🏆 Tournament Bracket")
-    
-    matches_df = get_matches()
-    
-    if matches_df.empty:
-        st.info("No matches found. Create some matches to view the tournament bracket.")
-    else:
-        # Category selection for bracket view
-        categories = matches_df['category'].unique()
+        categories = list(matches_df['category'].unique())
         selected_category = st.selectbox("Select category to view bracket:", categories, key="bracket_view_category_tab2")
         
         category_matches = matches_df[matches_df['category'] == selected_category]
@@ -3932,6 +3137,7 @@ with tab6:
                     st.write(f"{status_emoji} {match_display}{winner_info}")
     
     # Detailed reports
+    participants_df = get_participants(st.session_state.selected_game)
     if not participants_df.empty:
         st.subheader("📋 Detailed Participant List")
         
@@ -3984,35 +3190,60 @@ with tab6:
         
         st.dataframe(display_df[['emp_id', 'name', 'email', 'category', 'Partner', 'Status']], use_container_width=True)
 
-with tab8:
+if active_section == "reports":
     # Reports & Export tab content
     st.subheader("📊 Reports & Export")
     
-    participants_df = get_participants()
-    matches_df = get_matches()
-    
     # Summary statistics
     st.subheader("📈 Tournament Summary")
+    summary = get_summary_metrics(st.session_state.selected_game)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.metric("Total Participants", len(participants_df))
-        st.metric("Reported Participants", len(participants_df[participants_df['registered_at_desk'] == 1]) if not participants_df.empty else 0)
+        st.metric("Total Participants", summary['total_participants'])
+        st.metric("Reported Participants", summary['reported_participants'])
     
     with col2:
-        st.metric("Total Matches", len(matches_df))
-        st.metric("Completed Matches", len(matches_df[matches_df['match_status'] == 'completed']) if not matches_df.empty else 0)
+        st.metric("Total Matches", summary['total_matches'])
+        st.metric("Completed Matches", summary['completed_matches'])
+    
+    round_progress = get_round_progress(st.session_state.selected_game)
+    if not round_progress.empty:
+        with st.expander("🔄 Round Progress"):
+            round_progress['completion'] = (round_progress['completed_matches'] / round_progress['total_matches'] * 100).round(1).astype(str) + "%"
+            round_progress.columns = ['Category', 'Round', 'Matches', 'Completed', 'Completion']
+            st.dataframe(round_progress, use_container_width=True, hide_index=True)
+    
+    with st.expander("🏅 Leaderboard"):
+        st.caption("Matches won, then set difference, then point difference (Chess points are half points: a win is 2).")
+        leaderboard_categories = get_category_summary(st.session_state.selected_game)['category'].tolist()
+        leaderboard_category = st.selectbox("Category", ["All"] + leaderboard_categories, key="leaderboard_category")
+        leaderboard = get_leaderboard(st.session_state.selected_game,
+                                      None if leaderboard_category == "All" else leaderboard_category, limit=50)
+        if leaderboard.empty:
+            st.info("No completed matches yet.")
+        else:
+            ratings = get_ratings(leaderboard['emp_id'].tolist(), st.session_state.selected_game)
+            leaderboard['rating'] = leaderboard['emp_id'].astype(str).map(ratings).round(0)
+            leaderboard = leaderboard[['name', 'emp_id', 'category', 'matches_played', 'matches_won',
+                                       'sets_won', 'sets_lost', 'set_difference', 'point_difference', 'rating']]
+            leaderboard.columns = ['Player', 'Employee ID', 'Category', 'Played', 'Won', 'Sets Won', 'Sets Lost',
+                                   'Set Diff', 'Point Diff', 'Rating']
+            st.dataframe(leaderboard, use_container_width=True, hide_index=True)
     
     # Reports section
     st.subheader("📊 Tournament Reports")
     
     # Participants by Category report
     if st.button("📋 Generate Participants by Category Report"):
-        if not participants_df.empty:
+        category_summary = get_category_summary(st.session_state.selected_game)
+        if not category_summary.empty:
+            participants_df = get_participants(st.session_state.selected_game)
+            
             # Category-wise breakdown with enhanced styling
             st.subheader("📊 Category-wise Participants")
-            category_counts = participants_df['category'].value_counts().reset_index()
+            category_counts = category_summary[['category', 'participants']].copy()
             category_counts.columns = ['Category', 'Count']
             
             # Display bar chart
@@ -4071,13 +3302,14 @@ with tab8:
             # Detailed breakdown by category
             st.subheader("📋 Detailed Breakdown by Category")
             
-            for category in sorted(participants_df['category'].unique()):
-                with st.expander(f"{category} - {len(participants_df[participants_df['category'] == category])} participants"):
+            for category_row in category_summary.sort_values('category').itertuples():
+                category = category_row.category
+                with st.expander(f"{category} - {category_row.participants} participants"):
                     category_data = participants_df[participants_df['category'] == category]
                     
                     # Show registration status breakdown
-                    reported = len(category_data[category_data['registered_at_desk'] == 1])
-                    not_reported = len(category_data[category_data['registered_at_desk'] == 0])
+                    reported = category_row.reported
+                    not_reported = category_row.participants - category_row.reported
                     
                     col1, col2 = st.columns(2)
                     with col1:
@@ -4090,6 +3322,108 @@ with tab8:
             
             # Export participants
     
+    # Data export, streamed from the database cursor so large tournaments are never loaded into memory
+    st.subheader("📤 Export Data")
+    export_col1, export_col2 = st.columns(2)
+    with export_col1:
+        export_datasets = st.multiselect(
+            "Data to export:",
+            list(EXPORT_QUERIES),
+            default=list(EXPORT_QUERIES),
+            format_func=str.title,
+            key="export_datasets"
+        )
+        export_all_games = st.checkbox("Include every game", key="export_all_games",
+                                       help=f"By default only {selected_game} rows are exported")
+    with export_col2:
+        export_format = st.radio(
+            "Format:",
+            ["Excel (.xlsx, one sheet per table)", "CSV (zip of CSV files for several tables)"],
+            key="export_format"
+        )
+    
+    if st.button("📦 Build Export", key="build_export", disabled=not export_datasets):
+        with st.spinner("Exporting data..."):
+            export_started = time.time()
+            export_path, export_counts = build_export_file(export_datasets, "xlsx" if export_format.startswith("Excel") else "csv",
+                                                           game=None if export_all_games else selected_game)
+            st.session_state.export_file = export_path
+            st.success(f"✅ Exported {sum(export_counts.values())} rows "
+                       f"({', '.join(f'{name}: {count}' for name, count in export_counts.items())}) "
+                       f"in {time.time() - export_started:.1f}s")
+    
+    export_path = st.session_state.get('export_file')
+    if export_path and os.path.exists(export_path):
+        export_mime = {
+            '.xlsx': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            '.csv': "text/csv",
+            '.zip': "application/zip",
+        }[os.path.splitext(export_path)[1]]
+        with open(export_path, 'rb') as export_file:
+            st.download_button(
+                label=f"⬇️ Download {os.path.basename(export_path)}",
+                data=export_file,
+                file_name=os.path.basename(export_path),
+                mime=export_mime,
+                key="download_export"
+            )
+    
+    # Whole-tournament snapshots: typed Parquet files that restore with IDs intact
+    st.subheader("🗄️ Tournament Snapshots")
+    if not PYARROW_AVAILABLE:
+        st.info("Snapshots require pyarrow. Install it with: pip install pyarrow")
+    else:
+        snapshot_col1, snapshot_col2 = st.columns([3, 1])
+        with snapshot_col1:
+            snapshot_name = st.text_input("Snapshot name:", value="tournament", key="snapshot_name")
+        with snapshot_col2:
+            st.write("")
+            if st.button("📸 Create Snapshot", key="create_snapshot"):
+                with st.spinner("Writing snapshot..."):
+                    snapshot_started = time.time()
+                    snapshot_path, snapshot_manifest = create_snapshot(snapshot_name)
+                    snapshot_rows = ", ".join(f"{table}: {info['rows']}" for table, info in snapshot_manifest['tables'].items())
+                    st.success(f"✅ Snapshot saved to {snapshot_path} in {time.time() - snapshot_started:.1f}s ({snapshot_rows})")
+        
+        snapshot_upload = st.file_uploader("Import a snapshot (.zip):", type=["zip"], key="snapshot_upload")
+        if snapshot_upload is not None and st.button("📥 Import Snapshot", key="import_snapshot"):
+            try:
+                st.success(f"✅ Imported snapshot to {unzip_snapshot(snapshot_upload)}")
+            except (ValueError, zipfile.BadZipFile) as e:
+                st.error(f"❌ {e}")
+        
+        snapshots = list_snapshots()
+        if snapshots:
+            snapshot_labels = {f"{snapshot['name']} ({snapshot['created_at']}) - "
+                               f"{', '.join(f'{table}: {rows}' for table, rows in snapshot['rows'].items())}": snapshot['path']
+                               for snapshot in snapshots}
+            selected_snapshot = snapshot_labels[st.selectbox("Saved snapshots:", list(snapshot_labels), key="selected_snapshot")]
+            
+            restore_col1, restore_col2 = st.columns(2)
+            with restore_col1:
+                if st.button("📦 Prepare Download", key="zip_snapshot"):
+                    st.session_state.snapshot_zip = zip_snapshot(selected_snapshot)
+                snapshot_zip = st.session_state.get('snapshot_zip')
+                if snapshot_zip and os.path.exists(snapshot_zip):
+                    with open(snapshot_zip, 'rb') as snapshot_file:
+                        st.download_button(
+                            label=f"⬇️ Download {os.path.basename(snapshot_zip)}",
+                            data=snapshot_file,
+                            file_name=os.path.basename(snapshot_zip),
+                            mime="application/zip",
+                            key="download_snapshot"
+                        )
+            with restore_col2:
+                confirm_restore = st.checkbox("Replace all current participants, matches and fixtures", key="confirm_restore")
+                if st.button("♻️ Restore Snapshot", key="restore_snapshot", disabled=not confirm_restore):
+                    with st.spinner("Restoring snapshot..."):
+                        restore_started = time.time()
+                        restored = restore_snapshot(selected_snapshot)
+                        st.success(f"✅ Restored {', '.join(f'{table}: {count}' for table, count in restored.items())} "
+                                   f"in {time.time() - restore_started:.1f}s")
+        else:
+            st.caption("No snapshots saved yet.")
+    
     # Create email notification tabs
     email_tab1, email_tab2, email_tab3 = st.tabs(["📅 Match Fixtures", "🏆 Winner Notifications", "📝 Custom Email"])
     
@@ -4098,7 +3432,7 @@ with tab8:
             st.write("Notify participants about their upcoming matches.")
         
             # Get upcoming matches
-            upcoming_matches = get_upcoming_matches()
+            upcoming_matches = get_upcoming_matches(st.session_state.selected_game)
             
             if upcoming_matches.empty:
                 st.info("No upcoming matches found. Create some matches first.")
@@ -4138,6 +3472,10 @@ with tab8:
                             match_desc = f"{match['category']} - Round {match['round_number']}: {match['team1_names']} vs {match['team2_names']}"
                         match_options.append({"id": match['id'], "description": match_desc})
                     
+                    # Select every displayed match (e.g. for a whole-day digest)
+                    st.button("Select All Displayed Matches", key="select_all_fixture_matches",
+                              on_click=lambda: st.session_state.update(fixture_match_select=[m["id"] for m in match_options]))
+                    
                     selected_matches = st.multiselect(
                         "Select matches to send notifications for:",
                         options=[m["id"] for m in match_options],
@@ -4169,31 +3507,48 @@ with tab8:
                             key="fixture_email_footer"
                         )
                     
+                        fixture_email_mode = st.radio(
+                            "Send as:",
+                            ["One email per match", "One personalised email per player", "Digest: one email per player with all their matches"],
+                            key="fixture_email_mode",
+                            help="Digest mode groups every selected match by email address across categories and rounds"
+                        )
+                        digest_mode = fixture_email_mode.startswith("Digest")
+                        if digest_mode:
+                            st.caption("Placeholders such as {recipient_name}, {match_count} and {matches} can be used in the subject, introduction and footer.")
+                        else:
+                            st.caption("Placeholders such as {recipient_name}, {category}, {round_number}, {match_description} and {time_slot} can be used in the subject, introduction and footer.")
+                        
+                        # Compile the template once for the preview and the review
+                        try:
+                            details = DIGEST_DETAILS if digest_mode else FIXTURE_DETAILS
+                            fixture_template = EmailTemplate(email_subject, email_intro + "\n\n" + details + email_footer)
+                        except ValueError as e:
+                            fixture_template = None
+                            st.error(f"❌ Invalid email template: {str(e)}")
+                        
+                        def render_fixture_emails(match_ids):
+                            """Render the selected matches in the chosen mode"""
+                            match_frame = get_notification_frame(match_ids)
+                            if digest_mode:
+                                return render_digests(match_frame, fixture_template)
+                            return render_notifications(match_frame, fixture_template,
+                                                        per_recipient=fixture_email_mode.startswith("One personalised"))
+                    
                         # Preview section
                         with st.expander("📝 Preview Email", expanded=False):
                             st.subheader("Email Preview")
-                            st.write(f"**Subject:** {email_subject}")
-                            st.write("**Body:**")
                             
-                            # Show preview for first selected match
-                            if selected_matches:
-                                preview_match = filtered_matches[filtered_matches['id'] == selected_matches[0]].iloc[0]
-                                match_details = get_match_details(selected_matches[0])
-                                
-                                if match_details:
-                                    preview_body = email_intro + "\n\n"
-                                    
-                                    if 'Singles' in preview_match['category']:
-                                        preview_body += f"Category: {preview_match['category']}\n"
-                                        preview_body += f"Round: {preview_match['round_number']}\n"
-                                        preview_body += f"Match: {preview_match['player1_name']} vs {preview_match['player2_name']}\n"
-                                    else:
-                                        preview_body += f"Category: {preview_match['category']}\n"
-                                        preview_body += f"Round: {preview_match['round_number']}\n"
-                                        preview_body += f"Match: {preview_match['team1_names']} vs {preview_match['team2_names']}\n"
-                                    
-                                    preview_body += email_footer
-                                    st.text(preview_body)
+                            # Show preview for the first selected match (digests need every match of its first player)
+                            if selected_matches and fixture_template:
+                                try:
+                                    preview, _ = render_fixture_emails(selected_matches if digest_mode else selected_matches[:1])
+                                    if not preview.empty:
+                                        st.write(f"**Subject:** {preview.iloc[0]['subject']}")
+                                        st.write("**Body:**")
+                                        st.text(preview.iloc[0]['body'])
+                                except ValueError as e:
+                                    st.error(f"❌ {str(e)}")
                         
                         # Initialize session state for review if not exists
                         if 'fixture_emails_to_review' not in st.session_state:
@@ -4202,71 +3557,20 @@ with tab8:
                             st.session_state.show_fixture_review = False
                         
                         # Preview button
-                        if st.button("📝 Review Emails Before Sending", key="review_fixture_emails"):
+                        if st.button("📝 Review Emails Before Sending", key="review_fixture_emails", disabled=fixture_template is None):
                             with st.spinner("Preparing emails for review..."):
-                                emails_to_review = []
-                                
-                                for match_id in selected_matches:
-                                    match_details = get_match_details(match_id)
-                                
-                                    if match_details:
-                                        # Prepare email content
-                                        email_body = email_intro + "\n\n"
-                                        
-                                        if 'Singles' in match_details['category']:
-                                            email_body += f"Category: {match_details['category']}\n"
-                                            email_body += f"Round: {match_details['round_number']}\n"
-                                            email_body += f"Match: {match_details['player1_name']} vs {match_details['player2_name']}\n"
-                                            
-                                            # Get player emails
-                                            recipients = []
-                                            if 'player1_email' in match_details and match_details['player1_email']:
-                                                recipients.append(match_details['player1_email'])
-                                            if 'player2_email' in match_details and match_details['player2_email']:
-                                                recipients.append(match_details['player2_email'])
-                                                
-                                            match_description = f"{match_details['player1_name']} vs {match_details['player2_name']}"
-                                        else:
-                                            email_body += f"Category: {match_details['category']}\n"
-                                            email_body += f"Round: {match_details['round_number']}\n"
-                                            team1_names = []
-                                            if 'team1_player1_name' in match_details:
-                                                team1_names.append(match_details['team1_player1_name'])
-                                            if 'team1_player2_name' in match_details:
-                                                team1_names.append(match_details['team1_player2_name'])
-                                                
-                                            team2_names = []
-                                            if 'team2_player1_name' in match_details:
-                                                team2_names.append(match_details['team2_player1_name'])
-                                            if 'team2_player2_name' in match_details:
-                                                team2_names.append(match_details['team2_player2_name'])
-                                                
-                                            email_body += f"Match: {' & '.join(team1_names)} vs {' & '.join(team2_names)}\n"
-                                            
-                                            # Get team member emails
-                                            recipients = []
-                                            if 'team1_player1_email' in match_details and match_details['team1_player1_email']:
-                                                recipients.append(match_details['team1_player1_email'])
-                                            if 'team1_player2_email' in match_details and match_details['team1_player2_email']:
-                                                recipients.append(match_details['team1_player2_email'])
-                                            if 'team2_player1_email' in match_details and match_details['team2_player1_email']:
-                                                recipients.append(match_details['team2_player1_email'])
-                                            if 'team2_player2_email' in match_details and match_details['team2_player2_email']:
-                                                recipients.append(match_details['team2_player2_email'])
-                                                
-                                            match_description = f"{' & '.join(team1_names)} vs {' & '.join(team2_names)}"
-                                        
-                                        email_body += email_footer
-                                        
-                                        # Add to review list
-                                        if recipients:
-                                            emails_to_review.append({
-                                                'match_id': match_id,
-                                                'recipients': recipients,
-                                                'subject': email_subject,
-                                                'body': email_body,
-                                                'match_description': match_description
-                                            })
+                                try:
+                                    # Render every selected match in one pass from a single joined query
+                                    rendered, render_seconds = render_fixture_emails(selected_matches)
+                                    emails_to_review = rendered.rename(columns={'id': 'match_id'}).to_dict('records')
+                                    st.session_state.fixture_render_seconds = render_seconds
+                                    if digest_mode:
+                                        st.session_state.fixture_digest_saving = (int(rendered['match_count'].sum()), len(rendered))
+                                    else:
+                                        st.session_state.fixture_digest_saving = None
+                                except ValueError as e:
+                                    emails_to_review = []
+                                    st.error(f"❌ {str(e)}")
                             
                                 # Store in session state
                                 st.session_state.fixture_emails_to_review = emails_to_review
@@ -4287,6 +3591,10 @@ with tab8:
                             total_emails = len(st.session_state.fixture_emails_to_review)
                             total_recipients = sum(len(email['recipients']) for email in st.session_state.fixture_emails_to_review)
                             st.markdown(f"**Total emails to be sent:** {total_emails} (to {total_recipients} recipients)")
+                            st.caption(f"⏱️ Rendered {total_emails} emails in {st.session_state.get('fixture_render_seconds', 0) * 1000:.1f} ms")
+                            if st.session_state.get('fixture_digest_saving'):
+                                individual_count, digest_count = st.session_state.fixture_digest_saving
+                                st.caption(f"📉 Digest mode: {digest_count} emails instead of {individual_count} individual match emails")
                             
                             # List all matches
                             with st.expander("View all matches", expanded=False):
@@ -4297,13 +3605,13 @@ with tab8:
                             col1, col2, col3 = st.columns(3)
                             with col1:
                                 if st.button("📤 Confirm and Send Emails", key="confirm_fixture_emails"):
-                                    with st.spinner("Sending emails..."):
+                                    with st.spinner("Sending emails..."), app_email_session():
                                         success_count = 0
                                         fail_count = 0
                                         
                                         for email_data in st.session_state.fixture_emails_to_review:
                                             try:
-                                                if send_outlook_email(email_data['recipients'], email_data['subject'], email_data['body']):
+                                                if send_outlook_email(email_data['recipients'], email_data['subject'], email_data['body'], html_body=email_data.get('html_body')):
                                                     success_count += 1
                                                 else:
                                                     fail_count += 1
@@ -4321,121 +3629,121 @@ with tab8:
                                     st.session_state.show_fixture_review = False
                                     st.session_state.fixture_emails_to_review = []
                         
-                        with col2:
-                            # Add options for draft saving
-                            draft_options = st.radio(
-                                "Draft Options:",
-                                ["Save as individual drafts", "Save as batch drafts (5 per batch)", "Save as batch drafts (10 per batch)"],
-                                key="fixture_draft_options",
-                                horizontal=True
-                            )
+                            with col2:
+                                # Add options for draft saving
+                                draft_options = st.radio(
+                                    "Draft Options:",
+                                    ["Save as individual drafts", "Save as batch drafts (5 per batch)", "Save as batch drafts (10 per batch)"],
+                                    key="fixture_draft_options",
+                                    horizontal=True
+                                )
                             
-                            open_outlook = st.checkbox("Open Outlook after creating drafts", value=True, key="fixture_open_outlook")
+                                open_outlook = st.checkbox("Open Outlook after creating drafts", value=True, key="fixture_open_outlook")
                             
-                            if st.button("📝 Save as Drafts in Outlook", key="save_fixture_drafts"):
-                                with st.spinner("Saving emails as drafts..."):
-                                    success_count = 0
-                                    fail_count = 0
+                                if st.button("📝 Save as Drafts in Outlook", key="save_fixture_drafts"):
+                                    with st.spinner("Saving emails as drafts..."), app_email_session():
+                                        success_count = 0
+                                        fail_count = 0
                                     
-                                    # Determine batch size
-                                    batch_size = 1  # Default: individual emails
-                                    if draft_options == "Save as batch drafts (5 per batch)":
-                                        batch_size = 5
-                                    elif draft_options == "Save as batch drafts (10 per batch)":
-                                        batch_size = 10
+                                        # Determine batch size
+                                        batch_size = 1  # Default: individual emails
+                                        if draft_options == "Save as batch drafts (5 per batch)":
+                                            batch_size = 5
+                                        elif draft_options == "Save as batch drafts (10 per batch)":
+                                            batch_size = 10
                                     
-                                    # Process emails in batches if needed
-                                    if batch_size > 1:
-                                        # Group emails into batches
-                                        email_batches = []
-                                        current_batch = []
-                                        current_recipients = []
+                                        # Process emails in batches if needed
+                                        if batch_size > 1:
+                                            # Group emails into batches
+                                            email_batches = []
+                                            current_batch = []
+                                            current_recipients = []
                                         
-                                        for i, email_data in enumerate(st.session_state.fixture_emails_to_review):
-                                            current_batch.append(email_data)
-                                            current_recipients.extend(email_data['recipients'])
+                                            for i, email_data in enumerate(st.session_state.fixture_emails_to_review):
+                                                current_batch.append(email_data)
+                                                current_recipients.extend(email_data['recipients'])
                                             
-                                            # When batch is full or this is the last email
-                                            if len(current_batch) >= batch_size or i == len(st.session_state.fixture_emails_to_review) - 1:
-                                                if current_batch:  # Make sure batch isn't empty
-                                                    # Create a batch summary
-                                                    batch_subject = f"Carrom Tournament - Match Fixture Notifications (Batch of {len(current_batch)})"
-                                                    batch_body = "Hello Tournament Organizer,\n\nBelow are the match fixture emails ready to be sent. Please review and send them individually.\n\n=== EMAILS IN THIS BATCH ==="
+                                                # When batch is full or this is the last email
+                                                if len(current_batch) >= batch_size or i == len(st.session_state.fixture_emails_to_review) - 1:
+                                                    if current_batch:  # Make sure batch isn't empty
+                                                        # Create a batch summary
+                                                        batch_subject = f"Carrom Tournament - Match Fixture Notifications (Batch of {len(current_batch)})"
+                                                        batch_body = "Hello Tournament Organizer,\n\nBelow are the match fixture emails ready to be sent. Please review and send them individually.\n\n=== EMAILS IN THIS BATCH ==="
                                                     
-                                                    # Add each email to the batch body
-                                                    for idx, email in enumerate(current_batch):
-                                                        batch_body += "\n\n--- EMAIL " + str(idx+1) + " ---\n"
-                                                        batch_body += "To: " + ', '.join(email['recipients']) + "\n"
-                                                        batch_body += "Subject: " + email['subject'] + "\n"
-                                                        batch_body += "Body:\n" + email['body'] + "\n"
-                                                        batch_body += "\n--- END OF EMAIL ---"
+                                                        # Add each email to the batch body
+                                                        for idx, email in enumerate(current_batch):
+                                                            batch_body += "\n\n--- EMAIL " + str(idx+1) + " ---\n"
+                                                            batch_body += "To: " + ', '.join(email['recipients']) + "\n"
+                                                            batch_body += "Subject: " + email['subject'] + "\n"
+                                                            batch_body += "Body:\n" + email['body'] + "\n"
+                                                            batch_body += "\n--- END OF EMAIL ---"
                                                     
-                                                    # Add the batch to our list
-                                                    email_batches.append({
-                                                        'subject': batch_subject,
-                                                        'body': batch_body,
-                                                        'recipients': ['tournament.organizer@example.com']  # Placeholder recipient
-                                                    })
+                                                        # Add the batch to our list
+                                                        email_batches.append({
+                                                            'subject': batch_subject,
+                                                            'body': batch_body,
+                                                            'recipients': ['tournament.organizer@example.com']  # Placeholder recipient
+                                                        })
                                                     
-                                                    # Reset for next batch
-                                                    current_batch = []
-                                                    current_recipients = []
+                                                        # Reset for next batch
+                                                        current_batch = []
+                                                        current_recipients = []
                                         
-                                        # Save each batch as a draft
-                                        for batch in email_batches:
-                                            try:
-                                                if send_outlook_email(
-                                                    batch['recipients'][0],  # Send to organizer
-                                                    batch['subject'], 
-                                                    batch['body'], 
-                                                    draft_only=True,
-                                                    open_outlook=open_outlook and success_count == 0  # Only open on first success
-                                                ):
-                                                    success_count += 1
-                                                else:
+                                            # Save each batch as a draft
+                                            for batch in email_batches:
+                                                try:
+                                                    if send_outlook_email(
+                                                        batch['recipients'][0],  # Send to organizer
+                                                        batch['subject'], 
+                                                        batch['body'], 
+                                                        draft_only=True,
+                                                        open_outlook=open_outlook and success_count == 0  # Only open on first success
+                                                    ):
+                                                        success_count += 1
+                                                    else:
+                                                        fail_count += 1
+                                                except Exception as e:
+                                                    st.error(f"Error saving batch draft: {str(e)}")
                                                     fail_count += 1
-                                            except Exception as e:
-                                                st.error(f"Error saving batch draft: {str(e)}")
-                                                fail_count += 1
-                                    else:
-                                        # Save individual drafts (original behavior)
-                                        for i, email_data in enumerate(st.session_state.fixture_emails_to_review):
-                                            try:
-                                                if send_outlook_email(
-                                                    email_data['recipients'], 
-                                                    email_data['subject'], 
-                                                    email_data['body'], 
-                                                    draft_only=True,
-                                                    open_outlook=open_outlook and i == 0  # Only open on first email
-                                                ):
-                                                    success_count += 1
-                                                else:
+                                        else:
+                                            # Save individual drafts (original behavior)
+                                            for i, email_data in enumerate(st.session_state.fixture_emails_to_review):
+                                                try:
+                                                    if send_outlook_email(
+                                                        email_data['recipients'], 
+                                                        email_data['subject'], 
+                                                        email_data['body'], 
+                                                        draft_only=True,
+                                                        open_outlook=open_outlook and i == 0  # Only open on first email
+                                                    ):
+                                                        success_count += 1
+                                                    else:
+                                                        fail_count += 1
+                                                except Exception as e:
+                                                    st.error(f"Error saving draft for match {email_data['match_id']}: {str(e)}")
                                                     fail_count += 1
-                                            except Exception as e:
-                                                st.error(f"Error saving draft for match {email_data['match_id']}: {str(e)}")
-                                                fail_count += 1
                                     
-                                    # Show results
-                                    if batch_size > 1 and success_count > 0:
-                                        st.success(f"✅ Successfully saved {success_count} batch drafts in Outlook")
-                                        st.info("Each draft contains multiple emails that you can review and send individually.")
-                                    elif success_count > 0:
-                                        st.success(f"✅ Successfully saved {success_count} emails as drafts in Outlook")
-                                        st.info("Please review and send the draft emails in Outlook.")
+                                        # Show results
+                                        if batch_size > 1 and success_count > 0:
+                                            st.success(f"✅ Successfully saved {success_count} batch drafts in Outlook")
+                                            st.info("Each draft contains multiple emails that you can review and send individually.")
+                                        elif success_count > 0:
+                                            st.success(f"✅ Successfully saved {success_count} emails as drafts in Outlook")
+                                            st.info("Please review and send the draft emails in Outlook.")
                                         
-                                    if fail_count > 0:
-                                        st.error(f"❌ Failed to save {fail_count} drafts")
+                                        if fail_count > 0:
+                                            st.error(f"❌ Failed to save {fail_count} drafts")
                                     
-                                    # Clear review state
+                                        # Clear review state
+                                        st.session_state.show_fixture_review = False
+                                        st.session_state.fixture_emails_to_review = []
+                        
+                            with col3:
+                                if st.button("❌ Cancel", key="cancel_fixture_emails"):
                                     st.session_state.show_fixture_review = False
                                     st.session_state.fixture_emails_to_review = []
-                        
-                        with col3:
-                            if st.button("❌ Cancel", key="cancel_fixture_emails"):
-                                st.session_state.show_fixture_review = False
-                                st.session_state.fixture_emails_to_review = []
-                                st.info("Email sending cancelled.")
-                                st.rerun()
+                                    st.info("Email sending cancelled.")
+                                    st.rerun()
                 else:
                     st.info("Please select at least one match to send notifications.")
     
@@ -4444,7 +3752,7 @@ with tab8:
         st.write("Notify participants about match results and winners.")
         
         # Get completed matches with winners
-        completed_matches = get_recent_winners(limit=50)  # Get up to 50 recent winners
+        completed_matches = get_recent_winners(limit=50, game=st.session_state.selected_game)  # Get up to 50 recent winners
         
         if completed_matches.empty:
             st.info("No completed matches with winners found.")
@@ -4515,49 +3823,36 @@ with tab8:
                         key="winner_email_footer"
                     )
                     
+                    personalise_winner_emails = st.checkbox(
+                        "Send a personalised email to each player",
+                        value=False,
+                        key="winner_email_personalise",
+                        help="Send one email per recipient instead of one email per match"
+                    )
+                    st.caption("Placeholders such as {recipient_name}, {category}, {round_number}, {match_description} and {winner_names} can be used in the subject, introduction and footer.")
+                    
+                    # Compile the template once for the preview and the review
+                    try:
+                        winner_template = EmailTemplate(email_subject, email_intro + "\n\n" + WINNER_DETAILS + email_footer)
+                    except ValueError as e:
+                        winner_template = None
+                        st.error(f"❌ Invalid email template: {str(e)}")
+                    
                     # Preview section
                     with st.expander("📝 Preview Email", expanded=False):
                         st.subheader("Email Preview")
-                        st.write(f"**Subject:** {email_subject}")
-                        st.write("**Body:**")
                         
                         # Show preview for first selected match
-                        if selected_matches:
-                            preview_match = filtered_matches[filtered_matches['id'] == selected_matches[0]].iloc[0]
-                            match_details = get_match_details(selected_matches[0])
-                            
-                            if match_details:
-                                preview_body = email_intro + "\n\n"
-                                
-                                if 'Singles' in preview_match['category']:
-                                    preview_body += f"Category: {preview_match['category']}\n"
-                                    preview_body += f"Round: {preview_match['round_number']}\n"
-                                    
-                                    # Use match_details for player names if available, otherwise use safe fallbacks
-                                    player1 = match_details.get('player1_name', 'Player 1')
-                                    player2 = match_details.get('player2_name', 'Player 2')
-                                    preview_body += f"Match: {player1} vs {player2}\n"
-                                    preview_body += f"Winner: {preview_match['winner_name']}\n"
-                                else:
-                                    preview_body += f"Category: {preview_match['category']}\n"
-                                    preview_body += f"Round: {preview_match['round_number']}\n"
-                                    team1_names = []
-                                    if 'team1_player1_name' in match_details:
-                                        team1_names.append(match_details['team1_player1_name'])
-                                    if 'team1_player2_name' in match_details:
-                                        team1_names.append(match_details['team1_player2_name'])
-                                        
-                                    team2_names = []
-                                    if 'team2_player1_name' in match_details:
-                                        team2_names.append(match_details['team2_player1_name'])
-                                    if 'team2_player2_name' in match_details:
-                                        team2_names.append(match_details['team2_player2_name'])
-                                        
-                                    preview_body += f"Match: {' & '.join(team1_names)} vs {' & '.join(team2_names)}\n"
-                                    preview_body += f"Winners: {preview_match['winner_team_names']}\n"
-                                
-                                preview_body += email_footer
-                                st.text(preview_body)
+                        if selected_matches and winner_template:
+                            try:
+                                preview, _ = render_notifications(get_notification_frame(selected_matches[:1]),
+                                                                  winner_template, per_recipient=personalise_winner_emails)
+                                if not preview.empty:
+                                    st.write(f"**Subject:** {preview.iloc[0]['subject']}")
+                                    st.write("**Body:**")
+                                    st.text(preview.iloc[0]['body'])
+                            except ValueError as e:
+                                st.error(f"❌ {str(e)}")
                     
                     # Initialize session state for review if not exists
                     if 'winner_emails_to_review' not in st.session_state:
@@ -4566,88 +3861,22 @@ with tab8:
                         st.session_state.show_winner_review = False
                     
                     # Preview button
-                    if st.button("📝 Review Emails Before Sending", key="review_winner_emails"):
+                    if st.button("📝 Review Emails Before Sending", key="review_winner_emails", disabled=winner_template is None):
                         with st.spinner("Preparing emails for review..."):
-                            emails_to_review = []
-                            
-                            for match_id in selected_matches:
-                                match_details = get_match_details(match_id)
-                                
-                                if match_details:
-                                    # Prepare email content
-                                    email_body = email_intro + "\n\n"
-                                    
-                                    if 'Singles' in match_details['category']:
-                                        email_body += f"Category: {match_details['category']}\n"
-                                        email_body += f"Round: {match_details['round_number']}\n"
-                                        email_body += f"Match: {match_details['player1_name']} vs {match_details['player2_name']}\n"
-                                        
-                                        # Get winner name
-                                        if match_details['winner_id'] == match_details['player1_id']:
-                                            winner_name = match_details['player1_name']
-                                        else:
-                                            winner_name = match_details['player2_name']
-                                            
-                                        email_body += f"Winner: {winner_name}\n"
-                                        match_description = f"{match_details['player1_name']} vs {match_details['player2_name']} (Winner: {winner_name})"
-                                        
-                                        # Send to both players
-                                        recipients = []
-                                        if 'player1_email' in match_details and match_details['player1_email']:
-                                            recipients.append(match_details['player1_email'])
-                                        if 'player2_email' in match_details and match_details['player2_email']:
-                                            recipients.append(match_details['player2_email'])
-                                    else:
-                                        email_body += f"Category: {match_details['category']}\n"
-                                        email_body += f"Round: {match_details['round_number']}\n"
-                                        
-                                        team1_names = []
-                                        if 'team1_player1_name' in match_details:
-                                            team1_names.append(match_details['team1_player1_name'])
-                                        if 'team1_player2_name' in match_details:
-                                            team1_names.append(match_details['team1_player2_name'])
-                                            
-                                        team2_names = []
-                                        if 'team2_player1_name' in match_details:
-                                            team2_names.append(match_details['team2_player1_name'])
-                                        if 'team2_player2_name' in match_details:
-                                            team2_names.append(match_details['team2_player2_name'])
-                                            
-                                        email_body += f"Match: {' & '.join(team1_names)} vs {' & '.join(team2_names)}\n"
-                                        
-                                        # Get winner team names
-                                        winner_team_names = []
-                                        if match_details['winner_team'] == 'team1':
-                                            winner_team_names = team1_names
-                                            email_body += f"Winners: {' & '.join(team1_names)}\n"
-                                        else:
-                                            winner_team_names = team2_names
-                                            email_body += f"Winners: {' & '.join(team2_names)}\n"
-                                        
-                                        match_description = f"{' & '.join(team1_names)} vs {' & '.join(team2_names)} (Winners: {' & '.join(winner_team_names)})"
-                                        
-                                        # Send to all team members
-                                        recipients = []
-                                        if 'team1_player1_email' in match_details and match_details['team1_player1_email']:
-                                            recipients.append(match_details['team1_player1_email'])
-                                        if 'team1_player2_email' in match_details and match_details['team1_player2_email']:
-                                            recipients.append(match_details['team1_player2_email'])
-                                        if 'team2_player1_email' in match_details and match_details['team2_player1_email']:
-                                            recipients.append(match_details['team2_player1_email'])
-                                        if 'team2_player2_email' in match_details and match_details['team2_player2_email']:
-                                            recipients.append(match_details['team2_player2_email'])
-                                    
-                                    email_body += email_footer
-                                    
-                                    # Add to review list
-                                    if recipients:
-                                        emails_to_review.append({
-                                            'match_id': match_id,
-                                            'recipients': recipients,
-                                            'subject': email_subject,
-                                            'body': email_body,
-                                            'match_description': match_description
-                                        })
+                            try:
+                                # Render every selected match in one pass from a single joined query
+                                winner_frame = get_notification_frame(selected_matches)
+                                rendered, render_seconds = render_notifications(winner_frame, winner_template,
+                                                                                per_recipient=personalise_winner_emails)
+                                winners = winner_frame.set_index('id')
+                                rendered['match_description'] = (rendered['match_description'] + " ("
+                                                                 + rendered['id'].map(winners['winner_label']) + ": "
+                                                                 + rendered['id'].map(winners['winner_names']) + ")")
+                                emails_to_review = rendered.rename(columns={'id': 'match_id'}).to_dict('records')
+                                st.session_state.winner_render_seconds = render_seconds
+                            except ValueError as e:
+                                emails_to_review = []
+                                st.error(f"❌ {str(e)}")
                             
                             # Store in session state
                             st.session_state.winner_emails_to_review = emails_to_review
@@ -4668,6 +3897,7 @@ with tab8:
                         total_emails = len(st.session_state.winner_emails_to_review)
                         total_recipients = sum(len(email['recipients']) for email in st.session_state.winner_emails_to_review)
                         st.markdown(f"**Total emails to be sent:** {total_emails} (to {total_recipients} recipients)")
+                        st.caption(f"⏱️ Rendered {total_emails} emails in {st.session_state.get('winner_render_seconds', 0) * 1000:.1f} ms")
                         
                         # List all matches
                         with st.expander("View all matches", expanded=False):
@@ -4678,13 +3908,13 @@ with tab8:
                         col1, col2, col3 = st.columns(3)
                         with col1:
                             if st.button("📤 Confirm and Send Emails", key="confirm_winner_emails"):
-                                with st.spinner("Sending emails..."):
+                                with st.spinner("Sending emails..."), app_email_session():
                                     success_count = 0
                                     fail_count = 0
                                     
                                     for email_data in st.session_state.winner_emails_to_review:
                                         try:
-                                            if send_outlook_email(email_data['recipients'], email_data['subject'], email_data['body']):
+                                            if send_outlook_email(email_data['recipients'], email_data['subject'], email_data['body'], html_body=email_data.get('html_body')):
                                                 success_count += 1
                                             else:
                                                 fail_count += 1
@@ -4714,7 +3944,7 @@ with tab8:
                             open_outlook = st.checkbox("Open Outlook after creating drafts", value=True, key="winner_open_outlook")
                             
                             if st.button("📝 Save as Drafts in Outlook", key="save_winner_drafts"):
-                                with st.spinner("Saving emails as drafts..."):
+                                with st.spinner("Saving emails as drafts..."), app_email_session():
                                     success_count = 0
                                     fail_count = 0
                                     
@@ -4825,7 +4055,7 @@ with tab8:
         st.write("Send a custom email to selected participants.")
         
         # Get participants
-        participants_df = get_participants()
+        participants_df = get_participants(st.session_state.selected_game)
         
         if participants_df.empty:
             st.info("No participants found. Add participants first.")
@@ -4893,12 +4123,36 @@ with tab8:
                         key="custom_email_body"
                     )
                     
+                    personalise_custom_email = st.checkbox(
+                        "Send a personalised email to each participant",
+                        value=False,
+                        key="custom_email_personalise",
+                        help="Send one email per recipient, filling placeholders such as {name}, {emp_id}, {category}, {location} and {slot}"
+                    )
+                    
+                    # Compile the template once for the preview and the review
+                    custom_template = None
+                    if personalise_custom_email:
+                        try:
+                            custom_template = EmailTemplate(email_subject, email_body)
+                        except ValueError as e:
+                            st.error(f"❌ Invalid email template: {str(e)}")
+                    
                     # Preview section
                     with st.expander("📝 Preview Email", expanded=False):
                         st.subheader("Email Preview")
-                        st.write(f"**Subject:** {email_subject}")
-                        st.write("**Body:**")
-                        st.text(email_body)
+                        if custom_template:
+                            try:
+                                preview = custom_template.render(filtered_participants[filtered_participants['id'] == selected_participants[0]])
+                                st.write(f"**Subject:** {preview.iloc[0]['subject']}")
+                                st.write("**Body:**")
+                                st.text(preview.iloc[0]['body'])
+                            except ValueError as e:
+                                st.error(f"❌ {str(e)}")
+                        else:
+                            st.write(f"**Subject:** {email_subject}")
+                            st.write("**Body:**")
+                            st.text(email_body)
                         
                         # Show recipients
                         selected_emails = filtered_participants[filtered_participants['id'].isin(selected_participants)]['email'].tolist()
@@ -4915,7 +4169,8 @@ with tab8:
                         st.session_state.show_custom_review = False
                     
                     # Preview button
-                    if st.button("📝 Review Email Before Sending", key="review_custom_email"):
+                    if st.button("📝 Review Email Before Sending", key="review_custom_email",
+                                 disabled=personalise_custom_email and custom_template is None):
                         with st.spinner("Preparing email for review..."):
                             # Get recipient emails
                             selected_emails = filtered_participants[filtered_participants['id'].isin(selected_participants)]['email'].tolist()
@@ -4924,13 +4179,29 @@ with tab8:
                             # Filter out empty emails
                             valid_emails = [email for email in selected_emails if email and isinstance(email, str)]
                             
+                            messages = []
+                            if valid_emails and custom_template:
+                                try:
+                                    # Render one email per recipient in a single pass
+                                    started = time.perf_counter()
+                                    recipients_frame = filtered_participants[filtered_participants['id'].isin(selected_participants)
+                                                                             & filtered_participants['email'].isin(valid_emails)]
+                                    rendered = custom_template.render(recipients_frame)
+                                    messages = [{'recipients': [email], 'subject': subject, 'body': body}
+                                                for email, subject, body in zip(recipients_frame['email'], rendered['subject'], rendered['body'])]
+                                    st.caption(f"⏱️ Rendered {len(messages)} emails in {(time.perf_counter() - started) * 1000:.1f} ms")
+                                except ValueError as e:
+                                    valid_emails = []
+                                    st.error(f"❌ {str(e)}")
+                            
                             if valid_emails:
                                 # Store in session state
                                 st.session_state.custom_email_to_review = {
                                     'recipients': valid_emails,
-                                    'subject': email_subject,
-                                    'body': email_body,
-                                    'recipient_names': selected_names
+                                    'subject': messages[0]['subject'] if messages else email_subject,
+                                    'body': messages[0]['body'] if messages else email_body,
+                                    'recipient_names': selected_names,
+                                    'messages': messages
                                 }
                                 st.session_state.show_custom_review = True
                             else:
@@ -4950,6 +4221,8 @@ with tab8:
                         
                         # Show summary
                         st.markdown(f"**Total recipients:** {len(email_data['recipients'])}")
+                        if email_data.get('messages'):
+                            st.caption(f"Each recipient receives a personalised copy ({len(email_data['messages'])} emails); the preview shows the first.")
                         
                         # List recipients
                         with st.expander("View all recipients", expanded=False):
@@ -4964,14 +4237,25 @@ with tab8:
                         col1, col2, col3 = st.columns(3)
                         with col1:
                             if st.button("📤 Confirm and Send Email", key="confirm_custom_email"):
-                                with st.spinner("Sending emails..."):
-                                    try:
-                                        if send_outlook_email(email_data['recipients'], email_data['subject'], email_data['body']):
-                                            st.success(f"✅ Successfully sent emails to {len(email_data['recipients'])} participants")
-                                        else:
-                                            st.error("❌ Failed to send emails")
-                                    except Exception as e:
-                                        st.error(f"Error sending emails: {str(e)}")
+                                with st.spinner("Sending emails..."), app_email_session():
+                                    # Personalised emails go out one per recipient, otherwise one email to everyone
+                                    messages = email_data.get('messages') or [email_data]
+                                    sent_count = 0
+                                    fail_count = 0
+                                    for message in messages:
+                                        try:
+                                            if send_outlook_email(message['recipients'], message['subject'], message['body']):
+                                                sent_count += len(message['recipients'])
+                                            else:
+                                                fail_count += 1
+                                        except Exception as e:
+                                            st.error(f"Error sending emails: {str(e)}")
+                                            fail_count += 1
+                                    
+                                    if sent_count > 0:
+                                        st.success(f"✅ Successfully sent emails to {sent_count} participants")
+                                    if fail_count > 0:
+                                        st.error(f"❌ Failed to send {fail_count} emails")
                                     
                                     # Clear review state
                                     st.session_state.show_custom_review = False
@@ -4992,7 +4276,7 @@ with tab8:
                             open_outlook = st.checkbox("Open Outlook after creating drafts", value=True, key="custom_open_outlook")
                             
                             if st.button("📝 Save as Draft in Outlook", key="save_custom_draft"):
-                                with st.spinner("Saving email as draft..."):
+                                with st.spinner("Saving email as draft..."), app_email_session():
                                     success_count = 0
                                     fail_count = 0
                                     
@@ -5004,7 +4288,25 @@ with tab8:
                                     else:
                                         batch_size = 0  # No batching
                                     
-                                    if batch_size > 0 and len(email_data['recipients']) > batch_size:
+                                    if email_data.get('messages'):
+                                        # Personalised emails are saved as one draft per recipient
+                                        batch_size = 0
+                                        for i, message in enumerate(email_data['messages']):
+                                            try:
+                                                if send_outlook_email(
+                                                    message['recipients'],
+                                                    message['subject'],
+                                                    message['body'],
+                                                    draft_only=True,
+                                                    open_outlook=open_outlook and i == 0  # Only open on first draft
+                                                ):
+                                                    success_count += 1
+                                                else:
+                                                    fail_count += 1
+                                            except Exception as e:
+                                                st.error(f"Error saving draft for {message['recipients'][0]}: {str(e)}")
+                                                fail_count += 1
+                                    elif batch_size > 0 and len(email_data['recipients']) > batch_size:
                                         # Split recipients into batches
                                         recipient_batches = [email_data['recipients'][i:i+batch_size] 
                                                             for i in range(0, len(email_data['recipients']), batch_size)]
@@ -5046,6 +4348,8 @@ with tab8:
                                     if batch_size > 0 and success_count > 0:
                                         st.success(f"✅ Successfully saved {success_count} email drafts in Outlook")
                                         st.info(f"Recipients were split into {success_count} batches for easier management.")
+                                    elif email_data.get('messages') and success_count > 0:
+                                        st.success(f"✅ Successfully saved {success_count} personalised email drafts")
                                     elif success_count > 0:
                                         st.success(f"✅ Successfully saved email as draft in Outlook")
                                         st.info("Please open Outlook to review and send the draft email.")
@@ -5063,10 +4367,84 @@ with tab8:
                                 st.session_state.custom_email_to_review = None
                                 st.info("Email sending cancelled.")
                                 st.rerun()
+                        
+                        # Throttled, resumable delivery for large recipient lists
+                        with st.expander("🚦 Send as a rate-limited job", expanded=len(email_data['recipients']) > 50):
+                            st.write("Jobs are saved in the database and sent at a steady rate. If the run stops (closed tab, restart, relay error) it can be resumed from the Send Jobs list below without resending what already went out.")
+                            job_col1, job_col2, job_col3 = st.columns(3)
+                            with job_col1:
+                                job_rate = st.number_input("Messages per minute", min_value=1, max_value=600,
+                                                           value=int(EMAIL_RATE_PER_MINUTE), key="custom_job_rate")
+                            with job_col2:
+                                job_burst = st.number_input("Burst", min_value=1, max_value=100,
+                                                            value=EMAIL_RATE_BURST, key="custom_job_burst")
+                            with job_col3:
+                                job_batch_size = st.selectbox("Recipients per email", [1, 10, 50, 100], index=2,
+                                                              key="custom_job_batch_size",
+                                                              disabled=bool(email_data.get('messages')))
+                            job_draft_only = st.checkbox("Save as drafts instead of sending", value=False, key="custom_job_draft_only")
+                            
+                            if st.button("🚀 Start Send Job", key="start_custom_job"):
+                                # Personalised emails are already one message per recipient
+                                messages = email_data.get('messages') or split_into_batches(
+                                    email_data['recipients'], email_data['subject'], email_data['body'],
+                                    job_batch_size, names=email_data['recipient_names'])
+                                job_id = create_send_job(email_data['subject'], messages, rate_per_minute=job_rate,
+                                                         burst=job_burst, draft_only=job_draft_only)
+                                st.session_state.show_custom_review = False
+                                st.session_state.custom_email_to_review = None
+                                
+                                job_progress = st.progress(0.0, text=f"Job #{job_id}: starting...")
+                                job = run_send_job(job_id, progress_callback=lambda job: job_progress.progress(
+                                    job['sent_batches'] / max(job['total_batches'], 1),
+                                    text=f"Job #{job['id']}: {job['sent_batches']}/{job['total_batches']} emails sent, {job['failed_batches']} failed"))
+                                if job['status'] == 'completed':
+                                    st.success(f"✅ Job #{job_id} completed: {job['sent_recipients']} recipients in {job['sent_batches']} emails")
+                                else:
+                                    st.warning(f"⚠️ Job #{job_id} {job['status']}: {job['last_error'] or 'not finished'}. Resume it from the Send Jobs list.")
                 else:
                     st.info("Please select at least one participant to email.")
+        
+        # Bulk send jobs (resumable after a crash or closed tab)
+        with st.expander("📬 Send Jobs", expanded=False):
+            send_jobs = get_send_jobs()
+            if send_jobs.empty:
+                st.info("No send jobs yet.")
+            else:
+                st.dataframe(send_jobs, use_container_width=True, hide_index=True)
+                
+                unfinished_jobs = send_jobs[send_jobs['status'].isin(['pending', 'running', 'paused'])]
+                if not unfinished_jobs.empty:
+                    resume_job_id = st.selectbox(
+                        "Unfinished job:",
+                        unfinished_jobs['id'].tolist(),
+                        format_func=lambda x: f"#{x} - {unfinished_jobs[unfinished_jobs['id'] == x].iloc[0]['name']} ({unfinished_jobs[unfinished_jobs['id'] == x].iloc[0]['status']})",
+                        key="resume_job_id"
+                    )
+                    resume_col1, resume_col2 = st.columns(2)
+                    with resume_col1:
+                        if st.button("▶️ Resume Job", key="resume_send_job"):
+                            job_progress = st.progress(0.0, text=f"Job #{resume_job_id}: resuming...")
+                            job = run_send_job(resume_job_id, progress_callback=lambda job: job_progress.progress(
+                                job['sent_batches'] / max(job['total_batches'], 1),
+                                text=f"Job #{job['id']}: {job['sent_batches']}/{job['total_batches']} emails sent, {job['failed_batches']} failed"))
+                            if job['status'] == 'completed':
+                                st.success(f"✅ Job #{resume_job_id} completed")
+                            elif job['status'] == 'running':
+                                st.info(f"ℹ️ Job #{resume_job_id} is being sent by another session. It can be resumed here if that session stops.")
+                            else:
+                                st.warning(f"⚠️ Job #{resume_job_id} {job['status']}: {job['last_error'] or 'not finished'}")
+                    with resume_col2:
+                        if st.button("🛑 Cancel Job", key="cancel_send_job"):
+                            cancel_send_job(resume_job_id)
+                            st.rerun()
+
+if active_section == "tracker":
+    # Tournament Tracker (placeholder; the tab had no content yet)
+    st.subheader("📋 Tournament Tracker")
+    st.info("Tournament tracker view coming soon!")
 
-with tab10:
+if active_section == "email":
     # Email Notifications tab
     st.subheader("📧 Email Notifications")
     st.write("This tab allows you to send custom email notifications to tournament participants.")
@@ -5074,6 +4452,62 @@ with tab10:
     # Add your email notification functionality here
     st.info("Use this tab to send custom email notifications to participants.")
 
+# Performance panel: database activity of the rerun that just ran
+st.sidebar.toggle("⏱️ Performance panel", key="perf_panel",
+                  help="Profile database queries, connection opens and timings on every rerun of this session")
+if perf_profile is not None:
+    finish_rerun(st.session_state, perf_profile)
+    if st.session_state.get("perf_panel"):
+        with st.sidebar:
+            perf_summary = perf_profile.summary()
+            st.markdown("### ⏱️ Performance")
+            perf_col1, perf_col2 = st.columns(2)
+            perf_col1.metric("Rerun", f"{perf_summary['total_ms']:.0f} ms")
+            perf_col2.metric("Queries", perf_summary['queries'])
+            perf_col1.metric("Query time", f"{perf_summary['query_ms']:.0f} ms")
+            perf_col2.metric("Connections", perf_summary['connections'])
+            st.caption(f"{perf_summary['rows']} rows fetched · {SECTIONS.get(perf_profile.section, '')}")
+            st.dataframe(pd.DataFrame(perf_profile.spans).round(1), hide_index=True, use_container_width=True)
+
+            slow_queries = perf_profile.slow_queries()
+            if slow_queries:
+                st.warning(f"🐢 {len(slow_queries)} queries took {SLOW_QUERY_MS:.0f} ms or more")
+                for query in slow_queries[:5]:
+                    st.caption(f"{query['ms']:.0f} ms · {query['rows']} rows · {query['source']}")
+                    st.code(" ".join(query['sql'].split())[:500], language="sql")
+
+            repeated_queries = perf_profile.repeated_queries()
+            if repeated_queries:
+                st.warning(f"🔁 {len(repeated_queries)} statements repeated in one rerun (possible N+1)")
+                for group in repeated_queries[:5]:
+                    st.caption(f"{group['count']}× · {group['ms']:.0f} ms total · {', '.join(group['sources'][:3])}")
+                    st.code(group['sql'][:500], language="sql")
+
+            with st.expander("All queries"):
+                if perf_profile.queries:
+                    queries_df = pd.DataFrame(perf_profile.queries)
+                    queries_df['sql'] = queries_df['sql'].map(lambda sql: " ".join(sql.split())[:200])
+                    st.dataframe(queries_df.sort_values('ms', ascending=False).round(2),
+                                 hide_index=True, use_container_width=True)
+                else:
+                    st.write("No queries ran.")
+
+            with st.expander("DataFrame memory"):
+                st.caption("Participant and match frames as loaded from SQLite and with their compact dtypes")
+                if st.button("Measure", key="measure_frame_memory"):
+                    memory_report = get_memory_report()
+                    for frame in ("participants", "matches"):
+                        total = memory_report[(memory_report['frame'] == frame) & (memory_report['column'] == '(total)')].iloc[0]
+                        st.caption(f"{frame}: {total['untyped_bytes'] / 1e6:.1f} MB → {total['typed_bytes'] / 1e6:.1f} MB")
+                    st.dataframe(memory_report, hide_index=True, use_container_width=True)
+
+            with st.expander("Recent reruns"):
+                recent_reruns = read_log(limit=20)
+                if recent_reruns:
+                    st.dataframe(pd.DataFrame(recent_reruns)[['started_at', 'section', 'status', 'total_ms', 'queries',
+                                                              'query_ms', 'connections']],
+                                 hide_index=True, use_container_width=True)
+
 # Main execution
 if __name__ == "__main__":
     # Initialize database
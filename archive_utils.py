@@ -0,0 +1,294 @@
+import os
+import sys
+import time
+import argparse
+import threading
+
+from db_utils import connect, get_database
+from tournaments_utils import use_current_tournament, use_database
+from events_utils import record_event
+from scores_utils import rebuild_player_stats
+from summary_utils import rebuild_summary_tables
+
+# Tables a reset can archive, in compaction order (rows that reference participants go first)
+ARCHIVABLE_TABLES = ("fixtures", "matches", "participants")
+
+# Participant ID columns of matches and fixtures; an archived participant still named in an
+# active row stays in the tournament file so that row keeps resolving the name
+_PARTICIPANT_REFERENCES = {
+    "matches": ("player1_id", "player2_id", "team1_player1_id", "team1_player2_id",
+                "team2_player1_id", "team2_player2_id", "winner_id"),
+    "fixtures": ("player1_id", "player2_id", "team1_player1_id", "team1_player2_id",
+                 "team2_player1_id", "team2_player2_id"),
+}
+
+# Child rows that move to the archive with their parent rows: table -> (child table, key column)
+_ARCHIVED_CHILDREN = {"matches": ("match_sets", "match_id")}
+
+# Rows moved per compaction transaction, and free pages returned to the OS after each one.
+# Small batches keep every write lock short, so the app stays responsive while compaction runs.
+COMPACTION_BATCH_SIZE = 2000
+VACUUM_PAGES_PER_BATCH = 500
+
+# One compaction at a time per process
+_compaction_lock = threading.Lock()
+
+
+def archive_path_for(db_path):
+    """Archive database next to a tournament file, e.g. tournament.db -> tournament_archive.db"""
+    root, ext = os.path.splitext(db_path)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def archive_rows(tables, reason="reset", conn=None):
+    """
+    Archive every active row of the given tables, the fast replacement for DELETE FROM.
+
+    One UPDATE per table flips archived to 1. The change feed, summary and player stats
+    triggers skip archived rows, so nothing runs per row; the summaries and player stats
+    are rebuilt from the remaining active rows and a single "reset" event is logged.
+    Archived participants lose their doubles teams. Matches and fixtures that still
+    name an archived participant keep their references (see compact_archived()).
+
+    Args:
+        tables (list): Any of "participants", "matches" and "fixtures"
+        reason (str): Recorded in the reset event's payload
+        conn (sqlite3.Connection, optional): Write inside the caller's transaction
+
+    Returns:
+        dict: Rows archived per table
+    """
+    unknown = [table for table in tables if table not in ARCHIVABLE_TABLES]
+    if unknown:
+        raise ValueError(f"Cannot archive {', '.join(unknown)}")
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(get_database(), timeout=30)
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        counts = {}
+        for table in ARCHIVABLE_TABLES:
+            if table in tables:
+                counts[table] = conn.execute(f"UPDATE {table} SET archived = 1 WHERE archived = 0").rowcount
+        if counts.get('participants'):
+            conn.execute("DELETE FROM teams WHERE player1_id IN (SELECT id FROM participants WHERE archived = 1) "
+                         "OR player2_id IN (SELECT id FROM participants WHERE archived = 1)")
+        rebuild_summary_tables(conn)
+        if counts.get('matches'):
+            rebuild_player_stats(conn)
+        record_event('reset', 'tournament', payload={'reason': reason, 'archived': counts}, conn=conn)
+        if own_conn:
+            conn.commit()
+        return counts
+    except Exception:
+        if own_conn:
+            conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def get_archive_status(db_path=None):
+    """
+    Archived rows still in the tournament file, waiting for compaction.
+
+    Returns:
+        dict: archived (rows per table), archive_path, archive_bytes, running (whether a
+              compaction is in progress in this process) and incremental_vacuum (whether
+              compaction can give space back; see enable_incremental_vacuum())
+    """
+    db_path = db_path or get_database()
+    conn = connect(db_path)
+    archived = {table: conn.execute(f"SELECT COUNT(*) FROM {table} WHERE archived = 1").fetchone()[0]
+                for table in ARCHIVABLE_TABLES}
+    incremental_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    conn.close()
+    archive_path = archive_path_for(db_path)
+    return {
+        'archived': archived,
+        'archive_path': archive_path,
+        'archive_bytes': os.path.getsize(archive_path) if os.path.exists(archive_path) else 0,
+        'running': _compaction_lock.locked(),
+        'incremental_vacuum': incremental_vacuum,
+    }
+
+
+def _referenced_participants(conn):
+    """IDs of participants named by an active match or fixture"""
+    referenced = set()
+    for table, columns in _PARTICIPANT_REFERENCES.items():
+        for column in columns:
+            referenced.update(row[0] for row in conn.execute(
+                f"SELECT DISTINCT {column} FROM main.{table} WHERE archived = 0 AND {column} IS NOT NULL"))
+    return referenced
+
+
+def _prepare_archive_table(conn, table):
+    """Create or widen archive.<table> to hold every column of main.<table>; returns the column list"""
+    columns = [row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")]
+    conn.execute(f"CREATE TABLE IF NOT EXISTS archive.{table} AS SELECT * FROM main.{table} WHERE 0")
+    archive_columns = {row[1] for row in conn.execute(f"PRAGMA archive.table_info({table})")}
+    for column in columns:
+        if column not in archive_columns:
+            conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {column}")
+    return columns
+
+
+def _incremental_vacuum(conn, pages=None):
+    # executescript() steps the pragma to completion; execute() would free a single page
+    conn.executescript(f"PRAGMA main.incremental_vacuum{f'({int(pages)})' if pages else ''};")
+
+
+def enable_incremental_vacuum(db_path=None):
+    """
+    Switch a tournament file created before incremental auto-vacuum over to it.
+
+    A one-off maintenance step: the conversion is a full VACUUM, which rewrites the
+    whole file and blocks writers until it finishes, so run it while nobody is
+    entering results. New files start with incremental auto-vacuum (see init_database()).
+
+    Returns:
+        bool: True when the file was converted, False when it already used incremental auto-vacuum
+    """
+    conn = connect(db_path or get_database(), timeout=30)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    finally:
+        conn.close()
+
+
+def compact_archived(db_path=None, batch_size=COMPACTION_BATCH_SIZE, progress_callback=None, should_stop=None):
+    """
+    Move archived rows into the archive database and give their space back, in small batches.
+
+    Each batch copies up to batch_size rows (matches with their sets) into
+    <tournament>_archive.db, deletes them from the tournament file in the same
+    transaction, then frees pages with PRAGMA incremental_vacuum. Archived participants
+    that an active match or fixture still names are kept. Safe to stop and run again
+    at any point.
+
+    Compaction never runs a full VACUUM. A file created before incremental auto-vacuum
+    keeps its freed pages for reuse until enable_incremental_vacuum() converts it.
+
+    Args:
+        db_path (str, optional): Tournament file (default: get_database())
+        batch_size (int): Rows moved per transaction
+        progress_callback (callable, optional): Called as progress_callback(table, moved_so_far) after each batch
+        should_stop (callable, optional): Returns True to stop after the current batch
+
+    Returns:
+        dict: Rows moved per table
+    """
+    db_path = db_path or get_database()
+    moved = {table: 0 for table in ARCHIVABLE_TABLES}
+    conn = connect(db_path, timeout=30)
+    try:
+        conn.execute("ATTACH DATABASE ? AS archive", (os.path.abspath(archive_path_for(db_path)),))
+        for table in ARCHIVABLE_TABLES:
+            columns = ", ".join(_prepare_archive_table(conn, table))
+            child = _ARCHIVED_CHILDREN.get(table)
+            if child is not None:
+                child_columns = ", ".join(_prepare_archive_table(conn, child[0]))
+            keep = _referenced_participants(conn) if table == "participants" else set()
+            last_id = 0
+            while not (should_stop is not None and should_stop()):
+                ids = [row[0] for row in conn.execute(
+                    f"SELECT id FROM main.{table} WHERE archived = 1 AND id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size))]
+                if not ids:
+                    break
+                last_id = ids[-1]
+                ids = [row_id for row_id in ids if row_id not in keep]
+                if not ids:
+                    continue
+                marks = ", ".join("?" * len(ids))
+                conn.execute("BEGIN IMMEDIATE")
+                if child is not None:
+                    conn.execute(f"INSERT INTO archive.{child[0]} ({child_columns}) "
+                                 f"SELECT {child_columns} FROM main.{child[0]} WHERE {child[1]} IN ({marks})", ids)
+                    conn.execute(f"DELETE FROM main.{child[0]} WHERE {child[1]} IN ({marks})", ids)
+                conn.execute(f"INSERT INTO archive.{table} ({columns}) "
+                             f"SELECT {columns} FROM main.{table} WHERE id IN ({marks})", ids)
+                conn.execute(f"DELETE FROM main.{table} WHERE id IN ({marks})", ids)
+                conn.commit()
+                _incremental_vacuum(conn, VACUUM_PAGES_PER_BATCH)
+                moved[table] += len(ids)
+                if progress_callback is not None:
+                    progress_callback(table, moved[table])
+
+        if any(moved.values()):
+            record_event('archive_compacted', 'tournament', payload={'moved': moved}, conn=conn)
+            conn.commit()
+        conn.execute("DETACH DATABASE archive")
+        _incremental_vacuum(conn)
+        return moved
+    finally:
+        conn.close()
+
+
+def start_compaction(db_path=None, **kwargs):
+    """
+    Run compact_archived() on a background thread (e.g. right after a reset).
+
+    Returns:
+        threading.Thread: The started thread, or None when a compaction is already running
+    """
+    if not _compaction_lock.acquire(blocking=False):
+        return None
+    db_path = db_path or get_database()
+
+    def run():
+        try:
+            compact_archived(db_path, **kwargs)
+        except Exception as e:
+            print(f"Archive compaction of {db_path} failed: {str(e)}")
+        finally:
+            _compaction_lock.release()
+
+    thread = threading.Thread(target=run, name="archive-compaction", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    """Command line entry point: show archived rows, compact them into the archive database or enable incremental vacuum"""
+    parser = argparse.ArgumentParser(description="Move archived tournament rows into the archive database")
+    parser.add_argument("--db", help="Tournament database path (default: the current tournament)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="Count archived rows waiting for compaction")
+    compact_parser = subparsers.add_parser("compact", help="Move archived rows out and vacuum incrementally")
+    compact_parser.add_argument("--batch-size", type=int, default=COMPACTION_BATCH_SIZE)
+    subparsers.add_parser("vacuum", help="Convert an older file to incremental auto-vacuum (one full VACUUM)")
+    args = parser.parse_args(argv)
+    if args.db:
+        use_database(args.db)
+    else:
+        use_current_tournament()
+
+    if args.command == "status":
+        status = get_archive_status()
+        for table, count in status['archived'].items():
+            print(f"{table:<13} {count} archived")
+        print(f"archive       {status['archive_path']} ({status['archive_bytes']} bytes)")
+        print(f"auto-vacuum   {'incremental' if status['incremental_vacuum'] else 'off (run the vacuum command once)'}")
+    elif args.command == "vacuum":
+        start = time.perf_counter()
+        if enable_incremental_vacuum():
+            print(f"Converted to incremental auto-vacuum in {time.perf_counter() - start:.1f}s")
+        else:
+            print("Already uses incremental auto-vacuum")
+    else:
+        start = time.perf_counter()
+        moved = compact_archived(batch_size=args.batch_size,
+                                 progress_callback=lambda table, count: print(f"  {table}: {count} moved", flush=True))
+        print(f"Moved {sum(moved.values())} rows in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Fixture generation (time slots and pairing) for singles and doubles categories"""
+from datetime import datetime
+
+import pytest
+
+from fixtures_utils import assign_participants_to_slots, generate_time_slots
+from teams_utils import pair_partners
+from tournament_service import get_participants
+
+START_TIME = datetime(2024, 1, 15, 9, 0)
+END_TIME = datetime(2024, 1, 15, 18, 0)
+
+
+def generate(participants_df, category):
+    time_slots = generate_time_slots(START_TIME, END_TIME, 30, 8)
+    return assign_participants_to_slots(participants_df, time_slots, category, "Main Hall")
+
+
+@pytest.mark.parametrize("category", ["Men's Singles", "Mixed Doubles"])
+def test_generate_fixtures(benchmark, tournament, category):
+    participants_df = get_participants()
+    fixtures = benchmark.pedantic(generate, args=(participants_df, category), rounds=3)
+    assert fixtures
+
+
+def doubles_entrants(count):
+    """(id, emp_id, partner_emp_id) for `count` entrants: mostly mutual pairs, with some
+    one-sided claims, claims on an already paired player and unknown partners"""
+    entrants = []
+    for i in range(0, count - 1, 2):
+        first, second = f"E{i:06d}", f"E{i + 1:06d}"
+        kind = i // 2 % 20
+        if kind == 0:
+            entrants += [(i, first, second), (i + 1, second, "")]
+        elif kind == 1:
+            entrants += [(i, first, f"E{i - 2:06d}"), (i + 1, second, "UNKNOWN")]
+        else:
+            entrants += [(i, first, second), (i + 1, second, first)]
+    return entrants
+
+
+@pytest.mark.parametrize("count", [10000, 100000])
+def test_pair_partners(benchmark, count):
+    entrants = doubles_entrants(count)
+    result = benchmark(pair_partners, entrants)
+    assert len(result['pairs']) * 2 + len(result['orphans']) == len(entrants)
@@ -0,0 +1,29 @@
+"""Loading and rendering match and fixture notification emails"""
+from email_templates import (EmailTemplate, FIXTURE_DETAILS, FIXTURE_SLOT_BODY, FIXTURE_SLOT_SUBJECT, WINNER_DETAILS,
+                             get_fixture_notification_frame, get_notification_frame, render_notifications)
+
+WINNER_TEMPLATE = EmailTemplate("Tournament Results: {category}",
+                                "Dear {recipient_name},\n\n" + WINNER_DETAILS + "\nTournament Committee")
+FIXTURE_TEMPLATE = EmailTemplate("Tournament: Your {category} Match",
+                                 "Dear {recipient_name},\n\n" + FIXTURE_DETAILS + "\nTournament Committee")
+FIXTURE_SLOT_TEMPLATE = EmailTemplate(FIXTURE_SLOT_SUBJECT, FIXTURE_SLOT_BODY)
+
+
+def test_load_match_notifications(benchmark, tournament):
+    benchmark(get_notification_frame)
+
+
+def test_render_match_notifications(benchmark, tournament):
+    frame = get_notification_frame()
+    benchmark(render_notifications, frame, FIXTURE_TEMPLATE)
+
+
+def test_render_winner_notifications_per_recipient(benchmark, tournament):
+    frame = get_notification_frame()
+    frame = frame[frame['match_status'] == 'completed']
+    benchmark(render_notifications, frame, WINNER_TEMPLATE, per_recipient=True)
+
+
+def test_render_fixture_notifications_per_recipient(benchmark, tournament):
+    frame = get_fixture_notification_frame()
+    benchmark(render_notifications, frame, FIXTURE_SLOT_TEMPLATE, per_recipient=True)
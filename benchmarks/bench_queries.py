@@ -0,0 +1,34 @@
+"""Read paths behind the dashboard, match list, fixtures, bracket and leaderboard views"""
+from fixtures_utils import get_all_fixtures
+from scores_utils import get_leaderboard
+from tournament_service import get_bracket, get_matches, get_participants, search_participants
+
+
+def test_get_participants(benchmark, tournament):
+    benchmark(get_participants)
+
+
+def test_get_matches(benchmark, tournament):
+    benchmark(get_matches)
+
+
+def test_get_matches_latest_page(benchmark, tournament):
+    benchmark(get_matches, limit=50)
+
+
+def test_get_all_fixtures(benchmark, tournament):
+    benchmark(get_all_fixtures)
+
+
+def test_search_participants(benchmark, tournament):
+    participants_df = get_participants()
+    benchmark(search_participants, "sharma", participants_df)
+
+
+def test_get_bracket(benchmark, tournament):
+    # Sample participants are spread evenly, so any category gives a representative bracket
+    benchmark(get_bracket, "Men's Singles")
+
+
+def test_get_leaderboard(benchmark, tournament):
+    benchmark(get_leaderboard, "Badminton", "Men's Singles")
@@ -0,0 +1,54 @@
+"""Registration Desk view, bulk Excel import and the admin reset"""
+import shutil
+
+import pytest
+
+from archive_utils import archive_rows
+from tournament_service import get_participants, get_registration_desk_view, import_participants, init_database
+
+IMPORT_COLUMNS = ['emp_id', 'name', 'email', 'category', 'location', 'sub_location', 'game', 'slot',
+                  'partner_emp_id', 'gender', 'partner_gender', 'registered_at_desk']
+
+
+def test_registration_desk_view(benchmark, tournament):
+    participants_df = get_participants()
+    benchmark(get_registration_desk_view, participants_df, "Carrom")
+
+
+def test_registration_desk_search(benchmark, tournament):
+    participants_df = get_participants()
+    benchmark(get_registration_desk_view, participants_df, "Carrom", search_term="nair", status_filter="Not Reported")
+
+
+@pytest.fixture
+def import_frame(tournament_dir, monkeypatch):
+    """The generated participants as the Import tab would map them from a spreadsheet"""
+    monkeypatch.chdir(tournament_dir)
+    return get_participants()[IMPORT_COLUMNS].astype(object).fillna("")
+
+
+def test_import_participants(benchmark, import_frame, tmp_path, monkeypatch, tournament_size):
+    # Every round imports the whole frame into a fresh, empty database
+    monkeypatch.chdir(tmp_path)
+    benchmark.extra_info['participants'] = tournament_size
+
+    def fresh_database():
+        (tmp_path / "tournament.db").unlink(missing_ok=True)
+        init_database()
+
+    imported, skipped, errors = benchmark.pedantic(import_participants, args=(import_frame,), setup=fresh_database,
+                                                   rounds=3)
+    assert imported == len(import_frame) and not errors
+
+
+def test_reset_all_tournament_data(benchmark, tournament_dir, tmp_path, monkeypatch, tournament_size):
+    # Every round archives everything in a fresh copy of the generated tournament
+    monkeypatch.chdir(tmp_path)
+    benchmark.extra_info['participants'] = tournament_size
+
+    def fresh_copy():
+        shutil.copy(tournament_dir / "tournament.db", tmp_path / "tournament.db")
+
+    archived = benchmark.pedantic(archive_rows, args=(["participants", "matches", "fixtures"],), setup=fresh_copy,
+                                  rounds=3)
+    assert archived['participants'] > 0 and archived['matches'] > 0
@@ -0,0 +1,58 @@
+"""Result entry: 100 results saved one by one (match card buttons) or as one batch (result grid), and rating recomputes"""
+import shutil
+import sqlite3
+
+import pytest
+
+from ratings_utils import recompute_ratings
+from tournament_service import record_results, update_match_result
+
+RESULTS = 100
+
+
+@pytest.fixture
+def pending_results(tournament_dir, tmp_path, monkeypatch, tournament_size, benchmark):
+    """Up to RESULTS scheduled matches of a fresh copy of the tournament, each with a winner picked"""
+    monkeypatch.chdir(tmp_path)
+    benchmark.extra_info['participants'] = tournament_size
+    conn = sqlite3.connect(tournament_dir / "tournament.db")
+    rows = conn.execute('''
+        SELECT id, player1_id FROM matches
+        WHERE archived = 0 AND match_status = 'scheduled' AND (player1_id IS NOT NULL OR team1_player1_id IS NOT NULL)
+        ORDER BY id LIMIT ?
+    ''', (RESULTS,)).fetchall()
+    conn.close()
+    benchmark.extra_info['results'] = len(rows)
+    return [{'match_id': match_id, 'winner_id': player1_id} if player1_id is not None
+            else {'match_id': match_id, 'winner_team': 1} for match_id, player1_id in rows]
+
+
+def _fresh_copy(tournament_dir, tmp_path):
+    def setup():
+        shutil.copy(tournament_dir / "tournament.db", tmp_path / "tournament.db")
+    return setup
+
+
+def test_results_one_at_a_time(benchmark, pending_results, tournament_dir, tmp_path):
+    def save_each():
+        for result in pending_results:
+            update_match_result(result['match_id'], winner_id=result.get('winner_id'),
+                                winner_team=result.get('winner_team'))
+
+    benchmark.pedantic(save_each, setup=_fresh_copy(tournament_dir, tmp_path), rounds=3)
+
+
+def test_results_batch(benchmark, pending_results, tournament_dir, tmp_path):
+    saved = benchmark.pedantic(record_results, args=(pending_results,), setup=_fresh_copy(tournament_dir, tmp_path),
+                               rounds=3)
+    assert saved['completed'] == len(pending_results)
+
+
+def test_recompute_ratings(benchmark, tournament_dir, tmp_path, monkeypatch, tournament_size):
+    """Replay every completed match of the tournament (the only one in a fresh catalog)"""
+    monkeypatch.chdir(tmp_path)
+    benchmark.extra_info['participants'] = tournament_size
+    _fresh_copy(tournament_dir, tmp_path)()
+    counts = benchmark(recompute_ratings)
+    benchmark.extra_info['results'] = counts['results']
+    assert counts['tournaments'] == 1
@@ -0,0 +1,47 @@
+"""
+Fixtures shared by the benchmark suite.
+
+A sample tournament (see sample_data) is generated once per session for each
+size in BENCH_SIZES, in its own directory. Benchmarks run with that directory
+as the working directory, so the relative default database path (db_utils.get_database()) resolves to it.
+"""
+import os
+
+import pytest
+
+import sample_data
+from tournament_service import init_database
+
+# Participant counts to benchmark at, e.g. BENCH_SIZES=1000 for a quick run
+SIZES = [int(size) for size in os.environ.get("BENCH_SIZES", "1000,10000,100000").split(",") if size.strip()]
+# Fixed seed so every run (and the stored baseline) uses the same data
+SEED = 2024
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}p")
+def tournament_size(request):
+    """Number of participants in the generated tournament"""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def tournament_dir(tournament_size, tmp_path_factory):
+    """Directory holding a generated tournament.db"""
+    directory = tmp_path_factory.mktemp(f"tournament_{tournament_size}_")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        init_database()
+        sample_data.generate_tournament(tournament_size, seed=SEED)
+    finally:
+        os.chdir(cwd)
+    return directory
+
+
+@pytest.fixture
+def tournament(tournament_dir, tournament_size, monkeypatch, benchmark):
+    """Run the test against the generated tournament, which it must not modify"""
+    monkeypatch.chdir(tournament_dir)
+    benchmark.extra_info['participants'] = tournament_size
+    return tournament_dir
+
@@ -0,0 +1,127 @@
+"""
+Cold start import benchmark.
+
+Runs `python -X importtime` in fresh interpreters for two import sets and
+reports the median cumulative import time:
+
+- app: every top-level import of app.py (read with ast, so it follows the code)
+- modules: only the repository's own modules, as imported by the API, display
+  server and command line tools
+
+Heavy optional dependencies are loaded lazily (see import_utils.py); the
+benchmark fails when one of them is imported at startup again, or when a
+--budget-ms is given and the median exceeds it.
+
+    python benchmarks/importtime.py
+    python benchmarks/importtime.py --runs 10 --budget-ms 1500
+"""
+import os
+import re
+import ast
+import sys
+import argparse
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported at startup, per import set. Streamlit imports
+# plotly itself, so plotly is only checked for the repository's own modules.
+DEFERRED_MODULES = {
+    "app": ("openpyxl", "win32com", "pythoncom"),
+    "modules": ("openpyxl", "win32com", "pythoncom", "plotly"),
+}
+
+# import time: self [us] | cumulative | imported package
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def local_modules():
+    """Names of the repository's own top-level modules"""
+    return sorted(name[:-3] for name in os.listdir(REPO_DIR)
+                  if name.endswith(".py") and name != "app.py")
+
+
+def app_imports():
+    """The top-level import statements of app.py as source lines"""
+    with open(os.path.join(REPO_DIR, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def import_sets():
+    return {
+        "app": "\n".join(app_imports()),
+        "modules": "\n".join(f"import {name}" for name in local_modules()),
+    }
+
+
+def measure(source):
+    """
+    Import `source` in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: (total microseconds, {module: cumulative microseconds} for top-level imports,
+                set of every imported module name)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", source],
+                            cwd=REPO_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Import failed:\n{result.stderr[-2000:]}")
+
+    top_level = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if len(match.group(3)) == 1:
+            top_level[name] = int(match.group(2))
+    return sum(top_level.values()), top_level, imported
+
+
+def run_benchmark(name, source, runs):
+    """Measure one import set `runs` times; returns (median ms, slowest imports, deferred modules found)"""
+    totals = []
+    slowest = {}
+    imported = set()
+    for _ in range(runs):
+        total, top_level, imported = measure(source)
+        totals.append(total)
+        for module, cumulative in top_level.items():
+            slowest.setdefault(module, []).append(cumulative)
+
+    eager = sorted(module for module in imported
+                   if any(module == deferred or module.startswith(deferred + ".")
+                          for deferred in DEFERRED_MODULES[name]))
+    ranked = sorted(((statistics.median(values) / 1000, module) for module, values in slowest.items()), reverse=True)
+    return statistics.median(totals) / 1000, ranked, eager
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Measure cold start import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per import set")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the app import set's median exceeds this")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, source in import_sets().items():
+        median_ms, ranked, eager = run_benchmark(name, source, args.runs)
+        print(f"{name}: median {median_ms:.0f} ms over {args.runs} runs")
+        for ms, module in ranked[:args.top]:
+            print(f"  {ms:8.1f} ms  {module}")
+        if eager:
+            print(f"  FAIL: imported at startup: {', '.join(eager[:10])}")
+            failed = True
+        if name == "app" and args.budget_ms is not None and median_ms > args.budget_ms:
+            print(f"  FAIL: over budget of {args.budget_ms:.0f} ms")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
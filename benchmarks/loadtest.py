@@ -0,0 +1,355 @@
+"""
+Concurrent operator load test.
+
+Drives app.py headlessly with streamlit.testing's AppTest, one app session
+per simulated organiser, each in its own thread (as the Streamlit server runs
+each session's script in its own thread of one process). All sessions share
+one generated tournament database, so SQLite contention is the same as on
+event day. Sessions follow scripted workflows:
+
+- desk: search for a participant who has not reported yet and mark them reported
+- results: list scheduled matches and declare a winner
+- fixtures: browse fixtures with different category and round filters
+
+Every rerun is timed. The report gives p50/p95/p99 latency per action and
+counts "database is locked" errors and other failures, whether they were
+raised or shown with st.error(). The run fails when a rerun errors, a
+workflow stops early or a desk/results operator saves nothing, since
+latencies of sessions that never did their job measure nothing.
+
+    python benchmarks/loadtest.py --participants 10000 --desk 4 --results 3 --fixtures 3 --duration 120
+    python benchmarks/loadtest.py --db tournament.db --budget-p95-ms 2000
+
+The database is generated (or copied from --db) into a temporary directory,
+so an existing tournament is never modified.
+"""
+import os
+import re
+import sys
+import json
+import queue
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+from time import perf_counter, sleep
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import sample_data  # noqa: E402
+from db_utils import connect  # noqa: E402
+from tournament_service import init_database  # noqa: E402
+
+APP_PATH = os.path.join(REPO_DIR, "app.py")
+# The sidebar's default game; desk operators check in participants of this game
+GAME = "Carrom"
+# Fixed seed so runs at the same size use the same data
+SEED = 2024
+# Generated tournaments are early in round 1: half of its matches played and half of the
+# entrants reported, so desk operators have participants to check in (the desk lists no
+# one who has played) and results operators have matches to decide
+COMPLETION = 0.25
+REGISTERED = 0.5
+# A rerun slower than this is counted as a timeout
+RUN_TIMEOUT_SECONDS = 120
+
+# Result buttons on the Matches section, e.g. win1_12 or team2_win_12
+RESULT_BUTTON = re.compile(r"^(?:win[12]|team[12]_win)_(\d+)$")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of `values` (pct from 0 to 100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _is_lock_error(message):
+    return "locked" in message.lower()
+
+
+class Operator:
+    """One organiser's app session, recording the latency and errors of every rerun"""
+
+    def __init__(self, name, workflow, shared, seed, think_ms):
+        from streamlit.testing.v1 import AppTest
+
+        self.name = name
+        self.workflow = workflow
+        self.shared = shared
+        self.rng = random.Random(seed)
+        self.think_ms = think_ms
+        self.samples = []
+        self.writes = 0
+        # A fresh session that opens straight on the workflow's section: switching
+        # sections in-session carries the previous section's widget state over
+        self.at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT_SECONDS)
+        self.at.session_state['active_section'] = WORKFLOW_SECTIONS[workflow]
+
+    def run(self, action, element=None):
+        """
+        Rerun the script (after interacting with `element`, when given) and record it.
+
+        Returns:
+            bool: Whether the rerun finished without an exception, lock or error message
+        """
+        start = perf_counter()
+        try:
+            (element or self.at).run()
+            errors = [e.message for e in self.at.exception] + [str(e.value) for e in self.at.error]
+        except Exception as e:
+            errors = [f"{type(e).__name__}: {e}"]
+        ms = (perf_counter() - start) * 1000
+        locks = sum(1 for message in errors if _is_lock_error(message))
+        self.samples.append({'operator': self.name, 'workflow': self.workflow, 'action': action, 'ms': ms,
+                             'lock_errors': locks, 'errors': len(errors) - locks, 'messages': errors[:3]})
+        return not errors
+
+    def think(self):
+        if self.think_ms:
+            sleep(self.rng.uniform(0, self.think_ms) / 1000)
+
+    def write(self, action, element):
+        """Rerun after an interaction that saves something, counting it when it succeeds"""
+        if self.run(action, element):
+            self.writes += 1
+
+
+def desk_workflow(op, deadline):
+    """Look up the next pending participant by Employee ID and mark them reported"""
+    while perf_counter() < deadline:
+        op.think()
+        try:
+            participant_id, emp_id = op.shared['pending'].get_nowait()
+        except queue.Empty:
+            break
+        search = next(t for t in op.at.text_input if t.label.startswith("🔍 Search participants"))
+        if not op.run("desk_search", search.set_value(emp_id)):
+            continue
+        try:
+            button = op.at.button(key=f"mark_{participant_id}")
+        except KeyError:
+            # Reported or played meanwhile (e.g. by another desk's results operator)
+            continue
+        op.think()
+        op.write("desk_check_in", button.click())
+
+
+def results_workflow(op, deadline):
+    """Show scheduled matches and declare a winner of one no other operator has claimed"""
+    status_filter = next(s for s in op.at.selectbox if s.label == "Filter by Status:")
+    op.run("results_filter", status_filter.set_value("Scheduled"))
+    while perf_counter() < deadline:
+        op.think()
+        buttons = {}
+        for button in op.at.button:
+            match = RESULT_BUTTON.match(button.key or "")
+            if match:
+                buttons.setdefault(int(match.group(1)), []).append(button)
+        with op.shared['lock']:
+            unclaimed = [match_id for match_id in buttons if match_id not in op.shared['claimed']]
+            match_id = op.rng.choice(unclaimed) if unclaimed else None
+            if match_id is not None:
+                op.shared['claimed'].add(match_id)
+        if match_id is None:
+            op.run("results_refresh")
+            continue
+        op.write("results_enter", op.rng.choice(buttons[match_id]).click())
+
+
+def fixtures_workflow(op, deadline):
+    """Browse fixtures, changing the category and round filters"""
+    while perf_counter() < deadline:
+        op.think()
+        try:
+            category = op.at.selectbox(key="filter_fixtures_category")
+            round_number = op.at.selectbox(key="filter_round_number")
+        except KeyError:
+            # No fixtures yet; keep refreshing like an organiser waiting for them
+            op.run("fixtures_refresh")
+            continue
+        if op.rng.random() < 0.5:
+            op.run("fixtures_category", category.set_value(op.rng.choice(category.options)))
+        else:
+            op.run("fixtures_round", round_number.set_value(op.rng.choice(round_number.options)))
+
+
+WORKFLOWS = {
+    "desk": desk_workflow,
+    "results": results_workflow,
+    "fixtures": fixtures_workflow,
+}
+
+# App section each workflow's sessions open on
+WORKFLOW_SECTIONS = {
+    "desk": "registration",
+    "results": "matches",
+    "fixtures": "fixtures",
+}
+
+# Workflows that save something; an operator of these that saved nothing failed
+WRITING_WORKFLOWS = ("desk", "results")
+
+
+def prepare_database(directory, participants, source=None):
+    """Create tournament.db in `directory`, copied from `source` or generated with sample_data"""
+    path = os.path.join(directory, "tournament.db")
+    if source:
+        shutil.copyfile(source, path)
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        init_database()
+        if not source:
+            sample_data.generate_tournament(participants, completion=COMPLETION, registered=REGISTERED, seed=SEED)
+    finally:
+        os.chdir(cwd)
+    return path
+
+
+def pending_participants(db_path, rng):
+    """
+    Queue of (id, emp_id) for participants of GAME who have not reported, in random order.
+
+    Like the desk list, it leaves out anyone who already has a completed match.
+    """
+    conn = connect(db_path)
+    rows = conn.execute('''
+        WITH completed AS (SELECT * FROM matches WHERE archived = 0 AND game = ? AND match_status = 'completed')
+        SELECT id, emp_id FROM participants
+        WHERE archived = 0 AND game = ? AND registered_at_desk = 0
+          AND id NOT IN (SELECT player1_id FROM completed WHERE player1_id IS NOT NULL
+                         UNION SELECT player2_id FROM completed WHERE player2_id IS NOT NULL
+                         UNION SELECT team1_player1_id FROM completed WHERE team1_player1_id IS NOT NULL
+                         UNION SELECT team1_player2_id FROM completed WHERE team1_player2_id IS NOT NULL
+                         UNION SELECT team2_player1_id FROM completed WHERE team2_player1_id IS NOT NULL
+                         UNION SELECT team2_player2_id FROM completed WHERE team2_player2_id IS NOT NULL)
+    ''', (GAME, GAME)).fetchall()
+    conn.close()
+    rng.shuffle(rows)
+    pending = queue.Queue()
+    for row in rows:
+        pending.put(row)
+    return pending
+
+
+def run_load(operators, duration, think_ms, db_path):
+    """
+    Run every (name, workflow) operator concurrently for `duration` seconds.
+
+    Returns:
+        tuple: (samples, problems) - one sample dict per rerun from every operator, and a
+               message for each operator whose workflow stopped early or saved nothing
+    """
+    rng = random.Random(SEED)
+    shared = {'pending': pending_participants(db_path, rng), 'claimed': set(), 'lock': threading.Lock()}
+    sessions = [Operator(name, workflow, shared, rng.random(), think_ms) for name, workflow in operators]
+    start = threading.Barrier(len(sessions))
+    failures = []
+
+    def session(op):
+        start.wait()
+        deadline = perf_counter() + duration
+        try:
+            op.run("load")
+            WORKFLOWS[op.workflow](op, deadline)
+        except Exception as e:
+            failures.append(f"{op.name}: {type(e).__name__}: {e}")
+
+    threads = [threading.Thread(target=session, args=(op,), name=op.name) for op in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    problems = [f"workflow stopped early: {failure}" for failure in failures]
+    problems += [f"{op.name} saved nothing" for op in sessions if op.workflow in WRITING_WORKFLOWS and not op.writes]
+    return [sample for op in sessions for sample in op.samples], problems
+
+
+def summarize(samples):
+    """Count, latency percentiles and errors per action, plus an "all" row"""
+    groups = {}
+    for sample in samples:
+        groups.setdefault(sample['action'], []).append(sample)
+    groups["all"] = samples
+    rows = []
+    for action, group in groups.items():
+        ms = [s['ms'] for s in group]
+        rows.append({'action': action, 'count': len(group),
+                     'p50_ms': percentile(ms, 50), 'p95_ms': percentile(ms, 95), 'p99_ms': percentile(ms, 99),
+                     'max_ms': max(ms) if ms else None,
+                     'lock_errors': sum(s['lock_errors'] for s in group),
+                     'errors': sum(s['errors'] for s in group)})
+    return rows
+
+
+def print_report(rows, duration):
+    print(f"{'action':<20}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'locked':>8}{'errors':>8}")
+    for row in rows:
+        if not row['count']:
+            continue
+        print(f"{row['action']:<20}{row['count']:>7}{row['p50_ms']:>10.0f}{row['p95_ms']:>10.0f}"
+              f"{row['p99_ms']:>10.0f}{row['max_ms']:>10.0f}{row['lock_errors']:>8}{row['errors']:>8}")
+    total = rows[-1]['count']
+    print(f"{total} reruns in {duration:.0f}s ({total / duration:.1f}/s)")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Simulate organisers using the app at the same time")
+    parser.add_argument("--participants", type=int, default=1000, help="Size of the generated tournament")
+    parser.add_argument("--db", help="Load test a copy of this database instead of generating one")
+    for workflow, default in (("desk", 4), ("results", 2), ("fixtures", 2)):
+        parser.add_argument(f"--{workflow}", type=int, default=default, help=f"Operators running the {workflow} workflow")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds each operator keeps working")
+    parser.add_argument("--think-ms", type=float, default=500, help="Maximum random pause between actions")
+    parser.add_argument("--json", help="Write the summary and every rerun sample to this file")
+    parser.add_argument("--budget-p95-ms", type=float, help="Fail when the p95 of all reruns exceeds this")
+    args = parser.parse_args(argv)
+
+    operators = [(f"{workflow}-{i + 1}", workflow) for workflow in WORKFLOWS for i in range(getattr(args, workflow))]
+    if not operators:
+        parser.error("at least one operator is needed")
+
+    with tempfile.TemporaryDirectory(prefix="loadtest_") as directory:
+        print(f"Preparing {'a copy of ' + args.db if args.db else f'{args.participants} participants'}...")
+        db_path = prepare_database(directory, args.participants, args.db)
+        # The relative default database path resolves against the working directory
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            print(f"Running {len(operators)} operators for {args.duration:.0f}s...")
+            started = perf_counter()
+            samples, problems = run_load(operators, args.duration, args.think_ms, db_path)
+            elapsed = perf_counter() - started
+        finally:
+            os.chdir(cwd)
+
+    rows = summarize(samples)
+    print_report(rows, elapsed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'operators': dict(operators), 'duration_s': elapsed, 'summary': rows, 'samples': samples},
+                      f, indent=2)
+
+    overall = rows[-1]
+    errors = overall['lock_errors'] + overall['errors']
+    if errors:
+        messages = sorted({message for sample in samples for message in sample['messages']})
+        problems.append(f"{errors} errors raised or shown, e.g. {'; '.join(messages[:3])}")
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        return 1
+    if args.budget_p95_ms is not None and overall['p95_ms'] is not None and overall['p95_ms'] > args.budget_p95_ms:
+        print(f"FAIL: p95 {overall['p95_ms']:.0f} ms is over budget of {args.budget_p95_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import os
+import sys
+import sqlite3
+import threading
+from time import perf_counter
+
+# Per-thread state (Streamlit runs each session's script in its own thread): the query
+# recorder and the tournament database. When no recorder is set, connect() returns a
+# plain sqlite3 connection with no overhead.
+_local = threading.local()
+
+# Frames from these files are skipped when looking for the code that issued a query
+_SKIP_SOURCES = (os.path.abspath(__file__), os.sep + "pandas" + os.sep, os.sep + "sqlite3" + os.sep)
+
+
+# Tournament database of threads that have not chosen their own (see set_database()).
+# Scripts, the API and the venue display work on one tournament per process.
+_default_database = "tournament.db"
+
+
+def set_database(path, thread_only=False):
+    """
+    Make `path` the tournament database that get_database() returns.
+
+    With thread_only, only the calling thread switches: each Streamlit rerun sets its
+    session's tournament this way, so one organiser's choice never redirects another
+    session's queries mid-rerun. Otherwise `path` becomes the process default for every
+    thread that has not chosen its own (pass a thread's path explicitly to any thread
+    it starts).
+    """
+    if thread_only:
+        _local.database = path
+    else:
+        global _default_database
+        _default_database = path
+
+
+def get_database():
+    """Path of the tournament database the calling thread works on"""
+    return getattr(_local, "database", None) or _default_database
+
+
+def set_query_recorder(recorder):
+    """
+    Record queries made on this thread by connections opened from now on.
+
+    The recorder needs on_connect() and on_query(sql, source) methods; on_query()
+    returns a mutable record with "ms" and "rows" keys that cursors keep updating
+    while rows are fetched. Pass None to stop recording.
+    """
+    _local.recorder = recorder
+
+
+def get_query_recorder():
+    """Return the recorder active on this thread, if any"""
+    return getattr(_local, "recorder", None)
+
+
+def _query_source():
+    # First frame outside this module, pandas and sqlite3, e.g. "tournament_service.py:120 get_matches"
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not any(skip in filename for skip in _SKIP_SOURCES) and "site-packages" not in filename:
+            return f"{os.path.basename(filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports statement time and fetched rows to the connection's recorder"""
+
+    _record = None
+
+    def _run(self, method, sql, *args):
+        self._record = self.connection.recorder.on_query(sql, _query_source())
+        start = perf_counter()
+        try:
+            return method(self, sql, *args)
+        finally:
+            self._record["ms"] += (perf_counter() - start) * 1000
+
+    def execute(self, sql, parameters=()):
+        return self._run(sqlite3.Cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(sqlite3.Cursor.executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._run(sqlite3.Cursor.executescript, sql_script)
+
+    def _fetch(self, method, *args):
+        start = perf_counter()
+        result = method(self, *args)
+        if self._record is not None:
+            self._record["ms"] += (perf_counter() - start) * 1000
+            if result is not None:
+                self._record["rows"] += len(result) if isinstance(result, list) else 1
+        return result
+
+    def fetchone(self):
+        return self._fetch(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(sqlite3.Cursor.fetchmany, size if size is not None else self.arraysize)
+
+    def fetchall(self):
+        return self._fetch(sqlite3.Cursor.fetchall)
+
+    def __next__(self):
+        row = self._fetch(sqlite3.Cursor.fetchone)
+        if row is None:
+            raise StopIteration
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including the execute() shortcuts) are instrumented"""
+
+    def __init__(self, *args, recorder=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recorder = recorder
+        recorder.on_connect()
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connect(database, **kwargs):
+    """
+    Open a SQLite connection; all database access goes through here.
+
+    Takes the same arguments as sqlite3.connect(). When a query recorder is set on
+    the calling thread (see perf_utils), the connection reports every statement.
+    """
+    recorder = get_query_recorder()
+    if recorder is None:
+        return sqlite3.connect(database, **kwargs)
+    return sqlite3.connect(database, factory=lambda *args, **kw: InstrumentedConnection(*args, recorder=recorder, **kw),
+                           **kwargs)
+
+
+def create_triggers(conn, triggers):
+    """
+    Create triggers from a {name: body} dict, replacing any whose stored definition differs.
+
+    SQLite keeps the CREATE TRIGGER text in sqlite_master, so a changed body is picked
+    up on the next startup instead of being skipped by IF NOT EXISTS.
+
+    Returns:
+        list: Names of the triggers created or replaced
+    """
+    existing = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall())
+    changed = []
+    for name, body in triggers.items():
+        sql = f"CREATE TRIGGER {name} {body}"
+        if existing.get(name) == sql:
+            continue
+        if name in existing:
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.execute(sql)
+        changed.append(name)
+    return changed
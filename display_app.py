@@ -0,0 +1,384 @@
+import re
+import sys
+import json
+import asyncio
+import logging
+import argparse
+import contextlib
+from datetime import datetime, timedelta
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from events_utils import get_latest_seq
+from summary_utils import get_round_progress
+from db_utils import connect, get_database
+from tournaments_utils import use_current_tournament, use_database
+
+logger = logging.getLogger(__name__)
+
+# How often the shared poller checks the change feed for a new seq (one tiny query, shared by every screen)
+POLL_INTERVAL_SECONDS = 1.0
+
+# Rebuild the state at least this often even without changes, so "now"/"next" follow the clock
+CLOCK_REFRESH_SECONDS = 30
+
+# Comment lines sent to idle streams so proxies keep the connection open
+KEEPALIVE_SECONDS = 15
+
+RECENT_WINNERS_LIMIT = 10
+
+_SLOT_PATTERN = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*([ap]m)?\s*-\s*(\d{1,2})(?::(\d{2}))?\s*([ap]m)?', re.IGNORECASE)
+
+
+def _connect():
+    # The display never writes, so open the database read-only
+    return connect(f"file:{get_database()}?mode=ro", uri=True)
+
+
+def _slot_bounds(start_time, end_time, time_slot, now):
+    """Return (start, end) datetimes from stored timestamps, falling back to today's time_slot text"""
+    try:
+        if start_time and end_time:
+            return datetime.fromisoformat(start_time), datetime.fromisoformat(end_time)
+    except ValueError:
+        pass
+
+    match = _SLOT_PATTERN.search(time_slot or "")
+    if not match:
+        return None, None
+    start_hour, start_minute, start_ampm, end_hour, end_minute, end_ampm = match.groups()
+
+    def to_time(hour, minute, ampm):
+        hour = int(hour)
+        if ampm and ampm.lower() == 'pm' and hour < 12:
+            hour += 12
+        elif ampm and ampm.lower() == 'am' and hour == 12:
+            hour = 0
+        return now.replace(hour=hour % 24, minute=int(minute or 0), second=0, microsecond=0)
+
+    start = to_time(start_hour, start_minute, start_ampm or end_ampm)
+    end = to_time(end_hour, end_minute, end_ampm)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def _side(names):
+    names = [name for name in names if name]
+    return " & ".join(names) if names else "TBD"
+
+
+def get_court_schedule(now=None):
+    """
+    Current and next fixture for every court.
+
+    Fixtures whose slot has ended, or that are completed/cancelled, are skipped.
+    Fixtures without parseable times are shown as "next" in slot order.
+    """
+    now = now or datetime.now()
+    conn = _connect()
+    rows = conn.execute('''
+        SELECT f.id, f.category, f.time_slot, f.start_time, f.end_time, f.location, f.court_number,
+               p1.name, p2.name, t1p1.name, t1p2.name, t2p1.name, t2p2.name
+        FROM fixtures f
+        LEFT JOIN participants p1 ON f.player1_id = p1.id
+        LEFT JOIN participants p2 ON f.player2_id = p2.id
+        LEFT JOIN participants t1p1 ON f.team1_player1_id = t1p1.id
+        LEFT JOIN participants t1p2 ON f.team1_player2_id = t1p2.id
+        LEFT JOIN participants t2p1 ON f.team2_player1_id = t2p1.id
+        LEFT JOIN participants t2p2 ON f.team2_player2_id = t2p2.id
+        WHERE f.archived = 0 AND COALESCE(f.fixture_status, 'scheduled') NOT IN ('completed', 'cancelled')
+        ORDER BY f.location, f.court_number, f.id
+    ''').fetchall()
+    conn.close()
+
+    courts = {}
+    for (fixture_id, category, time_slot, start_time, end_time, location, court_number,
+         p1, p2, t1p1, t1p2, t2p1, t2p2) in rows:
+        start, end = _slot_bounds(start_time, end_time, time_slot, now)
+        if end is not None and end <= now:
+            continue
+        is_doubles = t1p1 is not None or t2p1 is not None
+        courts.setdefault((location or "", court_number or 0), []).append({
+            'fixture_id': fixture_id,
+            'category': category,
+            'time_slot': time_slot,
+            'start': start,
+            'side1': _side([t1p1, t1p2] if is_doubles else [p1]),
+            'side2': _side([t2p1, t2p2] if is_doubles else [p2]),
+        })
+
+    schedule = []
+    for (location, court_number), fixtures in sorted(courts.items()):
+        fixtures.sort(key=lambda fixture: (fixture['start'] is None, fixture['start'] or now, fixture['fixture_id']))
+        current = fixtures[0] if fixtures[0]['start'] is not None and fixtures[0]['start'] <= now else None
+        upcoming = fixtures[1:] if current else fixtures
+        for fixture in fixtures:
+            fixture.pop('start')
+        schedule.append({
+            'location': location,
+            'court_number': court_number,
+            'now': current,
+            'next': upcoming[0] if upcoming else None,
+        })
+    return schedule
+
+
+def get_recent_winners(limit=RECENT_WINNERS_LIMIT):
+    """Latest completed matches with the winning side's names"""
+    conn = _connect()
+    rows = conn.execute('''
+        SELECT m.id, m.category, m.round_number, m.score, m.completed_at,
+               CASE WHEN m.winner_team = 1 THEN t1p1.name || COALESCE(' & ' || t1p2.name, '')
+                    WHEN m.winner_team = 2 THEN t2p1.name || COALESCE(' & ' || t2p2.name, '')
+                    ELSE w.name END
+        FROM matches m
+        LEFT JOIN participants t1p1 ON m.team1_player1_id = t1p1.id
+        LEFT JOIN participants t1p2 ON m.team1_player2_id = t1p2.id
+        LEFT JOIN participants t2p1 ON m.team2_player1_id = t2p1.id
+        LEFT JOIN participants t2p2 ON m.team2_player2_id = t2p2.id
+        LEFT JOIN participants w ON m.winner_id = w.id
+        WHERE m.archived = 0 AND m.match_status = 'completed'
+        ORDER BY m.completed_at DESC, m.id DESC
+        LIMIT ?
+    ''', (limit,)).fetchall()
+    conn.close()
+    return [{
+        'match_id': row[0],
+        'category': row[1],
+        'round_number': row[2],
+        'score': row[3],
+        'completed_at': row[4],
+        'winner': row[5] or "TBD",
+    } for row in rows]
+
+
+def build_display_state(seq):
+    """Everything a venue screen shows, as one JSON-serialisable dict"""
+    progress = get_round_progress()
+    return {
+        'seq': seq,
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'courts': get_court_schedule(),
+        'winners': get_recent_winners(),
+        'progress': [{
+            'category': row.category,
+            'round_number': int(row.round_number),
+            'total_matches': int(row.total_matches),
+            'completed_matches': int(row.completed_matches),
+        } for row in progress.itertuples()],
+    }
+
+
+class DisplayFeed:
+    """
+    Shares one poller between every connected screen.
+
+    The poller reads the change feed's latest seq; only when it moves (or the clock
+    refresh is due) is the display state rebuilt, once, and pushed to all subscribers.
+    """
+
+    def __init__(self, poll_interval=POLL_INTERVAL_SECONDS, clock_refresh=CLOCK_REFRESH_SECONDS):
+        self.poll_interval = poll_interval
+        self.clock_refresh = clock_refresh
+        self.seq = None
+        self.message = None
+        self.built_at = None
+        self.rebuilds = 0
+        self.subscribers = set()
+
+    async def refresh(self):
+        seq = await run_in_threadpool(get_latest_seq)
+        now = datetime.now()
+        if seq == self.seq and self.built_at and (now - self.built_at).total_seconds() < self.clock_refresh:
+            return False
+        state = await run_in_threadpool(build_display_state, seq)
+        self.seq, self.built_at = seq, now
+        self.message = json.dumps(state)
+        self.rebuilds += 1
+        for queue in self.subscribers:
+            # Each message is a full state, so a slow screen only ever needs the newest one.
+            # Its seq travels with it, so the event id names the state the screen received.
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((self.seq, self.message))
+        return True
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                # Any failure (a locked database, a bad row) must not stop the poller for every screen
+                logger.exception("Display feed refresh failed")
+            await asyncio.sleep(self.poll_interval)
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=1)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+
+feed = DisplayFeed()
+
+
+async def events(request):
+    """Server-sent event stream of display states, one per change"""
+    queue = feed.subscribe()
+    last_sent = request.headers.get("last-event-id")
+
+    async def stream():
+        try:
+            if feed.message is not None and str(feed.seq) != last_sent:
+                yield f"id: {feed.seq}\nevent: state\ndata: {feed.message}\n\n"
+            while True:
+                try:
+                    seq, message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"id: {seq}\nevent: state\ndata: {message}\n\n"
+        finally:
+            feed.unsubscribe(queue)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def state(request):
+    """Current display state as JSON (for screens that cannot use SSE)"""
+    if feed.message is None:
+        await feed.refresh()
+    return JSONResponse(json.loads(feed.message))
+
+
+async def health(request):
+    return JSONResponse({'seq': feed.seq, 'screens': len(feed.subscribers), 'rebuilds': feed.rebuilds})
+
+
+async def index(request):
+    return HTMLResponse(DISPLAY_PAGE)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    task = asyncio.create_task(feed.run())
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
+app = Starlette(routes=[
+    Route("/", index),
+    Route("/events", events),
+    Route("/state", state),
+    Route("/health", health),
+], lifespan=lifespan)
+
+
+DISPLAY_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Tournament Scoreboard</title>
+<style>
+  body { margin: 0; padding: 24px; background: #0b132b; color: #f5f7fa; font-family: sans-serif; }
+  h1 { margin: 0 0 16px; color: #5bc0be; }
+  h2 { color: #5bc0be; border-bottom: 2px solid #3a506b; padding-bottom: 6px; }
+  .layout { display: grid; grid-template-columns: 2fr 1fr; gap: 24px; }
+  .courts { display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 16px; }
+  .court { background: #1c2541; border-radius: 12px; padding: 16px; }
+  .court h3 { margin: 0 0 8px; }
+  .label { color: #ff6b35; font-weight: bold; font-size: 0.8em; text-transform: uppercase; }
+  .match { font-size: 1.3em; margin-bottom: 10px; }
+  .meta { color: #9fb3c8; font-size: 0.75em; }
+  ul { list-style: none; padding: 0; }
+  li { padding: 6px 0; border-bottom: 1px solid #3a506b; }
+  .bar { background: #3a506b; border-radius: 6px; height: 12px; margin: 4px 0 12px; }
+  .bar div { background: #5bc0be; height: 100%; border-radius: 6px; }
+  #status { position: fixed; right: 16px; bottom: 8px; color: #6b818c; font-size: 0.8em; }
+</style>
+</head>
+<body>
+<h1>&#127942; Tournament Scoreboard</h1>
+<div class="layout">
+  <div><h2>Courts</h2><div class="courts" id="courts"></div></div>
+  <div>
+    <h2>Recent Winners</h2><ul id="winners"></ul>
+    <h2>Bracket Progress</h2><div id="progress"></div>
+  </div>
+</div>
+<div id="status">Connecting...</div>
+<script>
+function el(tag, className, text) {
+  const node = document.createElement(tag);
+  if (className) node.className = className;
+  if (text !== undefined) node.textContent = text;
+  return node;
+}
+function matchBlock(label, fixture) {
+  const block = el("div");
+  block.appendChild(el("div", "label", label));
+  if (!fixture) { block.appendChild(el("div", "match meta", "-")); return block; }
+  block.appendChild(el("div", "match", fixture.side1 + "  vs  " + fixture.side2));
+  block.appendChild(el("div", "meta", fixture.category + " \\u00b7 " + (fixture.time_slot || "")));
+  return block;
+}
+function render(state) {
+  const courts = document.getElementById("courts");
+  courts.replaceChildren(...state.courts.map(court => {
+    const card = el("div", "court");
+    card.appendChild(el("h3", null, (court.location ? court.location + " \\u00b7 " : "") + "Court " + court.court_number));
+    card.appendChild(matchBlock("Now", court.now));
+    card.appendChild(matchBlock("Next", court.next));
+    return card;
+  }));
+  document.getElementById("winners").replaceChildren(...state.winners.map(winner => {
+    const item = el("li", null, "\\ud83c\\udfc6 " + winner.winner);
+    item.appendChild(el("div", "meta", winner.category + " \\u00b7 Round " + winner.round_number + (winner.score ? " \\u00b7 " + winner.score : "")));
+    return item;
+  }));
+  document.getElementById("progress").replaceChildren(...state.progress.flatMap(round => {
+    const bar = el("div", "bar"), fill = el("div");
+    fill.style.width = (100 * round.completed_matches / round.total_matches) + "%";
+    bar.appendChild(fill);
+    return [el("div", "meta", round.category + " \\u00b7 Round " + round.round_number + ": " + round.completed_matches + "/" + round.total_matches), bar];
+  }));
+  document.getElementById("status").textContent = "Updated " + state.generated_at;
+}
+const source = new EventSource("events");
+source.addEventListener("state", event => render(JSON.parse(event.data)));
+source.onerror = () => { document.getElementById("status").textContent = "Reconnecting..."; };
+</script>
+</body>
+</html>
+"""
+
+
+def main(argv=None):
+    """Command line entry point: serve the scoreboard with uvicorn"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the read-only venue scoreboard")
+    parser.add_argument("--db", help="Tournament database path (default: the current tournament)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args(argv)
+    if args.db:
+        use_database(args.db)
+    else:
+        use_current_tournament()
+
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
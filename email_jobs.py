@@ -0,0 +1,392 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+import pandas as pd
+
+from email_utils import email_session, get_transport, send_email
+from db_utils import connect, get_database
+from tournaments_utils import use_current_tournament, use_database
+
+# Default throttle for bulk send jobs (messages per minute and burst size).
+# Most relays (Exchange Online, Gmail, corporate gateways) enforce per-minute limits.
+EMAIL_RATE_PER_MINUTE = float(os.environ.get("EMAIL_RATE_PER_MINUTE", "30"))
+EMAIL_RATE_BURST = int(os.environ.get("EMAIL_RATE_BURST", "5"))
+
+# A batch is retried on resume until it has failed this many times
+MAX_BATCH_ATTEMPTS = 3
+
+# Pause the job after this many failures in a row (relay down, auth revoked, quota hit)
+MAX_CONSECUTIVE_FAILURES = 3
+
+# A running job whose runner has not touched it for this long (crashed process, closed
+# tab) may be taken over by another session. Runners touch the job before every batch,
+# so this must stay above the longest wait for the rate limit.
+JOB_STALE_SECONDS = float(os.environ.get("EMAIL_JOB_STALE_SECONDS", "300"))
+
+# Job statuses
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_PAUSED = 'paused'
+JOB_COMPLETED = 'completed'
+JOB_CANCELLED = 'cancelled'
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    acquire() takes one token, sleeping until one is available.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+
+    @classmethod
+    def per_minute(cls, messages_per_minute, burst=1, **kwargs):
+        """Create a bucket from a messages-per-minute limit"""
+        return cls(messages_per_minute / 60.0, burst, **kwargs)
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """Take tokens, waiting as long as needed. Returns the time spent waiting in seconds."""
+        waited = 0.0
+        self._refill()
+        while self.tokens < tokens:
+            delay = (tokens - self.tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+            self._refill()
+        self.tokens -= tokens
+        return waited
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _stale_before():
+    # updated_at values older than this belong to a runner that stopped without finishing
+    return (datetime.now() - timedelta(seconds=JOB_STALE_SECONDS)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def split_into_batches(recipients, subject, body, batch_size, names=None, html_body=None):
+    """
+    Split one email to many recipients into messages of at most batch_size recipients.
+
+    Returns:
+        list: Message dicts with recipients, recipient_names, subject, body and html_body
+    """
+    names = names or [None] * len(recipients)
+    batch_size = max(1, int(batch_size))
+    return [{
+        'recipients': list(recipients[i:i + batch_size]),
+        'recipient_names': list(names[i:i + batch_size]),
+        'subject': subject,
+        'body': body,
+        'html_body': html_body,
+    } for i in range(0, len(recipients), batch_size)]
+
+
+def create_send_job(name, messages, rate_per_minute=None, burst=None, draft_only=False):
+    """
+    Persist a bulk send job; nothing is sent until run_send_job() is called.
+
+    Args:
+        name (str): Label shown in the job list
+        messages (list): Dicts with recipients, subject, body and optional html_body / recipient_names.
+            Each message becomes one batch (one outbound email).
+        rate_per_minute (float, optional): Messages per minute (default EMAIL_RATE_PER_MINUTE)
+        burst (int, optional): Messages allowed back-to-back before throttling (default EMAIL_RATE_BURST)
+        draft_only (bool): Save drafts instead of sending
+
+    Returns:
+        int: The new job ID
+    """
+    rate_per_minute = rate_per_minute or EMAIL_RATE_PER_MINUTE
+    burst = burst or EMAIL_RATE_BURST
+    total_recipients = sum(len(message['recipients']) for message in messages)
+
+    conn = connect(get_database())
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO email_jobs (name, status, rate_per_minute, burst, draft_only,
+                                    total_batches, total_recipients, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (name, JOB_PENDING, rate_per_minute, burst, int(draft_only),
+              len(messages), total_recipients, _now(), _now()))
+        job_id = cursor.lastrowid
+
+        for batch_number, message in enumerate(messages, start=1):
+            cursor.execute('''
+                INSERT INTO email_job_batches (job_id, batch_number, subject, body, html_body, recipient_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (job_id, batch_number, message['subject'], message['body'],
+                  message.get('html_body'), len(message['recipients'])))
+            batch_id = cursor.lastrowid
+            names = message.get('recipient_names') or [None] * len(message['recipients'])
+            cursor.executemany('''
+                INSERT INTO email_job_recipients (job_id, batch_id, email, name)
+                VALUES (?, ?, ?, ?)
+            ''', [(job_id, batch_id, email, recipient_name) for email, recipient_name in zip(message['recipients'], names)])
+
+        conn.commit()
+        return job_id
+    finally:
+        conn.close()
+
+
+def get_send_jobs(limit=20):
+    """Get the most recent send jobs with their progress counters"""
+    conn = connect(get_database())
+    df = pd.read_sql_query('''
+        SELECT id, name, status, total_batches, sent_batches, failed_batches,
+               total_recipients, sent_recipients, rate_per_minute, draft_only,
+               created_at, updated_at, completed_at, last_error
+        FROM email_jobs
+        ORDER BY id DESC
+        LIMIT ?
+    ''', conn, params=(limit,))
+    conn.close()
+    return df
+
+
+def get_job_progress(job_id):
+    """Get a job's row as a dict, or None if it does not exist"""
+    conn = connect(get_database())
+    conn.row_factory = sqlite3.Row
+    row = conn.execute("SELECT * FROM email_jobs WHERE id = ?", (job_id,)).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def get_resumable_jobs():
+    """
+    Get jobs that stopped before finishing: pending, paused, or left 'running' by a
+    runner that has not touched them for JOB_STALE_SECONDS
+    """
+    conn = connect(get_database())
+    df = pd.read_sql_query('''
+        SELECT id, name, status, total_batches, sent_batches, failed_batches, updated_at
+        FROM email_jobs
+        WHERE status IN (?, ?) OR (status = ? AND updated_at < ?)
+        ORDER BY id
+    ''', conn, params=(JOB_PENDING, JOB_PAUSED, JOB_RUNNING, _stale_before()))
+    conn.close()
+    return df
+
+
+def cancel_send_job(job_id):
+    """Cancel a job; batches not yet sent are left unsent"""
+    conn = connect(get_database())
+    conn.execute("UPDATE email_jobs SET status = ?, updated_at = ? WHERE id = ? AND status != ?",
+                 (JOB_CANCELLED, _now(), job_id, JOB_COMPLETED))
+    conn.commit()
+    conn.close()
+
+
+def _refresh_job_counts(conn, job_id):
+    # Recount from the batches rather than adding to the counters, so that a runner taking
+    # over from a stale one never counts a batch twice
+    conn.execute('''
+        UPDATE email_jobs
+        SET sent_batches = (SELECT COUNT(*) FROM email_job_batches WHERE job_id = ? AND status = 'sent'),
+            failed_batches = (SELECT COUNT(*) FROM email_job_batches WHERE job_id = ? AND status = 'failed'),
+            sent_recipients = (SELECT COALESCE(SUM(recipient_count), 0) FROM email_job_batches
+                               WHERE job_id = ? AND status = 'sent'),
+            updated_at = ?
+        WHERE id = ?
+    ''', (job_id, job_id, job_id, _now(), job_id))
+
+
+def run_send_job(job_id, progress_callback=None, should_stop=None, bucket=None):
+    """
+    Send the outstanding batches of a job, throttled by a token bucket.
+
+    Every state change is committed before moving on, so the job can be resumed by
+    calling this again after a crash, restart or closed browser tab. Only one runner
+    works on a job at a time: the job is claimed by moving it to 'running', and a job
+    that is already running is left alone unless its runner has not touched it for
+    JOB_STALE_SECONDS. Each batch is claimed the same way before it is handed to the
+    transport, so no batch goes out twice from two runners. A batch that was mid-send
+    when its runner died is retried (delivery is at-least-once for that single batch).
+    Failed batches are retried until they reach MAX_BATCH_ATTEMPTS.
+
+    Args:
+        job_id (int): Job to run or resume
+        progress_callback (callable, optional): Called as progress_callback(job_dict) after each batch
+        should_stop (callable, optional): Returns True to pause the job after the current batch
+        bucket (TokenBucket, optional): Rate limiter (default from the job's rate settings)
+
+    Returns:
+        dict: The job row after the run ('running' if another runner holds the job)
+    """
+    conn = connect(get_database(), timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        job = conn.execute("SELECT * FROM email_jobs WHERE id = ?", (job_id,)).fetchone()
+        if job is None:
+            raise ValueError(f"Email job #{job_id} not found")
+        if job['status'] in (JOB_COMPLETED, JOB_CANCELLED):
+            return dict(job)
+
+        # An unusable configuration (unknown or unavailable transport) fails the run before
+        # the job is marked running, so it stays resumable once the setting is fixed
+        try:
+            transport = get_transport()
+            if transport is None:
+                raise RuntimeError("No email transport configured")
+        except (ValueError, RuntimeError) as e:
+            conn.execute('''
+                UPDATE email_jobs SET status = CASE WHEN status = ? THEN ? ELSE status END, last_error = ?, updated_at = ?
+                WHERE id = ?
+            ''', (JOB_PENDING, JOB_PAUSED, str(e), _now(), job_id))
+            conn.commit()
+            return dict(conn.execute("SELECT * FROM email_jobs WHERE id = ?", (job_id,)).fetchone())
+
+        claimed = conn.execute('''
+            UPDATE email_jobs SET status = ?, started_at = COALESCE(started_at, ?), updated_at = ?
+            WHERE id = ? AND (status IN (?, ?) OR (status = ? AND updated_at < ?))
+        ''', (JOB_RUNNING, _now(), _now(), job_id, JOB_PENDING, JOB_PAUSED, JOB_RUNNING, _stale_before())).rowcount
+        if not claimed:
+            # Another session is sending this job (or it finished meanwhile)
+            return dict(conn.execute("SELECT * FROM email_jobs WHERE id = ?", (job_id,)).fetchone())
+        # The job is ours now: a batch left mid-send by a previous runner goes out again
+        conn.execute("UPDATE email_job_batches SET status = 'pending' WHERE job_id = ? AND status = 'sending'", (job_id,))
+        conn.commit()
+
+        bucket = bucket or TokenBucket.per_minute(job['rate_per_minute'], job['burst'])
+        batches = conn.execute('''
+            SELECT * FROM email_job_batches
+            WHERE job_id = ? AND (status = 'pending' OR (status = 'failed' AND attempts < ?))
+            ORDER BY batch_number
+        ''', (job_id, MAX_BATCH_ATTEMPTS)).fetchall()
+
+        final_status = JOB_COMPLETED
+        consecutive_failures = 0
+        with email_session(transport=transport):
+            for batch in batches:
+                if should_stop is not None and should_stop():
+                    final_status = JOB_PAUSED
+                    break
+                # Another session may have cancelled the job
+                status = conn.execute("SELECT status FROM email_jobs WHERE id = ?", (job_id,)).fetchone()[0]
+                if status != JOB_RUNNING:
+                    break
+
+                recipients = [row['email'] for row in conn.execute(
+                    "SELECT email FROM email_job_recipients WHERE batch_id = ? ORDER BY id", (batch['id'],))]
+
+                bucket.acquire()
+
+                # Claim the batch and record the attempt before handing the message to the
+                # transport; touching the job keeps it from looking stale to other sessions
+                claimed = conn.execute('''
+                    UPDATE email_job_batches SET status = 'sending', attempts = attempts + 1
+                    WHERE id = ? AND (status = 'pending' OR (status = 'failed' AND attempts < ?))
+                ''', (batch['id'], MAX_BATCH_ATTEMPTS)).rowcount
+                conn.execute("UPDATE email_jobs SET updated_at = ? WHERE id = ?", (_now(), job_id))
+                conn.commit()
+                if not claimed:
+                    continue
+
+                try:
+                    send_email(recipients, batch['subject'], batch['body'], html_body=batch['html_body'],
+                               draft_only=bool(job['draft_only']))
+                except Exception as e:
+                    consecutive_failures += 1
+                    conn.execute("UPDATE email_job_batches SET status = 'failed', last_error = ? WHERE id = ?",
+                                 (str(e), batch['id']))
+                    conn.execute("UPDATE email_jobs SET last_error = ? WHERE id = ?", (str(e), job_id))
+                    _refresh_job_counts(conn, job_id)
+                    conn.commit()
+                    if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                        final_status = JOB_PAUSED
+                        break
+                else:
+                    consecutive_failures = 0
+                    conn.execute("UPDATE email_job_batches SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?",
+                                 (_now(), batch['id']))
+                    conn.execute("UPDATE email_job_recipients SET status = 'sent' WHERE batch_id = ?", (batch['id'],))
+                    _refresh_job_counts(conn, job_id)
+                    conn.commit()
+
+                if progress_callback is not None:
+                    progress_callback(dict(conn.execute("SELECT * FROM email_jobs WHERE id = ?", (job_id,)).fetchone()))
+
+        if final_status == JOB_COMPLETED:
+            # Failed batches that can still be retried keep the job resumable
+            retryable = conn.execute('''
+                SELECT COUNT(*) FROM email_job_batches
+                WHERE job_id = ? AND (status IN ('pending', 'sending') OR (status = 'failed' AND attempts < ?))
+            ''', (job_id, MAX_BATCH_ATTEMPTS)).fetchone()[0]
+            if retryable:
+                final_status = JOB_PAUSED
+
+        conn.execute('''
+            UPDATE email_jobs SET status = ?, updated_at = ?,
+                   completed_at = CASE WHEN ? = 'completed' THEN ? ELSE completed_at END,
+                   last_error = CASE WHEN ? = 'completed' THEN NULL ELSE last_error END
+            WHERE id = ? AND status = ?
+        ''', (final_status, _now(), final_status, _now(), final_status, job_id, JOB_RUNNING))
+        conn.commit()
+        return dict(conn.execute("SELECT * FROM email_jobs WHERE id = ?", (job_id,)).fetchone())
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    """Command line entry point: list or resume send jobs outside the Streamlit app"""
+    parser = argparse.ArgumentParser(description="Manage rate-limited bulk email send jobs")
+    parser.add_argument("--db", help="Tournament database path (default: the current tournament)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List recent send jobs")
+    resume_parser = subparsers.add_parser("resume", help="Resume unfinished send jobs")
+    resume_parser.add_argument("job_ids", nargs="*", type=int, help="Job IDs (default: every unfinished job)")
+    cancel_parser = subparsers.add_parser("cancel", help="Cancel a send job")
+    cancel_parser.add_argument("job_id", type=int)
+    args = parser.parse_args(argv)
+    if args.db:
+        use_database(args.db)
+    else:
+        use_current_tournament()
+
+    if args.command == "list":
+        print(get_send_jobs().to_string(index=False))
+    elif args.command == "cancel":
+        cancel_send_job(args.job_id)
+        print(f"Cancelled job #{args.job_id}")
+    else:
+        job_ids = args.job_ids or get_resumable_jobs()['id'].tolist()
+        if not job_ids:
+            print("No unfinished send jobs")
+        for job_id in job_ids:
+            def report(job):
+                print(f"  job #{job['id']}: {job['sent_batches']}/{job['total_batches']} batches sent, "
+                      f"{job['failed_batches']} failed", flush=True)
+            print(f"Resuming job #{job_id}")
+            job = run_send_job(job_id, progress_callback=report)
+            if job['status'] == JOB_RUNNING:
+                print(f"Job #{job_id} is being sent by another session")
+            else:
+                print(f"Job #{job_id} {job['status']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+import html
+import string
+import time
+import numpy as np
+import pandas as pd
+
+from db_utils import connect, get_database
+
+# Participant slots on matches/fixtures, in the order recipients are listed
+PLAYER_SLOTS = ['player1', 'player2', 'team1_player1', 'team1_player2', 'team2_player1', 'team2_player2']
+
+# Largest IN (...) list sent to SQLite in one statement
+MAX_QUERY_IDS = 900
+
+# Match block shared by the fixture and winner notifications
+FIXTURE_DETAILS = """Category: {category}
+Round: {round_number}
+Match: {match_description}
+"""
+
+WINNER_DETAILS = FIXTURE_DETAILS + "{winner_label}: {winner_names}\n"
+
+FIXTURE_SLOT_SUBJECT = "Tournament: Your {category} Match Details"
+
+FIXTURE_SLOT_BODY = """Dear {recipient_name},
+
+Your {category} match has been scheduled.
+
+Match Details:
+- Time Slot: {time_slot}
+- Venue: {location}
+- Court Number: {court_number}
+
+Please arrive 10 minutes before your scheduled time.
+
+Good luck!
+Tournament Committee"""
+
+# One line per match in a digest email
+DIGEST_LINE = "- {category}, Round {round_number}: {match_description}{time_note}"
+
+DIGEST_DETAILS = """You have {match_count} upcoming match(es):
+
+{matches}
+"""
+
+
+def _participant_columns(extra_fields=("name", "emp_id", "email")):
+    """SELECT list and JOINs resolving every participant slot of a match/fixture row"""
+    columns = []
+    joins = []
+    for slot in PLAYER_SLOTS:
+        alias = f"p_{slot}"
+        columns.extend(f"{alias}.{field} as {slot}_{field}" for field in extra_fields)
+        joins.append(f"LEFT JOIN participants {alias} ON t.{slot}_id = {alias}.id")
+    return ",\n           ".join(columns), "\n    ".join(joins)
+
+
+def _load_frame(table, ids, order_by):
+    """Load active rows of matches/fixtures (or the given ids) joined with participant details"""
+    columns, joins = _participant_columns()
+    query = f"""
+    SELECT t.*,
+           {columns}
+    FROM {table} t
+    {joins}
+    """
+
+    conn = connect(get_database())
+    try:
+        if ids is None:
+            return pd.read_sql_query(query + f" WHERE t.archived = 0 ORDER BY {order_by}", conn)
+
+        ids = [int(i) for i in ids]
+        if not ids:
+            return pd.read_sql_query(query + " WHERE 0", conn)
+
+        # Chunk large selections to stay under SQLite's bound-parameter limit
+        chunks = []
+        for start in range(0, len(ids), MAX_QUERY_IDS):
+            chunk = ids[start:start + MAX_QUERY_IDS]
+            placeholders = ", ".join("?" * len(chunk))
+            chunks.append(pd.read_sql_query(query + f" WHERE t.id IN ({placeholders})", conn, params=chunk))
+        frame = pd.concat(chunks, ignore_index=True)
+    finally:
+        conn.close()
+
+    # Keep the caller's selection order
+    order = {match_id: position for position, match_id in enumerate(ids)}
+    frame = frame.sort_values('id', key=lambda s: s.map(order)).reset_index(drop=True)
+    return frame
+
+
+def get_notification_frame(match_ids=None):
+    """
+    Load matches with every player's name, emp_id and email in a single joined query.
+
+    Args:
+        match_ids (list, optional): Match IDs to load, in display order. All matches if None.
+
+    Returns:
+        DataFrame: One row per match with notification fields added (see prepare_notification_frame)
+    """
+    frame = _load_frame("matches", match_ids, "t.round_number, t.id")
+    # Matches created from fixtures carry the time slot in match_date
+    frame['time_slot'] = frame['match_date']
+    return prepare_notification_frame(frame)
+
+
+def get_fixture_notification_frame(fixture_ids=None):
+    """
+    Load fixtures with every player's name, emp_id and email in a single joined query.
+
+    Args:
+        fixture_ids (list, optional): Fixture IDs to load, in display order. All fixtures if None.
+
+    Returns:
+        DataFrame: One row per fixture with notification fields added (see prepare_notification_frame)
+    """
+    frame = _load_frame("fixtures", fixture_ids, "t.start_time, t.id")
+    return prepare_notification_frame(frame)
+
+
+def _text(series, default=""):
+    """Return a column as object dtype strings with missing values replaced"""
+    return series.astype(object).where(series.notna() & (series.astype(object) != ""), default)
+
+
+def _join_names(first, second):
+    """Vectorized 'A & B' join that skips missing names"""
+    first = _text(first)
+    second = _text(second)
+    separator = np.where((first != "") & (second != ""), " & ", "")
+    return first + separator + second
+
+
+def prepare_notification_frame(frame):
+    """
+    Add derived notification columns to a joined match/fixture frame, column-wise.
+
+    Adds team1_names, team2_names, match_description, winner_names, winner_label,
+    recipients (list of emails) and recipient_names (list of names).
+    """
+    frame = frame.copy()
+    if frame.empty:
+        for column in ['team1_names', 'team2_names', 'match_description', 'winner_names',
+                       'winner_label', 'recipients', 'recipient_names']:
+            frame[column] = pd.Series(dtype=object)
+        return frame
+
+    team1_names = _join_names(frame['team1_player1_name'], frame['team1_player2_name'])
+    team2_names = _join_names(frame['team2_player1_name'], frame['team2_player2_name'])
+    # Rows without team players (singles, or doubles entered as individual players) use the player slots
+    is_team = frame['team1_player1_id'].notna() | frame['team2_player1_id'].notna()
+
+    side1 = np.where(is_team, team1_names.where(team1_names != "", "TBD"), _text(frame['player1_name'], "TBD"))
+    side2 = np.where(is_team, team2_names.where(team2_names != "", "TBD"), _text(frame['player2_name'], "TBD"))
+
+    frame['team1_names'] = team1_names
+    frame['team2_names'] = team2_names
+    frame['match_description'] = pd.Series(side1, index=frame.index, dtype=object) + " vs " + side2
+
+    if 'winner_id' in frame.columns:
+        winner_id = frame['winner_id']
+        winner_team = pd.to_numeric(frame['winner_team'], errors='coerce')
+        frame['winner_names'] = np.select(
+            [is_team & (winner_team == 1),
+             is_team & (winner_team == 2),
+             winner_id.notna() & (winner_id == frame['player1_id']),
+             winner_id.notna() & (winner_id == frame['player2_id'])],
+            [team1_names, team2_names, _text(frame['player1_name']), _text(frame['player2_name'])],
+            default="")
+        frame['winner_label'] = np.where(is_team, "Winners", "Winner")
+    else:
+        frame['winner_names'] = ""
+        frame['winner_label'] = "Winner"
+
+    # Recipient lists, one entry per slot with an email, in slot order
+    email_columns = [f"{slot}_email" for slot in PLAYER_SLOTS]
+    name_columns = [f"{slot}_name" for slot in PLAYER_SLOTS]
+    emails = frame[email_columns].replace("", np.nan).stack().dropna()
+    names = frame[name_columns].set_axis(email_columns, axis=1).fillna("Participant").stack().reindex(emails.index)
+    no_recipients = pd.Series([[]] * len(frame), index=frame.index, dtype=object)
+    frame['recipients'] = emails.groupby(level=0).agg(list).reindex(frame.index).fillna(no_recipients)
+    frame['recipient_names'] = names.groupby(level=0).agg(list).reindex(frame.index).fillna(no_recipients)
+    return frame
+
+
+def explode_recipients(frame):
+    """
+    Expand a notification frame to one row per recipient for personalised emails.
+
+    Adds recipient_name and recipient_email; rows without any email are dropped.
+    """
+    exploded = frame.explode(['recipients', 'recipient_names'])
+    exploded = exploded[exploded['recipients'].notna()]
+    exploded = exploded.assign(recipient_email=exploded['recipients'], recipient_name=exploded['recipient_names'])
+    exploded['recipients'] = exploded['recipient_email'].map(lambda email: [email])
+    exploded['recipient_names'] = exploded['recipient_name'].map(lambda name: [name])
+    # The same address listed twice on one match (e.g. a shared mailbox) gets one email
+    exploded['recipient_key'] = exploded['recipient_email'].astype(str).str.strip().str.lower()
+    exploded = exploded.drop_duplicates(['id', 'recipient_key'])
+    return exploded.reset_index(drop=True)
+
+
+def _compile(source):
+    """Split a str.format style template into (literal, field, format_spec) parts"""
+    parts = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(source or ""):
+        if field is not None:
+            if not field.isidentifier():
+                raise ValueError(f"Invalid placeholder {{{field}}}: use plain names like {{recipient_name}}")
+            if conversion:
+                raise ValueError(f"Conversions are not supported in placeholder {{{field}!{conversion}}}")
+        parts.append((literal, field, format_spec or ""))
+    return parts
+
+
+class EmailTemplate:
+    """
+    Email subject/text/HTML templates compiled once and rendered column-wise over a DataFrame.
+
+    Templates use {column} placeholders (str.format syntax, {{ and }} for literal braces).
+    If no HTML template is given one is derived from the text template. Values are
+    HTML-escaped, except that a {name}_html column is used verbatim for {name} if present.
+    """
+
+    def __init__(self, subject, text, html_text=None):
+        self.subject_parts = _compile(subject)
+        self.text_parts = _compile(text)
+        # HTML derived from the text keeps line breaks in both literals and values
+        self.derived_html = html_text is None
+        if html_text is None:
+            # Derive HTML from the text: escape literals and keep line breaks
+            self.html_parts = [(html.escape(literal).replace("\n", "<br>\n"), field, format_spec)
+                               for literal, field, format_spec in self.text_parts]
+        else:
+            self.html_parts = _compile(html_text)
+
+    @property
+    def fields(self):
+        """Names of all placeholders used by the template"""
+        return sorted({field for parts in (self.subject_parts, self.text_parts, self.html_parts)
+                       for _, field, _ in parts if field})
+
+    def _render(self, parts, frame, columns, escape):
+        rendered = pd.Series("", index=frame.index, dtype=object)
+        for literal, field, format_spec in parts:
+            if literal:
+                rendered = rendered + literal
+            if field is None:
+                continue
+            key = (field, format_spec, escape)
+            if key not in columns and escape and f"{field}_html" in frame.columns:
+                # Columns with a prebuilt HTML version are inserted as-is
+                columns[key] = frame[f"{field}_html"].astype(str).astype(object)
+            if key not in columns:
+                values = frame[field]
+                if format_spec:
+                    values = values.map(lambda value: "" if pd.isna(value) else format(value, format_spec))
+                else:
+                    values = _text(values)
+                # Plain object strings so concatenation works whatever dtype the column was loaded with
+                values = values.astype(str).astype(object)
+                if escape:
+                    values = values.map(html.escape)
+                    if self.derived_html:
+                        values = values.str.replace("\n", "<br>\n", regex=False).astype(object)
+                columns[key] = values
+            rendered = rendered + columns[key]
+        return rendered
+
+    def render(self, frame):
+        """
+        Render subject, body and html_body for every row of the frame.
+
+        Returns:
+            DataFrame: subject, body and html_body columns aligned with the frame's index
+        """
+        missing = [field for field in self.fields if field not in frame.columns]
+        if missing:
+            raise ValueError(f"Unknown placeholder(s): {', '.join('{' + f + '}' for f in missing)}")
+
+        columns = {}
+        return pd.DataFrame({
+            'subject': self._render(self.subject_parts, frame, columns, escape=False),
+            'body': self._render(self.text_parts, frame, columns, escape=False),
+            'html_body': self._render(self.html_parts, frame, columns, escape=True),
+        }, index=frame.index)
+
+
+def render_notifications(frame, template, per_recipient=False):
+    """
+    Render notifications for every row of a notification frame in one pass.
+
+    Args:
+        frame (DataFrame): Output of get_notification_frame() / get_fixture_notification_frame()
+        template (EmailTemplate): Compiled template
+        per_recipient (bool): One personalised email per recipient instead of one per match
+
+    Returns:
+        tuple: (DataFrame of emails with id, recipients, recipient_names, match_description,
+                subject, body, html_body; render time in seconds)
+    """
+    started = time.perf_counter()
+    if per_recipient:
+        frame = explode_recipients(frame)
+    else:
+        frame = frame.assign(recipient_name="Participant", recipient_email="")
+    frame = frame[frame['recipients'].map(len) > 0]
+
+    rendered = template.render(frame)
+    emails = pd.concat([frame[['id', 'recipients', 'recipient_names', 'match_description']], rendered], axis=1)
+    return emails.reset_index(drop=True), time.perf_counter() - started
+
+
+def render_digests(frame, template, line_template=None):
+    """
+    Render one digest email per unique recipient listing all of their matches.
+
+    Recipients are matched case-insensitively on email address across every
+    category and round in the frame, so a player with three matches gets one
+    email instead of three.
+
+    Args:
+        frame (DataFrame): Output of get_notification_frame() / get_fixture_notification_frame()
+        template (EmailTemplate): Digest template; may use {matches}, {match_count},
+            {recipient_name} and {recipient_email}
+        line_template (EmailTemplate, optional): Template for each match line (defaults to DIGEST_LINE)
+
+    Returns:
+        tuple: (DataFrame of emails with id (list of match IDs), recipients, recipient_names,
+                match_description, match_count, subject, body, html_body; render time in seconds)
+    """
+    started = time.perf_counter()
+    line_template = line_template or EmailTemplate("", DIGEST_LINE)
+
+    exploded = explode_recipients(frame)
+    if exploded.empty:
+        columns = ['id', 'recipients', 'recipient_names', 'match_description', 'match_count', 'subject', 'body', 'html_body']
+        return pd.DataFrame(columns=columns), time.perf_counter() - started
+
+    time_slot = _text(exploded['time_slot']) if 'time_slot' in exploded.columns else pd.Series("", index=exploded.index, dtype=object)
+    exploded['time_note'] = np.where(time_slot != "", " (" + time_slot.astype(str) + ")", "")
+
+    lines = line_template.render(exploded)
+    exploded['digest_line'] = lines['body']
+    exploded['digest_line_html'] = lines['html_body']
+
+    grouped = exploded.groupby('recipient_key', sort=False)
+    digests = grouped.agg(
+        id=('id', list),
+        recipient_email=('recipient_email', 'first'),
+        recipient_name=('recipient_name', 'first'),
+        match_count=('id', 'size'),
+        matches=('digest_line', "\n".join),
+        matches_html=('digest_line_html', "<br>\n".join),
+    ).reset_index(drop=True)
+    digests['recipients'] = digests['recipient_email'].map(lambda email: [email])
+    digests['recipient_names'] = digests['recipient_name'].map(lambda name: [name])
+    digests['match_description'] = digests['recipient_name'] + ": " + digests['match_count'].astype(str) + " match(es)"
+
+    rendered = template.render(digests)
+    emails = pd.concat([digests[['id', 'recipients', 'recipient_names', 'match_description', 'match_count']], rendered], axis=1)
+    return emails, time.perf_counter() - started
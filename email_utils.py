@@ -0,0 +1,325 @@
+import os
+import smtplib
+import mailbox
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+
+from import_utils import lazy_import, module_available
+
+# Windows-specific modules (for Outlook integration), only present on Windows systems.
+# They are imported when an Outlook session is first opened, not at startup.
+OUTLOOK_AVAILABLE = module_available("win32com") and module_available("pythoncom")
+win32com_client = lazy_import("win32com.client")
+pythoncom = lazy_import("pythoncom")
+
+# Transport configuration (environment driven so the same code runs on Windows desktops and Linux hosts)
+# EMAIL_TRANSPORT: "outlook", "smtp" or "file". When unset, Outlook is used if available,
+# otherwise SMTP if SMTP_HOST is configured.
+EMAIL_TRANSPORT = os.environ.get("EMAIL_TRANSPORT", "").strip().lower()
+EMAIL_SENDER = os.environ.get("EMAIL_SENDER", "tournament.organizer@example.com")
+SMTP_HOST = os.environ.get("SMTP_HOST", "")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "25"))
+SMTP_USER = os.environ.get("SMTP_USER", "")
+SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "0") == "1"
+SMTP_TIMEOUT = float(os.environ.get("SMTP_TIMEOUT", "30"))
+# Maildir used by the file transport and for drafts on non-Outlook transports
+EMAIL_MAILDIR = os.environ.get("EMAIL_MAILDIR", "outbox")
+EMAIL_DRAFTS_DIR = os.environ.get("EMAIL_DRAFTS_DIR", os.path.join(EMAIL_MAILDIR, "drafts"))
+
+# Transport held open by email_session() for the current thread (Streamlit runs each session in its own thread)
+_session = threading.local()
+
+
+def build_message(recipients, subject, body, html_body=None, sender=None):
+    """Build a MIME message with a plain text body and optional HTML alternative"""
+    if isinstance(recipients, str):
+        recipients = [recipients]
+
+    msg = EmailMessage()
+    msg['From'] = sender or EMAIL_SENDER
+    msg['To'] = ", ".join(recipients)
+    msg['Subject'] = subject
+    msg['Date'] = formatdate(localtime=True)
+    msg['Message-ID'] = make_msgid()
+    msg.set_content(body or "")
+    if html_body:
+        msg.add_alternative(html_body, subtype='html')
+    return msg
+
+
+class EmailTransport(ABC):
+    """Base class for email backends used by send_email()"""
+
+    name = "base"
+
+    def open(self):
+        """Open any underlying connection (no-op by default)"""
+        pass
+
+    def close(self):
+        """Close any underlying connection (no-op by default)"""
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def save_draft(self, recipients, subject, body, html_body=None):
+        """Store the message in the drafts Maildir instead of sending it"""
+        os.makedirs(os.path.dirname(os.path.abspath(EMAIL_DRAFTS_DIR)), exist_ok=True)
+        drafts = mailbox.Maildir(EMAIL_DRAFTS_DIR, create=True)
+        drafts.add(build_message(recipients, subject, body, html_body))
+        return True
+
+    @abstractmethod
+    def send(self, recipients, subject, body, html_body=None, save_copy=True, draft_only=False, open_outlook=False):
+        """Send (or draft) one message; raise the backend's exception on failure"""
+
+
+class OutlookTransport(EmailTransport):
+    """Send or draft emails through the Outlook desktop application (Windows only)"""
+
+    name = "outlook"
+
+    def __init__(self):
+        self.outlook = None
+        self.namespace = None
+
+    def open(self):
+        if self.outlook is None:
+            # Initialize COM for this thread (required for multithreaded applications)
+            pythoncom.CoInitialize()
+            self.outlook = win32com_client.Dispatch("Outlook.Application")
+            self.namespace = self.outlook.GetNamespace("MAPI")
+
+    def close(self):
+        if self.outlook is not None:
+            self.outlook = None
+            self.namespace = None
+            try:
+                pythoncom.CoUninitialize()
+            except Exception:
+                pass
+
+    def send(self, recipients, subject, body, html_body=None, save_copy=True, draft_only=False, open_outlook=False):
+        self.open()
+        mail = self.outlook.CreateItem(0)  # olMailItem
+
+        # Set recipients
+        if isinstance(recipients, list):
+            mail.To = "; ".join(recipients)
+        else:
+            mail.To = recipients
+
+        # Set subject and body
+        mail.Subject = subject
+        if html_body:
+            mail.HTMLBody = html_body
+        else:
+            mail.Body = body
+
+        # Try to save to sent items folder for both old and new Outlook
+        if save_copy:
+            try:
+                # Method for older Outlook versions
+                mail.SaveSentMessageFolder = self.namespace.GetDefaultFolder(5)  # 5 = olFolderSentMail
+            except Exception:
+                # For newer Outlook versions the default behavior saves to sent items anyway
+                pass
+
+        # If draft_only is True, save as draft instead of sending
+        if draft_only:
+            mail.Save()
+
+            # Try to open Outlook if requested
+            if open_outlook:
+                try:
+                    # Try to make Outlook visible
+                    self.outlook.Application.ActiveExplorer().Activate()
+                except Exception:
+                    # If that fails, try to launch Outlook via shell
+                    try:
+                        os.system('start outlook.exe')
+                    except Exception:
+                        pass
+        else:
+            mail.Send()
+        return True
+
+
+class SMTPTransport(EmailTransport):
+    """Send emails over SMTP, reusing one connection for every message sent while open"""
+
+    name = "smtp"
+
+    def __init__(self, host=None, port=None, user=None, password=None, starttls=None, timeout=None):
+        self.host = host or SMTP_HOST or "localhost"
+        self.port = port or SMTP_PORT
+        self.user = user if user is not None else SMTP_USER
+        self.password = password if password is not None else SMTP_PASSWORD
+        self.starttls = SMTP_STARTTLS if starttls is None else starttls
+        self.timeout = timeout or SMTP_TIMEOUT
+        self.connection = None
+
+    def open(self):
+        if self.connection is None:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            connection.ehlo()
+            if self.starttls:
+                connection.starttls()
+                connection.ehlo()
+            if self.user:
+                connection.login(self.user, self.password)
+            self.connection = connection
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.quit()
+            except smtplib.SMTPException:
+                self.connection.close()
+            self.connection = None
+
+    def send(self, recipients, subject, body, html_body=None, save_copy=True, draft_only=False, open_outlook=False):
+        if draft_only:
+            return self.save_draft(recipients, subject, body, html_body)
+
+        msg = build_message(recipients, subject, body, html_body)
+        self.open()
+        try:
+            self.connection.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped an idle session; reconnect once and retry
+            self.connection = None
+            self.open()
+            self.connection.send_message(msg)
+        return True
+
+
+class FileTransport(EmailTransport):
+    """Write every message to a local Maildir instead of sending it (for tests and dry runs)"""
+
+    name = "file"
+
+    def __init__(self, path=None):
+        self.path = path or EMAIL_MAILDIR
+        self.maildir = None
+
+    def open(self):
+        if self.maildir is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.maildir = mailbox.Maildir(self.path, create=True)
+
+    def close(self):
+        self.maildir = None
+
+    def send(self, recipients, subject, body, html_body=None, save_copy=True, draft_only=False, open_outlook=False):
+        if draft_only:
+            return self.save_draft(recipients, subject, body, html_body)
+
+        self.open()
+        self.maildir.add(build_message(recipients, subject, body, html_body))
+        return True
+
+
+TRANSPORTS = {
+    "outlook": OutlookTransport,
+    "smtp": SMTPTransport,
+    "file": FileTransport,
+}
+
+
+def get_transport_name():
+    """Return the configured transport name, or None if no backend is usable on this host"""
+    if EMAIL_TRANSPORT:
+        return EMAIL_TRANSPORT
+    if OUTLOOK_AVAILABLE:
+        return "outlook"
+    if SMTP_HOST:
+        return "smtp"
+    return None
+
+
+def get_transport(name=None):
+    """Create a transport instance for the given (or configured) backend name"""
+    name = name or get_transport_name()
+    if name is None:
+        return None
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown email transport: {name}. Use one of {', '.join(TRANSPORTS)}")
+    if name == "outlook" and not OUTLOOK_AVAILABLE:
+        raise RuntimeError("Outlook transport requires Microsoft Outlook and pywin32 on Windows")
+    return TRANSPORTS[name]()
+
+
+def get_session_transport():
+    """Return the transport held open by an enclosing email_session(), if any"""
+    return getattr(_session, "transport", None)
+
+
+@contextmanager
+def email_session(name=None, transport=None):
+    """
+    Keep a single transport connection open for a run of send_email() calls.
+
+    Bulk notification loops wrap their sends in this so that SMTP connects,
+    authenticates and negotiates TLS once per run instead of once per message.
+
+    Args:
+        name (str, optional): Transport name, defaults to the configured one
+        transport (EmailTransport, optional): Already resolved transport to hold open instead.
+            Callers that must not fail half-way (send jobs) resolve it first with get_transport(),
+            which raises ValueError/RuntimeError when the configuration is unusable.
+
+    Yields:
+        EmailTransport: The open transport, or None if email is unavailable
+    """
+    outer = get_session_transport()
+    if outer is not None:
+        # Nested sessions share the outer connection
+        yield outer
+        return
+
+    transport = transport or get_transport(name)
+    if transport is None:
+        yield None
+        return
+
+    # Connections are opened lazily by the first send so that connection errors
+    # surface through send_email() like any other delivery failure
+    _session.transport = transport
+    try:
+        yield transport
+    finally:
+        _session.transport = None
+        transport.close()
+
+
+def send_email(recipients, subject, body, html_body=None, save_copy=True, draft_only=False, open_outlook=False):
+    """
+    Send (or draft) one email through the active session transport or a one-shot transport.
+
+    Raises the backend's exception on failure so callers can report it.
+
+    Returns:
+        bool: True if the message was handed to the backend
+    """
+    transport = get_session_transport()
+    if transport is not None:
+        return transport.send(recipients, subject, body, html_body=html_body, save_copy=save_copy,
+                              draft_only=draft_only, open_outlook=open_outlook)
+
+    transport = get_transport()
+    if transport is None:
+        raise RuntimeError("No email transport configured")
+    with transport:
+        return transport.send(recipients, subject, body, html_body=html_body, save_copy=save_copy,
+                              draft_only=draft_only, open_outlook=open_outlook)
@@ -0,0 +1,168 @@
+import json
+
+from db_utils import connect, create_triggers, get_database
+
+# Events returned per get_changes_since() call unless a limit is given
+CHANGES_PAGE_SIZE = 1000
+
+# Append-only change log. seq is AUTOINCREMENT so it only ever grows and is never reused,
+# which lets consumers remember the last seq they applied and ask for everything after it.
+EVENTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_type TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        entity_id INTEGER,
+        payload TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+_PARTICIPANT_PAYLOAD = ("json_object('emp_id', {row}.emp_id, 'name', {row}.name, 'game', {row}.game, "
+                        "'category', {row}.category, 'slot', {row}.slot, 'registered_at_desk', {row}.registered_at_desk)")
+_MATCH_PAYLOAD = ("json_object('match_code', {row}.match_code, 'category', {row}.category, "
+                  "'round_number', {row}.round_number, 'match_number', {row}.match_number, "
+                  "'match_status', {row}.match_status, 'winner_id', {row}.winner_id, "
+                  "'winner_team', {row}.winner_team, 'score', {row}.score)")
+_FIXTURE_PAYLOAD = ("json_object('category', {row}.category, 'time_slot', {row}.time_slot, "
+                    "'location', {row}.location, 'court_number', {row}.court_number, "
+                    "'fixture_status', {row}.fixture_status, 'emails_sent', {row}.emails_sent)")
+
+
+def _log(event_type, entity, row, payload):
+    return (f"INSERT INTO events (event_type, entity, entity_id, payload) "
+            f"VALUES ({event_type}, '{entity}', {row}.id, {payload.format(row=row)});")
+
+
+# Row-level triggers record every change however it is made (helper functions, inline
+# UI queries, bulk imports), so no mutation path can forget to log. Archiving rows and
+# compacting archived ones away are logged once by archive_utils, not per row; archived
+# rows inserted by a snapshot restore are covered by its "reset" event.
+EVENT_TRIGGERS = {
+    "trg_events_participant_insert": ("AFTER INSERT ON participants WHEN NEW.archived = 0 BEGIN "
+                                      + _log("'participant_added'", "participant", "NEW", _PARTICIPANT_PAYLOAD) + " END"),
+    "trg_events_participant_update": ("AFTER UPDATE ON participants WHEN OLD.archived = 0 AND NEW.archived = 0 BEGIN "
+                                      + _log("CASE WHEN NEW.registered_at_desk IS OLD.registered_at_desk THEN 'participant_updated' "
+                                             "WHEN NEW.registered_at_desk = 1 THEN 'participant_registered' "
+                                             "ELSE 'participant_unregistered' END",
+                                             "participant", "NEW", _PARTICIPANT_PAYLOAD) + " END"),
+    "trg_events_participant_delete": ("AFTER DELETE ON participants WHEN OLD.archived = 0 BEGIN "
+                                      + _log("'participant_deleted'", "participant", "OLD", _PARTICIPANT_PAYLOAD) + " END"),
+    "trg_events_match_insert": ("AFTER INSERT ON matches WHEN NEW.archived = 0 BEGIN "
+                                + _log("'match_created'", "match", "NEW", _MATCH_PAYLOAD) + " END"),
+    "trg_events_match_update": ("AFTER UPDATE ON matches WHEN OLD.archived = 0 AND NEW.archived = 0 BEGIN "
+                                + _log("CASE WHEN NEW.match_status = 'completed' AND OLD.match_status IS NOT 'completed' THEN 'match_completed' "
+                                       "WHEN NEW.winner_id IS NOT OLD.winner_id OR NEW.winner_team IS NOT OLD.winner_team "
+                                       "OR NEW.score IS NOT OLD.score THEN 'match_result_updated' "
+                                       "ELSE 'match_updated' END",
+                                       "match", "NEW", _MATCH_PAYLOAD) + " END"),
+    "trg_events_match_delete": ("AFTER DELETE ON matches WHEN OLD.archived = 0 BEGIN "
+                                + _log("'match_deleted'", "match", "OLD", _MATCH_PAYLOAD) + " END"),
+    "trg_events_fixture_insert": ("AFTER INSERT ON fixtures WHEN NEW.archived = 0 BEGIN "
+                                  + _log("'fixture_created'", "fixture", "NEW", _FIXTURE_PAYLOAD) + " END"),
+    "trg_events_fixture_update": ("AFTER UPDATE ON fixtures WHEN OLD.archived = 0 AND NEW.archived = 0 BEGIN "
+                                  + _log("CASE WHEN NEW.emails_sent = 1 AND OLD.emails_sent IS NOT 1 THEN 'fixture_emails_sent' "
+                                         "ELSE 'fixture_updated' END",
+                                         "fixture", "NEW", _FIXTURE_PAYLOAD) + " END"),
+    "trg_events_fixture_delete": ("AFTER DELETE ON fixtures WHEN OLD.archived = 0 BEGIN "
+                                  + _log("'fixture_deleted'", "fixture", "OLD", _FIXTURE_PAYLOAD) + " END"),
+    "trg_events_email_job_batch_sent": ("AFTER UPDATE OF status ON email_job_batches "
+                                        "WHEN NEW.status = 'sent' AND OLD.status IS NOT 'sent' BEGIN "
+                                        "INSERT INTO events (event_type, entity, entity_id, payload) "
+                                        "VALUES ('email_sent', 'email_job', NEW.job_id, json_object("
+                                        "'batch_id', NEW.id, 'subject', NEW.subject, 'recipients', NEW.recipient_count, "
+                                        "'draft_only', (SELECT draft_only FROM email_jobs WHERE id = NEW.job_id))); END"),
+}
+
+
+def create_event_log(conn):
+    """
+    Create the events table and its triggers on an open connection.
+
+    Called from init_database(); triggers dropped by a table migration, or defined
+    differently by an older version, are recreated.
+    """
+    cursor = conn.cursor()
+    cursor.execute(EVENTS_TABLE)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_entity ON events (entity, entity_id)")
+    create_triggers(conn, EVENT_TRIGGERS)
+
+
+def drop_event_triggers(conn):
+    """Drop the per-row event triggers (bulk replacements log a single "reset" event instead)"""
+    for name in EVENT_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def record_event(event_type, entity, entity_id=None, payload=None, conn=None):
+    """
+    Append an event for changes that do not go through a logged table (e.g. an email sent directly).
+
+    Args:
+        event_type (str): e.g. "email_sent"
+        entity (str): Kind of thing the event is about
+        entity_id (int, optional): Its ID
+        payload (dict, optional): JSON-serialisable details
+        conn (sqlite3.Connection, optional): Write inside the caller's transaction
+
+    Returns:
+        int: The new event's seq
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(get_database())
+    try:
+        cursor = conn.execute(
+            "INSERT INTO events (event_type, entity, entity_id, payload) VALUES (?, ?, ?, ?)",
+            (event_type, entity, entity_id, json.dumps(payload) if payload is not None else None))
+        if own_conn:
+            conn.commit()
+        return cursor.lastrowid
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def get_latest_seq():
+    """Return the seq of the newest event (0 when the log is empty)"""
+    conn = connect(get_database())
+    seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+    conn.close()
+    return seq
+
+
+def get_changes_since(seq=0, limit=CHANGES_PAGE_SIZE, entities=None):
+    """
+    Return events with a seq greater than `seq`, oldest first.
+
+    Callers keep the seq of the last event they applied and pass it back; when a page
+    comes back full there are more events waiting. A "reset" event (e.g. after a
+    snapshot restore) means the consumer should reload from scratch.
+
+    Args:
+        seq (int): Last seq already applied (0 for everything)
+        limit (int): Maximum number of events to return
+        entities (list, optional): Only return events about these entities
+
+    Returns:
+        list: Dicts with seq, event_type, entity, entity_id, payload (dict) and created_at
+    """
+    query = "SELECT seq, event_type, entity, entity_id, payload, created_at FROM events WHERE seq > ?"
+    params = [seq]
+    if entities:
+        query += f" AND (entity IN ({', '.join('?' * len(entities))}) OR event_type = 'reset')"
+        params.extend(entities)
+    query += " ORDER BY seq LIMIT ?"
+    params.append(limit)
+
+    conn = connect(get_database())
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return [{
+        'seq': row[0],
+        'event_type': row[1],
+        'entity': row[2],
+        'entity_id': row[3],
+        'payload': json.loads(row[4]) if row[4] else {},
+        'created_at': row[5],
+    } for row in rows]
@@ -0,0 +1,311 @@
+import os
+import io
+import csv
+import sys
+import zipfile
+import argparse
+from datetime import datetime
+
+from import_utils import lazy_import
+from db_utils import connect, get_database
+from tournaments_utils import use_current_tournament, use_database
+
+# openpyxl is only needed for xlsx exports; import it on first use
+openpyxl = lazy_import("openpyxl")
+
+# Rows fetched from SQLite per round trip; memory use is bounded by this, not by table size
+EXPORT_CHUNK_SIZE = 5000
+
+# Excel's hard limit is 1,048,576 rows per sheet (one is used by the header)
+XLSX_MAX_ROWS = 1048575
+
+# Directory generated export files are written to
+EXPORT_DIR = "exports"
+
+# Readable exports of each table's active rows; player IDs are resolved to emp_id/name pairs in SQL.
+# {game_filter} becomes "AND <table>.game = ?" when exporting one game (see _export_query)
+EXPORT_QUERIES = {
+    "participants": """
+        SELECT id, emp_id, name, email, gender, category, partner_emp_id, partner_gender,
+               game, location, sub_location, slot, registered_at_desk, registered_timestamp, created_at
+        FROM participants
+        WHERE archived = 0 {game_filter}
+        ORDER BY id
+    """,
+    "matches": """
+        SELECT m.id, m.match_code, m.match_number, m.round_number, m.game, m.category, m.match_status,
+               p1.emp_id AS player1_emp_id, p1.name AS player1_name,
+               p2.emp_id AS player2_emp_id, p2.name AS player2_name,
+               t1p1.name AS team1_player1_name, t1p2.name AS team1_player2_name,
+               t2p1.name AS team2_player1_name, t2p2.name AS team2_player2_name,
+               w.name AS winner_name, m.winner_team, m.score, m.advancement_type,
+               m.match_date, m.created_at, m.completed_at
+        FROM matches m
+        LEFT JOIN participants p1 ON m.player1_id = p1.id
+        LEFT JOIN participants p2 ON m.player2_id = p2.id
+        LEFT JOIN participants t1p1 ON m.team1_player1_id = t1p1.id
+        LEFT JOIN participants t1p2 ON m.team1_player2_id = t1p2.id
+        LEFT JOIN participants t2p1 ON m.team2_player1_id = t2p1.id
+        LEFT JOIN participants t2p2 ON m.team2_player2_id = t2p2.id
+        LEFT JOIN participants w ON m.winner_id = w.id
+        WHERE m.archived = 0 {game_filter}
+        ORDER BY m.category, m.round_number, m.match_number, m.id
+    """,
+    "fixtures": """
+        SELECT f.id, f.category, f.game, f.slot, f.round_number, f.time_slot, f.start_time, f.end_time,
+               f.location, f.court_number,
+               p1.emp_id AS player1_emp_id, p1.name AS player1_name,
+               p2.emp_id AS player2_emp_id, p2.name AS player2_name,
+               t1p1.name AS team1_player1_name, t1p2.name AS team1_player2_name,
+               t2p1.name AS team2_player1_name, t2p2.name AS team2_player2_name,
+               f.fixture_status, f.emails_sent, f.created_at
+        FROM fixtures f
+        LEFT JOIN participants p1 ON f.player1_id = p1.id
+        LEFT JOIN participants p2 ON f.player2_id = p2.id
+        LEFT JOIN participants t1p1 ON f.team1_player1_id = t1p1.id
+        LEFT JOIN participants t1p2 ON f.team1_player2_id = t1p2.id
+        LEFT JOIN participants t2p1 ON f.team2_player1_id = t2p1.id
+        LEFT JOIN participants t2p2 ON f.team2_player2_id = t2p2.id
+        WHERE f.archived = 0 {game_filter}
+        ORDER BY f.start_time, f.court_number, f.id
+    """,
+    "results": """
+        SELECT m.id AS match_id, m.match_code, m.category, m.round_number,
+               CASE WHEN m.team1_player1_id IS NOT NULL
+                    THEN t1p1.name || ' & ' || COALESCE(t1p2.name, '')
+                    ELSE p1.name END AS side1,
+               CASE WHEN m.team2_player1_id IS NOT NULL
+                    THEN t2p1.name || ' & ' || COALESCE(t2p2.name, '')
+                    ELSE p2.name END AS side2,
+               CASE WHEN m.winner_team = 1 THEN t1p1.name || ' & ' || COALESCE(t1p2.name, '')
+                    WHEN m.winner_team = 2 THEN t2p1.name || ' & ' || COALESCE(t2p2.name, '')
+                    ELSE w.name END AS winner,
+               m.score, m.advancement_type, m.completed_at
+        FROM matches m
+        LEFT JOIN participants p1 ON m.player1_id = p1.id
+        LEFT JOIN participants p2 ON m.player2_id = p2.id
+        LEFT JOIN participants t1p1 ON m.team1_player1_id = t1p1.id
+        LEFT JOIN participants t1p2 ON m.team1_player2_id = t1p2.id
+        LEFT JOIN participants t2p1 ON m.team2_player1_id = t2p1.id
+        LEFT JOIN participants t2p2 ON m.team2_player2_id = t2p2.id
+        LEFT JOIN participants w ON m.winner_id = w.id
+        WHERE m.archived = 0 AND m.match_status = 'completed' {game_filter}
+        ORDER BY m.category, m.round_number, m.match_number, m.id
+    """,
+}
+
+# Game column of each dataset's main table, as qualified in its query
+EXPORT_GAME_COLUMNS = {"participants": "game", "matches": "m.game", "fixtures": "f.game", "results": "m.game"}
+
+
+def _export_query(dataset, game=None):
+    """SQL and params for one dataset, for every game or only `game` (filtered on the active game indexes)"""
+    if game:
+        return EXPORT_QUERIES[dataset].format(game_filter=f"AND {EXPORT_GAME_COLUMNS[dataset]} = ?"), (game,)
+    return EXPORT_QUERIES[dataset].format(game_filter=""), ()
+
+
+def iter_export_rows(dataset, conn=None, chunk_size=EXPORT_CHUNK_SIZE, game=None):
+    """
+    Stream one export dataset from SQLite, for every game or only `game`.
+
+    Yields the column names first, then row tuples fetched chunk_size at a time,
+    so the whole table is never held in memory.
+    """
+    if dataset not in EXPORT_QUERIES:
+        raise ValueError(f"Unknown export dataset: {dataset}. Use one of {', '.join(EXPORT_QUERIES)}")
+
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(get_database())
+    try:
+        cursor = conn.cursor()
+        cursor.execute(*_export_query(dataset, game))
+        yield [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def export_csv(dataset, output, chunk_size=EXPORT_CHUNK_SIZE, game=None):
+    """
+    Write one dataset as CSV.
+
+    Args:
+        dataset (str): Key of EXPORT_QUERIES
+        output: File path or text file object
+        chunk_size (int): Rows fetched per round trip
+        game (str, optional): Only export this game's rows
+
+    Returns:
+        int: Number of data rows written
+    """
+    own_file = isinstance(output, (str, os.PathLike))
+    handle = open(output, "w", newline="", encoding="utf-8") if own_file else output
+    try:
+        writer = csv.writer(handle)
+        rows = iter_export_rows(dataset, chunk_size=chunk_size, game=game)
+        writer.writerow(next(rows))
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+    finally:
+        if own_file:
+            handle.close()
+
+
+def export_csv_zip(datasets, output, chunk_size=EXPORT_CHUNK_SIZE, game=None):
+    """
+    Write several datasets as CSV files inside one zip archive.
+
+    Returns:
+        dict: Data rows written per dataset
+    """
+    counts = {}
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for dataset in datasets:
+            # ZipFile.open streams the entry, so rows are compressed as they are written
+            with archive.open(f"{dataset}.csv", "w") as entry:
+                text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+                counts[dataset] = export_csv(dataset, text, chunk_size=chunk_size, game=game)
+                text.flush()
+                text.detach()
+    return counts
+
+
+def export_xlsx(datasets, output, chunk_size=EXPORT_CHUNK_SIZE, game=None):
+    """
+    Write datasets to an xlsx workbook, one sheet per dataset, using openpyxl's write-only mode.
+
+    Rows are appended straight from the SQLite cursor; datasets larger than one
+    Excel sheet continue on "<name> (2)", "<name> (3)", ...
+
+    Args:
+        datasets (list): Keys of EXPORT_QUERIES
+        output: File path or binary file object
+        chunk_size (int): Rows fetched per round trip
+        game (str, optional): Only export this game's rows
+
+    Returns:
+        dict: Data rows written per dataset
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    header_font = openpyxl.styles.Font(bold=True)
+    counts = {}
+
+    for dataset in datasets:
+        rows = iter_export_rows(dataset, chunk_size=chunk_size, game=game)
+        columns = next(rows)
+        sheet = None
+        sheet_number = 0
+        sheet_rows = XLSX_MAX_ROWS
+        count = 0
+
+        def new_sheet():
+            title = dataset.title() if sheet_number == 1 else f"{dataset.title()} ({sheet_number})"
+            created = workbook.create_sheet(title=title[:31])
+            header = []
+            for column in columns:
+                cell = openpyxl.cell.WriteOnlyCell(created, value=column)
+                cell.font = header_font
+                header.append(cell)
+            created.append(header)
+            return created
+
+        for row in rows:
+            if sheet_rows >= XLSX_MAX_ROWS:
+                sheet_number += 1
+                sheet = new_sheet()
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+            count += 1
+
+        if sheet is None:
+            # Keep an empty sheet with headers so every requested dataset is present
+            sheet_number = 1
+            new_sheet()
+        counts[dataset] = count
+
+    workbook.save(output)
+    return counts
+
+
+def build_export_file(datasets, file_format="xlsx", directory=None, chunk_size=EXPORT_CHUNK_SIZE, game=None):
+    """
+    Write an export to a timestamped file under the export directory.
+
+    Args:
+        datasets (list): Keys of EXPORT_QUERIES
+        file_format (str): "xlsx" (one sheet per dataset) or "csv" (single dataset as .csv,
+            several datasets as a zip of CSV files)
+        game (str, optional): Only export this game's rows (the file name starts with it)
+
+    Returns:
+        tuple: (file path, rows written per dataset)
+    """
+    directory = directory or EXPORT_DIR
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    name = datasets[0] if len(datasets) == 1 else "tournament"
+    if game:
+        name = f"{game.lower().replace(' ', '_')}_{name}"
+
+    if file_format == "xlsx":
+        path = os.path.join(directory, f"{name}_{stamp}.xlsx")
+        counts = export_xlsx(datasets, path, chunk_size=chunk_size, game=game)
+    elif file_format == "csv" and len(datasets) == 1:
+        path = os.path.join(directory, f"{name}_{stamp}.csv")
+        counts = {datasets[0]: export_csv(datasets[0], path, chunk_size=chunk_size, game=game)}
+    elif file_format == "csv":
+        path = os.path.join(directory, f"{name}_{stamp}_csv.zip")
+        counts = export_csv_zip(datasets, path, chunk_size=chunk_size, game=game)
+    else:
+        raise ValueError(f"Unknown export format: {file_format}")
+    return path, counts
+
+
+def main(argv=None):
+    """Command line entry point for exporting tournament data"""
+    parser = argparse.ArgumentParser(description="Export tournament data to xlsx or csv")
+    parser.add_argument("datasets", nargs="*", default=list(EXPORT_QUERIES),
+                        help=f"Datasets to export ({', '.join(EXPORT_QUERIES)}); default all")
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx")
+    parser.add_argument("--output", help="Output file (default: timestamped file in exports/)")
+    parser.add_argument("--game", help="Only export this game's rows, e.g. Chess (default: every game)")
+    parser.add_argument("--db", help="Tournament database path (default: the current tournament)")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    if args.db:
+        use_database(args.db)
+    else:
+        use_current_tournament()
+
+    started = datetime.now()
+    if args.output is None:
+        path, counts = build_export_file(args.datasets, args.format, chunk_size=args.chunk_size, game=args.game)
+    elif args.format == "xlsx":
+        path, counts = args.output, export_xlsx(args.datasets, args.output, chunk_size=args.chunk_size, game=args.game)
+    elif len(args.datasets) == 1:
+        path, counts = args.output, {args.datasets[0]: export_csv(args.datasets[0], args.output,
+                                                                 chunk_size=args.chunk_size, game=args.game)}
+    else:
+        path, counts = args.output, export_csv_zip(args.datasets, args.output, chunk_size=args.chunk_size,
+                                                   game=args.game)
+
+    elapsed = (datetime.now() - started).total_seconds()
+    for dataset, count in counts.items():
+        print(f"{dataset}: {count} rows")
+    print(f"Wrote {path} in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,18 @@
-import sqlite3
 import pandas as pd
-import streamlit as st
 from datetime import datetime, timedelta
 import re
 
-# Database path
-DB_PATH = "tournament.db"
+from import_utils import lazy_import
+from db_utils import connect, get_database
+from teams_utils import get_teams
+from ratings_utils import seed_by_rating
 
-def get_all_fixtures():
-    """Get all fixtures from the database"""
-    conn = sqlite3.connect(DB_PATH)
+# Only parse_time_slot() reports through Streamlit; the API and CLI tools never load it
+st = lazy_import("streamlit")
+
+def get_all_fixtures(game=None):
+    """Get all active fixtures from the database, or only one game's"""
+    conn = connect(get_database())
     query = """
     SELECT f.*, 
            p1.name as player1_name, p1.emp_id as player1_emp_id,
@@ -25,15 +28,16 @@ def get_all_fixtures():
     LEFT JOIN participants t1p2 ON f.team1_player2_id = t1p2.id
     LEFT JOIN participants t2p1 ON f.team2_player1_id = t2p1.id
     LEFT JOIN participants t2p2 ON f.team2_player2_id = t2p2.id
+    WHERE f.archived = 0 {}
     ORDER BY start_time
-    """
-    fixtures_df = pd.read_sql_query(query, conn)
+    """.format("AND f.game = ?" if game else "")
+    fixtures_df = pd.read_sql_query(query, conn, params=[game] if game else None)
     conn.close()
     return fixtures_df
 
-def get_fixtures_by_category(category):
-    """Get fixtures for a specific category"""
-    conn = sqlite3.connect(DB_PATH)
+def get_fixtures_by_category(category, game=None):
+    """Get active fixtures for a specific category (and game, when given)"""
+    conn = connect(get_database())
     query = """
     SELECT f.*, 
            p1.name as player1_name, p1.emp_id as player1_emp_id,
@@ -49,10 +53,10 @@ def get_fixtures_by_category(category):
     LEFT JOIN participants t1p2 ON f.team1_player2_id = t1p2.id
     LEFT JOIN participants t2p1 ON f.team2_player1_id = t2p1.id
     LEFT JOIN participants t2p2 ON f.team2_player2_id = t2p2.id
-    WHERE f.category = ?
+    WHERE f.archived = 0 AND f.category = ? {}
     ORDER BY start_time
-    """
-    fixtures_df = pd.read_sql_query(query, conn, params=(category,))
+    """.format("AND f.game = ?" if game else "")
+    fixtures_df = pd.read_sql_query(query, conn, params=(category, game) if game else (category,))
     conn.close()
     return fixtures_df
 
@@ -114,8 +118,8 @@ def generate_time_slots(start_time, end_time, interval_minutes, matches_per_slot
     
     return time_slots
 
-def assign_participants_to_slots(participants_df, time_slots, category, location):
-    """Assign participants to time slots based on category"""
+def assign_participants_to_slots(participants_df, time_slots, category, location, seeded=False):
+    """Assign participants to time slots based on category (by rating with `seeded`, see seed_by_rating())"""
     fixtures = []
     
     # Filter participants by category
@@ -128,26 +132,14 @@ def assign_participants_to_slots(participants_df, time_slots, category, location
     is_doubles = 'Doubles' in category
     
     if is_doubles:
-        # For doubles, we need to pair participants
-        # Group by partner_emp_id to get teams
-        teams = []
-        processed_ids = set()
-        
-        for _, player in category_participants.iterrows():
-            if player['id'] in processed_ids:
-                continue
-                
-            partner_emp_id = player['partner_emp_id']
-            if not partner_emp_id or pd.isna(partner_emp_id):
-                continue
-                
-            # Find the partner
-            partner = category_participants[category_participants['emp_id'] == partner_emp_id]
-            if not partner.empty:
-                partner = partner.iloc[0]
-                teams.append((player, partner))
-                processed_ids.add(player['id'])
-                processed_ids.add(partner['id'])
+        # Teams come from the teams table; keep those with both players in the given participants
+        participant_ids = set(category_participants['id'])
+        category_teams = get_teams(category)
+        category_teams = category_teams[category_teams['player1_id'].isin(participant_ids) &
+                                        category_teams['player2_id'].isin(participant_ids)]
+        teams = category_teams.to_dict('records')
+        if seeded:
+            teams = seed_by_rating(teams, lambda team: (team['game'], [team['player1_emp_id'], team['player2_emp_id']]))
         
         # Create fixtures for doubles teams
         for i in range(0, len(teams), 2):
@@ -164,15 +156,19 @@ def assign_participants_to_slots(participants_df, time_slots, category, location
                     'court_number': (i//2) + 1,
                     'player1_id': None,
                     'player2_id': None,
-                    'team1_player1_id': team1[0]['id'],
-                    'team1_player2_id': team1[1]['id'],
-                    'team2_player1_id': team2[0]['id'],
-                    'team2_player2_id': team2[1]['id'],
+                    'team1_player1_id': team1['player1_id'],
+                    'team1_player2_id': team1['player2_id'],
+                    'team2_player1_id': team2['player1_id'],
+                    'team2_player2_id': team2['player2_id'],
+                    'team1_id': team1['id'],
+                    'team2_id': team2['id'],
                     'fixture_status': 'scheduled'
                 })
     else:
         # For singles, pair individual participants
         players = category_participants.to_dict('records')
+        if seeded:
+            players = seed_by_rating(players, lambda player: (player['game'], [player['emp_id']]))
         
         for i in range(0, len(players), 2):
             if i + 1 < len(players) and i//2 < len(time_slots):
@@ -202,7 +198,7 @@ def save_fixtures(fixtures):
     if not fixtures:
         return 0
         
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     cursor = conn.cursor()
     
     # Insert fixtures
@@ -211,8 +207,9 @@ def save_fixtures(fixtures):
             INSERT INTO fixtures (
                 category, time_slot, start_time, end_time, location, court_number,
                 player1_id, player2_id, team1_player1_id, team1_player2_id,
-                team2_player1_id, team2_player2_id, fixture_status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                team2_player1_id, team2_player2_id, team1_id, team2_id, fixture_status, game
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                      COALESCE(?, (SELECT game FROM participants WHERE id = COALESCE(?, ?))))
         ''', (
             fixture['category'], fixture['time_slot'], 
             fixture['start_time'], fixture['end_time'], 
@@ -220,7 +217,9 @@ def save_fixtures(fixtures):
             fixture['player1_id'], fixture['player2_id'],
             fixture['team1_player1_id'], fixture['team1_player2_id'],
             fixture['team2_player1_id'], fixture['team2_player2_id'],
-            fixture['fixture_status']
+            fixture.get('team1_id'), fixture.get('team2_id'),
+            fixture['fixture_status'],
+            fixture.get('game'), fixture['player1_id'], fixture['team1_player1_id']
         ))
     
     conn.commit()
@@ -231,7 +230,7 @@ def save_fixtures(fixtures):
 
 def delete_fixture(fixture_id):
     """Delete a fixture from the database"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     cursor = conn.cursor()
     
     cursor.execute("DELETE FROM fixtures WHERE id = ?", (fixture_id,))
@@ -243,7 +242,7 @@ def delete_fixture(fixture_id):
 
 def get_fixture_emails(fixture_id):
     """Get email data for a fixture"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     query = """
     SELECT f.*, 
            p1.name as player1_name, p1.emp_id as player1_emp_id, p1.email as player1_email,
@@ -334,7 +333,7 @@ def get_fixture_emails(fixture_id):
 
 def mark_emails_sent(fixture_id):
     """Mark emails as sent for a fixture"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     cursor = conn.cursor()
     
     cursor.execute("UPDATE fixtures SET emails_sent = 1 WHERE id = ?", (fixture_id,))
@@ -346,7 +345,7 @@ def mark_emails_sent(fixture_id):
 
 def update_fixture(fixture_id, **kwargs):
     """Update fixture details"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     cursor = conn.cursor()
     
     # Build update query dynamically
@@ -370,7 +369,7 @@ def update_fixture(fixture_id, **kwargs):
 
 def get_fixture_by_id(fixture_id):
     """Get a single fixture by ID"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(get_database())
     query = """
     SELECT f.*, 
            p1.name as player1_name, p1.emp_id as player1_emp_id,
@@ -0,0 +1,51 @@
+import importlib
+import importlib.util
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access.
+
+    Heavy optional dependencies (plotly, openpyxl, win32com) are bound to a
+    LazyModule at module level so importing app.py or a utils module stays cheap,
+    and the real import happens the first time a chart, workbook or Outlook
+    session is actually needed.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self):
+        """True once the underlying module has been imported"""
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a LazyModule for `name` (e.g. "plotly.graph_objects")"""
+    return LazyModule(name)
+
+
+def module_available(name):
+    """
+    Check whether a top-level module can be imported, without importing it.
+
+    Used for *_AVAILABLE flags in place of a try/except import at module level.
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,177 @@
+import os
+import re
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from time import perf_counter
+
+from db_utils import set_query_recorder
+
+# PERF_PROFILING=1 profiles every rerun of every session; otherwise only sessions that turn on
+# the sidebar performance panel are profiled. Profiles are appended to PERF_LOG_PATH as JSON lines.
+PERF_PROFILING = os.environ.get("PERF_PROFILING", "0") == "1"
+PERF_LOG_PATH = os.environ.get("PERF_LOG_PATH", "perf_log.jsonl")
+# Statements slower than this (including fetching their rows) are flagged
+SLOW_QUERY_MS = float(os.environ.get("PERF_SLOW_QUERY_MS", "100"))
+# The same statement shape run this many times in one rerun is flagged as a likely N+1 pattern
+REPEATED_QUERY_THRESHOLD = int(os.environ.get("PERF_REPEATED_QUERY_THRESHOLD", "10"))
+# Queries kept per logged rerun (counts and totals always cover all of them)
+LOG_QUERY_LIMIT = 200
+
+# Session state key holding a profile that has started but not been finished yet
+_PENDING_KEY = "_perf_pending_profile"
+_log_lock = threading.Lock()
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Collapse whitespace and replace literals with ? so repeated statements group together"""
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", sql)).strip()
+
+
+class RerunProfile:
+    """Queries, connection opens and timed spans recorded during one script rerun"""
+
+    def __init__(self, section=None):
+        self.started_at = datetime.now()
+        self.section = section
+        self.status = "running"
+        self.connections = 0
+        self.queries = []
+        self.spans = []
+        self.total_ms = None
+        self._start = perf_counter()
+        self._span = ("startup", self._start, 0)
+
+    def on_connect(self):
+        self.connections += 1
+
+    def on_query(self, sql, source):
+        record = {'sql': sql, 'source': source, 'ms': 0.0, 'rows': 0}
+        self.queries.append(record)
+        return record
+
+    def _close_span(self, now):
+        name, start, first_query = self._span
+        self.spans.append({'name': name, 'ms': (now - start) * 1000, 'queries': len(self.queries) - first_query})
+
+    def mark(self, name):
+        """
+        End the current span of the script and start one called `name`.
+
+        Spans run from mark to mark (the first is "startup"), so a top-level
+        section can be timed without wrapping it in a block.
+        """
+        now = perf_counter()
+        self._close_span(now)
+        self._span = (name, now, len(self.queries))
+
+    def finish(self, status="completed"):
+        now = perf_counter()
+        self._close_span(now)
+        self.status = status
+        self.total_ms = (now - self._start) * 1000
+
+    def elapsed_ms(self):
+        return self.total_ms if self.total_ms is not None else (perf_counter() - self._start) * 1000
+
+    def slow_queries(self):
+        """Queries at or over SLOW_QUERY_MS, slowest first"""
+        return sorted((q for q in self.queries if q['ms'] >= SLOW_QUERY_MS), key=lambda q: q['ms'], reverse=True)
+
+    def repeated_queries(self):
+        """
+        Statement shapes run at least REPEATED_QUERY_THRESHOLD times, most frequent first.
+
+        Returns:
+            list: Dicts with sql (normalized), count, ms (total) and sources
+        """
+        groups = {}
+        for query in self.queries:
+            group = groups.setdefault(normalize_sql(query['sql']), {'count': 0, 'ms': 0.0, 'sources': set()})
+            group['count'] += 1
+            group['ms'] += query['ms']
+            if query['source']:
+                group['sources'].add(query['source'])
+        repeated = [{'sql': sql, 'count': g['count'], 'ms': g['ms'], 'sources': sorted(g['sources'])}
+                    for sql, g in groups.items() if g['count'] >= REPEATED_QUERY_THRESHOLD]
+        return sorted(repeated, key=lambda g: g['count'], reverse=True)
+
+    def summary(self):
+        """Totals for the rerun"""
+        return {
+            'total_ms': round(self.elapsed_ms(), 1),
+            'queries': len(self.queries),
+            'query_ms': round(sum(q['ms'] for q in self.queries), 1),
+            'rows': sum(q['rows'] for q in self.queries),
+            'connections': self.connections,
+        }
+
+    def to_dict(self):
+        """JSON-serialisable form written to the log"""
+        return {
+            'started_at': self.started_at.isoformat(timespec='milliseconds'),
+            'section': self.section,
+            'status': self.status,
+            **self.summary(),
+            'spans': [{**s, 'ms': round(s['ms'], 1)} for s in self.spans],
+            'slow_queries': [{**q, 'ms': round(q['ms'], 1)} for q in self.slow_queries()],
+            'repeated_queries': [{**g, 'ms': round(g['ms'], 1)} for g in self.repeated_queries()],
+            'query_log': [{**q, 'ms': round(q['ms'], 2)} for q in self.queries[:LOG_QUERY_LIMIT]],
+        }
+
+
+def append_log(profile, path=None):
+    """Append one rerun profile as a JSON line"""
+    line = json.dumps(profile.to_dict(), default=str)
+    with _log_lock:
+        with open(path or PERF_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def begin_rerun(state, enabled):
+    """
+    Start profiling a rerun when `enabled`, returning the RerunProfile (or None).
+
+    A profile left pending by the previous rerun (stopped early by st.rerun(),
+    st.stop() or an exception) is logged first with status "interrupted".
+
+    Args:
+        state: Session state (any dict-like object) that carries the pending profile between reruns
+        enabled (bool): Whether this rerun should be profiled
+    """
+    pending = state.get(_PENDING_KEY)
+    if pending is not None:
+        state[_PENDING_KEY] = None
+        pending.finish("interrupted")
+        append_log(pending)
+
+    if not enabled:
+        set_query_recorder(None)
+        return None
+    profile = RerunProfile()
+    state[_PENDING_KEY] = profile
+    set_query_recorder(profile)
+    return profile
+
+
+def finish_rerun(state, profile):
+    """Stop recording, log the profile and clear it from the pending slot"""
+    set_query_recorder(None)
+    state[_PENDING_KEY] = None
+    profile.finish()
+    append_log(profile)
+    return profile
+
+
+def read_log(path=None, limit=100):
+    """Return the last `limit` logged reruns, newest first"""
+    path = path or PERF_LOG_PATH
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        lines = deque(f, maxlen=limit)
+    return [json.loads(line) for line in reversed(lines) if line.strip()]
@@ -0,0 +1,422 @@
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import tournaments_utils
+from db_utils import connect, get_database
+
+# Elo ratings per employee and game, shared by every tournament, so they live in the
+# tournament catalog (tournaments_utils.CATALOG_PATH) rather than a tournament file.
+# rating_changes keeps each match's change per player, so a corrected result can be
+# taken back out before it is rated again.
+RATINGS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS ratings (
+        emp_id TEXT NOT NULL,
+        game TEXT NOT NULL,
+        rating REAL NOT NULL,
+        matches INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP,
+        PRIMARY KEY (emp_id, game)
+    ) WITHOUT ROWID
+'''
+
+RATING_CHANGES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS rating_changes (
+        tournament TEXT NOT NULL,
+        match_id INTEGER NOT NULL,
+        emp_id TEXT NOT NULL,
+        game TEXT NOT NULL,
+        change REAL NOT NULL,
+        PRIMARY KEY (tournament, match_id, emp_id)
+    ) WITHOUT ROWID
+'''
+
+# Everyone starts at INITIAL_RATING. The K-factor is larger for a player's first
+# PROVISIONAL_MATCHES matches in a game, so new players find their level quickly.
+# A doubles team is rated as the mean of its players, and both players move by the
+# team's result.
+INITIAL_RATING = 1500.0
+K_FACTOR = 20
+K_PROVISIONAL = 40
+PROVISIONAL_MATCHES = 10
+
+# Player columns of a result, side 1 then side 2 (the second of each is empty for singles)
+SLOT_COLUMNS = ("side1_emp_id", "side1_partner_emp_id", "side2_emp_id", "side2_partner_emp_id")
+
+# Completed results with each player slot resolved to an emp_id; byes are not rated.
+# {matches} and {people} are the match rows and the participant rows to read from.
+# side1_won comes from winner_team when set (doubles, and singles saved by side), else
+# from winner_id; it is NULL for a winner who is not in the match, which is not rated.
+_RESULTS_QUERY = '''
+    SELECT r.id AS match_id, r.game,
+           COALESCE(p1.emp_id, t1p1.emp_id) AS side1_emp_id, t1p2.emp_id AS side1_partner_emp_id,
+           COALESCE(p2.emp_id, t2p1.emp_id) AS side2_emp_id, t2p2.emp_id AS side2_partner_emp_id,
+           CASE WHEN r.winner_team IN (1, 2) THEN r.winner_team = 1
+                WHEN r.winner_id = r.player1_id THEN 1 WHEN r.winner_id = r.player2_id THEN 0 END AS side1_won
+    FROM ({matches}) r
+    LEFT JOIN ({people}) p1 ON p1.id = r.player1_id
+    LEFT JOIN ({people}) p2 ON p2.id = r.player2_id
+    LEFT JOIN ({people}) t1p1 ON t1p1.id = r.team1_player1_id
+    LEFT JOIN ({people}) t1p2 ON t1p2.id = r.team1_player2_id
+    LEFT JOIN ({people}) t2p1 ON t2p1.id = r.team2_player1_id
+    LEFT JOIN ({people}) t2p2 ON t2p2.id = r.team2_player2_id
+    WHERE r.match_status = 'completed' AND r.advancement_type IS NOT 'bye' AND r.game IS NOT NULL
+    ORDER BY r.completed_at, r.round_number, r.id
+'''
+_MATCH_COLUMNS = ("id, game, match_status, advancement_type, completed_at, round_number, winner_id, winner_team, "
+                  "player1_id, player2_id, team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id")
+
+
+def _ratings_db():
+    """Open the catalog with the ratings tables"""
+    conn = connect(tournaments_utils.CATALOG_PATH, timeout=30)
+    conn.execute(RATINGS_TABLE)
+    conn.execute(RATING_CHANGES_TABLE)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ratings_game ON ratings (game, rating)")
+    return conn
+
+
+def _tournament_key(db_path):
+    """Catalog slug of a tournament file (the path itself for a file outside the catalog)"""
+    path = os.path.abspath(db_path)
+    for tournament in tournaments_utils.list_tournaments():
+        if os.path.abspath(tournament['db_path']) == path:
+            return tournament['slug']
+    return db_path
+
+
+def _read_results(conn, match_ids=None, include_archive=False):
+    """
+    Rated results of one tournament file, in the order they were played.
+
+    Only active matches are read, unless include_archive: then archived ones and those
+    compacted into an attached "archive" database count too (whole history).
+
+    Returns:
+        list: (match_id, game, one emp_id per SLOT_COLUMNS slot, side1_won) tuples
+    """
+    schemas = ["main"]
+    if include_archive and conn.execute("SELECT 1 FROM pragma_database_list WHERE name = 'archive'").fetchone():
+        schemas.append("archive")
+    where, params = [], []
+    if not include_archive:
+        where.append("archived = 0")
+    if match_ids is not None:
+        match_ids = [int(match_id) for match_id in match_ids]
+        where.append(f"id IN ({', '.join('?' * len(match_ids))})")
+        params = match_ids
+    where = f" WHERE {' AND '.join(where)}" if where else ""
+
+    matches, people, match_params = [], [], []
+    for schema in schemas:
+        tables = {row[0] for row in conn.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table'")}
+        if "matches" in tables:
+            matches.append(f"SELECT {_MATCH_COLUMNS} FROM {schema}.matches{where}")
+            match_params.extend(params)
+        if "participants" in tables:
+            people.append(f"SELECT id, emp_id FROM {schema}.participants")
+    if not matches or not people:
+        return []
+
+    query = _RESULTS_QUERY.format(matches=" UNION ALL ".join(matches), people=" UNION ALL ".join(people))
+    # Both sides need a player, and the winner must be in the match (a walkover into an empty slot is not rated)
+    return [row for row in conn.execute(query, match_params)
+            if row[2] is not None and row[4] is not None and row[6] is not None]
+
+
+def _waves(players, player_count):
+    """
+    Split results into waves in which every player appears at most once.
+
+    A result goes in the wave after its players' latest one, so each player's
+    results stay in play order and a wave can be rated in one vectorized step
+    with exactly the outcome of rating the results one by one.
+    """
+    latest = [0] * player_count
+    waves = np.empty(len(players), dtype=np.int64)
+    for row_number, row in enumerate(players.tolist()):
+        present = [player for player in row if player >= 0]
+        wave = max(latest[player] for player in present) + 1
+        waves[row_number] = wave
+        for player in present:
+            latest[player] = wave
+    order = np.argsort(waves, kind="stable")
+    return np.split(order, np.flatnonzero(np.diff(waves[order])) + 1)
+
+
+def _replay(results, current):
+    """
+    Rate results in order, starting from the current ratings.
+
+    Args:
+        results (list): Output of _read_results(), in play order
+        current (dict): (emp_id, game) -> (rating, matches) for players already rated
+
+    Returns:
+        tuple: ({(emp_id, game): (rating, matches)} for every player in the results,
+                array of each result's rating change per SLOT_COLUMNS slot)
+    """
+    # Number every (emp_id, game) in the results; -1 marks an empty slot
+    index = {}
+    players = np.array([[-1 if emp_id is None else index.setdefault((emp_id, row[1]), len(index))
+                         for emp_id in row[2:6]] for row in results], dtype=np.int64).reshape(-1, len(SLOT_COLUMNS))
+    people = list(index)
+    ratings = np.array([current.get(person, (INITIAL_RATING, 0))[0] for person in people], dtype=float)
+    played = np.array([current.get(person, (INITIAL_RATING, 0))[1] for person in people], dtype=np.int64)
+    side1_won = np.array([row[6] for row in results], dtype=float)
+    changes = np.zeros(players.shape)
+
+    for wave in _waves(players, len(people)):
+        slots = players[wave]
+        present = slots >= 0
+        lookup = np.where(present, slots, 0)
+        slot_ratings = np.where(present, ratings[lookup], np.nan)
+        side1 = np.nanmean(slot_ratings[:, :2], axis=1)
+        side2 = np.nanmean(slot_ratings[:, 2:], axis=1)
+        surprise = side1_won[wave] - 1 / (1 + 10 ** ((side2 - side1) / 400))
+        k = np.where(played[lookup] < PROVISIONAL_MATCHES, K_PROVISIONAL, K_FACTOR)
+        change = np.where(present, k * np.column_stack([surprise, surprise, -surprise, -surprise]), 0.0)
+        changes[wave] = change
+        np.add.at(ratings, slots[present], change[present])
+        np.add.at(played, slots[present], 1)
+
+    return {person: (float(rating), int(matches)) for person, rating, matches in zip(people, ratings, played)}, changes
+
+
+def _change_rows(tournament, results, changes):
+    """rating_changes rows for replayed results"""
+    return [(tournament, result[0], emp_id, result[1], change)
+            for result, match_changes in zip(results, changes.tolist())
+            for emp_id, change in zip(result[2:6], match_changes) if emp_id is not None]
+
+
+def rate_matches(match_ids, db_path=None):
+    """
+    Update ratings for results just saved in a tournament, in one catalog transaction.
+
+    Called after update_match_result() and record_results() commit. A match rated
+    before (a corrected result) has its earlier change taken out first; a match that
+    is no longer completed just loses its change. Taking a change out afterwards is
+    an approximation once later matches were rated on top of it; recompute_ratings()
+    replays the history exactly.
+
+    Returns:
+        int: Results rated
+    """
+    db_path = db_path or get_database()
+    match_ids = [int(match_id) for match_id in match_ids]
+    if not match_ids:
+        return 0
+    tournament = _tournament_key(db_path)
+    conn = connect(db_path)
+    try:
+        results = _read_results(conn, match_ids)
+    finally:
+        conn.close()
+
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    catalog = _ratings_db()
+    try:
+        catalog.execute("BEGIN IMMEDIATE")
+        marks = ", ".join("?" * len(match_ids))
+        earlier = catalog.execute(f"SELECT change, emp_id, game FROM rating_changes "
+                                  f"WHERE tournament = ? AND match_id IN ({marks})", [tournament, *match_ids]).fetchall()
+        catalog.executemany("UPDATE ratings SET rating = rating - ?, matches = matches - 1 WHERE emp_id = ? AND game = ?",
+                            earlier)
+        catalog.execute(f"DELETE FROM rating_changes WHERE tournament = ? AND match_id IN ({marks})",
+                        [tournament, *match_ids])
+
+        if results:
+            people = {(emp_id, result[1]) for result in results for emp_id in result[2:6] if emp_id is not None}
+            people_marks = ", ".join("(?, ?)" for _ in people)
+            current = {(emp_id, game): (rating, matches) for emp_id, game, rating, matches in catalog.execute(
+                f"SELECT emp_id, game, rating, matches FROM ratings WHERE (emp_id, game) IN (VALUES {people_marks})",
+                [value for person in people for value in person])}
+            ratings, changes = _replay(results, current)
+            catalog.executemany('''
+                INSERT INTO ratings (emp_id, game, rating, matches, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (emp_id, game) DO UPDATE SET rating = excluded.rating, matches = excluded.matches,
+                                                         updated_at = excluded.updated_at
+            ''', [(emp_id, game, rating, matches, now) for (emp_id, game), (rating, matches) in ratings.items()])
+            catalog.executemany("INSERT INTO rating_changes (tournament, match_id, emp_id, game, change) "
+                                "VALUES (?, ?, ?, ?, ?)", _change_rows(tournament, results, changes))
+        catalog.commit()
+        return len(results)
+    except Exception:
+        catalog.rollback()
+        raise
+    finally:
+        catalog.close()
+
+
+def recompute_ratings(progress_callback=None):
+    """
+    Rebuild every rating from the whole match history of every tournament in the catalog.
+
+    Tournaments are replayed oldest first, each with its archived and compacted matches,
+    and the results in the order they were played. The replay runs in waves of results
+    that share no player, one vectorized numpy step per wave (see _waves()).
+
+    Args:
+        progress_callback (callable, optional): Called as progress_callback(slug, results) per tournament
+
+    Returns:
+        dict: results and players rated, and tournaments read
+    """
+    history, sections = [], []
+    for tournament in reversed(tournaments_utils.list_tournaments()):
+        if not os.path.exists(tournament['db_path']):
+            continue
+        conn = connect(tournament['db_path'])
+        try:
+            archive_path = f"{os.path.splitext(tournament['db_path'])[0]}_archive.db"
+            if os.path.exists(archive_path):
+                conn.execute("ATTACH DATABASE ? AS archive", (os.path.abspath(archive_path),))
+            results = _read_results(conn, include_archive=True)
+        finally:
+            conn.close()
+        sections.append((tournament['slug'], len(history), len(history) + len(results)))
+        history.extend(results)
+        if progress_callback is not None:
+            progress_callback(tournament['slug'], len(results))
+
+    ratings, changes = _replay(history, {})
+    change_rows = [row for slug, start, end in sections
+                   for row in _change_rows(slug, history[start:end], changes[start:end])]
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    catalog = _ratings_db()
+    try:
+        catalog.execute("BEGIN IMMEDIATE")
+        catalog.execute("DELETE FROM ratings")
+        catalog.execute("DELETE FROM rating_changes")
+        catalog.executemany("INSERT INTO ratings (emp_id, game, rating, matches, updated_at) VALUES (?, ?, ?, ?, ?)",
+                            [(emp_id, game, rating, matches, now) for (emp_id, game), (rating, matches) in ratings.items()])
+        catalog.executemany("INSERT INTO rating_changes (tournament, match_id, emp_id, game, change) "
+                            "VALUES (?, ?, ?, ?, ?)", change_rows)
+        catalog.commit()
+    except Exception:
+        catalog.rollback()
+        raise
+    finally:
+        catalog.close()
+    return {'results': len(history), 'players': len(ratings), 'tournaments': len(sections)}
+
+
+def get_ratings(emp_ids, game):
+    """
+    Ratings of some employees in one game.
+
+    Returns:
+        dict: emp_id -> rating (INITIAL_RATING for anyone not rated yet)
+    """
+    emp_ids = [str(emp_id) for emp_id in emp_ids if emp_id is not None]
+    ratings = dict.fromkeys(emp_ids, INITIAL_RATING)
+    if not emp_ids:
+        return ratings
+    conn = _ratings_db()
+    for start in range(0, len(emp_ids), 500):
+        chunk = emp_ids[start:start + 500]
+        ratings.update(conn.execute(f"SELECT emp_id, rating FROM ratings WHERE game = ? "
+                                    f"AND emp_id IN ({', '.join('?' * len(chunk))})", [game, *chunk]).fetchall())
+    conn.close()
+    return ratings
+
+
+def get_top_ratings(game=None, limit=20):
+    """Highest rated employees, for every game or one"""
+    conn = _ratings_db()
+    df = pd.read_sql_query(f'''
+        SELECT emp_id, game, ROUND(rating, 1) AS rating, matches, updated_at
+        FROM ratings {"WHERE game = ?" if game else ""}
+        ORDER BY rating DESC, emp_id
+        LIMIT ?
+    ''', conn, params=[game, limit] if game else [limit])
+    conn.close()
+    return df
+
+
+def _bracket_positions(size):
+    """Seed numbers 1..size (a power of two) in bracket order, so seeds 1 and 2 can only meet in the final"""
+    positions = [1]
+    while len(positions) < size:
+        mirror = len(positions) * 2 + 1
+        positions = [seed for position in positions for seed in (position, mirror - position)]
+    return positions
+
+
+def seed_entries(entries, ratings):
+    """
+    Order entries for a seeded draw, to be paired consecutively (1st v 2nd, 3rd v 4th, ...).
+
+    The highest rated entry plays the lowest rated, the second the second lowest, and
+    so on; the pairs are laid out in bracket order, so the top seeds are in different
+    halves and next rounds (which pair winners in match order) keep them apart. With
+    an odd count the top seed comes last, i.e. it is the entry left over for the bye.
+
+    Args:
+        entries (list): Players or teams
+        ratings (list): Rating of each entry (a team's is its players' mean)
+
+    Returns:
+        list: The entries in draw order
+    """
+    ranked = sorted(range(len(entries)), key=lambda index: -ratings[index])
+    bye = [ranked.pop(0)] if len(ranked) % 2 else []
+    pairs = [(ranked[number], ranked[-1 - number]) for number in range(len(ranked) // 2)]
+    size = 1
+    while size < len(pairs):
+        size *= 2
+    order = [index for seed in _bracket_positions(size) if seed <= len(pairs) for index in pairs[seed - 1]]
+    return [entries[index] for index in order + bye]
+
+
+def seed_by_rating(entries, players):
+    """
+    seed_entries() with ratings looked up for each entry.
+
+    Args:
+        entries (list): Players or teams
+        players (callable): Maps an entry to (game, [emp_id, ...]); a team is rated as its players' mean
+
+    Returns:
+        list: The entries in draw order
+    """
+    entry_players = [players(entry) for entry in entries]
+    ratings = {}
+    for game in {game for game, _ in entry_players}:
+        ratings[game] = get_ratings([emp_id for entry_game, emp_ids in entry_players if entry_game == game
+                                     for emp_id in emp_ids], game)
+    return seed_entries(entries, [
+        float(np.mean([ratings[game].get(str(emp_id), INITIAL_RATING) for emp_id in emp_ids])) if emp_ids
+        else INITIAL_RATING for game, emp_ids in entry_players])
+
+
+def main(argv=None):
+    """Command line entry point: rebuild ratings from every tournament or list the top rated"""
+    parser = argparse.ArgumentParser(description="Employee ratings across tournaments")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("recompute", help="Rebuild every rating from the whole match history")
+    top_parser = subparsers.add_parser("top", help="List the highest rated employees")
+    top_parser.add_argument("--game")
+    top_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == "recompute":
+        start = time.perf_counter()
+        counts = recompute_ratings(progress_callback=lambda slug, count: print(f"  {slug}: {count} results", flush=True))
+        print(f"Rated {counts['results']} results for {counts['players']} players "
+              f"in {time.perf_counter() - start:.1f}s")
+    else:
+        for row in get_top_ratings(args.game, args.limit).itertuples():
+            print(f"{row.rating:7.1f}  {row.emp_id:<12} {row.game:<14} {row.matches} matches")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from db_utils import connect, get_database
+from tournaments_utils import use_current_tournament, use_database
+from events_utils import create_event_log, drop_event_triggers, record_event
+from scores_utils import CHESS_RESULTS, format_score, get_rules
+from teams_utils import link_team_ids, sync_teams
+from tournament_service import generate_match_id, init_database
+
+# Same choices the app offers
+GAMES = ["Carrom", "Chess", "Badminton", "Table Tennis"]
+CATEGORIES = ["Men's Singles", "Women's Singles", "Men's Doubles", "Women's Doubles", "Mixed Doubles"]
+SLOTS = ["Morning", "Afternoon", "Evening"]
+
+LOCATIONS = {
+    "Bangalore": ["Tower A", "Tower B", "Tech Park"],
+    "Chennai": ["Campus 1", "Campus 2"],
+    "Hyderabad": ["Block C", "Block D"],
+    "Pune": ["Phase 1"],
+}
+VENUES = ["Main Hall", "Recreation Room", "Cafeteria Annex", "Auditorium Lobby"]
+COURTS_PER_VENUE = 8
+MATCH_MINUTES = 30
+
+FIRST_NAMES = {
+    "M": ["Arjun", "Rahul", "Vikram", "Karthik", "Rohan", "Aditya", "Sanjay", "Nikhil", "Pranav", "Imran",
+          "Suresh", "Manoj", "Deepak", "Anil", "Joseph", "Faisal", "Harish", "Varun", "Kiran", "Ramesh"],
+    "F": ["Priya", "Ananya", "Divya", "Kavya", "Sneha", "Meera", "Lakshmi", "Pooja", "Aisha", "Neha",
+          "Swathi", "Deepa", "Nandini", "Fatima", "Reshma", "Anjali", "Shreya", "Asha", "Maria", "Geetha"],
+}
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Nair", "Menon", "Rao", "Patel", "Khan", "Singh", "Gupta",
+              "Das", "Pillai", "Kulkarni", "Joshi", "Fernandes", "Mehta", "Bose", "Chatterjee", "Naidu", "Verma"]
+
+
+def _genders(category):
+    """Genders of the two members of an entry (the second is None for singles)"""
+    if category.startswith("Men's"):
+        return "M", "M"
+    if category.startswith("Women's"):
+        return "F", "F"
+    return "M", "F"
+
+
+def _bucket_sizes(count, buckets):
+    """Split count across (game, category) buckets, keeping doubles buckets even"""
+    base, extra = divmod(count, len(buckets))
+    sizes = []
+    for i, (game, category) in enumerate(buckets):
+        size = base + (1 if i < extra else 0)
+        sizes.append(size - size % 2 if "Doubles" in category else size)
+    return sizes
+
+
+def _random_sets(game, winner, rng):
+    """A random score, as (side1, side2) pairs, that side `winner` wins under the game's rules"""
+    rules = get_rules(game)
+    if rules is None:
+        return []
+    if rules['format'] == 'rally':
+        needed = rules['best_of'] // 2 + 1
+        game_winners = [1] * (needed - 1) + [2] * rng.randint(0, needed - 1)
+        rng.shuffle(game_winners)
+        sets = []
+        for game_winner in game_winners + [1]:
+            if rng.random() < 0.15:
+                loser = rng.randint(rules['points'] - 1, rules['points'] + 4)
+                points = (loser + 2, loser)
+                if rules['cap'] and points[0] > rules['cap']:
+                    points = (rules['cap'], rules['cap'] - 1)
+            else:
+                points = (rules['points'], rng.randint(0, rules['points'] - 2))
+            sets.append(points if game_winner == 1 else points[::-1])
+    elif rules['format'] == 'boards':
+        sets, totals = [], [0, 0]
+        while max(totals) < rules['target'] and (len(sets) < rules['boards'] or totals[0] == totals[1]):
+            points = rng.randint(1, rules['max_board_points'])
+            board_winner = 0 if rng.random() < 0.6 else 1
+            totals[board_winner] += points
+            sets.append((points, 0) if board_winner == 0 else (0, points))
+        if totals[0] < totals[1]:
+            sets = [points[::-1] for points in sets]
+    else:
+        sets = []
+        while not sets or sum(points[0] for points in sets) == sum(points[1] for points in sets):
+            sets.append(rng.choice(list(CHESS_RESULTS.values())) if len(sets) < rules['max_games'] - 1 else (2, 0))
+        if sum(points[0] for points in sets) < sum(points[1] for points in sets):
+            sets = [points[::-1] for points in sets]
+    return sets if winner == 1 else [points[::-1] for points in sets]
+
+
+def generate_participants(conn, count, games=GAMES, categories=CATEGORIES, slots=SLOTS, registered=0.0,
+                          rng=None, start_time=None):
+    """
+    Insert `count` participants spread evenly across every game and category with executemany.
+
+    Doubles entries are created as partner pairs that reference each other's emp_id,
+    and added to the teams table. Runs on the caller's connection and does not commit.
+
+    Args:
+        conn (sqlite3.Connection): Open connection
+        count (int): Participants to create (doubles buckets are rounded down to pairs)
+        games (list): Games to spread participants over
+        categories (list): Categories to spread participants over
+        slots (list): Slots assigned at random (partners share a slot)
+        registered (float): Fraction marked as reported at the registration desk
+        rng (random.Random, optional): Source of randomness (seed it for repeatable data)
+        start_time (datetime, optional): Registration timestamps start here
+
+    Returns:
+        dict: {(game, category): [entries]} where an entry is a tuple of one (singles)
+              or two (doubles) participant IDs, in creation order
+    """
+    rng = rng or random.Random()
+    start_time = start_time or datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+    cursor = conn.cursor()
+    next_id = (cursor.execute("SELECT MAX(id) FROM participants").fetchone()[0] or 0) + 1
+    result = cursor.execute("SELECT MAX(CAST(emp_id AS INTEGER)) FROM participants WHERE emp_id GLOB '[0-9]*'").fetchone()[0]
+    next_emp_id = (int(result) if result else 10000) + 1
+
+    buckets = [(game, category) for game in games for category in categories]
+    rows = []
+    entries = {}
+    for (game, category), size in zip(buckets, _bucket_sizes(count, buckets)):
+        doubles = "Doubles" in category
+        genders = _genders(category)
+        bucket_entries = entries.setdefault((game, category), [])
+        for _ in range(size // 2 if doubles else size):
+            location = rng.choice(list(LOCATIONS))
+            slot = rng.choice(slots)
+            members = []
+            for gender in (genders if doubles else genders[:1]):
+                emp_id = str(next_emp_id)
+                first, last = rng.choice(FIRST_NAMES[gender]), rng.choice(LAST_NAMES)
+                is_registered = 1 if rng.random() < registered else 0
+                created = start_time + timedelta(seconds=len(rows))
+                members.append([next_id, emp_id, f"{first} {last}", f"{first}.{last}.{emp_id}@example.com".lower(),
+                                gender, category, None, None, is_registered,
+                                (created + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S') if is_registered else None,
+                                location, rng.choice(LOCATIONS[location]), game, slot,
+                                created.strftime('%Y-%m-%d %H:%M:%S')])
+                next_id += 1
+                next_emp_id += 1
+            if doubles:
+                members[0][6], members[0][7] = members[1][1], members[1][4]
+                members[1][6], members[1][7] = members[0][1], members[0][4]
+            rows.extend(members)
+            bucket_entries.append(tuple(member[0] for member in members))
+
+    cursor.executemany('''
+        INSERT INTO participants
+        (id, emp_id, name, email, gender, category, partner_emp_id, partner_gender, registered_at_desk,
+         registered_timestamp, location, sub_location, game, slot, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    sync_teams(conn)
+    return entries
+
+
+def generate_brackets(conn, entries, completion=0.5, rng=None, start_time=None):
+    """
+    Create a knockout bracket per (game, category), with results and fixtures.
+
+    Rounds are played in order: the first `completion` share of each bracket's
+    matches are completed with a random winner and a score that follows the game's
+    rules (saved as match_sets); once a round has an unplayed match no later round
+    is created. Every scheduled match gets a fixture on a venue court, and doubles
+    matches and fixtures are linked to their teams. Runs on the caller's connection and does not commit.
+
+    Args:
+        conn (sqlite3.Connection): Open connection
+        entries (dict): Output of generate_participants()
+        completion (float): 0 schedules only round 1, 1 plays every bracket to a champion
+        rng (random.Random, optional): Source of randomness
+        start_time (datetime, optional): First fixture / result time
+
+    Returns:
+        dict: Counts of matches, completed_matches and fixtures created
+    """
+    rng = rng or random.Random()
+    start_time = start_time or datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    cursor = conn.cursor()
+    next_match_id = (cursor.execute("SELECT MAX(id) FROM matches").fetchone()[0] or 0) + 1
+    match_numbers = dict(cursor.execute("SELECT category, COALESCE(MAX(match_number), 0) FROM matches GROUP BY category").fetchall())
+
+    match_rows = []
+    set_rows = []
+    fixture_rows = []
+    completed_count = 0
+    for bucket_number, ((game, category), bucket_entries) in enumerate(entries.items()):
+        doubles = "Doubles" in category
+        venue = VENUES[bucket_number % len(VENUES)]
+        round_entries = list(bucket_entries)
+        rng.shuffle(round_entries)
+        to_complete = round(completion * max(len(round_entries) - 1, 0))
+        played = 0
+        round_number = 1
+        fixture_number = 0
+        while len(round_entries) > 1:
+            # An odd entry out gets a bye into the next round, recorded as a completed match
+            # so the round's winners are all in the matches table
+            bye = round_entries.pop() if len(round_entries) % 2 else None
+            next_round = []
+            round_complete = True
+            for side1, side2 in zip(round_entries[::2], round_entries[1::2]):
+                match_number = match_numbers.get(category, 0) + 1
+                match_numbers[category] = match_number
+                completed = played < to_complete
+                row = {
+                    'id': next_match_id, 'match_code': generate_match_id(next_match_id, category, round_number),
+                    'match_number': match_number, 'round_number': round_number, 'category': category, 'game': game,
+                    'player1_id': None, 'player2_id': None, 'team1_player1_id': None, 'team1_player2_id': None,
+                    'team2_player1_id': None, 'team2_player2_id': None, 'winner_id': None, 'winner_team': None,
+                    'match_status': 'completed' if completed else 'scheduled', 'score': None,
+                    'advancement_type': 'normal', 'completed_at': None,
+                }
+                if doubles:
+                    row['team1_player1_id'], row['team1_player2_id'] = side1
+                    row['team2_player1_id'], row['team2_player2_id'] = side2
+                else:
+                    row['player1_id'], row['player2_id'] = side1[0], side2[0]
+
+                if completed:
+                    played += 1
+                    winner = rng.choice((1, 2))
+                    sets = _random_sets(game, winner, rng)
+                    row['score'] = format_score(game, sets) if sets else None
+                    set_rows.extend((next_match_id, number, side1, side2)
+                                    for number, (side1, side2) in enumerate(sets, start=1))
+                    row['completed_at'] = (start_time + timedelta(minutes=MATCH_MINUTES * played)).strftime('%Y-%m-%d %H:%M:%S')
+                    if doubles:
+                        row['winner_team'] = winner
+                    else:
+                        row['winner_id'] = (side1 if winner == 1 else side2)[0]
+                    next_round.append(side1 if winner == 1 else side2)
+                else:
+                    round_complete = False
+                    slot_start = start_time + timedelta(minutes=MATCH_MINUTES * (fixture_number // COURTS_PER_VENUE))
+                    slot_end = slot_start + timedelta(minutes=MATCH_MINUTES)
+                    fixture_rows.append((
+                        category, game, rng.choice(SLOTS), round_number,
+                        f"{slot_start.strftime('%I:%M%p')}-{slot_end.strftime('%I:%M%p')}",
+                        slot_start.strftime('%Y-%m-%d %H:%M:%S'), slot_end.strftime('%Y-%m-%d %H:%M:%S'),
+                        venue, fixture_number % COURTS_PER_VENUE + 1,
+                        row['player1_id'], row['player2_id'], row['team1_player1_id'], row['team1_player2_id'],
+                        row['team2_player1_id'], row['team2_player2_id'], 'scheduled'))
+                    fixture_number += 1
+                match_rows.append(row)
+                next_match_id += 1
+            if bye is not None:
+                match_number = match_numbers.get(category, 0) + 1
+                match_numbers[category] = match_number
+                row = {
+                    'id': next_match_id, 'match_code': generate_match_id(next_match_id, category, round_number),
+                    'match_number': match_number, 'round_number': round_number, 'category': category, 'game': game,
+                    'player1_id': None, 'player2_id': None, 'team1_player1_id': None, 'team1_player2_id': None,
+                    'team2_player1_id': None, 'team2_player2_id': None, 'winner_id': None, 'winner_team': None,
+                    'match_status': 'completed', 'score': None,
+                    'advancement_type': 'bye', 'completed_at': start_time.strftime('%Y-%m-%d %H:%M:%S'),
+                }
+                if doubles:
+                    row['team1_player1_id'], row['team1_player2_id'] = bye
+                    row['winner_team'] = 1
+                else:
+                    row['player1_id'] = row['winner_id'] = bye[0]
+                match_rows.append(row)
+                next_match_id += 1
+                completed_count += 1
+                next_round.append(bye)
+            if not round_complete:
+                break
+            round_entries = next_round
+            round_number += 1
+        completed_count += played
+
+    if match_rows:
+        columns = list(match_rows[0])
+        cursor.executemany(f"INSERT INTO matches ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                           [tuple(row[column] for column in columns) for row in match_rows])
+    cursor.executemany("INSERT INTO match_sets (match_id, set_number, side1_points, side2_points) VALUES (?, ?, ?, ?)",
+                       set_rows)
+    cursor.executemany('''
+        INSERT INTO fixtures
+        (category, game, slot, round_number, time_slot, start_time, end_time, location, court_number,
+         player1_id, player2_id, team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id, fixture_status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', fixture_rows)
+    for table in ("matches", "fixtures"):
+        link_team_ids(conn, table)
+    return {'matches': len(match_rows), 'completed_matches': completed_count, 'fixtures': len(fixture_rows)}
+
+
+def generate_tournament(participants=1000, games=GAMES, categories=CATEGORIES, completion=0.5, registered=0.8,
+                        matches=True, replace=False, seed=None):
+    """
+    Bulk-create a realistic tournament in one transaction.
+
+    Per-row change feed triggers are suspended during the load and a single
+    "reset" event is logged instead, as for a snapshot restore, so 100k
+    participants load in seconds. Dashboard summaries stay trigger-maintained.
+
+    Args:
+        participants (int): Participants to create across all games and categories
+        games (list): Games to include
+        categories (list): Categories to include
+        completion (float): Share of each bracket's matches that have results (0 to 1)
+        registered (float): Share of participants marked as reported at the desk
+        matches (bool): Also create brackets, results and fixtures
+        replace (bool): Delete existing participants, matches and fixtures first
+        seed (int, optional): Random seed for repeatable data
+
+    Returns:
+        dict: Counts of participants, matches, completed_matches and fixtures created
+    """
+    rng = random.Random(seed)
+    conn = connect(get_database())
+    try:
+        conn.execute("BEGIN")
+        drop_event_triggers(conn)
+        if replace:
+            for table in ("fixtures", "matches", "teams", "participants"):
+                conn.execute(f"DELETE FROM {table}")
+        entries = generate_participants(conn, participants, games, categories, registered=registered, rng=rng)
+        counts = {'participants': sum(len(entry) for bucket in entries.values() for entry in bucket),
+                  'matches': 0, 'completed_matches': 0, 'fixtures': 0}
+        if matches:
+            counts.update(generate_brackets(conn, entries, completion=completion, rng=rng))
+        record_event('reset', 'tournament', payload={'reason': 'sample_data_generated', 'replace': replace, **counts},
+                     conn=conn)
+        create_event_log(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        create_event_log(conn)
+        conn.commit()
+        raise
+    finally:
+        conn.close()
+    return counts
+
+
+def main(argv=None):
+    """Command line entry point for generating sample tournaments"""
+    parser = argparse.ArgumentParser(description="Bulk-create a sample tournament for testing and benchmarks")
+    parser.add_argument("--participants", type=int, default=1000)
+    parser.add_argument("--games", nargs="+", default=GAMES)
+    parser.add_argument("--categories", nargs="+", default=CATEGORIES)
+    parser.add_argument("--completion", type=float, default=0.5,
+                        help="Share of each bracket's matches with results, 0 to 1 (default 0.5)")
+    parser.add_argument("--registered", type=float, default=0.8,
+                        help="Share of participants reported at the desk, 0 to 1 (default 0.8)")
+    parser.add_argument("--no-matches", action="store_true", help="Only create participants")
+    parser.add_argument("--replace", action="store_true", help="Delete existing participants, matches and fixtures first")
+    parser.add_argument("--seed", type=int, help="Random seed for repeatable data")
+    parser.add_argument("--db", help="Tournament database path (default: the current tournament)")
+    args = parser.parse_args(argv)
+    if not 0 <= args.completion <= 1 or not 0 <= args.registered <= 1:
+        parser.error("--completion and --registered must be between 0 and 1")
+    if args.db:
+        use_database(args.db)
+    else:
+        use_current_tournament()
+
+    started = datetime.now()
+    init_database()
+    counts = generate_tournament(args.participants, args.games, args.categories, args.completion, args.registered,
+                                 matches=not args.no_matches, replace=args.replace, seed=args.seed)
+    for name, count in counts.items():
+        print(f"{name}: {count}")
+    print(f"Generated in {(datetime.now() - started).total_seconds():.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
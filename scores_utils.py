@@ -0,0 +1,365 @@
+import re
+
+import pandas as pd
+
+from db_utils import connect, create_triggers, get_database
+
+# Scoring rules per game.
+# rally: Badminton and Table Tennis games go to `points`, must be won by two, and stop at
+#        `cap` when there is one (30-29); the match is the first to win best_of // 2 + 1 games.
+# boards: a Carrom match is one game of boards. Only the board winner scores (the opponent's
+#         coins left plus the queen, at most max_board_points); the first to `target` points,
+#         or the leader after `boards` boards, wins. A tie after the last board plays on.
+# chess: each game is a result code, stored in half points (1-0 is 2-0, a draw 1-1); the
+#        side with more points after at most max_games games wins.
+GAME_RULES = {
+    "Badminton": {'format': 'rally', 'best_of': 3, 'points': 21, 'cap': 30},
+    "Table Tennis": {'format': 'rally', 'best_of': 5, 'points': 11, 'cap': None},
+    "Carrom": {'format': 'boards', 'target': 25, 'boards': 8, 'max_board_points': 12},
+    "Chess": {'format': 'chess', 'max_games': 6},
+}
+
+CHESS_RESULTS = {'1-0': (2, 0), '0-1': (0, 2), '1/2-1/2': (1, 1)}
+_CHESS_ALIASES = {'½-½': '1/2-1/2', '0.5-0.5': '1/2-1/2', '=': '1/2-1/2', '1:0': '1-0', '0:1': '0-1'}
+_SET_SEPARATOR = re.compile(r"[,;\s]+")
+_SET_SCORE = re.compile(r"^(\d+)\s*[-:]\s*(\d+)$")
+
+# One row per set, game or board of a match, points of side 1 (player1 or team 1) and side 2
+MATCH_SETS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS match_sets (
+        match_id INTEGER NOT NULL,
+        set_number INTEGER NOT NULL,
+        side1_points INTEGER NOT NULL,
+        side2_points INTEGER NOT NULL,
+        PRIMARY KEY (match_id, set_number),
+        FOREIGN KEY (match_id) REFERENCES matches (id)
+    ) WITHOUT ROWID
+'''
+
+# Per-participant totals maintained by triggers on matches and match_sets, so leaderboards
+# and tie-breakers read one row per player. Byes are not matches played.
+PLAYER_STATS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS player_stats (
+        participant_id INTEGER PRIMARY KEY,
+        matches_played INTEGER NOT NULL DEFAULT 0,
+        matches_won INTEGER NOT NULL DEFAULT 0,
+        sets_won INTEGER NOT NULL DEFAULT 0,
+        sets_lost INTEGER NOT NULL DEFAULT 0,
+        points_for INTEGER NOT NULL DEFAULT 0,
+        points_against INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (participant_id) REFERENCES participants (id)
+    )
+'''
+
+STATS_COLUMNS = ("matches_played", "matches_won", "sets_won", "sets_lost", "points_for", "points_against")
+
+# Leaderboard order, which is also the tie-break order
+LEADERBOARD_ORDER = "matches_won DESC, set_difference DESC, point_difference DESC, name"
+
+# The six player columns of a match as (player_id, side) rows; singles use slots 1 and 4
+_SLOTS = ("(SELECT 1 AS slot UNION ALL SELECT 2 UNION ALL SELECT 3 "
+          "UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6) s")
+_PLAYERS = ("CASE s.slot WHEN 1 THEN {m}.player1_id WHEN 2 THEN {m}.team1_player1_id "
+            "WHEN 3 THEN {m}.team1_player2_id WHEN 4 THEN {m}.player2_id WHEN 5 THEN {m}.team2_player1_id "
+            "ELSE {m}.team2_player2_id END AS player_id, CASE WHEN s.slot <= 3 THEN 1 ELSE 2 END AS side")
+_PLAYED = "({m}.match_status = 'completed' AND {m}.advancement_type IS NOT 'bye')"
+_WON = f"({_PLAYED} AND COALESCE({{m}}.winner_team = p.side, {{m}}.winner_id = p.player_id, 0))"
+# Sets won and lost and points for and against, from the side's point of view
+_SIDE_TOTALS = ("CASE p.side WHEN 1 THEN t.won1 ELSE t.won2 END", "CASE p.side WHEN 1 THEN t.won2 ELSE t.won1 END",
+                "CASE p.side WHEN 1 THEN t.points1 ELSE t.points2 END",
+                "CASE p.side WHEN 1 THEN t.points2 ELSE t.points1 END")
+_SET_TOTALS = ("COALESCE(SUM(side1_points > side2_points), 0) AS won1, "
+               "COALESCE(SUM(side2_points > side1_points), 0) AS won2, "
+               "COALESCE(SUM(side1_points), 0) AS points1, COALESCE(SUM(side2_points), 0) AS points2")
+_UPSERT = ("INSERT INTO player_stats (participant_id, " + ", ".join(STATS_COLUMNS) + ") "
+           "SELECT p.player_id, {sign} * {played}, {sign} * {won}, "
+           + ", ".join(f"{{sign}} * {total}" for total in _SIDE_TOTALS) + " "
+           "FROM ({players}) p, ({totals}) t WHERE p.player_id IS NOT NULL "
+           "ON CONFLICT (participant_id) DO UPDATE SET "
+           + ", ".join(f"{column} = {column} + excluded.{column}" for column in STATS_COLUMNS) + ";")
+
+
+def _match_delta(row, sign):
+    """A match row's whole contribution (result and sets) to its players' stats, added or removed"""
+    return _UPSERT.format(
+        sign=sign, played=_PLAYED.format(m=row), won=_WON.format(m=row),
+        players=f"SELECT {_PLAYERS.format(m=row)} FROM {_SLOTS} WHERE {row}.archived = 0",
+        totals=f"SELECT {_SET_TOTALS} FROM match_sets WHERE match_id = {row}.id")
+
+
+def _set_delta(row, sign):
+    """One match_sets row's contribution to the stats of its match's players, added or removed"""
+    return _UPSERT.format(
+        sign=sign, played=0, won=0,
+        players=f"SELECT {_PLAYERS.format(m='m')} FROM matches m, {_SLOTS} WHERE m.id = {row}.match_id AND m.archived = 0",
+        totals=(f"SELECT {row}.side1_points > {row}.side2_points AS won1, {row}.side2_points > {row}.side1_points AS won2, "
+                f"{row}.side1_points AS points1, {row}.side2_points AS points2"))
+
+
+_MATCH_STATS_COLUMNS = ("match_status, winner_id, winner_team, advancement_type, player1_id, player2_id, "
+                        "team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id")
+
+# Archived matches are not counted: archiving rebuilds the stats once (see archive_utils), and
+# compaction moves an archived match's sets before deleting it. Deleting an active match takes
+# its sets with it.
+STATS_TRIGGERS = {
+    "trg_player_stats_match_insert": f"AFTER INSERT ON matches BEGIN {_match_delta('NEW', 1)} END",
+    "trg_player_stats_match_update": (f"AFTER UPDATE OF {_MATCH_STATS_COLUMNS} ON matches "
+                                      f"WHEN OLD.archived = 0 AND NEW.archived = 0 "
+                                      f"BEGIN {_match_delta('OLD', -1)} {_match_delta('NEW', 1)} END"),
+    "trg_player_stats_match_delete": (f"AFTER DELETE ON matches BEGIN {_match_delta('OLD', -1)} "
+                                      "DELETE FROM match_sets WHERE match_id = OLD.id; END"),
+    "trg_player_stats_set_insert": f"AFTER INSERT ON match_sets BEGIN {_set_delta('NEW', 1)} END",
+    "trg_player_stats_set_delete": f"AFTER DELETE ON match_sets BEGIN {_set_delta('OLD', -1)} END",
+    "trg_player_stats_set_update": (f"AFTER UPDATE ON match_sets "
+                                    f"BEGIN {_set_delta('OLD', -1)} {_set_delta('NEW', 1)} END"),
+}
+
+
+def create_score_tables(conn):
+    """
+    Create match_sets, player_stats and the stats triggers on an open connection.
+
+    Called from init_database(). When any trigger is missing or out of date the
+    stats are recomputed once.
+    """
+    cursor = conn.cursor()
+    cursor.execute(MATCH_SETS_TABLE)
+    cursor.execute(PLAYER_STATS_TABLE)
+    if create_triggers(conn, STATS_TRIGGERS):
+        rebuild_player_stats(conn)
+
+
+def rebuild_player_stats(conn=None):
+    """Recompute player_stats from the active (not archived) matches and their sets in one pass"""
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(get_database())
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM player_stats")
+        cursor.execute(f'''
+            INSERT INTO player_stats (participant_id, {', '.join(STATS_COLUMNS)})
+            SELECT p.player_id, SUM({_PLAYED.format(m='p')}), SUM({_WON.format(m='p')}),
+                   {', '.join(f'COALESCE(SUM({total}), 0)' for total in _SIDE_TOTALS)}
+            FROM (SELECT m.id, m.match_status, m.advancement_type, m.winner_id, m.winner_team, {_PLAYERS.format(m='m')}
+                  FROM matches m, {_SLOTS} WHERE m.archived = 0) p
+            LEFT JOIN (SELECT match_id, {_SET_TOTALS} FROM match_sets GROUP BY match_id) t ON t.match_id = p.id
+            WHERE p.player_id IS NOT NULL
+            GROUP BY p.player_id
+        ''')
+        if own_conn:
+            conn.commit()
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def get_rules(game):
+    """Scoring rules of a game, or None when its scores are free text"""
+    return GAME_RULES.get(game)
+
+
+def parse_score(game, score):
+    """
+    Turn a score into (side1_points, side2_points) pairs for a game.
+
+    Accepts text such as "21-15, 18-21, 21-19" (Chess: "1-0 1/2-1/2"), or a list of
+    pairs or strings. Nothing is checked against the game's rules here (see check_sets()).
+
+    Raises:
+        ValueError: If a set cannot be read
+    """
+    if score is None:
+        return []
+    if isinstance(score, str):
+        score = [token for token in _SET_SEPARATOR.split(score.strip()) if token]
+    chess = get_rules(game) is not None and get_rules(game)['format'] == 'chess'
+    sets = []
+    for item in score:
+        if isinstance(item, str):
+            item = item.strip()
+            if chess:
+                code = _CHESS_ALIASES.get(item, item)
+                if code not in CHESS_RESULTS:
+                    raise ValueError(f"'{item}' is not a chess result (1-0, 0-1 or 1/2-1/2)")
+                sets.append(CHESS_RESULTS[code])
+                continue
+            found = _SET_SCORE.match(item)
+            if not found:
+                raise ValueError(f"'{item}' is not a score like 21-15")
+            item = (found.group(1), found.group(2))
+        try:
+            side1, side2 = (int(points) for points in item)
+        except (TypeError, ValueError):
+            raise ValueError(f"{item!r} is not a pair of points")
+        if side1 < 0 or side2 < 0:
+            raise ValueError("Points cannot be negative")
+        sets.append((side1, side2))
+    return sets
+
+
+def _check_rally_game(number, side1, side2, rules):
+    winner, loser = max(side1, side2), min(side1, side2)
+    target, cap = rules['points'], rules['cap']
+    if winner < target or winner == loser:
+        raise ValueError(f"Game {number} ({side1}-{side2}) is not finished; games go to {target}")
+    if cap is not None and winner > cap:
+        raise ValueError(f"Game {number} ({side1}-{side2}) goes past {cap}")
+    if winner == target and loser > target - 2:
+        raise ValueError(f"Game {number} ({side1}-{side2}) must be won by two")
+    if winner > target and winner - loser != 2 and not (winner == cap and loser == cap - 1):
+        raise ValueError(f"Game {number} ({side1}-{side2}) should have ended at a two-point lead")
+
+
+def check_sets(game, sets):
+    """
+    Check a complete match score against the game's rules.
+
+    Returns:
+        int: Winning side, 1 or 2
+
+    Raises:
+        ValueError: If the game has no rules or the score breaks them
+    """
+    rules = get_rules(game)
+    if rules is None:
+        raise ValueError(f"No scoring rules for {game}")
+    if not sets:
+        raise ValueError("A score needs at least one set")
+
+    if rules['format'] == 'rally':
+        needed = rules['best_of'] // 2 + 1
+        won = [0, 0, 0]
+        for number, (side1, side2) in enumerate(sets, start=1):
+            if max(won) == needed:
+                raise ValueError(f"Game {number} was played after the match was decided (best of {rules['best_of']})")
+            _check_rally_game(number, side1, side2, rules)
+            won[1 if side1 > side2 else 2] += 1
+        if max(won) < needed:
+            raise ValueError(f"The match is not decided: best of {rules['best_of']} needs {needed} games")
+        return 1 if won[1] == needed else 2
+
+    if rules['format'] == 'boards':
+        totals = [0, 0, 0]
+        for number, (side1, side2) in enumerate(sets, start=1):
+            if max(totals) >= rules['target'] or (number > rules['boards'] and totals[1] != totals[2]):
+                raise ValueError(f"Board {number} was played after the game was decided")
+            if min(side1, side2) != 0 or not 1 <= max(side1, side2) <= rules['max_board_points']:
+                raise ValueError(f"Board {number} ({side1}-{side2}): only the board winner scores, "
+                                 f"1 to {rules['max_board_points']} points")
+            totals[1] += side1
+            totals[2] += side2
+        if max(totals) < rules['target'] and (len(sets) < rules['boards'] or totals[1] == totals[2]):
+            raise ValueError(f"The game is not decided: first to {rules['target']} points or "
+                             f"the leader after {rules['boards']} boards")
+        return 1 if totals[1] > totals[2] else 2
+
+    if len(sets) > rules['max_games']:
+        raise ValueError(f"At most {rules['max_games']} games per match")
+    if any(points not in CHESS_RESULTS.values() for points in sets):
+        raise ValueError("Chess games are 1-0, 0-1 or 1/2-1/2")
+    side1, side2 = (sum(points) for points in zip(*sets))
+    if side1 == side2:
+        raise ValueError("The match is level; add a tie-break game")
+    return 1 if side1 > side2 else 2
+
+
+def read_score(game, score):
+    """
+    Parse and check a match score for a game with scoring rules.
+
+    Returns:
+        tuple: (sets, winning side, score text), or None when the game has no rules
+               or there is no score
+
+    Raises:
+        ValueError: If the score cannot be read or breaks the game's rules
+    """
+    if get_rules(game) is None or score is None or score == "" or score == []:
+        return None
+    sets = parse_score(game, score)
+    return sets, check_sets(game, sets), format_score(game, sets)
+
+
+def format_score(game, sets):
+    """Score text stored in matches.score, e.g. "21-15, 18-21, 21-19" or "1-0, 1/2-1/2" """
+    if get_rules(game) is not None and get_rules(game)['format'] == 'chess':
+        codes = {points: code for code, points in CHESS_RESULTS.items()}
+        return ", ".join(codes.get(tuple(points), f"{points[0]}-{points[1]}") for points in sets)
+    return ", ".join(f"{side1}-{side2}" for side1, side2 in sets)
+
+
+def save_match_sets(match_id, sets, conn=None):
+    """Replace a match's sets; the stats triggers update its players' totals"""
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(get_database())
+    try:
+        conn.execute("DELETE FROM match_sets WHERE match_id = ?", (match_id,))
+        conn.executemany("INSERT INTO match_sets (match_id, set_number, side1_points, side2_points) VALUES (?, ?, ?, ?)",
+                         [(match_id, number, side1, side2) for number, (side1, side2) in enumerate(sets, start=1)])
+        if own_conn:
+            conn.commit()
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def get_match_sets(match_id):
+    """A match's sets as (side1_points, side2_points) pairs, in order"""
+    conn = connect(get_database())
+    rows = conn.execute("SELECT side1_points, side2_points FROM match_sets WHERE match_id = ? ORDER BY set_number",
+                        (match_id,)).fetchall()
+    conn.close()
+    return rows
+
+
+def get_player_stats(participant_ids):
+    """
+    Stats of some participants, e.g. to break a tie between them.
+
+    Returns:
+        dict: participant_id -> dict of STATS_COLUMNS (zeros for players without results)
+    """
+    participant_ids = [int(participant_id) for participant_id in participant_ids]
+    stats = {participant_id: dict.fromkeys(STATS_COLUMNS, 0) for participant_id in participant_ids}
+    if not participant_ids:
+        return stats
+    conn = connect(get_database())
+    rows = conn.execute(f"SELECT participant_id, {', '.join(STATS_COLUMNS)} FROM player_stats "
+                        f"WHERE participant_id IN ({', '.join('?' * len(participant_ids))})", participant_ids).fetchall()
+    conn.close()
+    for row in rows:
+        stats[row[0]] = dict(zip(STATS_COLUMNS, row[1:]))
+    return stats
+
+
+def get_leaderboard(game=None, category=None, limit=20):
+    """
+    Players ranked by matches won, then set difference, then point difference.
+
+    Read from player_stats, so no scores are parsed. Players without a played
+    match are left out.
+    """
+    conditions, params = ["p.archived = 0", "s.matches_played > 0"], []
+    if game:
+        conditions.append("p.game = ?")
+        params.append(game)
+    if category:
+        conditions.append("p.category = ?")
+        params.append(category)
+    conn = connect(get_database())
+    df = pd.read_sql_query(f'''
+        SELECT p.id AS participant_id, p.emp_id, p.name, p.game, p.category,
+               s.matches_played, s.matches_won, s.sets_won, s.sets_lost,
+               s.sets_won - s.sets_lost AS set_difference, s.points_for, s.points_against,
+               s.points_for - s.points_against AS point_difference
+        FROM player_stats s
+        JOIN participants p ON p.id = s.participant_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY {LEADERBOARD_ORDER}
+        LIMIT ?
+    ''', conn, params=params + [limit])
+    conn.close()
+    return df
@@ -0,0 +1,303 @@
+import os
+import sys
+import json
+import shutil
+import zipfile
+import argparse
+from datetime import datetime
+from events_utils import create_event_log, drop_event_triggers, record_event
+from db_utils import connect, get_database
+from tournaments_utils import use_current_tournament, use_database
+from teams_utils import sync_teams
+
+# pyarrow is optional: snapshots are unavailable without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Directory snapshots are written to
+SNAPSHOT_DIR = "snapshots"
+
+# Tables included in a snapshot, in restore order
+SNAPSHOT_TABLES = ["participants", "teams", "matches", "match_sets", "fixtures"]
+
+# Primary key each table is dumped in (tables not listed use id)
+SNAPSHOT_ORDER = {"match_sets": "match_id, set_number"}
+
+# Rows per Parquet row group / SQLite fetch
+SNAPSHOT_BATCH_SIZE = 50000
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Snapshots require pyarrow. Install it with: pip install pyarrow")
+
+
+def _column_types(conn, table):
+    """
+    Map a table's columns to Arrow types.
+
+    Declared SQLite types are only a hint, so each column is checked against the
+    data: INTEGER/REAL columns holding text, and TIMESTAMP columns holding anything
+    but YYYY-MM-DD date-times (e.g. time slot labels in match_date), are kept as strings.
+    """
+    columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    fields = []
+    for _, name, declared, _, _, _ in columns:
+        declared = (declared or "").upper()
+        if "INT" in declared:
+            mismatched = conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE typeof({name}) NOT IN ('integer', 'null')").fetchone()[0]
+            arrow_type = pa.int64() if not mismatched else pa.string()
+        elif "REAL" in declared or "FLOA" in declared or "DOUB" in declared:
+            mismatched = conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE typeof({name}) NOT IN ('real', 'integer', 'null')").fetchone()[0]
+            arrow_type = pa.float64() if not mismatched else pa.string()
+        elif "TIMESTAMP" in declared or "DATE" in declared:
+            mismatched = conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE {name} IS NOT NULL "
+                f"AND (typeof({name}) != 'text' OR datetime({name}) IS NULL "
+                f"OR {name} NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*')").fetchone()[0]
+            arrow_type = pa.timestamp('us') if not mismatched else pa.string()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _to_arrow_column(values, arrow_type):
+    if pa.types.is_timestamp(arrow_type):
+        # SQLite keeps timestamps as ISO text; Arrow parses them in one vectorized cast
+        return pa.array(values, type=pa.string()).cast(arrow_type)
+    if pa.types.is_string(arrow_type):
+        return pa.array([None if value is None else str(value) for value in values], type=arrow_type)
+    return pa.array(values, type=arrow_type)
+
+
+def _from_arrow_column(array):
+    if pa.types.is_timestamp(array.type):
+        # Back to SQLite's text form (CURRENT_TIMESTAMP style, microseconds only when present)
+        return [None if value is None else value.isoformat(sep=' ') for value in array.to_pylist()]
+    return array.to_pylist()
+
+
+def create_snapshot(name=None, directory=None, tables=None):
+    """
+    Dump tournament tables to typed Parquet files plus a manifest.
+
+    Tables are streamed from SQLite in SNAPSHOT_BATCH_SIZE row groups, so memory
+    stays bounded by one batch.
+
+    Args:
+        name (str, optional): Snapshot label (default "snapshot")
+        directory (str, optional): Parent directory (default SNAPSHOT_DIR)
+        tables (list, optional): Tables to include (default SNAPSHOT_TABLES)
+
+    Returns:
+        tuple: (snapshot directory path, manifest dict)
+    """
+    _require_pyarrow()
+    directory = directory or SNAPSHOT_DIR
+    tables = tables or SNAPSHOT_TABLES
+    label = "".join(c if c.isalnum() or c in "-_" else "_" for c in (name or "snapshot").strip()) or "snapshot"
+    path = os.path.join(directory, f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(path, exist_ok=True)
+
+    manifest = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'name': name or label,
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'tables': {},
+    }
+
+    conn = connect(get_database())
+    try:
+        for table in tables:
+            schema = _column_types(conn, table)
+            cursor = conn.execute(f"SELECT {', '.join(schema.names)} FROM {table} "
+                                  f"ORDER BY {SNAPSHOT_ORDER.get(table, 'id')}")
+            file_name = f"{table}.parquet"
+            rows = 0
+            with pq.ParquetWriter(os.path.join(path, file_name), schema, compression='zstd') as writer:
+                while True:
+                    batch = cursor.fetchmany(SNAPSHOT_BATCH_SIZE)
+                    if not batch:
+                        break
+                    columns = list(zip(*batch))
+                    writer.write_batch(pa.record_batch(
+                        [_to_arrow_column(list(values), field.type) for values, field in zip(columns, schema)],
+                        schema=schema))
+                    rows += len(batch)
+            manifest['tables'][table] = {
+                'file': file_name,
+                'rows': rows,
+                'bytes': os.path.getsize(os.path.join(path, file_name)),
+                'columns': {field.name: str(field.type) for field in schema},
+            }
+    finally:
+        conn.close()
+
+    with open(os.path.join(path, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path, manifest
+
+
+def read_manifest(path):
+    """Read a snapshot's manifest.json"""
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def list_snapshots(directory=None):
+    """
+    List snapshots under the snapshot directory, newest first.
+
+    Returns:
+        list: Dicts with path, name, created_at and rows per table
+    """
+    directory = directory or SNAPSHOT_DIR
+    if not os.path.isdir(directory):
+        return []
+    snapshots = []
+    for entry in sorted(os.listdir(directory), reverse=True):
+        path = os.path.join(directory, entry)
+        if os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+            manifest = read_manifest(path)
+            snapshots.append({
+                'path': path,
+                'name': manifest.get('name', entry),
+                'created_at': manifest.get('created_at'),
+                'rows': {table: info['rows'] for table, info in manifest['tables'].items()},
+            })
+    return snapshots
+
+
+def restore_snapshot(path, tables=None):
+    """
+    Replace tournament tables with the contents of a snapshot, in one transaction.
+
+    Row IDs are preserved so match/fixture references stay valid. Columns that
+    no longer exist in the current schema are skipped; new columns keep their defaults.
+    The change feed gets a single "reset" event instead of one event per restored row.
+
+    Args:
+        path (str): Snapshot directory
+        tables (list, optional): Tables to restore (default: every table in the snapshot)
+
+    Returns:
+        dict: Rows restored per table
+    """
+    _require_pyarrow()
+    manifest = read_manifest(path)
+    if manifest.get('format_version', 0) > SNAPSHOT_FORMAT_VERSION:
+        raise ValueError("Snapshot was written by a newer version of the app")
+    tables = tables or [table for table in SNAPSHOT_TABLES if table in manifest['tables']]
+
+    counts = {}
+    conn = connect(get_database())
+    try:
+        # Explicit BEGIN so the trigger drop/recreate is part of the same transaction as the data
+        conn.execute("BEGIN")
+        drop_event_triggers(conn)
+        for table in tables:
+            current_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            parquet_file = pq.ParquetFile(os.path.join(path, manifest['tables'][table]['file']))
+            columns = [name for name in parquet_file.schema_arrow.names if name in current_columns]
+            placeholders = ", ".join("?" * len(columns))
+            insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+            conn.execute(f"DELETE FROM {table}")
+            rows = 0
+            for batch in parquet_file.iter_batches(batch_size=SNAPSHOT_BATCH_SIZE, columns=columns):
+                values = [_from_arrow_column(batch.column(i)) for i in range(batch.num_columns)]
+                conn.executemany(insert, zip(*values))
+                rows += batch.num_rows
+            counts[table] = rows
+        if 'participants' in tables and 'teams' not in tables:
+            # Snapshots from before the teams table: rebuild teams from partner_emp_id
+            sync_teams(conn)
+        record_event('reset', 'tournament', payload={'reason': 'snapshot_restored', 'snapshot': manifest.get('name'),
+                                                     'rows': counts}, conn=conn)
+        create_event_log(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return counts
+
+
+def zip_snapshot(path):
+    """Pack a snapshot directory into a .zip next to it and return the zip path"""
+    archive_path = path.rstrip(os.sep) + ".zip"
+    # Parquet is already compressed; store the files as-is
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for file_name in sorted(os.listdir(path)):
+            archive.write(os.path.join(path, file_name), arcname=file_name)
+    return archive_path
+
+
+def unzip_snapshot(archive, directory=None):
+    """Extract an uploaded snapshot .zip (path or file object) into the snapshot directory"""
+    directory = directory or SNAPSHOT_DIR
+    with zipfile.ZipFile(archive) as zipped:
+        names = zipped.namelist()
+        if MANIFEST_FILE not in names:
+            raise ValueError("Not a tournament snapshot (manifest.json missing)")
+        manifest = json.loads(zipped.read(MANIFEST_FILE))
+        label = "".join(c if c.isalnum() or c in "-_" else "_" for c in manifest.get('name', 'snapshot')) or "snapshot"
+        path = os.path.join(directory, f"{label}_{manifest.get('created_at', '').replace('-', '').replace(':', '').replace(' ', '_')}_imported")
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+        for name in names:
+            # Only flat files are expected; ignore anything with a directory component
+            if os.path.basename(name) == name:
+                with open(os.path.join(path, name), "wb") as f:
+                    f.write(zipped.read(name))
+    return path
+
+
+def main(argv=None):
+    """Command line entry point for creating and restoring snapshots"""
+    parser = argparse.ArgumentParser(description="Archive or restore a tournament as Parquet snapshots")
+    parser.add_argument("--db", help="Tournament database path (default: the current tournament)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    create_parser = subparsers.add_parser("create", help="Write a snapshot of the current tournament")
+    create_parser.add_argument("--name", default="snapshot")
+    subparsers.add_parser("list", help="List snapshots")
+    restore_parser = subparsers.add_parser("restore", help="Replace the tournament data with a snapshot")
+    restore_parser.add_argument("path", help="Snapshot directory or .zip")
+    args = parser.parse_args(argv)
+    if args.db:
+        use_database(args.db)
+    else:
+        use_current_tournament()
+
+    started = datetime.now()
+    if args.command == "create":
+        path, manifest = create_snapshot(args.name)
+        for table, info in manifest['tables'].items():
+            print(f"{table}: {info['rows']} rows, {info['bytes'] / 1024:.0f} KB")
+        print(f"Wrote {path} in {(datetime.now() - started).total_seconds():.1f}s")
+    elif args.command == "list":
+        for snapshot in list_snapshots():
+            print(f"{snapshot['path']}  {snapshot['created_at']}  {snapshot['rows']}")
+    else:
+        path = unzip_snapshot(args.path) if args.path.endswith(".zip") else args.path
+        counts = restore_snapshot(path)
+        for table, count in counts.items():
+            print(f"{table}: {count} rows restored")
+        print(f"Restored {path} in {(datetime.now() - started).total_seconds():.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import pandas as pd
+
+from db_utils import connect, create_triggers, get_database
+
+# Counts maintained by triggers so dashboard metrics never scan the participants or matches tables.
+# NULL dimensions are stored as '' / 0 so they can take part in the upsert's unique key.
+# placeholder marks auto-generated "Player-..." partners, which get_participants() hides.
+SUMMARY_TABLES = {
+    "participant_summary": '''
+        CREATE TABLE IF NOT EXISTS participant_summary (
+            game TEXT NOT NULL,
+            category TEXT NOT NULL,
+            registered_at_desk INTEGER NOT NULL,
+            placeholder INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (game, category, registered_at_desk, placeholder)
+        )
+    ''',
+    "match_summary": '''
+        CREATE TABLE IF NOT EXISTS match_summary (
+            game TEXT NOT NULL,
+            category TEXT NOT NULL,
+            round_number INTEGER NOT NULL,
+            match_status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (game, category, round_number, match_status)
+        )
+    ''',
+}
+
+_PARTICIPANT_KEY = ("COALESCE({row}.game, ''), COALESCE({row}.category, ''), "
+                    "COALESCE({row}.registered_at_desk, 0), COALESCE({row}.name LIKE 'Player-%', 0)")
+_PARTICIPANT_MATCH = ("game = COALESCE({row}.game, '') AND category = COALESCE({row}.category, '') "
+                      "AND registered_at_desk = COALESCE({row}.registered_at_desk, 0) "
+                      "AND placeholder = COALESCE({row}.name LIKE 'Player-%', 0)")
+_MATCH_KEY = ("COALESCE({row}.game, ''), COALESCE({row}.category, ''), COALESCE({row}.round_number, 0), "
+              "COALESCE({row}.match_status, '')")
+_MATCH_MATCH = ("game = COALESCE({row}.game, '') AND category = COALESCE({row}.category, '') "
+                "AND round_number = COALESCE({row}.round_number, 0) AND match_status = COALESCE({row}.match_status, '')")
+
+_PARTICIPANT_ADD = (f"INSERT INTO participant_summary (game, category, registered_at_desk, placeholder, count) "
+                    f"VALUES ({_PARTICIPANT_KEY.format(row='NEW')}, 1) "
+                    f"ON CONFLICT (game, category, registered_at_desk, placeholder) DO UPDATE SET count = count + 1;")
+_PARTICIPANT_REMOVE = f"UPDATE participant_summary SET count = count - 1 WHERE {_PARTICIPANT_MATCH.format(row='OLD')};"
+_MATCH_ADD = (f"INSERT INTO match_summary (game, category, round_number, match_status, count) "
+              f"VALUES ({_MATCH_KEY.format(row='NEW')}, 1) "
+              f"ON CONFLICT (game, category, round_number, match_status) DO UPDATE SET count = count + 1;")
+_MATCH_REMOVE = f"UPDATE match_summary SET count = count - 1 WHERE {_MATCH_MATCH.format(row='OLD')};"
+
+# Archived rows are not counted: archiving rebuilds the summaries once (see archive_utils),
+# and inserting (e.g. a snapshot restore), editing or compacting archived rows leaves them alone
+SUMMARY_TRIGGERS = {
+    "trg_participant_summary_insert": f"AFTER INSERT ON participants WHEN NEW.archived = 0 BEGIN {_PARTICIPANT_ADD} END",
+    "trg_participant_summary_delete": f"AFTER DELETE ON participants WHEN OLD.archived = 0 BEGIN {_PARTICIPANT_REMOVE} END",
+    "trg_participant_summary_update": ("AFTER UPDATE OF name, game, category, registered_at_desk ON participants "
+                                       f"WHEN OLD.archived = 0 BEGIN {_PARTICIPANT_REMOVE} {_PARTICIPANT_ADD} END"),
+    "trg_match_summary_insert": f"AFTER INSERT ON matches WHEN NEW.archived = 0 BEGIN {_MATCH_ADD} END",
+    "trg_match_summary_delete": f"AFTER DELETE ON matches WHEN OLD.archived = 0 BEGIN {_MATCH_REMOVE} END",
+    "trg_match_summary_update": ("AFTER UPDATE OF game, category, round_number, match_status ON matches "
+                                 f"WHEN OLD.archived = 0 BEGIN {_MATCH_REMOVE} {_MATCH_ADD} END"),
+}
+
+
+def create_summary_tables(conn):
+    """
+    Create the summary tables and their triggers on an open connection.
+
+    Called from init_database(). When any trigger is missing or out of date (new
+    database, a migration rebuilt participants/matches, or an older trigger
+    definition) the summaries are recomputed once.
+    A match_summary from before it was keyed by game is dropped with its triggers.
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(match_summary)")
+    match_summary_columns = [column[1] for column in cursor.fetchall()]
+    if match_summary_columns and 'game' not in match_summary_columns:
+        cursor.execute("DROP TABLE match_summary")
+        for name in SUMMARY_TRIGGERS:
+            if name.startswith("trg_match_summary"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    for ddl in SUMMARY_TABLES.values():
+        cursor.execute(ddl)
+
+    if create_triggers(conn, SUMMARY_TRIGGERS):
+        rebuild_summary_tables(conn)
+
+
+def rebuild_summary_tables(conn=None):
+    """Recompute both summary tables from the active (not archived) rows, one GROUP BY per table"""
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(get_database())
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM participant_summary")
+        cursor.execute(f'''
+            INSERT INTO participant_summary (game, category, registered_at_desk, placeholder, count)
+            SELECT {_PARTICIPANT_KEY.format(row='p')}, COUNT(*)
+            FROM participants p
+            WHERE p.archived = 0
+            GROUP BY 1, 2, 3, 4
+        ''')
+        cursor.execute("DELETE FROM match_summary")
+        cursor.execute(f'''
+            INSERT INTO match_summary (game, category, round_number, match_status, count)
+            SELECT {_MATCH_KEY.format(row='m')}, COUNT(*)
+            FROM matches m
+            WHERE m.archived = 0
+            GROUP BY 1, 2, 3, 4
+        ''')
+        if own_conn:
+            conn.commit()
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def _game_filter(game, prefix="WHERE"):
+    """SQL condition and params restricting a summary table to one game (nothing when game is None)"""
+    return (f" {prefix} game = ?", [game]) if game else ("", [])
+
+
+def get_summary_metrics(game=None):
+    """
+    Headline tournament counts read from the summary tables, for every game or one.
+
+    Placeholder partners are excluded, matching get_participants().
+
+    Returns:
+        dict: total_participants, reported_participants, total_matches, completed_matches
+    """
+    participant_filter, params = _game_filter(game, "AND")
+    match_filter, _ = _game_filter(game)
+    completed_filter, _ = _game_filter(game, "AND")
+    conn = connect(get_database())
+    row = conn.execute(f'''
+        SELECT
+            (SELECT COALESCE(SUM(count), 0) FROM participant_summary WHERE placeholder = 0{participant_filter}),
+            (SELECT COALESCE(SUM(count), 0) FROM participant_summary
+             WHERE placeholder = 0 AND registered_at_desk = 1{participant_filter}),
+            (SELECT COALESCE(SUM(count), 0) FROM match_summary{match_filter}),
+            (SELECT COALESCE(SUM(count), 0) FROM match_summary WHERE match_status = 'completed'{completed_filter})
+    ''', params * 4).fetchone()
+    conn.close()
+    return {
+        'total_participants': row[0],
+        'reported_participants': row[1],
+        'total_matches': row[2],
+        'completed_matches': row[3],
+    }
+
+
+def get_category_summary(game=None):
+    """Participants and desk registrations per category, for every game or one (placeholder partners excluded)"""
+    game_filter, params = _game_filter(game, "AND")
+    conn = connect(get_database())
+    df = pd.read_sql_query(f'''
+        SELECT category,
+               SUM(count) AS participants,
+               SUM(CASE WHEN registered_at_desk = 1 THEN count ELSE 0 END) AS reported
+        FROM participant_summary
+        WHERE placeholder = 0{game_filter}
+        GROUP BY category
+        HAVING SUM(count) > 0
+        ORDER BY participants DESC, category
+    ''', conn, params=params)
+    conn.close()
+    return df
+
+
+def get_round_progress(game=None):
+    """Total and completed matches per category and round, for every game or one"""
+    game_filter, params = _game_filter(game)
+    conn = connect(get_database())
+    df = pd.read_sql_query(f'''
+        SELECT category, round_number,
+               SUM(count) AS total_matches,
+               SUM(CASE WHEN match_status = 'completed' THEN count ELSE 0 END) AS completed_matches
+        FROM match_summary{game_filter}
+        GROUP BY category, round_number
+        HAVING SUM(count) > 0
+        ORDER BY category, round_number
+    ''', conn, params=params)
+    conn.close()
+    return df
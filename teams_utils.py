@@ -0,0 +1,272 @@
+import pandas as pd
+
+from db_utils import connect, create_triggers, get_database
+
+# One row per doubles pair. player1_id is always the lower participant ID, so a pair has
+# exactly one row whichever partner named the other.
+TEAMS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS teams (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game TEXT,
+        category TEXT NOT NULL,
+        player1_id INTEGER NOT NULL,
+        player2_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (player1_id, player2_id),
+        CHECK (player1_id < player2_id),
+        FOREIGN KEY (player1_id) REFERENCES participants (id),
+        FOREIGN KEY (player2_id) REFERENCES participants (id)
+    )
+'''
+
+# A team stops existing when either player is deleted or changes partner, category or game;
+# the next sync_teams() pairs them again from the new details.
+TEAM_TRIGGERS = {
+    "trg_teams_participant_delete": ("AFTER DELETE ON participants BEGIN "
+                                     "DELETE FROM teams WHERE player1_id = OLD.id OR player2_id = OLD.id; END"),
+    "trg_teams_participant_update": ("AFTER UPDATE OF partner_emp_id, category, game ON participants "
+                                     "WHEN NEW.partner_emp_id IS NOT OLD.partner_emp_id OR NEW.category IS NOT OLD.category "
+                                     "OR NEW.game IS NOT OLD.game BEGIN "
+                                     "DELETE FROM teams WHERE player1_id = NEW.id OR player2_id = NEW.id; END"),
+}
+
+# Tables whose doubles rows carry team1_id / team2_id next to their four player columns
+TEAM_REFERENCING_TABLES = ("matches", "fixtures")
+
+# Active doubles participants who can be paired (placeholder partners never are)
+_ENTRANTS = ("SELECT id, emp_id, partner_emp_id, game, category FROM participants "
+             "WHERE archived = 0 AND category LIKE '%Doubles%' AND name NOT LIKE 'Player-%'")
+
+# Team of two player columns, or NULL when either is empty or they are not a team
+_TEAM_ID = "(SELECT t.id FROM teams t WHERE t.player1_id = min({a}, {b}) AND t.player2_id = max({a}, {b}))"
+
+
+def create_teams_table(conn):
+    """
+    Create the teams table, its triggers and the team columns of matches and fixtures.
+
+    Called from init_database(). When the table is new, teams are built from the
+    existing partner_emp_id pairs and existing doubles matches and fixtures are linked.
+    Triggers defined differently by an older version are recreated.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'teams'")
+    is_new = cursor.fetchone()[0] == 0
+    cursor.execute(TEAMS_TABLE)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_teams_player2 ON teams (player2_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_teams_category ON teams (category, game)")
+    create_triggers(conn, TEAM_TRIGGERS)
+
+    for table in TEAM_REFERENCING_TABLES:
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = [column[1] for column in cursor.fetchall()]
+        for column in ("team1_id", "team2_id"):
+            if columns and column not in columns:
+                print(f"Adding {column} column to {table} table...")
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER REFERENCES teams (id)")
+
+    if is_new:
+        sync_teams(conn)
+        for table in TEAM_REFERENCING_TABLES:
+            link_team_ids(conn, table)
+
+
+def pair_partners(entrants, paired=()):
+    """
+    Pair the doubles entrants of one game and category by partner_emp_id in O(n).
+
+    Entrants are indexed by emp_id once, so each partner lookup is a dict access.
+    Mutual pairs (each names the other) are made first; a one-sided claim then
+    pairs two players only if neither is taken.
+
+    Args:
+        entrants (iterable): (id, emp_id, partner_emp_id) tuples
+        paired (set, optional): IDs already in a team, which are left out
+
+    Returns:
+        dict: pairs (list of (lower ID, higher ID)), asymmetric ((id, partner ID) of the
+              pairs made from a one-sided claim), conflicts ((id, partner ID) claims on someone paired with
+              another player) and orphans (IDs still without a partner)
+    """
+    entrants = list(entrants)
+    by_emp_id = {emp_id: (participant_id, partner_emp_id) for participant_id, emp_id, partner_emp_id in entrants}
+    taken = set(paired)
+    pairs = []
+    one_sided = []
+    conflicts = []
+    for participant_id, emp_id, partner_emp_id in entrants:
+        partner = by_emp_id.get(partner_emp_id) if partner_emp_id else None
+        if partner is None or partner[0] == participant_id:
+            continue
+        partner_id, partners_partner = partner
+        if partners_partner != emp_id:
+            one_sided.append((participant_id, partner_id))
+        elif participant_id < partner_id:
+            if participant_id in taken or partner_id in taken:
+                conflicts.append((participant_id, partner_id))
+            else:
+                pairs.append((participant_id, partner_id))
+                taken.update((participant_id, partner_id))
+
+    asymmetric = []
+    for participant_id, partner_id in one_sided:
+        if participant_id in taken or partner_id in taken:
+            conflicts.append((participant_id, partner_id))
+            continue
+        pair = (min(participant_id, partner_id), max(participant_id, partner_id))
+        pairs.append(pair)
+        asymmetric.append((participant_id, partner_id))
+        taken.update(pair)
+
+    orphans = [participant_id for participant_id, _, _ in entrants if participant_id not in taken]
+    return {'pairs': pairs, 'asymmetric': asymmetric, 'conflicts': conflicts, 'orphans': orphans}
+
+
+def _group_entrants(rows):
+    """Split (id, emp_id, partner_emp_id, game, category) rows into {(game, category): entrants}"""
+    groups = {}
+    for participant_id, emp_id, partner_emp_id, game, category in rows:
+        groups.setdefault((game, category), []).append((participant_id, emp_id, partner_emp_id))
+    return groups
+
+
+def sync_teams(conn=None, participant_ids=None):
+    """
+    Create a team for every doubles pair that is not in one yet (see pair_partners()).
+
+    Args:
+        conn (sqlite3.Connection, optional): Write inside the caller's transaction
+        participant_ids (list, optional): Only pair these participants (default: everyone).
+            Their partners and anyone naming them are loaded too, not the whole category.
+
+    Returns:
+        int: Teams created
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(get_database())
+    try:
+        if participant_ids is None:
+            rows = conn.execute(_ENTRANTS).fetchall()
+            teamed_rows = conn.execute("SELECT player1_id, player2_id FROM teams")
+        else:
+            ids = [int(participant_id) for participant_id in participant_ids]
+            if not ids:
+                return 0
+            marks = ", ".join("?" * len(ids))
+            rows = conn.execute(f"{_ENTRANTS} AND (id IN ({marks}) "
+                                f"OR emp_id IN (SELECT partner_emp_id FROM participants WHERE id IN ({marks})) "
+                                f"OR partner_emp_id IN (SELECT emp_id FROM participants WHERE id IN ({marks})))",
+                                ids * 3).fetchall()
+            involved = [row[0] for row in rows]
+            if not involved:
+                return 0
+            marks = ", ".join("?" * len(involved))
+            teamed_rows = conn.execute(f"SELECT player1_id, player2_id FROM teams "
+                                       f"WHERE player1_id IN ({marks}) OR player2_id IN ({marks})", involved * 2)
+        teamed = {player_id for row in teamed_rows for player_id in row}
+
+        new_teams = []
+        for (game, category), entrants in _group_entrants(rows).items():
+            for player1_id, player2_id in pair_partners(entrants, teamed)['pairs']:
+                new_teams.append((game, category, player1_id, player2_id))
+        conn.executemany("INSERT OR IGNORE INTO teams (game, category, player1_id, player2_id) VALUES (?, ?, ?, ?)",
+                         new_teams)
+        if own_conn:
+            conn.commit()
+        return len(new_teams)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def get_pairing_report(category, game=None):
+    """
+    How a doubles category's entrants pair up from partner_emp_id alone, ignoring existing teams.
+
+    Returns:
+        dict: teams (count), and asymmetric, conflicts and orphans as lists of dicts with
+              the emp_id and name of the player and, where there is one, the partner
+    """
+    where = " AND category = ?"
+    params = [category]
+    if game is not None:
+        where += " AND game = ?"
+        params.append(game)
+    conn = connect(get_database())
+    rows = conn.execute(_ENTRANTS + where, params).fetchall()
+    names = dict(conn.execute("SELECT id, name FROM participants WHERE archived = 0" + where, params))
+    conn.close()
+
+    emp_ids = {row[0]: row[1] for row in rows}
+    report = {'teams': 0, 'asymmetric': [], 'conflicts': [], 'orphans': []}
+    for entrants in _group_entrants(rows).values():
+        result = pair_partners(entrants)
+        report['teams'] += len(result['pairs'])
+        for key in ('asymmetric', 'conflicts'):
+            report[key].extend({'emp_id': emp_ids[player_id], 'name': names[player_id],
+                                'partner_emp_id': emp_ids[partner_id], 'partner_name': names[partner_id]}
+                               for player_id, partner_id in result[key])
+        report['orphans'].extend({'emp_id': emp_ids[player_id], 'name': names[player_id]}
+                                 for player_id in result['orphans'])
+    return report
+
+
+def link_team_ids(conn, table, row_ids=None):
+    """
+    Set team1_id / team2_id of matches or fixtures rows from their doubles player columns.
+
+    Args:
+        conn (sqlite3.Connection): Open connection (not committed here)
+        table (str): "matches" or "fixtures"
+        row_ids (list, optional): Only these rows (default: every row)
+    """
+    if table not in TEAM_REFERENCING_TABLES:
+        raise ValueError(f"{table} has no team columns")
+    query = (f"UPDATE {table} SET team1_id = {_TEAM_ID.format(a='team1_player1_id', b='team1_player2_id')}, "
+             f"team2_id = {_TEAM_ID.format(a='team2_player1_id', b='team2_player2_id')}")
+    params = []
+    if row_ids is not None:
+        params = [int(row_id) for row_id in row_ids]
+        if not params:
+            return
+        query += f" WHERE id IN ({', '.join('?' * len(params))})"
+    else:
+        query += " WHERE team1_player1_id IS NOT NULL OR team2_player1_id IS NOT NULL"
+    conn.execute(query, params)
+
+
+def get_teams(category=None, game=None):
+    """
+    Doubles teams with both players' details, resolved with one join per player.
+
+    Args:
+        category (str, optional): Only this category
+        game (str, optional): Only this game
+
+    Returns:
+        DataFrame: id, game, category, player1_id, player1_name, player1_emp_id, player1_email,
+                   player2_id, player2_name, player2_emp_id, player2_email, oldest team first
+    """
+    query = '''
+        SELECT t.id, t.game, t.category,
+               t.player1_id, p1.name AS player1_name, p1.emp_id AS player1_emp_id, p1.email AS player1_email,
+               t.player2_id, p2.name AS player2_name, p2.emp_id AS player2_emp_id, p2.email AS player2_email
+        FROM teams t
+        JOIN participants p1 ON p1.id = t.player1_id
+        JOIN participants p2 ON p2.id = t.player2_id
+    '''
+    where = []
+    params = []
+    if category is not None:
+        where.append("t.category = ?")
+        params.append(category)
+    if game is not None:
+        where.append("t.game = ?")
+        params.append(game)
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    conn = connect(get_database())
+    teams_df = pd.read_sql_query(query + " ORDER BY t.id", conn, params=params)
+    conn.close()
+    return teams_df
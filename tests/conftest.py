@@ -0,0 +1,35 @@
+"""
+Fixtures shared by the test suite.
+
+Each test runs in its own temporary directory with a fresh tournament.db, so
+the tournament, its catalog and any snapshots or archives stay out of the repo.
+"""
+import sqlite3
+
+import pytest
+
+import sample_data
+from tournament_service import init_database
+
+
+@pytest.fixture
+def tournament(tmp_path, monkeypatch):
+    """An empty tournament in a temporary working directory"""
+    monkeypatch.chdir(tmp_path)
+    init_database()
+    return tmp_path
+
+
+@pytest.fixture
+def sample_tournament(tournament):
+    """A small generated tournament with half of each bracket played"""
+    sample_data.generate_tournament(200, seed=7, completion=0.5)
+    return tournament
+
+
+@pytest.fixture
+def db(tournament):
+    """A connection to the test's tournament.db"""
+    conn = sqlite3.connect(tournament / "tournament.db")
+    yield conn
+    conn.close()
@@ -0,0 +1,28 @@
+"""JSON API: request body validation"""
+import pytest
+from starlette.testclient import TestClient
+
+import api_app
+from tournament_service import add_participant_extended, get_participant, get_participants
+
+
+@pytest.fixture
+def client(tournament, monkeypatch):
+    monkeypatch.setattr(api_app, "API_TOKEN", "")
+    with TestClient(api_app.app) as client:
+        yield client
+
+
+def test_check_in_takes_only_json_booleans(client):
+    add_participant_extended("E-1", "Asha", "asha@example.com", game="Chess", category="Open")
+    participant_id = int(get_participants()['id'].iloc[0])
+    url = f"/api/participants/{participant_id}/check-in"
+
+    assert client.post(url).json()['registered_at_desk'] == 1
+    for value in ("false", 0, "0", None):
+        response = client.post(url, json={'registered': value})
+        assert response.status_code == 400
+        assert response.json() == {'error': "registered must be true or false"}
+    assert get_participant(participant_id)['registered_at_desk'] == 1
+
+    assert client.post(url, json={'registered': False}).json()['registered_at_desk'] == 0
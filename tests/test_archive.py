@@ -0,0 +1,59 @@
+"""Archived rows: resets, and what the summaries and change feed count"""
+import pytest
+
+from archive_utils import archive_rows, compact_archived, enable_incremental_vacuum, get_archive_status
+from events_utils import get_latest_seq
+from summary_utils import get_summary_metrics, rebuild_summary_tables
+
+
+def _summaries(db):
+    return (db.execute("SELECT * FROM participant_summary WHERE count != 0 ORDER BY 1, 2, 3, 4").fetchall(),
+            db.execute("SELECT * FROM match_summary WHERE count != 0 ORDER BY 1, 2, 3, 4").fetchall())
+
+
+def test_reset_empties_the_dashboard(sample_tournament, db):
+    assert get_summary_metrics()['total_participants'] > 0
+    archive_rows(["participants", "matches", "fixtures"])
+    assert get_summary_metrics() == {'total_participants': 0, 'reported_participants': 0,
+                                     'total_matches': 0, 'completed_matches': 0}
+
+
+def test_archived_inserts_are_not_counted_or_logged(sample_tournament, db):
+    summaries, seq = _summaries(db), get_latest_seq()
+    db.execute("INSERT INTO participants (emp_id, name, game, category, archived) "
+               "VALUES ('X1', 'Archived Player', 'Chess', 'Open', 1)")
+    db.execute("INSERT INTO matches (game, category, round_number, match_status, archived) "
+               "VALUES ('Chess', 'Open', 1, 'scheduled', 1)")
+    db.execute("INSERT INTO fixtures (game, category, archived) VALUES ('Chess', 'Open', 1)")
+    db.commit()
+    assert _summaries(db) == summaries
+    assert get_latest_seq() == seq
+
+
+def test_restore_after_reset_counts_only_active_rows(sample_tournament, db):
+    pytest.importorskip("pyarrow")
+    from snapshot_utils import create_snapshot, restore_snapshot
+
+    archive_rows(["participants", "matches", "fixtures"])
+    path, _ = create_snapshot("after reset", directory=str(sample_tournament / "snapshots"))
+    restore_snapshot(path)
+    assert get_summary_metrics()['total_participants'] == 0
+    counted = _summaries(db)
+    rebuild_summary_tables()
+    assert _summaries(db) == counted
+
+
+def test_compaction_only_vacuums_incrementally(sample_tournament, db):
+    # A file from before incremental auto-vacuum is left as it is until converted on purpose
+    db.execute("PRAGMA auto_vacuum = NONE")
+    db.execute("VACUUM")
+    archive_rows(["participants", "matches", "fixtures"])
+    assert not get_archive_status()['incremental_vacuum']
+
+    moved = compact_archived(batch_size=50)
+    assert sum(moved.values()) > 0
+    assert db.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+    assert enable_incremental_vacuum()
+    assert get_archive_status()['incremental_vacuum']
+    assert not enable_incremental_vacuum()
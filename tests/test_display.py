@@ -0,0 +1,45 @@
+"""Venue display feed: one shared poller pushing (seq, state) to every screen"""
+import asyncio
+import json
+
+import display_app
+from display_app import DisplayFeed
+from events_utils import record_event
+
+
+def test_screens_get_each_state_with_its_own_seq(tournament):
+    async def scenario():
+        feed = DisplayFeed()
+        queue = feed.subscribe()
+        await feed.refresh()
+        first = queue.get_nowait()
+        record_event('match_result', 'matches', payload={'match_id': 1})
+        await feed.refresh()
+        return first, queue.get_nowait()
+
+    for seq, message in asyncio.run(scenario()):
+        assert json.loads(message)['seq'] == seq
+
+
+def test_poller_survives_a_failed_refresh(tournament, monkeypatch):
+    build = display_app.build_display_state
+    calls = []
+
+    def flaky_build(seq):
+        calls.append(seq)
+        if len(calls) == 1:
+            raise KeyError("court_number")
+        return build(seq)
+
+    monkeypatch.setattr(display_app, "build_display_state", flaky_build)
+
+    async def scenario():
+        feed = DisplayFeed(poll_interval=0)
+        task = asyncio.create_task(feed.run())
+        while feed.rebuilds == 0:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        return feed
+
+    feed = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+    assert len(calls) == 2 and feed.message is not None
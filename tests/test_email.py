@@ -0,0 +1,40 @@
+"""Email transports, and send jobs refusing to start on an unusable transport setting"""
+import mailbox
+
+import pytest
+
+import email_utils
+from email_jobs import create_send_job, get_job_progress, run_send_job
+from email_utils import EmailTransport, FileTransport, email_session, send_email
+
+
+def test_transports_must_implement_send():
+    with pytest.raises(TypeError):
+        EmailTransport()
+
+
+def test_file_transport_writes_to_the_maildir(tmp_path):
+    maildir = tmp_path / "outbox"
+    with email_session(transport=FileTransport(str(maildir))):
+        send_email(["asha@example.com", "ben@example.com"], "Round 1", "You play at 10:00")
+        send_email("chen@example.com", "Round 1", "You play at 10:30", html_body="<p>You play at 10:30</p>")
+
+    messages = sorted(mailbox.Maildir(str(maildir), create=False), key=lambda msg: msg['To'])
+    assert [(msg['To'], msg['Subject']) for msg in messages] == [
+        ("asha@example.com, ben@example.com", "Round 1"), ("chen@example.com", "Round 1")]
+    assert messages[0].get_payload(decode=True).decode().strip() == "You play at 10:00"
+    assert messages[1].is_multipart()
+
+
+@pytest.mark.parametrize("transport, error", [("pigeon", "Unknown email transport"), ("", "No email transport")])
+def test_send_job_does_not_start_without_a_usable_transport(tournament, monkeypatch, transport, error):
+    monkeypatch.setattr(email_utils, "EMAIL_TRANSPORT", transport)
+    monkeypatch.setattr(email_utils, "OUTLOOK_AVAILABLE", False)
+    monkeypatch.setattr(email_utils, "SMTP_HOST", "")
+    job_id = create_send_job("Fixtures", [{'recipients': ["asha@example.com"], 'subject': "Hi", 'body': "Hello"}])
+
+    job = run_send_job(job_id)
+    assert job['status'] == 'paused'
+    assert error in job['last_error']
+    assert job['sent_batches'] == 0 and job['started_at'] is None
+    assert get_job_progress(job_id) == job
@@ -0,0 +1,99 @@
+"""Send jobs: pausing and resuming, and one runner per job when sessions overlap"""
+import mailbox
+import threading
+
+import pytest
+
+import email_utils
+from email_jobs import TokenBucket, create_send_job, get_resumable_jobs, run_send_job
+
+
+@pytest.fixture
+def outbox(tournament, monkeypatch):
+    """Send through the file transport into a Maildir in the test's directory"""
+    monkeypatch.setattr(email_utils, "EMAIL_TRANSPORT", "file")
+    monkeypatch.setattr(email_utils, "EMAIL_MAILDIR", str(tournament / "outbox"))
+    return tournament / "outbox"
+
+
+def _job(count):
+    return create_send_job("Fixtures", [{'recipients': [f"player{i}@example.com"], 'subject': "Round 1",
+                                          'body': "You play at 10:00"} for i in range(count)])
+
+
+def _sent_to(outbox):
+    return sorted(msg['To'] for msg in mailbox.Maildir(str(outbox), create=False))
+
+
+def _unthrottled():
+    return TokenBucket(1000, 1000)
+
+
+def test_paused_job_resumes_where_it_stopped(outbox):
+    job_id = _job(5)
+    sent = []
+    job = run_send_job(job_id, progress_callback=sent.append, should_stop=lambda: len(sent) == 2,
+                       bucket=_unthrottled())
+    assert (job['status'], job['sent_batches'], job['sent_recipients']) == ('paused', 2, 2)
+    assert list(get_resumable_jobs()['id']) == [job_id]
+
+    job = run_send_job(job_id, bucket=_unthrottled())
+    assert (job['status'], job['sent_batches'], job['sent_recipients']) == ('completed', 5, 5)
+    assert _sent_to(outbox) == [f"player{i}@example.com" for i in range(5)]
+
+
+def test_a_running_job_is_not_sent_twice(outbox):
+    job_id = _job(6)
+    second = []
+
+    def start_another_run(job):
+        # A second session resumes the job while the first is between batches
+        if not second:
+            second.append(run_send_job(job_id, bucket=_unthrottled()))
+
+    job = run_send_job(job_id, progress_callback=start_another_run, bucket=_unthrottled())
+    assert second[0]['status'] == 'running'
+    assert (job['status'], job['sent_batches'], job['sent_recipients']) == ('completed', 6, 6)
+    assert len(_sent_to(outbox)) == 6
+
+
+def test_concurrent_runs_send_each_batch_once(outbox):
+    job_id = _job(6)
+    barrier = threading.Barrier(2)
+    results = []
+
+    def session():
+        barrier.wait()
+        results.append(run_send_job(job_id, bucket=_unthrottled()))
+
+    threads = [threading.Thread(target=session) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _sent_to(outbox) == [f"player{i}@example.com" for i in range(6)]
+    final = max(results, key=lambda job: job['status'] == 'completed')
+    assert (final['status'], final['sent_batches'], final['sent_recipients']) == ('completed', 6, 6)
+
+
+def test_a_stale_running_job_can_be_taken_over(outbox, db):
+    job_id = _job(3)
+    # A runner died after sending the first batch and while sending the second
+    db.execute("UPDATE email_jobs SET status = 'running', updated_at = '2000-01-01 00:00:00' WHERE id = ?", (job_id,))
+    db.execute("UPDATE email_job_batches SET status = 'sent', attempts = 1 WHERE job_id = ? AND batch_number = 1",
+               (job_id,))
+    db.execute("UPDATE email_job_batches SET status = 'sending', attempts = 1 WHERE job_id = ? AND batch_number = 2",
+               (job_id,))
+    db.commit()
+    assert list(get_resumable_jobs()['id']) == [job_id]
+
+    job = run_send_job(job_id, bucket=_unthrottled())
+    assert (job['status'], job['sent_batches'], job['sent_recipients']) == ('completed', 3, 3)
+    assert _sent_to(outbox) == ["player1@example.com", "player2@example.com"]
+
+    # A job that is still making progress is left to its runner
+    db.execute("UPDATE email_jobs SET status = 'running', updated_at = datetime('now', 'localtime') WHERE id = ?",
+               (job_id,))
+    db.commit()
+    assert get_resumable_jobs().empty
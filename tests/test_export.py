@@ -0,0 +1,27 @@
+import csv
+
+import pytest
+
+from export_utils import EXPORT_QUERIES, build_export_file, iter_export_rows
+
+
+@pytest.mark.parametrize("dataset", list(EXPORT_QUERIES))
+def test_game_filter_matches_unfiltered_rows(sample_tournament, db, dataset):
+    columns, *rows = iter_export_rows(dataset)
+    chess = list(iter_export_rows(dataset, game="Chess"))[1:]
+    if "game" in columns:
+        assert chess == [row for row in rows if row[columns.index("game")] == "Chess"]
+    else:
+        # results has no game column; compare against the matches it comes from
+        chess_ids = {match_id for (match_id,) in db.execute("SELECT id FROM matches WHERE game = 'Chess'")}
+        assert chess == [row for row in rows if row[0] in chess_ids]
+    assert 0 < len(chess) < len(rows)
+
+
+def test_build_export_file_for_one_game(sample_tournament, tmp_path):
+    path, counts = build_export_file(["participants"], "csv", directory=tmp_path, game="Table Tennis")
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert counts == {"participants": len(rows)}
+    assert rows and {row["game"] for row in rows} == {"Table Tennis"}
+    assert path.startswith(str(tmp_path / "table_tennis_participants_"))
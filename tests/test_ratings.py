@@ -0,0 +1,119 @@
+"""Elo ratings: the vectorized replay, incremental updates and seeding"""
+import random
+import sqlite3
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import ratings_utils
+from ratings_utils import (INITIAL_RATING, _replay, get_ratings, rate_matches, recompute_ratings, seed_entries)
+from tournament_service import create_match, record_result, update_match_tracker_details
+
+
+def _sequential(results):
+    """Reference Elo: rate one result at a time"""
+    ratings, played = {}, {}
+    for _, game, *emp_ids, side1_won in results:
+        keys = [(emp_id, game) if emp_id is not None else None for emp_id in emp_ids]
+        sides = [[ratings.get(key, INITIAL_RATING) for key in keys[start:start + 2] if key] for start in (0, 2)]
+        side1, side2 = (sum(side) / len(side) for side in sides)
+        surprise = side1_won - 1 / (1 + 10 ** ((side2 - side1) / 400))
+        for slot, key in enumerate(keys):
+            if key:
+                k = ratings_utils.K_PROVISIONAL if played.get(key, 0) < ratings_utils.PROVISIONAL_MATCHES \
+                    else ratings_utils.K_FACTOR
+                ratings[key] = ratings.get(key, INITIAL_RATING) + k * (surprise if slot < 2 else -surprise)
+                played[key] = played.get(key, 0) + 1
+    return {key: (ratings[key], played[key]) for key in ratings}
+
+
+def test_replay_is_exactly_sequential_elo():
+    rng = random.Random(3)
+    people = [f"E{number}" for number in range(12)]
+    results = []
+    for match_id in range(400):
+        game = rng.choice(["Chess", "Carrom"])
+        if rng.random() < 0.5:
+            side1, side2 = rng.sample(people, 2)
+            results.append((match_id, game, side1, None, side2, None, rng.random() < 0.6))
+        else:
+            a, b, c, d = rng.sample(people, 4)
+            results.append((match_id, game, a, b, c, d, rng.random() < 0.4))
+    ratings, _ = _replay(results, {})
+    assert ratings.keys() == _sequential(results).keys()
+    for key, (rating, played) in _sequential(results).items():
+        assert ratings[key][0] == pytest.approx(rating)
+        assert ratings[key][1] == played
+
+
+def _ratings_table():
+    conn = sqlite3.connect("tournaments.db")
+    rows = {(emp_id, game): (round(rating, 9), matches)
+            for emp_id, game, rating, matches in conn.execute("SELECT emp_id, game, rating, matches FROM ratings")}
+    conn.close()
+    return rows
+
+
+@pytest.fixture
+def played_tournament(sample_tournament, db):
+    """The sample tournament with its results dated in the past, as real results would be"""
+    db.execute("UPDATE matches SET completed_at = datetime('now', '-30 days', '+' || id || ' seconds') "
+               "WHERE completed_at IS NOT NULL")
+    db.commit()
+    return sample_tournament
+
+
+def test_incremental_ratings_match_a_full_replay(played_tournament, db):
+    match_ids = [row[0] for row in db.execute(
+        "SELECT id FROM matches WHERE match_status = 'completed' ORDER BY completed_at, round_number, id")]
+    for match_id in match_ids:
+        rate_matches([match_id])
+    incremental = _ratings_table()
+
+    counts = recompute_ratings()
+    assert counts['tournaments'] == 1
+    assert counts['players'] == len(incremental) > 0
+    assert _ratings_table() == incremental
+
+
+def test_a_saved_result_matches_a_full_replay(played_tournament, db):
+    recompute_ratings()
+    match_id, player1_id = db.execute(
+        "SELECT id, player1_id FROM matches WHERE match_status = 'scheduled' AND player1_id IS NOT NULL "
+        "AND player2_id IS NOT NULL LIMIT 1").fetchone()
+    record_result(match_id, winner_id=player1_id)
+    incremental = _ratings_table()
+    recompute_ratings()
+    assert _ratings_table() == incremental
+
+
+def test_an_undone_result_is_taken_back_out(tournament, db):
+    db.executemany("INSERT INTO participants (emp_id, name, game, category) VALUES (?, ?, 'Chess', 'Open')",
+                   [("E1", "One"), ("E2", "Two")])
+    db.commit()
+    match_id = create_match("Open", 1, player1_id=1, player2_id=2, game="Chess")
+    record_result(match_id, winner_id=1)
+    assert get_ratings(["E1", "E2"], "Chess") == {'E1': INITIAL_RATING + 20, 'E2': INITIAL_RATING - 20}
+
+    update_match_tracker_details(match_id, match_status='scheduled')
+    assert get_ratings(["E1", "E2"], "Chess") == {'E1': INITIAL_RATING, 'E2': INITIAL_RATING}
+
+
+def test_singles_saved_with_winner_team_are_rated(tournament, db):
+    db.executemany("INSERT INTO participants (emp_id, name, game, category) VALUES (?, ?, 'Chess', 'Open')",
+                   [("E1", "One"), ("E2", "Two"), ("E3", "Three")])
+    db.execute("INSERT INTO matches (game, category, round_number, player1_id, player2_id, match_status, "
+               "winner_team, completed_at) VALUES ('Chess', 'Open', 1, 1, 2, 'completed', 2, '2024-01-01 10:00:00')")
+    db.execute("INSERT INTO matches (game, category, round_number, player1_id, player2_id, match_status, "
+               "winner_id, completed_at) VALUES ('Chess', 'Open', 1, 1, 2, 'completed', 3, '2024-01-01 11:00:00')")
+    db.commit()
+    assert recompute_ratings()['results'] == 1
+    assert get_ratings(["E1", "E2"], "Chess") == {'E1': INITIAL_RATING - 20, 'E2': INITIAL_RATING + 20}
+
+
+def test_seeding_keeps_top_seeds_apart():
+    entries = list("ABCDEFGH")
+    assert seed_entries(entries, [8, 7, 6, 5, 4, 3, 2, 1]) == list("AHDEBGCF")
+    # Odd count: the top seed is left over for the bye
+    assert seed_entries(list("ABCDEFG"), [7, 6, 5, 4, 3, 2, 1])[-1] == "A"
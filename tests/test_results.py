@@ -0,0 +1,117 @@
+"""Saving results: the batch grid path, single results and round advancement"""
+import pytest
+
+from tournament_service import create_match, record_result, record_results, update_match_result
+
+
+@pytest.fixture
+def players(db):
+    """Add singles players to Chess Open and return their IDs"""
+    def add(count):
+        ids = []
+        for number in range(count):
+            cursor = db.execute("INSERT INTO participants (emp_id, name, email, game, category) "
+                                "VALUES (?, ?, ?, 'Chess', 'Open')",
+                                (f"E{number}", f"Player {number}", f"p{number}@example.com"))
+            ids.append(cursor.lastrowid)
+        db.commit()
+        return ids
+    return add
+
+
+def _round_one(player_ids):
+    return [create_match("Open", 1, player1_id=player1, player2_id=player2, game="Chess")
+            for player1, player2 in zip(player_ids[::2], player_ids[1::2])]
+
+
+def _round(db, round_number):
+    return db.execute("SELECT player1_id, player2_id, match_status, advancement_type, winner_id FROM matches "
+                      "WHERE round_number = ? ORDER BY match_number, id", (round_number,)).fetchall()
+
+
+def test_batch_completes_matches_and_creates_next_round(db, players):
+    ids = players(4)
+    matches = _round_one(ids)
+    saved = record_results([{'match_id': matches[0], 'winner_id': ids[1]},
+                            {'match_id': matches[1], 'winner_id': ids[2], 'score': "1-0 1/2-1/2"}])
+    assert saved['completed'] == 2
+    assert len(saved['created']) == 1
+    assert _round(db, 2) == [(ids[1], ids[2], 'scheduled', 'normal', None)]
+    assert db.execute("SELECT score FROM matches WHERE id = ?", (matches[1],)).fetchone() == ("1-0, 1/2-1/2",)
+
+
+def test_batch_is_all_or_nothing(db, players):
+    ids = players(4)
+    matches = _round_one(ids)
+    with pytest.raises(ValueError):
+        record_results([{'match_id': matches[0], 'winner_id': ids[0]},
+                        {'match_id': matches[1], 'winner_id': ids[0]}])
+    assert db.execute("SELECT COUNT(*) FROM matches WHERE match_status = 'completed'").fetchone() == (0,)
+    assert _round(db, 2) == []
+
+
+def test_odd_winner_out_gets_a_bye_and_advances(db, players):
+    ids = players(6)
+    matches = _round_one(ids)
+    record_results([{'match_id': match_id, 'winner_team': 1} for match_id in matches])
+    assert _round(db, 2) == [(ids[0], ids[2], 'scheduled', 'normal', None),
+                             (ids[4], None, 'completed', 'bye', ids[4])]
+
+    final = record_results([{'match_id': _match_id(db, 2, ids[0]), 'winner_id': ids[2]}])
+    assert len(final['created']) == 1
+    assert _round(db, 3) == [(ids[2], ids[4], 'scheduled', 'normal', None)]
+
+
+def _match_id(db, round_number, player1_id):
+    return db.execute("SELECT id FROM matches WHERE round_number = ? AND player1_id = ?",
+                      (round_number, player1_id)).fetchone()[0]
+
+
+def test_singles_winner_team_is_saved_as_the_player(db, players):
+    ids = players(4)
+    matches = _round_one(ids)
+    record_results([{'match_id': matches[0], 'winner_team': 2}], advance=False)
+    record_result(matches[1], winner_team=1)
+    assert db.execute("SELECT winner_id, winner_team FROM matches ORDER BY id").fetchall()[:2] == [
+        (ids[1], None), (ids[2], None)]
+
+
+@pytest.mark.parametrize("result", [{'winner_team': 3}, {'winner_team': 1, 'winner_id': 'player 2'},
+                                    {'winner_id': 'outsider'}, {'score': "1-0 0-1"}, {}])
+def test_invalid_singles_results_are_rejected(db, players, result):
+    ids = players(3)
+    match_id = _round_one(ids)[0]
+    result = {key: {'player 2': ids[1], 'outsider': ids[2]}.get(value, value) for key, value in result.items()}
+    with pytest.raises(ValueError):
+        record_results([{'match_id': match_id, **result}])
+    with pytest.raises(ValueError):
+        record_result(match_id, **result)
+
+
+def test_single_results_advance_like_a_batch(db, players):
+    ids = players(6)
+    matches = _round_one(ids)
+    record_result(matches[0], winner_id=ids[0], advance=True)
+    record_result(matches[1], winner_id=ids[2], advance=True)
+    assert _round(db, 2) == []
+    record_result(matches[2], winner_id=ids[4], advance=True)
+    assert _round(db, 2) == [(ids[0], ids[2], 'scheduled', 'normal', None),
+                             (ids[4], None, 'completed', 'bye', ids[4])]
+
+
+def test_rounds_built_one_match_at_a_time_do_not_advance_early(db, players):
+    ids = players(6)
+    # Like "Create Match" in the app: two of the three round 1 matches exist and are played
+    first, second = _round_one(ids[:4])
+    record_result(first, winner_id=ids[0])
+    update_match_result(second, winner_id=ids[2])
+    assert _round(db, 2) == []
+
+    third = create_match("Open", 1, player1_id=ids[4], player2_id=ids[5], game="Chess")
+    record_result(third, winner_id=ids[4])
+    assert _round(db, 2) == []
+
+    # Advancing once the round is really complete takes every winner forward
+    record_result(third, winner_id=ids[4], advance=True)
+    assert _round(db, 2) == [(ids[0], ids[2], 'scheduled', 'normal', None),
+                             (ids[4], None, 'completed', 'bye', ids[4])]
@@ -0,0 +1,86 @@
+"""Scores: each game's rules, and player_stats kept up to date by triggers"""
+import pytest
+
+from archive_utils import archive_rows
+from scores_utils import read_score, rebuild_player_stats
+from tournament_service import record_results, update_match_result
+
+
+@pytest.mark.parametrize("game, score, expected", [
+    ("Badminton", "21-15, 18-21, 21-19", ([(21, 15), (18, 21), (21, 19)], 1, "21-15, 18-21, 21-19")),
+    ("Badminton", "30-29 21-0", ([(30, 29), (21, 0)], 1, "30-29, 21-0")),
+    ("Table Tennis", "5-11; 11-9; 9-11; 13-11; 7-11", ([(5, 11), (11, 9), (9, 11), (13, 11), (7, 11)], 2,
+                                                      "5-11, 11-9, 9-11, 13-11, 7-11")),
+    ("Carrom", "12-0 0-5 12-0 3-0", ([(12, 0), (0, 5), (12, 0), (3, 0)], 1, "12-0, 0-5, 12-0, 3-0")),
+    # Level after the last board, so a ninth decides it
+    ("Carrom", "3-0 0-3 " * 4 + "0-1", ([(3, 0), (0, 3)] * 4 + [(0, 1)], 2, ", ".join(["3-0, 0-3"] * 4) + ", 0-1")),
+    ("Chess", "½-½ 0:1", ([(1, 1), (0, 2)], 2, "1/2-1/2, 0-1")),
+    ("Chess", [(2, 0)], ([(2, 0)], 1, "1-0")),
+])
+def test_valid_scores_pick_the_winner(game, score, expected):
+    assert read_score(game, score) == expected
+
+
+@pytest.mark.parametrize("game, score, error", [
+    ("Badminton", "21-15 15-21", "not decided"),
+    ("Badminton", "21-20 21-0", "won by two"),
+    ("Badminton", "31-29 21-0", "goes past 30"),
+    ("Badminton", "25-21 21-0", "two-point lead"),
+    ("Badminton", "21-0 21-0 21-0", "after the match was decided"),
+    ("Table Tennis", "11-9 11-9 11-9 11-9", "after the match was decided"),
+    ("Table Tennis", "10-8 11-0 11-0", "not finished"),
+    ("Carrom", "12-3", "only the board winner scores"),
+    ("Carrom", "13-0 12-0", "1 to 12 points"),
+    ("Carrom", "12-0 12-0 1-0 0-1", "after the game was decided"),
+    ("Carrom", "1-0 0-1 " * 4, "not decided"),
+    ("Chess", "1-0 0-1", "level"),
+    ("Chess", "1-0 2-0", "not a chess result"),
+    ("Chess", "1-0 " * 7, "At most 6 games"),
+    ("Badminton", "21 15", "not a score"),
+])
+def test_invalid_scores_are_rejected(game, score, error):
+    with pytest.raises(ValueError, match=error):
+        read_score(game, score)
+
+
+def test_games_without_rules_keep_free_text():
+    assert read_score("Darts", "501-320") is None
+    assert read_score("Chess", "") is None
+
+
+def _player_stats(db):
+    return db.execute("SELECT * FROM player_stats WHERE matches_played + sets_won + sets_lost > 0 "
+                      "ORDER BY participant_id").fetchall()
+
+
+def _assert_stats_match_a_rebuild(db):
+    kept = _player_stats(db)
+    rebuild_player_stats()
+    assert _player_stats(db) == kept
+
+
+def test_stats_triggers_follow_results(sample_tournament, db):
+    _assert_stats_match_a_rebuild(db)
+
+    scheduled = db.execute("SELECT id, game FROM matches WHERE match_status = 'scheduled' AND archived = 0 "
+                           "AND COALESCE(player2_id, team2_player1_id) IS NOT NULL "
+                           "AND game IN ('Chess', 'Table Tennis') ORDER BY id").fetchall()
+    assert len(scheduled) > 4
+    scores = {"Chess": "1-0 1/2-1/2", "Table Tennis": "11-5 11-7 11-9"}
+    record_results([{'match_id': match_id, 'winner_team': 1, 'score': scores[game]} for match_id, game in scheduled],
+                   advance=False)
+    _assert_stats_match_a_rebuild(db)
+
+    # A corrected score replaces the match's sets and its players' totals
+    for match_id, game in (scheduled[0], scheduled[-1]):
+        sets, winner, text = read_score(game, "1-0 1-0" if game == "Chess" else "11-0 11-0 11-0")
+        update_match_result(match_id, winner_team=winner, score=text, sets=sets, advance=False)
+    _assert_stats_match_a_rebuild(db)
+
+    db.execute("UPDATE matches SET match_status = 'scheduled', winner_id = NULL, winner_team = NULL WHERE id = ?",
+               (scheduled[0][0],))
+    db.commit()
+    _assert_stats_match_a_rebuild(db)
+
+    archive_rows(["matches"])
+    assert _player_stats(db) == []
@@ -0,0 +1,35 @@
+"""Snapshot create/restore round trips"""
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from scores_utils import rebuild_player_stats
+from snapshot_utils import SNAPSHOT_ORDER, SNAPSHOT_TABLES, create_snapshot, restore_snapshot
+
+
+def _rows(db, table):
+    return db.execute(f"SELECT * FROM {table} ORDER BY {SNAPSHOT_ORDER.get(table, 'id')}").fetchall()
+
+
+def _player_stats(db):
+    return db.execute("SELECT * FROM player_stats ORDER BY participant_id").fetchall()
+
+
+def test_round_trip_with_match_sets(sample_tournament, db):
+    before = {table: _rows(db, table) for table in SNAPSHOT_TABLES}
+    assert before['match_sets'], "the sample tournament should have set scores"
+    stats = _player_stats(db)
+
+    path, manifest = create_snapshot("round trip", directory=str(sample_tournament / "snapshots"))
+    assert manifest['tables']['match_sets']['rows'] == len(before['match_sets'])
+
+    db.execute("DELETE FROM matches WHERE id IN (SELECT match_id FROM match_sets LIMIT 20)")
+    db.execute("DELETE FROM participants WHERE id % 3 = 0")
+    db.commit()
+
+    counts = restore_snapshot(path)
+    assert counts == {table: len(rows) for table, rows in before.items()}
+    assert {table: _rows(db, table) for table in SNAPSHOT_TABLES} == before
+    assert _player_stats(db) == stats
+    rebuild_player_stats()
+    assert _player_stats(db) == stats
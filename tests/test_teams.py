@@ -0,0 +1,71 @@
+"""Doubles pairing from partner_emp_id: pair_partners() and the teams built from it"""
+from teams_utils import get_pairing_report, get_teams, pair_partners, sync_teams
+
+
+def test_mutual_partners_pair_up():
+    result = pair_partners([(1, "A", "B"), (2, "B", "A"), (3, "C", "D"), (4, "D", "C")])
+    assert result == {'pairs': [(1, 2), (3, 4)], 'asymmetric': [], 'conflicts': [], 'orphans': []}
+
+
+def test_one_sided_claim_pairs_when_both_are_free():
+    # B named nobody (or someone who never registered), so A's claim is honoured
+    for b_partner in (None, "Z"):
+        result = pair_partners([(1, "A", "B"), (2, "B", b_partner)])
+        assert result == {'pairs': [(1, 2)], 'asymmetric': [(1, 2)], 'conflicts': [], 'orphans': []}
+
+
+def test_mutual_pairs_win_over_earlier_one_sided_claims():
+    # C's claim on A comes first, but A and B name each other
+    result = pair_partners([(5, "C", "A"), (1, "A", "B"), (2, "B", "A")])
+    assert result == {'pairs': [(1, 2)], 'asymmetric': [], 'conflicts': [(5, 1)], 'orphans': [5]}
+
+
+def test_second_one_sided_claim_on_a_player_is_a_conflict():
+    result = pair_partners([(3, "C", "B"), (1, "A", "B"), (2, "B", None)])
+    assert result == {'pairs': [(2, 3)], 'asymmetric': [(3, 2)], 'conflicts': [(1, 2)], 'orphans': [1]}
+
+
+def test_unmatched_entrants_are_orphans():
+    result = pair_partners([(1, "A", None), (2, "B", "B"), (3, "C", "NOT-REGISTERED")])
+    assert result == {'pairs': [], 'asymmetric': [], 'conflicts': [], 'orphans': [1, 2, 3]}
+
+
+def test_players_already_in_a_team_are_left_out():
+    result = pair_partners([(1, "A", "B"), (2, "B", "A"), (3, "C", "A")], paired={1, 2})
+    assert result == {'pairs': [], 'asymmetric': [], 'conflicts': [(1, 2), (3, 1)], 'orphans': [3]}
+
+
+def _add(db, rows):
+    db.executemany("INSERT INTO participants (emp_id, name, partner_emp_id, game, category) "
+                   "VALUES (?, ?, ?, 'Badminton', 'Mixed Doubles')", rows)
+    db.commit()
+
+
+def _pairs():
+    teams = get_teams("Mixed Doubles", "Badminton")
+    return set(zip(teams['player1_emp_id'], teams['player2_emp_id']))
+
+
+def test_pairing_report_and_teams(db):
+    _add(db, [("A", "Asha", "B"), ("B", "Ben", "A"), ("C", "Chen", "D"), ("D", "Dana", None),
+              ("E", "Eli", "A"), ("F", "Fay", None)])
+    report = get_pairing_report("Mixed Doubles", "Badminton")
+    assert report == {
+        'teams': 2,
+        'asymmetric': [{'emp_id': "C", 'name': "Chen", 'partner_emp_id': "D", 'partner_name': "Dana"}],
+        'conflicts': [{'emp_id': "E", 'name': "Eli", 'partner_emp_id': "A", 'partner_name': "Asha"}],
+        'orphans': [{'emp_id': "E", 'name': "Eli"}, {'emp_id': "F", 'name': "Fay"}],
+    }
+
+    # Pairing a few new entrants at a time ends with the same teams as pairing everyone
+    sync_teams()
+    assert _pairs() == {("A", "B"), ("C", "D")}
+    _add(db, [("G", "Gus", "F"), ("H", "Hal", "G")])
+    new_ids = [row[0] for row in db.execute("SELECT id FROM participants WHERE emp_id IN ('G', 'H')")]
+    assert sync_teams(participant_ids=new_ids) == 1
+    incremental = _pairs()
+    db.execute("DELETE FROM teams")
+    db.commit()
+    sync_teams()
+    assert _pairs() == incremental
+    assert incremental == {("A", "B"), ("C", "D"), ("F", "G")}
@@ -0,0 +1,39 @@
+import threading
+
+from db_utils import get_database
+from tournament_service import add_participant_extended, get_participants
+from tournaments_utils import create_tournament, get_current_tournament, set_current_tournament, use_database
+
+
+def test_sessions_keep_their_own_tournament(tournament):
+    spring = create_tournament("Spring")
+    autumn = create_tournament("Autumn")
+    barrier = threading.Barrier(2)
+    seen = {}
+
+    def session(entry, name):
+        # Like an app rerun: choose the session's tournament for this thread, then interleave
+        use_database(entry['db_path'], thread_only=True)
+        barrier.wait()
+        add_participant_extended(f"E-{name}", name, f"{name}@example.com", game="Chess", category="Open")
+        barrier.wait()
+        seen[entry['slug']] = (get_database(), list(get_participants()['name']))
+
+    threads = [threading.Thread(target=session, args=args) for args in ((spring, "Asha"), (autumn, "Ben"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {"spring": (spring['db_path'], ["Asha"]), "autumn": (autumn['db_path'], ["Ben"])}
+    # Neither session touched the process default
+    assert get_database() == "tournament.db"
+    assert get_participants().empty
+
+
+def test_switching_current_leaves_running_processes_alone(tournament):
+    create_tournament("Spring")
+    set_current_tournament("spring")
+    assert get_current_tournament()['slug'] == "spring"
+    assert get_database() == "tournament.db"
+
@@ -0,0 +1,1511 @@
+import re
+import logging
+import sqlite3
+import pandas as pd
+from datetime import datetime
+from db_utils import connect, get_database
+from events_utils import create_event_log, get_latest_seq
+from summary_utils import create_summary_tables, get_summary_metrics
+from scores_utils import create_score_tables, read_score, save_match_sets
+from ratings_utils import rate_matches
+from teams_utils import create_teams_table, sync_teams, link_team_ids
+from fixtures_utils import generate_time_slots, assign_participants_to_slots, save_fixtures, delete_fixture
+
+logger = logging.getLogger(__name__)
+
+# Page size used when a caller does not ask for one, and the most a single page may hold
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+MATCH_STATUSES = ('scheduled', 'completed')
+
+# Matches with every participant slot resolved to a name (shared by the match list, detail and bracket queries)
+MATCH_SELECT = '''
+    SELECT m.id, m.match_code, m.game, m.category, m.round_number, m.match_number, m.match_status,
+           m.player1_id, p1.name AS player1_name, m.player2_id, p2.name AS player2_name,
+           m.team1_player1_id, t1p1.name AS team1_player1_name, m.team1_player2_id, t1p2.name AS team1_player2_name,
+           m.team2_player1_id, t2p1.name AS team2_player1_name, m.team2_player2_id, t2p2.name AS team2_player2_name,
+           m.team1_id, m.team2_id, m.winner_id, w.name AS winner_name, m.winner_team, m.score, m.advancement_type,
+           m.match_date, m.created_at, m.completed_at
+    FROM matches m
+    LEFT JOIN participants p1 ON m.player1_id = p1.id
+    LEFT JOIN participants p2 ON m.player2_id = p2.id
+    LEFT JOIN participants t1p1 ON m.team1_player1_id = t1p1.id
+    LEFT JOIN participants t1p2 ON m.team1_player2_id = t1p2.id
+    LEFT JOIN participants t2p1 ON m.team2_player1_id = t2p1.id
+    LEFT JOIN participants t2p2 ON m.team2_player2_id = t2p2.id
+    LEFT JOIN participants w ON m.winner_id = w.id
+'''
+
+FIXTURE_SELECT = '''
+    SELECT f.id, f.category, f.game, f.slot, f.round_number, f.time_slot, f.start_time, f.end_time,
+           f.location, f.court_number,
+           f.player1_id, p1.name AS player1_name, f.player2_id, p2.name AS player2_name,
+           f.team1_player1_id, t1p1.name AS team1_player1_name, f.team1_player2_id, t1p2.name AS team1_player2_name,
+           f.team2_player1_id, t2p1.name AS team2_player1_name, f.team2_player2_id, t2p2.name AS team2_player2_name,
+           f.team1_id, f.team2_id, f.fixture_status, f.emails_sent, f.created_at
+    FROM fixtures f
+    LEFT JOIN participants p1 ON f.player1_id = p1.id
+    LEFT JOIN participants p2 ON f.player2_id = p2.id
+    LEFT JOIN participants t1p1 ON f.team1_player1_id = t1p1.id
+    LEFT JOIN participants t1p2 ON f.team1_player2_id = t1p2.id
+    LEFT JOIN participants t2p1 ON f.team2_player1_id = t2p1.id
+    LEFT JOIN participants t2p2 ON f.team2_player2_id = t2p2.id
+'''
+
+# Compact dtypes for get_participants() and get_matches(): low-cardinality text as categoricals,
+# and nullable participant IDs as Int64 instead of float64 (so they compare and bind as integers)
+PARTICIPANT_DTYPES = {column: 'category' for column in
+                      ('location', 'sub_location', 'game', 'category', 'slot', 'gender', 'partner_gender')}
+MATCH_ID_COLUMNS = ('player1_id', 'player2_id', 'team1_player1_id', 'team1_player2_id',
+                    'team2_player1_id', 'team2_player2_id', 'winner_id')
+MATCH_DTYPES = {
+    **{column: 'category' for column in
+       ('category', 'match_status', 'advancement_type', 'player1_name', 'player2_name', 'team1_player1_name',
+        'team1_player2_name', 'team2_player1_name', 'team2_player2_name', 'winner_name')},
+    **{column: 'Int64' for column in MATCH_ID_COLUMNS + ('team1_id', 'team2_id')},
+}
+
+# Game of a match or fixture row, taken from its first player (for rows written without one)
+ROW_GAME = ("(SELECT game FROM participants WHERE id = "
+            "COALESCE({row}player1_id, {row}team1_player1_id, {row}player2_id, {row}team2_player1_id))")
+
+# Tables whose rows a reset archives (archived = 1) instead of deleting; archive_utils
+# later moves archived rows out to the archive database
+ARCHIVABLE_TABLES = ("participants", "matches", "fixtures")
+
+# Partial indexes: game-scoped reads seek to a game's active rows without touching archived
+# ones, and compaction finds archived rows without scanning the active ones
+ACTIVE_INDEXES = {
+    "idx_participants_active": "participants (game, category) WHERE archived = 0",
+    "idx_matches_active": "matches (game, category, round_number) WHERE archived = 0",
+    "idx_fixtures_active": "fixtures (game, category) WHERE archived = 0",
+    "idx_participants_archived": "participants (id) WHERE archived = 1",
+    "idx_matches_archived": "matches (id) WHERE archived = 1",
+    "idx_fixtures_archived": "fixtures (id) WHERE archived = 1",
+}
+
+# Full-table game indexes superseded by ACTIVE_INDEXES
+_OLD_GAME_INDEXES = ("idx_participants_game", "idx_matches_game", "idx_fixtures_game")
+
+# Column-level UNIQUE on emp_id in participants tables created before archiving
+_EMP_ID_UNIQUE = re.compile(r"(emp_id\s+TEXT(?:\s+NOT NULL)?)\s+UNIQUE", re.IGNORECASE)
+
+PARTICIPANT_COLUMNS = ('id, emp_id, name, email, location, sub_location, game, category, slot, partner_emp_id, '
+                       'gender, partner_gender, registered_at_desk, registered_timestamp, created_at')
+
+
+def init_database(db_path=None):
+    """Initialize the SQLite database (get_database(), or another tournament's file)"""
+    conn = connect(db_path or get_database())
+    cursor = conn.cursor()
+    
+    # New files use incremental auto-vacuum, so archive compaction can return space a batch at a time
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master")
+    if cursor.fetchone()[0] == 0:
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    
+    # Check if participants table exists and get its structure
+    cursor.execute("PRAGMA table_info(participants)")
+    columns = [column[1] for column in cursor.fetchall()]
+    
+    # Migrate old database if needed
+    if columns and 'emp_id' not in columns:
+        print("Migrating database to new schema...")
+        
+        # Create new table with correct schema
+        cursor.execute('''
+            CREATE TABLE participants_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                emp_id TEXT NOT NULL,
+                name TEXT NOT NULL,  
+                email TEXT,
+                location TEXT,
+                sub_location TEXT,
+                game TEXT,
+                category TEXT NOT NULL,
+                slot TEXT,
+                partner_emp_id TEXT,
+                gender TEXT,
+                partner_gender TEXT,
+                registered_at_desk INTEGER DEFAULT 0,
+                registered_timestamp TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Migrate existing data if any
+        cursor.execute("SELECT COUNT(*) FROM participants")
+        if cursor.fetchone()[0] > 0:
+            # Generate unique emp_ids for existing participants
+            if 'team_partner' in columns:
+                cursor.execute('''
+                    INSERT INTO participants_new (emp_id, name, email, category, partner_emp_id, registered_at_desk, created_at)
+                    SELECT 
+                        'EMP' || SUBSTR('0000' || id, -4) AS emp_id,
+                        name,
+                        email,
+                        category,
+                        CASE WHEN team_partner IS NOT NULL AND team_partner != '' THEN team_partner ELSE NULL END,
+                        COALESCE(registered_at_desk, 0),
+                        COALESCE(created_at, CURRENT_TIMESTAMP)
+                    FROM participants
+                ''')
+            else:
+                cursor.execute('''
+                    INSERT INTO participants_new (emp_id, name, email, category, registered_at_desk, created_at)
+                    SELECT 
+                        'EMP' || SUBSTR('0000' || id, -4) AS emp_id,
+                        name,
+                        email,
+                        category,
+                        COALESCE(registered_at_desk, 0),
+                        COALESCE(created_at, CURRENT_TIMESTAMP)
+                    FROM participants
+                ''')
+        
+        # Replace old table
+        cursor.execute("DROP TABLE participants")
+        cursor.execute("ALTER TABLE participants_new RENAME TO participants")
+        print("Database migration completed.")
+    
+    # Check if registered_timestamp column exists, if not add it
+    elif columns and 'registered_timestamp' not in columns:
+        print("Adding registered_timestamp column...")
+        cursor.execute("ALTER TABLE participants ADD COLUMN registered_timestamp TIMESTAMP")
+    
+    # Check if created_at column exists, if not add it
+    if columns and 'created_at' not in columns:
+        print("Adding created_at column to participants table...")
+        cursor.execute("ALTER TABLE participants ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+        print("created_at column added to participants table.")
+    
+    # Check and add missing columns to matches table
+    cursor.execute("PRAGMA table_info(matches)")
+    matches_columns = [column[1] for column in cursor.fetchall()]
+    
+    if matches_columns and 'winner_team' not in matches_columns:
+        print("Adding winner_team column to matches table...")
+        try:
+            cursor.execute("ALTER TABLE matches ADD COLUMN winner_team INTEGER")
+            print("winner_team column added to matches table.")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+    
+    if matches_columns and 'completed_at' not in matches_columns:
+        print("Adding completed_at column to matches table...")
+        try:
+            cursor.execute("ALTER TABLE matches ADD COLUMN completed_at TIMESTAMP")
+            print("completed_at column added to matches table.")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+    
+    if matches_columns and 'updated_at' not in matches_columns:
+        print("Adding updated_at column to matches table...")
+        try:
+            cursor.execute("ALTER TABLE matches ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+            print("updated_at column added to matches table.")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+    
+    if matches_columns and 'created_at' not in matches_columns:
+        print("Adding created_at column to matches table...")
+        try:
+            cursor.execute("ALTER TABLE matches ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+            print("created_at column added to matches table.")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+    
+    # Create participants table if it doesn't exist
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS participants (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            emp_id TEXT,
+            name TEXT,
+            email TEXT,
+            category TEXT,
+            partner_emp_id TEXT,
+            registered_at_desk INTEGER DEFAULT 0,
+            registered_timestamp TIMESTAMP,
+            location TEXT,
+            sub_location TEXT,
+            game TEXT,
+            slot TEXT,
+            gender TEXT,
+            partner_gender TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            archived INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    
+    # Create matches table if it doesn't exist
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS matches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_number INTEGER,
+            round_number INTEGER,
+            category TEXT,
+            game TEXT,
+            player1_id INTEGER,
+            player2_id INTEGER,
+            team1_player1_id INTEGER,
+            team1_player2_id INTEGER,
+            team2_player1_id INTEGER,
+            team2_player2_id INTEGER,
+            winner_id INTEGER,
+            winner_team_id INTEGER,
+            winner_team INTEGER,
+            match_status TEXT DEFAULT 'pending',
+            match_date TIMESTAMP,
+            score TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            archived INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (player1_id) REFERENCES participants (id),
+            FOREIGN KEY (player2_id) REFERENCES participants (id),
+            FOREIGN KEY (team1_player1_id) REFERENCES participants (id),
+            FOREIGN KEY (team1_player2_id) REFERENCES participants (id),
+            FOREIGN KEY (team2_player1_id) REFERENCES participants (id),
+            FOREIGN KEY (team2_player2_id) REFERENCES participants (id)
+        )
+    ''')
+    
+    # Create fixtures table if it doesn't exist
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fixtures (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category TEXT,
+            time_slot TEXT,
+            start_time TIMESTAMP,
+            end_time TIMESTAMP,
+            location TEXT,
+            court_number INTEGER,
+            player1_id INTEGER,
+            player2_id INTEGER,
+            team1_player1_id INTEGER,
+            team1_player2_id INTEGER,
+            team2_player1_id INTEGER,
+            team2_player2_id INTEGER,
+            fixture_status TEXT DEFAULT 'scheduled',
+            emails_sent INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            archived INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (player1_id) REFERENCES participants (id),
+            FOREIGN KEY (player2_id) REFERENCES participants (id),
+            FOREIGN KEY (team1_player1_id) REFERENCES participants (id),
+            FOREIGN KEY (team1_player2_id) REFERENCES participants (id),
+            FOREIGN KEY (team2_player1_id) REFERENCES participants (id),
+            FOREIGN KEY (team2_player2_id) REFERENCES participants (id)
+        )
+    ''')
+    
+    # Bulk email send jobs: one row per job, one per outbound message (batch), one per recipient
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS email_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            status TEXT DEFAULT 'pending',
+            rate_per_minute REAL,
+            burst INTEGER,
+            draft_only INTEGER DEFAULT 0,
+            total_batches INTEGER DEFAULT 0,
+            sent_batches INTEGER DEFAULT 0,
+            failed_batches INTEGER DEFAULT 0,
+            total_recipients INTEGER DEFAULT 0,
+            sent_recipients INTEGER DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            updated_at TIMESTAMP,
+            completed_at TIMESTAMP
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS email_job_batches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER,
+            batch_number INTEGER,
+            subject TEXT,
+            body TEXT,
+            html_body TEXT,
+            recipient_count INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            sent_at TIMESTAMP,
+            last_error TEXT,
+            FOREIGN KEY (job_id) REFERENCES email_jobs (id)
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS email_job_recipients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER,
+            batch_id INTEGER,
+            email TEXT,
+            name TEXT,
+            status TEXT DEFAULT 'pending',
+            FOREIGN KEY (job_id) REFERENCES email_jobs (id),
+            FOREIGN KEY (batch_id) REFERENCES email_job_batches (id)
+        )
+    ''')
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_email_job_batches_job ON email_job_batches (job_id, batch_number)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_email_job_recipients_batch ON email_job_recipients (batch_id)")
+    
+    # Check if match_code column exists in matches table, if not add it
+    cursor.execute("PRAGMA table_info(matches)")
+    match_columns = [column[1] for column in cursor.fetchall()]
+    
+    if 'match_code' not in match_columns:
+        print("Adding match_code column to matches table...")
+        cursor.execute("ALTER TABLE matches ADD COLUMN match_code TEXT")
+        print("match_code column added.")
+    
+    if 'advancement_type' not in match_columns:
+        print("Adding advancement_type column to matches table...")
+        cursor.execute("ALTER TABLE matches ADD COLUMN advancement_type TEXT DEFAULT 'normal'")
+        print("advancement_type column added.")
+    
+    if 'game' not in match_columns:
+        print("Adding game column to matches table...")
+        cursor.execute("ALTER TABLE matches ADD COLUMN game TEXT")
+        print("game column added to matches table.")
+    
+    # Check if slot and round_number columns exist in fixtures table, if not add them
+    cursor.execute("PRAGMA table_info(fixtures)")
+    fixtures_columns = [column[1] for column in cursor.fetchall()]
+    
+    if 'slot' not in fixtures_columns:
+        print("Adding slot column to fixtures table...")
+        cursor.execute("ALTER TABLE fixtures ADD COLUMN slot TEXT")
+        print("slot column added to fixtures table.")
+    
+    if 'round_number' not in fixtures_columns:
+        print("Adding round_number column to fixtures table...")
+        cursor.execute("ALTER TABLE fixtures ADD COLUMN round_number INTEGER")
+        print("round_number column added to fixtures table.")
+    
+    if 'game' not in fixtures_columns:
+        print("Adding game column to fixtures table...")
+        cursor.execute("ALTER TABLE fixtures ADD COLUMN game TEXT")
+        print("game column added to fixtures table.")
+    
+    # Resets archive rows instead of deleting them (see archive_utils)
+    for table in ARCHIVABLE_TABLES:
+        cursor.execute(f"PRAGMA table_info({table})")
+        if 'archived' not in [column[1] for column in cursor.fetchall()]:
+            print(f"Adding archived column to {table} table...")
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN archived INTEGER NOT NULL DEFAULT 0")
+            print(f"archived column added to {table} table.")
+    
+    # emp_id is unique among active participants only, so people from an archived reset can
+    # be imported again; SQLite cannot drop a column constraint, so the table is rebuilt once
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'participants'")
+    participants_sql = cursor.fetchone()[0]
+    if _EMP_ID_UNIQUE.search(participants_sql):
+        print("Moving the emp_id unique constraint to an index over active participants...")
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'participants'")
+        sequence = cursor.fetchone()
+        rebuild_sql = _EMP_ID_UNIQUE.sub(r"\1", participants_sql)
+        cursor.execute(re.sub(r'^CREATE TABLE "?participants"?', "CREATE TABLE participants_rebuild", rebuild_sql))
+        cursor.execute("INSERT INTO participants_rebuild SELECT * FROM participants")
+        cursor.execute("DROP TABLE participants")
+        cursor.execute("ALTER TABLE participants_rebuild RENAME TO participants")
+        if sequence:
+            cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'participants'", sequence)
+        print("emp_id unique constraint moved.")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_participants_emp_id ON participants (emp_id) WHERE archived = 0")
+    
+    for name in _OLD_GAME_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, columns in ACTIVE_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {columns}")
+    
+    # Matches and fixtures written before they had a game (or without players) take their players' game;
+    # the game IS NULL lookup uses the active index, so this costs nothing once they are filled
+    for table in ("matches", "fixtures"):
+        cursor.execute(f"UPDATE {table} SET game = {ROW_GAME.format(row='')} "
+                       f"WHERE archived = 0 AND game IS NULL "
+                       f"AND COALESCE(player1_id, team1_player1_id, player2_id, team2_player1_id) IS NOT NULL")
+    
+    # Doubles teams, referenced by matches and fixtures through team1_id / team2_id
+    create_teams_table(conn)
+    
+    # Trigger-maintained counts for dashboard metrics
+    create_summary_tables(conn)
+    
+    # Per-set scores and the trigger-maintained player stats built from them
+    create_score_tables(conn)
+    
+    # Append-only change feed of every participant, match, fixture and email change
+    create_event_log(conn)
+    
+    conn.commit()
+    conn.close()
+
+def apply_dtypes(df, dtypes):
+    """Cast the columns of `df` named in `dtypes`; columns it does not have are skipped"""
+    return df.astype({column: dtype for column, dtype in dtypes.items() if column in df.columns})
+
+def _read_participants(game=None):
+    conn = connect(get_database())
+    # Filter out placeholder partners (those with names starting with "Player-")
+    df = pd.read_sql_query(f'''
+        SELECT * FROM participants 
+        WHERE archived = 0 AND name NOT LIKE 'Player-%' {"AND game = ?" if game else ""}
+        ORDER BY created_at DESC
+    ''', conn, params=[game] if game else None)
+    conn.close()
+    return df
+
+def _read_matches(limit=None, game=None):
+    conn = connect(get_database())
+    
+    # Check if created_at column exists in matches table
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(matches)")
+    columns = [column[1] for column in cursor.fetchall()]
+    
+    # Use appropriate ordering based on available columns
+    if 'created_at' in columns:
+        order_by = 'ORDER BY m.created_at DESC'
+    elif 'updated_at' in columns:
+        order_by = 'ORDER BY m.updated_at DESC'
+    else:
+        order_by = 'ORDER BY m.id DESC'
+    
+    df = pd.read_sql_query(f'''
+        SELECT m.*, 
+               p1.name as player1_name, p2.name as player2_name,
+               t1p1.name as team1_player1_name, t1p2.name as team1_player2_name,
+               t2p1.name as team2_player1_name, t2p2.name as team2_player2_name,
+               w.name as winner_name
+        FROM matches m
+        LEFT JOIN participants p1 ON m.player1_id = p1.id
+        LEFT JOIN participants p2 ON m.player2_id = p2.id
+        LEFT JOIN participants t1p1 ON m.team1_player1_id = t1p1.id
+        LEFT JOIN participants t1p2 ON m.team1_player2_id = t1p2.id
+        LEFT JOIN participants t2p1 ON m.team2_player1_id = t2p1.id
+        LEFT JOIN participants t2p2 ON m.team2_player2_id = t2p2.id
+        LEFT JOIN participants w ON m.winner_id = w.id
+        WHERE m.archived = 0 {"AND m.game = ?" if game else ""}
+        {order_by}
+        {f"LIMIT {int(limit)}" if limit else ""}
+    ''', conn, params=[game] if game else None)
+    conn.close()
+    return df
+
+def get_participants(game=None):
+    """
+    Get all participants from database (or only one game's), excluding auto-generated placeholder partners.
+
+    Columns in PARTICIPANT_DTYPES are categoricals; assigning a value that is not
+    already a category needs .astype(object) first.
+    """
+    return apply_dtypes(_read_participants(game), PARTICIPANT_DTYPES)
+
+def get_matches(limit=None, game=None):
+    """
+    Get all matches from database (newest first), or only the latest `limit` matches.
+
+    With `game`, only that game's matches are read (the filter runs in SQL on idx_matches_active).
+
+    Participant ID columns are Int64, so a missing player is pd.NA rather than NaN;
+    test with pd.isna() before using one in a condition.
+    """
+    return apply_dtypes(_read_matches(limit, game), MATCH_DTYPES)
+
+def get_memory_report():
+    """
+    Deep memory use of every get_participants() and get_matches() column, as loaded and typed.
+
+    Returns:
+        DataFrame: frame, column, dtype, untyped_bytes, typed_bytes and ratio, with a total row per frame
+    """
+    rows = []
+    for frame, df, dtypes in (("participants", _read_participants(), PARTICIPANT_DTYPES),
+                              ("matches", _read_matches(), MATCH_DTYPES)):
+        typed = apply_dtypes(df, dtypes)
+        untyped_bytes = df.memory_usage(deep=True, index=False)
+        typed_bytes = typed.memory_usage(deep=True, index=False)
+        for column in df.columns:
+            rows.append({'frame': frame, 'column': column, 'dtype': str(typed[column].dtype),
+                         'untyped_bytes': int(untyped_bytes[column]), 'typed_bytes': int(typed_bytes[column])})
+        rows.append({'frame': frame, 'column': '(total)', 'dtype': '',
+                     'untyped_bytes': int(untyped_bytes.sum()), 'typed_bytes': int(typed_bytes.sum())})
+    report = pd.DataFrame(rows, columns=['frame', 'column', 'dtype', 'untyped_bytes', 'typed_bytes'])
+    report['ratio'] = (report['untyped_bytes'] / report['typed_bytes'].where(report['typed_bytes'] > 0)).round(1)
+    return report
+
+def add_participant(emp_id, name, email, category, partner_emp_id=None):
+    """Add a new participant to the database (legacy function)"""
+    return add_participant_extended(emp_id, name, email, None, None, "Carrom", category, None, partner_emp_id, None, None)
+
+def add_participant_extended(emp_id, name, email, location=None, sub_location=None, game="Carrom", 
+                           category=None, slot=None, partner_emp_id=None, gender=None, partner_gender=None):
+    """Add a new participant to the database with extended fields"""
+    conn = connect(get_database())
+    try:
+        cursor = conn.cursor()
+        
+        # Get current timestamp for created_at
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Check if the participant already exists
+        cursor.execute('SELECT COUNT(*) FROM participants WHERE emp_id = ? AND archived = 0', (emp_id,))
+        if cursor.fetchone()[0] > 0:
+            raise sqlite3.IntegrityError(f"UNIQUE constraint failed: participants.emp_id ({emp_id})")
+        
+        # Insert the new participant with all fields
+        cursor.execute('''
+            INSERT INTO participants (emp_id, name, email, location, sub_location, game, category, slot, 
+                                    partner_emp_id, gender, partner_gender, registered_at_desk, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (emp_id, name, email, location, sub_location, game, category, slot, 
+              partner_emp_id, gender, partner_gender, 0, current_time))
+        
+        # Pair with a partner who is already registered
+        sync_teams(conn, [cursor.lastrowid])
+        
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+def ensure_partner_exists(partner_emp_id, category, game="Carrom", slot=None, gender=None):
+    """Ensure that a partner exists in the database, create a placeholder if not"""
+    if not partner_emp_id:
+        return False
+        
+    conn = connect(get_database())
+    cursor = conn.cursor()
+    
+    # Check if partner exists
+    cursor.execute('SELECT COUNT(*) FROM participants WHERE emp_id = ? AND archived = 0', (partner_emp_id,))
+    exists = cursor.fetchone()[0] > 0
+    
+    if not exists:
+        # Create a placeholder partner entry
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        partner_name = f"Player-{partner_emp_id}"
+        partner_email = f"player{partner_emp_id}@example.com"
+        
+        # Insert with all the new fields
+        cursor.execute('''
+            INSERT INTO participants (emp_id, name, email, game, category, slot, gender, registered_at_desk, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (partner_emp_id, partner_name, partner_email, game, category, slot, gender, 0, current_time))
+        
+        conn.commit()
+        print(f"Created placeholder partner with ID {partner_emp_id}")
+        result = True
+    else:
+        print(f"Partner with ID {partner_emp_id} already exists")
+        result = False
+        
+    conn.close()
+    return result
+
+def update_registration_status(participant_id, status):
+    """Update participant registration status with timestamp"""
+    conn = connect(get_database())
+    cursor = conn.cursor()
+    
+    if status == 1:
+        # Mark as reported with current timestamp
+        cursor.execute('''
+            UPDATE participants 
+            SET registered_at_desk = ?, registered_timestamp = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (status, participant_id))
+    else:
+        # Unmark - clear both status and timestamp
+        cursor.execute('''
+            UPDATE participants 
+            SET registered_at_desk = ?, registered_timestamp = NULL
+            WHERE id = ?
+        ''', (status, participant_id))
+    
+    # Pair anyone whose partner was registered, or re-partnered, after them
+    sync_teams(conn, [participant_id])
+    
+    conn.commit()
+    conn.close()
+
+def generate_match_id(match_id, category, round_number):
+    """Generate a readable match ID"""
+    category_code = ''.join([word[0].upper() for word in category.split()])
+    return f"{category_code}-R{round_number}-{match_id:03d}"
+
+def create_match(category, round_number, player1_id=None, player2_id=None, 
+                team1_player1_id=None, team1_player2_id=None,
+                team2_player1_id=None, team2_player2_id=None, game=None):
+    """Create a new match (game defaults to the first player's game)"""
+    conn = connect(get_database())
+    cursor = conn.cursor()
+    
+    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    if game is None:
+        first_player_id = next((player_id for player_id in (player1_id, team1_player1_id, player2_id, team2_player1_id)
+                                if player_id is not None), None)
+        if first_player_id is not None:
+            row = cursor.execute("SELECT game FROM participants WHERE id = ?", (first_player_id,)).fetchone()
+            game = row[0] if row else None
+    
+    # Check if created_at column exists
+    cursor.execute("PRAGMA table_info(matches)")
+    columns = [column[1] for column in cursor.fetchall()]
+    
+    if 'created_at' in columns:
+        cursor.execute(''' 
+            INSERT INTO matches (category, round_number, player1_id, player2_id, 
+                                team1_player1_id, team1_player2_id, 
+                                team2_player1_id, team2_player2_id, 
+                                match_status, created_at, game)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (category, round_number, player1_id, player2_id, 
+              team1_player1_id, team1_player2_id, 
+              team2_player1_id, team2_player2_id, 
+              'scheduled', current_time, game))
+    else:
+        cursor.execute(''' 
+            INSERT INTO matches (category, round_number, player1_id, player2_id, 
+                                team1_player1_id, team1_player2_id, 
+                                team2_player1_id, team2_player2_id, 
+                                match_status, game)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (category, round_number, player1_id, player2_id, 
+              team1_player1_id, team1_player2_id, 
+              team2_player1_id, team2_player2_id, 
+              'scheduled', game))
+    
+    match_id = cursor.lastrowid
+    link_team_ids(conn, 'matches', [match_id])
+    
+    # Generate a readable match ID
+    readable_id = generate_match_id(match_id, category, round_number)
+    
+    # Update the match with the readable ID
+    cursor.execute(''' 
+        UPDATE matches SET match_code = ? WHERE id = ?
+    ''', (readable_id, match_id))
+    
+    conn.commit()
+    conn.close()
+    return match_id
+
+def _rate_results(match_ids):
+    """Update player ratings for saved results; the results stand even if this fails"""
+    try:
+        rate_matches(match_ids, get_database())
+    except Exception:
+        logger.exception("Could not update ratings for matches %s; run `python ratings_utils.py recompute`",
+                         match_ids)
+
+def update_match_result(match_id, winner_id=None, winner_team=None, advancement_type='normal', score=None, sets=None,
+                        advance=False):
+    """
+    Complete a match, and with `advance` create the next round once its round is done,
+    in the same transaction (as record_results() does for a batch).
+
+    Off by default: a round built one match at a time looks done as soon as the
+    matches created so far are, so only advance when the operator asks for it.
+    """
+    try:
+        conn = connect(get_database())
+        cursor = conn.cursor()
+        
+        # Update match status and winner
+        if winner_id is not None:  # Singles match
+            cursor.execute(''' 
+                UPDATE matches 
+                SET match_status = 'completed', winner_id = ?, completed_at = ?, advancement_type = ?, score = COALESCE(?, score) 
+                WHERE id = ?
+            ''', (winner_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), advancement_type, score, match_id))
+        elif winner_team is not None:  # Doubles match
+            cursor.execute(''' 
+                UPDATE matches 
+                SET match_status = 'completed', winner_team = ?, completed_at = ?, advancement_type = ?, score = COALESCE(?, score) 
+                WHERE id = ?
+            ''', (winner_team, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), advancement_type, score, match_id))
+        
+        # Sets already checked by the caller (see read_score()); the stats triggers pick them up
+        if sets is not None:
+            save_match_sets(match_id, sets, conn=conn)
+        
+        if advance:
+            _advance_rounds(conn, conn.execute("SELECT game, category, round_number FROM matches "
+                                               "WHERE id = ? AND archived = 0", (match_id,)).fetchall())
+        
+        conn.commit()
+        conn.close()
+        _rate_results([match_id])
+        return True
+    except Exception as e:
+        print(f"Error updating match result: {str(e)}")
+        return False
+
+def update_match_tracker_details(match_id, round_number=None, match_status=None, winner_id=None, advancement_type=None):
+    """Update match details including round, status, winner and advancement type"""
+    try:
+        conn = connect(get_database())
+        cursor = conn.cursor()
+        
+        # Build the update query dynamically based on provided parameters
+        update_parts = []
+        params = []
+        
+        if round_number is not None:
+            update_parts.append("round_number = ?")
+            params.append(round_number)
+        
+        if match_status is not None:
+            update_parts.append("match_status = ?")
+            params.append(match_status)
+            
+            # If status is completed, add timestamp
+            if match_status == 'completed':
+                update_parts.append("completed_at = ?")
+                params.append(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            elif match_status == 'scheduled':
+                # Reset completed_at if match is rescheduled
+                update_parts.append("completed_at = NULL")
+        
+        if winner_id is not None:
+            update_parts.append("winner_id = ?")
+            params.append(winner_id)
+        
+        if advancement_type is not None:
+            update_parts.append("advancement_type = ?")
+            params.append(advancement_type)
+        
+        # Only proceed if we have something to update
+        if update_parts:
+            query = f"UPDATE matches SET {', '.join(update_parts)} WHERE id = ?"
+            params.append(match_id)
+            
+            cursor.execute(query, params)
+            conn.commit()
+            if match_status is not None or winner_id is not None or advancement_type is not None:
+                _rate_results([match_id])
+            
+            print(f"Updated match {match_id} with {', '.join(update_parts)}")
+            result = True
+        else:
+            print(f"No updates provided for match {match_id}")
+            result = False
+            
+        conn.close()
+        return result
+    except Exception as e:
+        print(f"Error updating match details: {str(e)}")
+        return False
+
+def update_match_details(match_id, player1_id=None, player2_id=None, team1_player1_id=None, team1_player2_id=None, team2_player1_id=None, team2_player2_id=None, match_status=None, round_number=None):
+    """Update match details"""
+    conn = connect(get_database())
+    cursor = conn.cursor()
+    
+    # Build the update query dynamically
+    update_parts = []
+    params = []
+    
+    if player1_id is not None:
+        update_parts.append("player1_id = ?")
+        params.append(player1_id)
+    
+    if player2_id is not None:
+        update_parts.append("player2_id = ?")
+        params.append(player2_id)
+    
+    if team1_player1_id is not None:
+        update_parts.append("team1_player1_id = ?")
+        params.append(team1_player1_id)
+    
+    if team1_player2_id is not None:
+        update_parts.append("team1_player2_id = ?")
+        params.append(team1_player2_id)
+    
+    if team2_player1_id is not None:
+        update_parts.append("team2_player1_id = ?")
+        params.append(team2_player1_id)
+    
+    if team2_player2_id is not None:
+        update_parts.append("team2_player2_id = ?")
+        params.append(team2_player2_id)
+    
+    if match_status is not None:
+        update_parts.append("match_status = ?")
+        params.append(match_status)
+    
+    if round_number is not None:
+        update_parts.append("round_number = ?")
+        params.append(round_number)
+    
+    # Only proceed if we have something to update
+    if update_parts:
+        query = f"UPDATE matches SET {', '.join(update_parts)} WHERE id = ?"
+        params.append(match_id)
+        
+        cursor.execute(query, params)
+        cursor.execute(f"UPDATE matches SET game = {ROW_GAME.format(row='')} WHERE id = ? AND game IS NULL", (match_id,))
+        link_team_ids(conn, 'matches', [match_id])
+        conn.commit()
+        conn.close()
+        return True
+    else:
+        conn.close()
+        return False
+
+def search_participants(search_term, participants_df):
+    # Search participants by emp_id, name, email, or category
+    if participants_df.empty:
+        return pd.DataFrame()
+        
+    search_term = str(search_term).lower()
+    
+    # Search in multiple columns
+    mask = (
+        participants_df['emp_id'].astype(str).str.lower().str.contains(search_term) |
+        participants_df['name'].astype(str).str.lower().str.contains(search_term) |
+        participants_df['email'].astype(str).str.lower().str.contains(search_term) |
+        participants_df['category'].astype(str).str.lower().str.contains(search_term)
+    )
+    
+    return participants_df[mask]
+
+
+def import_participants(df, progress=None):
+    """
+    Insert participants mapped on the Import tab, committing once at the end.
+
+    Rows whose Employee ID already exists are skipped rather than failing the import.
+
+    Args:
+        df (DataFrame): emp_id, name, email, category, location, sub_location, game, slot,
+                        partner_emp_id, gender, partner_gender and registered_at_desk columns
+        progress (callable, optional): Called as progress(position, total, row) before each row
+
+    Returns:
+        tuple: (imported_count, skipped_count, errors) where errors lists skipped and failed rows
+    """
+    conn = connect(get_database())
+    cursor = conn.cursor()
+    
+    imported_count = 0
+    skipped_count = 0
+    errors = []
+    total_rows = len(df)
+    
+    for position, (_, row) in enumerate(df.iterrows()):
+        if progress:
+            progress(position, total_rows, row)
+        
+        try:
+            cursor.execute('''
+                INSERT INTO participants (emp_id, name, email, location, sub_location, game, category, slot, 
+                                      partner_emp_id, gender, partner_gender, registered_at_desk)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                row['emp_id'], 
+                row['name'], 
+                row['email'],
+                row['location'] if 'location' in row and row['location'] else None,
+                row['sub_location'] if 'sub_location' in row and row['sub_location'] else None,
+                row['game'] if 'game' in row and row['game'] else 'Carrom',
+                row['category'], 
+                row['slot'] if 'slot' in row and row['slot'] else None,
+                row['partner_emp_id'] if 'partner_emp_id' in row and row['partner_emp_id'] else None,
+                row['gender'] if 'gender' in row and row['gender'] else None,
+                row['partner_gender'] if 'partner_gender' in row and row['partner_gender'] else None,
+                row['registered_at_desk']
+            ))
+            imported_count += 1
+        except sqlite3.IntegrityError as ie:
+            if "UNIQUE constraint failed" in str(ie):
+                skipped_count += 1
+                errors.append(f"Skipped {row['emp_id']} - {row['name']} (Employee ID already exists)")
+            else:
+                errors.append(f"Error with {row['emp_id']} - {row['name']}: {str(ie)}")
+        except Exception as e:
+            errors.append(f"Unexpected error with {row['emp_id']} - {row['name']}: {str(e)}")
+    
+    sync_teams(conn)
+    conn.commit()
+    conn.close()
+    return imported_count, skipped_count, errors
+
+
+def get_registration_desk_view(participants_df, game, search_term="", status_filter="All", category_filter="All"):
+    """
+    Participants listed at the Registration Desk, with partner and next-match details.
+
+    Applies the desk's search, game, status and category filters and leaves out
+    anyone who already has a completed match. Partner names and each participant's
+    next scheduled match are read with one query each for the whole table.
+
+    Args:
+        participants_df (DataFrame): Output of get_participants(game)
+        game (str): Selected game
+        search_term (str): Text matched by search_participants()
+        status_filter (str): "All", "Reported" or "Not Reported"
+        category_filter (str): "All" or a category
+
+    Returns:
+        DataFrame: The filtered participants plus partner_info ("name (emp_id)", the bare
+                   emp_id when unknown, or "None"), current_round (round of the next scheduled
+                   match, NA when none) and slot_info (that match's time slot, else the slot)
+    """
+    # Every query reads only the selected game's active matches and participants
+    conn = connect(get_database())
+    completed_ids = pd.read_sql_query('''
+        WITH game_matches AS (SELECT * FROM matches WHERE archived = 0 AND game = ? AND match_status = 'completed')
+        SELECT player1_id AS id FROM game_matches
+        UNION SELECT player2_id FROM game_matches
+        UNION SELECT team1_player1_id FROM game_matches
+        UNION SELECT team1_player2_id FROM game_matches
+        UNION SELECT team2_player1_id FROM game_matches
+        UNION SELECT team2_player2_id FROM game_matches
+    ''', conn, params=(game,))['id'].dropna()
+    partner_names = dict(conn.execute('''
+        SELECT emp_id, name FROM participants
+        WHERE archived = 0 AND emp_id IN (SELECT partner_emp_id FROM participants
+                                          WHERE archived = 0 AND game = ? AND partner_emp_id IS NOT NULL)
+    ''', (game,)).fetchall())
+    # A singles match takes precedence over a doubles one, then the earliest round
+    next_matches = pd.read_sql_query('''
+        WITH game_matches AS (SELECT * FROM matches WHERE archived = 0 AND game = ? AND match_status = 'scheduled')
+        SELECT player_id, round_number, match_date FROM (
+            SELECT player1_id AS player_id, round_number, match_date, 0 AS doubles FROM game_matches
+            UNION ALL SELECT player2_id, round_number, match_date, 0 FROM game_matches
+            UNION ALL SELECT team1_player1_id, round_number, match_date, 1 FROM game_matches
+            UNION ALL SELECT team1_player2_id, round_number, match_date, 1 FROM game_matches
+            UNION ALL SELECT team2_player1_id, round_number, match_date, 1 FROM game_matches
+            UNION ALL SELECT team2_player2_id, round_number, match_date, 1 FROM game_matches
+        )
+        WHERE player_id IS NOT NULL
+        ORDER BY doubles, round_number
+    ''', conn, params=(game,)).drop_duplicates('player_id').set_index('player_id')
+    conn.close()
+
+    filtered_df = search_participants(search_term, participants_df)
+    if filtered_df.empty:
+        return filtered_df
+    filtered_df = filtered_df[filtered_df['game'] == game]
+    filtered_df = filtered_df[~filtered_df['id'].isin(completed_ids)]
+    if status_filter == "Reported":
+        filtered_df = filtered_df[filtered_df['registered_at_desk'] == 1]
+    elif status_filter == "Not Reported":
+        filtered_df = filtered_df[filtered_df['registered_at_desk'] == 0]
+    if category_filter != "All":
+        filtered_df = filtered_df[filtered_df['category'] == category_filter]
+
+    filtered_df = filtered_df.copy()
+    partner_ids = filtered_df['partner_emp_id']
+    filtered_df['partner_info'] = [
+        "None" if pd.isna(emp_id) or not emp_id
+        else f"{partner_names[emp_id]} ({emp_id})" if emp_id in partner_names else emp_id
+        for emp_id in partner_ids
+    ]
+    filtered_df['current_round'] = filtered_df['id'].map(next_matches['round_number']).astype('Int64')
+    match_dates = filtered_df['id'].map(next_matches['match_date'])
+    filtered_df['slot_info'] = match_dates.where(match_dates.notna() & (match_dates != ''),
+                                                 filtered_df['slot'].astype(object))
+    return filtered_df
+
+
+def _page_bounds(offset, limit):
+    """Validate pagination arguments and clamp the page size to MAX_PAGE_SIZE"""
+    offset = int(offset or 0)
+    limit = DEFAULT_PAGE_SIZE if limit is None else int(limit)
+    if offset < 0 or limit < 1:
+        raise ValueError("offset must be >= 0 and limit >= 1")
+    return offset, min(limit, MAX_PAGE_SIZE)
+
+
+def _fetch_page(base_query, where, params, order_by, offset, limit, count_from):
+    """Run one page of a list query plus its total count; rows come back as dicts"""
+    offset, limit = _page_bounds(offset, limit)
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+    conn = connect(get_database())
+    conn.row_factory = sqlite3.Row
+    total = conn.execute(f"SELECT COUNT(*) FROM {count_from}{where_sql}", params).fetchone()[0]
+    rows = conn.execute(f"{base_query}{where_sql} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                        [*params, limit, offset]).fetchall()
+    conn.close()
+    return {
+        'items': [dict(row) for row in rows],
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'next_offset': offset + limit if offset + limit < total else None,
+    }
+
+
+def _fetch_one(query, params):
+    conn = connect(get_database())
+    conn.row_factory = sqlite3.Row
+    row = conn.execute(query, params).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def get_data_version():
+    """
+    Version of the tournament data: the change feed's latest seq.
+
+    Every participant, match and fixture change bumps it, so it is a cheap
+    validator for caches and HTTP ETags.
+    """
+    return get_latest_seq()
+
+
+def list_participants(offset=0, limit=DEFAULT_PAGE_SIZE, category=None, game=None, registered=None, search=None):
+    """
+    One page of active participants (auto-generated placeholder partners excluded), ordered by ID.
+
+    Returns:
+        dict: items, total, offset, limit and next_offset (None on the last page)
+    """
+    where, params = ["archived = 0", "name NOT LIKE 'Player-%'"], []
+    if category:
+        where.append("category = ?")
+        params.append(category)
+    if game:
+        where.append("game = ?")
+        params.append(game)
+    if registered is not None:
+        where.append("COALESCE(registered_at_desk, 0) = ?")
+        params.append(1 if registered else 0)
+    if search:
+        where.append("(emp_id LIKE ? OR name LIKE ? OR email LIKE ?)")
+        params.extend([f"%{search}%"] * 3)
+    return _fetch_page(f"SELECT {PARTICIPANT_COLUMNS} FROM participants", where, params, "id",
+                       offset, limit, "participants")
+
+
+def get_participant(participant_id):
+    """Return one active participant as a dict, or None"""
+    return _fetch_one(f"SELECT {PARTICIPANT_COLUMNS} FROM participants WHERE id = ? AND archived = 0",
+                      (participant_id,))
+
+
+def create_participant(emp_id, name, category, email=None, location=None, sub_location=None, game="Carrom",
+                       slot=None, partner_emp_id=None, gender=None, partner_gender=None):
+    """
+    Add a participant (and a placeholder partner for doubles) and return it.
+
+    Raises:
+        ValueError: If a required field is missing
+        sqlite3.IntegrityError: If the employee ID is already registered
+    """
+    if not emp_id or not name or not category:
+        raise ValueError("emp_id, name and category are required")
+    add_participant_extended(emp_id, name, email, location, sub_location, game, category, slot,
+                             partner_emp_id, gender, partner_gender)
+    if partner_emp_id:
+        ensure_partner_exists(partner_emp_id, category, game, slot, partner_gender)
+    return _fetch_one(f"SELECT {PARTICIPANT_COLUMNS} FROM participants WHERE emp_id = ? AND archived = 0", (emp_id,))
+
+
+def check_in_participant(participant_id, registered=True):
+    """Mark a participant as reported at the desk (or undo it); returns the updated participant or None"""
+    if get_participant(participant_id) is None:
+        return None
+    update_registration_status(participant_id, 1 if registered else 0)
+    return get_participant(participant_id)
+
+
+def list_matches(offset=0, limit=DEFAULT_PAGE_SIZE, category=None, status=None, round_number=None, game=None):
+    """One page of active matches with participant names, ordered by category, round and match number"""
+    where, params = ["m.archived = 0"], []
+    if game:
+        where.append("m.game = ?")
+        params.append(game)
+    if category:
+        where.append("m.category = ?")
+        params.append(category)
+    if status:
+        where.append("m.match_status = ?")
+        params.append(status)
+    if round_number is not None:
+        where.append("m.round_number = ?")
+        params.append(int(round_number))
+    return _fetch_page(MATCH_SELECT, where, params, "m.category, m.round_number, m.match_number, m.id",
+                       offset, limit, "matches m")
+
+
+def get_match(match_id):
+    """Return one active match with participant names, or None"""
+    return _fetch_one(f"{MATCH_SELECT} WHERE m.id = ? AND m.archived = 0", (match_id,))
+
+
+def schedule_match(category, round_number, player1_id=None, player2_id=None, team1_player1_id=None,
+                   team1_player2_id=None, team2_player1_id=None, team2_player2_id=None, game=None):
+    """
+    Create a match after checking its participants exist, and return it.
+
+    Raises:
+        ValueError: If a participant ID is unknown or both singles and doubles slots are given
+    """
+    player_ids = [player1_id, player2_id, team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id]
+    if (player1_id or player2_id) and (team1_player1_id or team2_player1_id):
+        raise ValueError("A match is either singles (player IDs) or doubles (team IDs), not both")
+    given = [int(player_id) for player_id in player_ids if player_id is not None]
+    if given:
+        conn = connect(get_database())
+        found = {row[0] for row in conn.execute(
+            f"SELECT id FROM participants WHERE archived = 0 AND id IN ({', '.join('?' * len(given))})", given)}
+        conn.close()
+        missing = sorted(set(given) - found)
+        if missing:
+            raise ValueError(f"Unknown participant IDs: {', '.join(map(str, missing))}")
+    match_id = create_match(category, int(round_number), player1_id, player2_id, team1_player1_id,
+                            team1_player2_id, team2_player1_id, team2_player2_id, game)
+    return get_match(match_id)
+
+
+def _scored_result(match_id, game, singles_players, score, winner_id=None, winner_team=None):
+    """
+    Read a result's score (text or a list of sets) with the rules of the match's game.
+
+    A valid score decides the winner: a missing winner is filled in from it and a
+    different one is rejected. Games without scoring rules keep the score as text.
+    A singles winner given as winner_team (1 or 2) becomes that side's player, so
+    singles results are always saved with winner_id.
+
+    Args:
+        singles_players (tuple): (player1_id, player2_id), or None for a doubles match
+
+    Returns:
+        tuple: (winner_id, winner_team, score text, sets), sets being None when not checked
+
+    Raises:
+        ValueError: If the score cannot be read, breaks the game's rules or names another winner,
+            or a singles winner_team is not 1 or 2, names an empty side or disagrees with winner_id
+    """
+    if singles_players is not None and winner_team is not None:
+        if int(winner_team) not in (1, 2):
+            raise ValueError(f"winner_team of match {match_id} must be 1 or 2")
+        side_player = singles_players[int(winner_team) - 1]
+        if side_player is None:
+            raise ValueError(f"Match {match_id} has no player {int(winner_team)}")
+        if winner_id is not None and int(winner_id) != side_player:
+            raise ValueError(f"winner_id and winner_team of match {match_id} name different players")
+        winner_id, winner_team = side_player, None
+    try:
+        scored = read_score(game, score)
+    except ValueError as e:
+        raise ValueError(f"Score of match {match_id}: {str(e)}")
+    if scored is None:
+        if isinstance(score, str):
+            return winner_id, winner_team, score.strip() or None, None
+        return winner_id, winner_team, None, None
+    sets, side, text = scored
+    if singles_players is not None:
+        if winner_id is not None and int(winner_id) != singles_players[side - 1]:
+            raise ValueError(f"The score of match {match_id} says player {side} won")
+        return singles_players[side - 1], None, text, sets
+    if winner_team is not None and int(winner_team) != side:
+        raise ValueError(f"The score of match {match_id} says team {side} won")
+    return None, side, text, sets
+
+
+def record_result(match_id, winner_id=None, winner_team=None, advancement_type='normal', score=None, advance=False):
+    """
+    Complete a match with a singles winner or a doubles winning team, and return it.
+
+    A score is checked against the game's rules (see scores_utils) and saved as sets;
+    it can stand in for the winner. With `advance`, the next round is created once the
+    match's round is complete (see update_match_result()).
+
+    Returns None if the match does not exist.
+
+    Raises:
+        ValueError: If the winner is not one of the match's players (or team is not 1 or 2),
+            or the score is invalid or names another winner (see _scored_result())
+    """
+    match = get_match(match_id)
+    if match is None:
+        return None
+    doubles = match['team1_player1_id'] is not None or match['team2_player1_id'] is not None
+    winner_id, winner_team, score, sets = _scored_result(
+        match_id, match['game'], None if doubles else (match['player1_id'], match['player2_id']), score,
+        winner_id, winner_team)
+    if winner_id is not None:
+        if int(winner_id) not in (match['player1_id'], match['player2_id']):
+            raise ValueError("winner_id must be one of the match's players")
+        winner_id = int(winner_id)
+    elif winner_team is not None:
+        if int(winner_team) not in (1, 2):
+            raise ValueError("winner_team must be 1 or 2")
+        winner_team = int(winner_team)
+    else:
+        raise ValueError("Provide winner_id (singles), winner_team (doubles) or a score")
+    if not update_match_result(match_id, winner_id=winner_id, winner_team=winner_team,
+                               advancement_type=advancement_type, score=score, sets=sets, advance=advance):
+        raise RuntimeError(f"Could not record the result of match {match_id}")
+    return get_match(match_id)
+
+
+def _advance_round(conn, game, category, round_number):
+    """
+    Create the next knockout round once every match of a round is completed.
+
+    Winners are paired in match order; with an odd number the last one gets a bye,
+    recorded as a completed match with advancement_type 'bye'. Nothing happens while
+    the round has unplayed matches, when the next round already exists, or when the
+    round produced the champion.
+
+    Returns:
+        list: IDs of the matches created
+    """
+    key = "archived = 0 AND game IS ? AND category = ?"
+    rows = conn.execute(f'''
+        SELECT match_status, winner_id, winner_team, player1_id, player2_id,
+               team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id
+        FROM matches WHERE {key} AND round_number = ?
+        ORDER BY match_number, id
+    ''', (game, category, round_number)).fetchall()
+    if not rows or any(row[0] != 'completed' for row in rows):
+        return []
+    if conn.execute(f"SELECT 1 FROM matches WHERE {key} AND round_number = ? LIMIT 1",
+                    (game, category, round_number + 1)).fetchone():
+        return []
+
+    doubles = rows[0][5] is not None or rows[0][7] is not None
+    winners = []
+    for _, winner_id, winner_team, player1_id, player2_id, t1p1, t1p2, t2p1, t2p2 in rows:
+        if doubles and winner_team in (1, 2):
+            winners.append((t1p1, t1p2) if winner_team == 1 else (t2p1, t2p2))
+        elif not doubles and winner_id is not None:
+            winners.append((winner_id,))
+    if len(winners) < 2:
+        return []
+
+    next_round = round_number + 1
+    match_number = conn.execute(f"SELECT COALESCE(MAX(match_number), 0) FROM matches WHERE {key}",
+                                (game, category)).fetchone()[0]
+    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    pairs = list(zip(winners[::2], winners[1::2]))
+    if len(winners) % 2:
+        pairs.append((winners[-1], None))
+
+    match_ids = []
+    for side1, side2 in pairs:
+        match_number += 1
+        if doubles:
+            players = (None, None, *side1, *(side2 or (None, None)))
+        else:
+            players = (side1[0], side2[0] if side2 else None, None, None, None, None)
+        bye = side2 is None
+        cursor = conn.execute('''
+            INSERT INTO matches (game, category, round_number, match_number, player1_id, player2_id,
+                                 team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id,
+                                 match_status, winner_id, winner_team, advancement_type, created_at, completed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (game, category, next_round, match_number, *players,
+              'completed' if bye else 'scheduled',
+              players[0] if bye and not doubles else None, 1 if bye and doubles else None,
+              'bye' if bye else 'normal', current_time, current_time if bye else None))
+        match_ids.append(cursor.lastrowid)
+    conn.executemany("UPDATE matches SET match_code = ? WHERE id = ?",
+                     [(generate_match_id(match_id, category, next_round), match_id) for match_id in match_ids])
+    link_team_ids(conn, 'matches', match_ids)
+    return match_ids
+
+
+def _advance_rounds(conn, rounds):
+    """
+    Run _advance_round() for each (game, category, round_number), and again for every
+    round it creates, so byes carry players forward in the caller's transaction.
+
+    Returns:
+        list: IDs of the matches created
+    """
+    rounds = set(rounds)
+    created = []
+    while rounds:
+        game, category, round_number = rounds.pop()
+        new_ids = _advance_round(conn, game, category, round_number)
+        created.extend(new_ids)
+        if new_ids:
+            rounds.add((game, category, round_number + 1))
+    return created
+
+
+def record_results(results, advance=True):
+    """
+    Complete many matches in one transaction, e.g. a referee's batch from the result grid.
+
+    Every result is checked before anything is written, so a bad row saves nothing.
+    With `advance`, each round the batch finishes gets its next round created (see
+    _advance_round()), repeatedly, so byes carry players forward in the same commit.
+
+    Args:
+        results (list): Dicts with match_id and winner_id (singles) or winner_team (1 or 2;
+            for singles it names player 1 or 2), and optionally score (text or sets, which
+            can stand in for the winner) and advancement_type
+        advance (bool): Create next-round matches for completed rounds
+
+    Returns:
+        dict: completed (matches saved) and created (IDs of next-round matches)
+
+    Raises:
+        ValueError: If a match is unknown, archived or already completed, a winner is not in it,
+            or a score breaks its game's rules (see _scored_result())
+    """
+    if not results:
+        return {'completed': 0, 'created': []}
+    match_ids = [int(result['match_id']) for result in results]
+    if len(set(match_ids)) != len(match_ids):
+        raise ValueError("Each match can only have one result per batch")
+
+    conn = connect(get_database(), timeout=30)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        marks = ", ".join("?" * len(match_ids))
+        matches = {row[0]: row for row in conn.execute(f'''
+            SELECT id, game, category, round_number, match_status, player1_id, player2_id,
+                   team1_player1_id IS NOT NULL OR team2_player1_id IS NOT NULL
+            FROM matches WHERE archived = 0 AND id IN ({marks})
+        ''', match_ids)}
+
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        updates = []
+        match_sets = []
+        for result in results:
+            match = matches.get(int(result['match_id']))
+            if match is None:
+                raise ValueError(f"Match {result['match_id']} not found")
+            if match[4] == 'completed':
+                raise ValueError(f"Match {match[0]} already has a result")
+            winner_id, winner_team, score, sets = _scored_result(
+                match[0], match[1], None if match[7] else (match[5], match[6]), result.get('score'),
+                result.get('winner_id'), result.get('winner_team'))
+            if sets is not None:
+                match_sets.append((match[0], sets))
+            if winner_id is not None:
+                winner_id = int(winner_id)
+                if winner_id not in (match[5], match[6]):
+                    raise ValueError(f"winner_id of match {match[0]} must be one of its players")
+            elif winner_team is not None:
+                winner_team = int(winner_team)
+                if winner_team not in (1, 2):
+                    raise ValueError(f"winner_team of match {match[0]} must be 1 or 2")
+            else:
+                raise ValueError(f"Match {match[0]} needs winner_id (singles), winner_team (doubles) or a score")
+            updates.append((winner_id, winner_team, score,
+                            result.get('advancement_type') or 'normal', current_time, match[0]))
+
+        conn.executemany('''
+            UPDATE matches
+            SET match_status = 'completed', winner_id = ?, winner_team = ?, score = COALESCE(?, score),
+                advancement_type = ?, completed_at = ?
+            WHERE id = ?
+        ''', updates)
+        for match_id, sets in match_sets:
+            save_match_sets(match_id, sets, conn=conn)
+
+        created = _advance_rounds(conn, {(match[1], match[2], match[3]) for match in matches.values()}) if advance else []
+        conn.commit()
+        _rate_results(match_ids)
+        return {'completed': len(updates), 'created': created}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def list_fixtures(offset=0, limit=DEFAULT_PAGE_SIZE, category=None, location=None, game=None):
+    """One page of active fixtures with participant names, ordered by start time and court"""
+    where, params = ["f.archived = 0"], []
+    if game:
+        where.append("f.game = ?")
+        params.append(game)
+    if category:
+        where.append("f.category = ?")
+        params.append(category)
+    if location:
+        where.append("f.location = ?")
+        params.append(location)
+    return _fetch_page(FIXTURE_SELECT, where, params, "f.start_time, f.time_slot, f.court_number, f.id",
+                       offset, limit, "fixtures f")
+
+
+def get_fixture(fixture_id):
+    """Return one active fixture with participant names, or None"""
+    return _fetch_one(f"{FIXTURE_SELECT} WHERE f.id = ? AND f.archived = 0", (fixture_id,))
+
+
+def generate_fixtures(category, location, start_time, end_time, interval_minutes=30, matches_per_slot=1, game=None,
+                      seeded=False):
+    """
+    Pair a category's participants into time slots and save the fixtures.
+
+    Args:
+        category (str): Category to schedule
+        location (str): Venue written on every fixture
+        start_time, end_time (datetime or ISO str): Scheduling window
+        interval_minutes (int): Slot length
+        matches_per_slot (int): Courts used in parallel
+        game (str, optional): Only pair this game's participants
+        seeded (bool): Pair by rating, top seed against bottom seed (see ratings_utils.seed_entries())
+
+    Returns:
+        int: Number of fixtures created
+    """
+    start_time = datetime.fromisoformat(start_time) if isinstance(start_time, str) else start_time
+    end_time = datetime.fromisoformat(end_time) if isinstance(end_time, str) else end_time
+    if end_time <= start_time or int(interval_minutes) < 1 or int(matches_per_slot) < 1:
+        raise ValueError("end_time must be after start_time; interval_minutes and matches_per_slot must be >= 1")
+    time_slots = generate_time_slots(start_time, end_time, int(interval_minutes), int(matches_per_slot))
+    fixtures = assign_participants_to_slots(get_participants(game), time_slots, category, location,
+                                            seeded=seeded)
+    return save_fixtures(fixtures)
+
+
+def remove_fixture(fixture_id):
+    """Delete a fixture; returns False if it did not exist"""
+    if get_fixture(fixture_id) is None:
+        return False
+    return delete_fixture(fixture_id)
+
+
+def get_bracket(category, game=None):
+    """
+    A category's matches (of one game, when given) grouped by round, with completion counts.
+
+    Returns:
+        dict: category, rounds (list of round_number, total, completed, matches)
+    """
+    conn = connect(get_database())
+    conn.row_factory = sqlite3.Row
+    game_filter = " AND m.game = ?" if game else ""
+    rows = conn.execute(f"{MATCH_SELECT} WHERE m.archived = 0 AND m.category = ?{game_filter} ORDER BY m.round_number, m.match_number, m.id",
+                        (category, game) if game else (category,)).fetchall()
+    conn.close()
+
+    rounds = {}
+    for row in rows:
+        rounds.setdefault(row['round_number'], []).append(dict(row))
+    return {
+        'category': category,
+        'rounds': [{
+            'round_number': round_number,
+            'total': len(matches),
+            'completed': sum(1 for match in matches if match['match_status'] == 'completed'),
+            'matches': matches,
+        } for round_number, matches in rounds.items()],
+    }
+
+
+def get_summary(game=None):
+    """Headline counts (of one game, when given) from the trigger-maintained summary tables"""
+    return get_summary_metrics(game)
@@ -0,0 +1,267 @@
+import os
+import re
+import sys
+import shutil
+import argparse
+
+from db_utils import connect, set_database
+
+# Catalog of tournaments. Each tournament's participants, matches and fixtures live in
+# their own SQLite file, so a past season never adds rows to the current one's queries.
+CATALOG_PATH = "tournaments.db"
+
+# New tournament files are created here; archiving moves a file into ARCHIVE_DIR
+TOURNAMENTS_DIR = "tournaments"
+ARCHIVE_DIR = os.path.join(TOURNAMENTS_DIR, "archive")
+
+# The single database used before tournaments existed, registered as the first tournament
+DEFAULT_SLUG = "default"
+DEFAULT_DB_PATH = "tournament.db"
+
+CATALOG_TABLE = '''
+    CREATE TABLE IF NOT EXISTS tournaments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        slug TEXT NOT NULL UNIQUE,
+        name TEXT NOT NULL,
+        db_path TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'active',
+        is_current INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        archived_at TIMESTAMP
+    )
+'''
+
+CATALOG_COLUMNS = ("id", "slug", "name", "db_path", "status", "is_current", "created_at", "archived_at")
+
+
+def _catalog():
+    """Open the catalog, creating it with the default tournament on first use"""
+    conn = connect(CATALOG_PATH)
+    conn.execute(CATALOG_TABLE)
+    if conn.execute("SELECT COUNT(*) FROM tournaments").fetchone()[0] == 0:
+        conn.execute("INSERT INTO tournaments (slug, name, db_path, is_current) VALUES (?, ?, ?, 1)",
+                     (DEFAULT_SLUG, "Tournament", DEFAULT_DB_PATH))
+        conn.commit()
+    return conn
+
+
+def _row_to_dict(row):
+    return dict(zip(CATALOG_COLUMNS, row)) if row else None
+
+
+def slugify(name):
+    """File-name-safe identifier for a tournament name, e.g. "Carrom 2025" -> "carrom-2025" """
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def list_tournaments(include_archived=True):
+    """
+    Tournaments in the catalog, newest first.
+
+    Returns:
+        list: Dicts with id, slug, name, db_path, status (active/archived), is_current,
+              created_at and archived_at
+    """
+    query = f"SELECT {', '.join(CATALOG_COLUMNS)} FROM tournaments"
+    if not include_archived:
+        query += " WHERE status = 'active'"
+    conn = _catalog()
+    rows = conn.execute(query + " ORDER BY id DESC").fetchall()
+    conn.close()
+    return [_row_to_dict(row) for row in rows]
+
+
+def get_tournament(slug):
+    """A tournament's catalog entry, or None"""
+    conn = _catalog()
+    row = conn.execute(f"SELECT {', '.join(CATALOG_COLUMNS)} FROM tournaments WHERE slug = ?", (slug,)).fetchone()
+    conn.close()
+    return _row_to_dict(row)
+
+
+def get_current_tournament():
+    """The tournament the API, scripts and new app sessions work on"""
+    conn = _catalog()
+    row = conn.execute(f"SELECT {', '.join(CATALOG_COLUMNS)} FROM tournaments WHERE is_current = 1").fetchone()
+    conn.close()
+    return _row_to_dict(row)
+
+
+def use_database(db_path, thread_only=False):
+    """
+    Make every data module work on `db_path` (see db_utils.get_database()).
+
+    Args:
+        db_path (str): Tournament database path
+        thread_only (bool): Only for the calling thread, e.g. one app session's rerun
+    """
+    set_database(db_path, thread_only)
+
+
+def use_current_tournament(thread_only=False):
+    """
+    Make every data module work on the current tournament's file.
+
+    Returns:
+        str: The current tournament's database path
+    """
+    db_path = get_current_tournament()['db_path']
+    use_database(db_path, thread_only)
+    return db_path
+
+
+def create_tournament(name, make_current=False):
+    """
+    Register a tournament and create its database file.
+
+    Args:
+        name (str): Display name, e.g. "Carrom 2025"
+        make_current (bool): Make it the current tournament straight away
+
+    Returns:
+        dict: The catalog entry
+    """
+    from tournament_service import init_database
+
+    slug = slugify(name)
+    if not slug:
+        raise ValueError("Tournament name needs at least one letter or digit")
+    if get_tournament(slug):
+        raise ValueError(f"A tournament called {slug} already exists")
+    os.makedirs(TOURNAMENTS_DIR, exist_ok=True)
+    db_path = os.path.join(TOURNAMENTS_DIR, f"{slug}.db")
+    init_database(db_path)
+
+    conn = _catalog()
+    conn.execute("INSERT INTO tournaments (slug, name, db_path) VALUES (?, ?, ?)", (slug, name.strip(), db_path))
+    conn.commit()
+    conn.close()
+    if make_current:
+        set_current_tournament(slug)
+    return get_tournament(slug)
+
+
+def set_current_tournament(slug):
+    """
+    Make an active tournament the current one.
+
+    The API, scripts and app sessions started from now on use it; open app sessions
+    keep the tournament they selected.
+    """
+    tournament = get_tournament(slug)
+    if tournament is None:
+        raise ValueError(f"No tournament called {slug}")
+    if tournament['status'] != 'active':
+        raise ValueError(f"{slug} is archived; restore it first")
+    conn = _catalog()
+    conn.execute("UPDATE tournaments SET is_current = (slug = ?)", (slug,))
+    conn.commit()
+    conn.close()
+
+
+def archive_tournament(slug):
+    """
+    Move a tournament's database file into ARCHIVE_DIR and mark it archived.
+
+    The current tournament cannot be archived; switch to another one first.
+
+    Returns:
+        str: The archived file's path
+    """
+    tournament = get_tournament(slug)
+    if tournament is None:
+        raise ValueError(f"No tournament called {slug}")
+    if tournament['is_current']:
+        raise ValueError("The current tournament cannot be archived")
+    if tournament['status'] == 'archived':
+        return tournament['db_path']
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    archived_path = os.path.join(ARCHIVE_DIR, f"{slug}.db")
+    if os.path.exists(tournament['db_path']):
+        shutil.move(tournament['db_path'], archived_path)
+    conn = _catalog()
+    conn.execute("UPDATE tournaments SET status = 'archived', db_path = ?, archived_at = CURRENT_TIMESTAMP "
+                 "WHERE slug = ?", (archived_path, slug))
+    conn.commit()
+    conn.close()
+    return archived_path
+
+
+def restore_tournament(slug):
+    """
+    Move an archived tournament's file back into TOURNAMENTS_DIR and mark it active.
+
+    Returns:
+        str: The restored file's path
+    """
+    tournament = get_tournament(slug)
+    if tournament is None:
+        raise ValueError(f"No tournament called {slug}")
+    if tournament['status'] == 'active':
+        return tournament['db_path']
+    os.makedirs(TOURNAMENTS_DIR, exist_ok=True)
+    restored_path = os.path.join(TOURNAMENTS_DIR, f"{slug}.db")
+    if os.path.exists(restored_path):
+        raise ValueError(f"{restored_path} already exists")
+    shutil.move(tournament['db_path'], restored_path)
+    conn = _catalog()
+    conn.execute("UPDATE tournaments SET status = 'active', db_path = ?, archived_at = NULL WHERE slug = ?",
+                 (restored_path, slug))
+    conn.commit()
+    conn.close()
+    return restored_path
+
+
+def attach_tournament(conn, slug, alias=None):
+    """
+    Attach another tournament's file (active or archived) to an open connection.
+
+    For reports across seasons, e.g. after attach_tournament(conn, "carrom-2024", "past"):
+    SELECT emp_id FROM participants WHERE emp_id IN (SELECT emp_id FROM past.participants)
+
+    Returns:
+        str: The schema alias to qualify its tables with (default: the slug with "_" for "-")
+    """
+    tournament = get_tournament(slug)
+    if tournament is None:
+        raise ValueError(f"No tournament called {slug}")
+    alias = alias or slug.replace("-", "_")
+    if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", alias):
+        raise ValueError(f"Invalid schema alias {alias}")
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (os.path.abspath(tournament['db_path']),))
+    return alias
+
+
+def main(argv=None):
+    """Command line entry point for managing tournaments"""
+    parser = argparse.ArgumentParser(description="Create, switch, archive and restore tournaments")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List tournaments")
+    create_parser = subparsers.add_parser("create", help="Create a tournament with an empty database")
+    create_parser.add_argument("name")
+    create_parser.add_argument("--current", action="store_true", help="Switch to it")
+    for command, help_text in (("switch", "Make a tournament the current one"),
+                               ("archive", "Move a tournament's database into the archive"),
+                               ("restore", "Move an archived tournament's database back")):
+        subparsers.add_parser(command, help=help_text).add_argument("slug")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for tournament in list_tournaments():
+            marker = "*" if tournament['is_current'] else " "
+            print(f"{marker} {tournament['slug']:<24} {tournament['status']:<9} {tournament['db_path']}  {tournament['name']}")
+    elif args.command == "create":
+        tournament = create_tournament(args.name, make_current=args.current)
+        print(f"Created {tournament['slug']} at {tournament['db_path']}")
+    elif args.command == "switch":
+        set_current_tournament(args.slug)
+        print(f"{args.slug} is now the current tournament")
+    elif args.command == "archive":
+        print(f"Archived {args.slug} to {archive_tournament(args.slug)}")
+    else:
+        print(f"Restored {args.slug} to {restore_tournament(args.slug)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())